@@ -2,17 +2,27 @@ from __future__ import annotations
 
 import asyncio
 import logging
+import time
 from collections.abc import AsyncGenerator, Mapping, Sequence
-from dataclasses import dataclass
+from dataclasses import dataclass, field
 from typing import Any
 
 from langchain_core.language_models.chat_models import BaseChatModel
 from langchain_core.messages import BaseMessage, HumanMessage, SystemMessage
 from langchain_core.prompts import ChatPromptTemplate
-from langchain_openai import ChatOpenAI
-from langchain_openrouter import ChatOpenRouter
 
+from agents.llm_registry import create_llm, get_llm_registry
+from agents.rate_limiter import Priority, estimate_tokens, get_provider_limiter
+from agents.resilience import STREAM_STARTED, StreamPolicy, resilient_stream
+from app.config import settings
+from constants.llm import get_model_info
 from observability import TraceContext, observed_span
+from observability.metrics import (
+    LLM_FIRST_TOKEN_SECONDS,
+    LLM_IN_FLIGHT,
+    LLM_REQUESTS_TOTAL,
+    LLM_STREAM_SECONDS,
+)
 
 logger = logging.getLogger(__name__)
 
@@ -76,6 +86,58 @@ def build_cached_system_messages(
     ]
 
 
+@dataclass(slots=True)
+class _TokenCounts:
+    input_tokens: int | None = None
+    output_tokens: int | None = None
+    cache_read_tokens: int | None = None
+    cache_creation_tokens: int | None = None
+
+    def record_usage_metadata(self, usage_metadata: dict) -> None:
+        details = usage_metadata.get("input_token_details") or {}
+        self.input_tokens = usage_metadata.get("input_tokens")
+        self.output_tokens = usage_metadata.get("output_tokens")
+        self.cache_read_tokens = details.get("cache_read") or details.get("cache_read_input_tokens")
+        self.cache_creation_tokens = details.get("cache_creation") or details.get(
+            "cache_creation_input_tokens"
+        )
+
+
+@dataclass(slots=True)
+class CallAttempt(_TokenCounts):
+    """One request actually sent to a provider within a ``BaseAgent.stream`` call.
+
+    ``kind`` is ``primary``, ``retry`` or ``hedge``; ``outcome`` is ``ok``,
+    ``error`` or ``cancelled`` (e.g. the hedge that lost). Latency is measured
+    from when the request left the rate limiter. Providers only report tokens
+    for streams that complete.
+    """
+
+    provider: str = ""
+    model: str = ""
+    kind: str = "primary"
+    outcome: str = "cancelled"
+    ttft_ms: int | None = None
+    duration_ms: int = 0
+
+
+@dataclass(slots=True)
+class CallUsage(_TokenCounts):
+    """Latency and token usage of one ``BaseAgent.stream`` call, filled in as it runs.
+
+    ``ttft_ms`` and ``duration_ms`` are measured from the caller's side, so they
+    include rate limiter waits and retries. Token counts are as reported by the
+    provider whose stream was kept (the hedge, if it won). ``attempts`` holds
+    every provider request the call made, whatever became of it.
+    """
+
+    provider: str | None = None
+    model: str | None = None
+    ttft_ms: int | None = None
+    duration_ms: int | None = None
+    attempts: list[CallAttempt] = field(default_factory=list)
+
+
 def log_cache_usage(
     response_metadata: dict | None,
     usage_metadata: dict | None,
@@ -141,35 +203,6 @@ def _chunk_content_to_text(chunk_content) -> str:
     return ""
 
 
-def create_llm(
-    provider: str,
-    model: str,
-    api_key: str,
-    api_base: str | None,
-) -> BaseChatModel:
-    """Create the appropriate LLM based on the provider."""
-    if provider == "openai":
-        return ChatOpenAI(
-            api_key=api_key,
-            model=model,
-            base_url=api_base or None,
-            temperature=0.2,
-            streaming=True,
-            stream_usage=True,
-        )
-    elif provider == "openrouter":
-        return ChatOpenRouter(
-            api_key=api_key,
-            model=model,
-            base_url=api_base or None,
-            temperature=0.2,
-            streaming=True,
-            stream_usage=True,
-        )
-    else:
-        raise ValueError(f"Unsupported provider: {provider}")
-
-
 def _normalize_context_segments(
     segments: Sequence[SegmentContextInput],
 ) -> list[SegmentContext]:
@@ -219,6 +252,16 @@ def render_block(
     return "\n".join(lines)
 
 
+@dataclass(frozen=True, slots=True)
+class _LLMTarget:
+    """What a call leases its client from the registry with."""
+
+    provider: str
+    model: str
+    api_key: str
+    api_base: str | None
+
+
 class BaseAgent:
     """Base agent for LLM-powered text generation with streaming support."""
 
@@ -236,24 +279,24 @@ class BaseAgent:
         self.model = model
         self.chunk_chars = max(8, chunk_chars)
         self._api_key = api_key
+        self._api_base = api_base
         self.provider = provider
+        self.system_prompt = system_prompt
         self._llm: BaseChatModel | None = None
+        self._hedge: _LLMTarget | None = None
         self.prompt: ChatPromptTemplate | None = None
 
         if api_key:
             try:
-                self._llm = create_llm(
+                registry = get_llm_registry()
+                self._llm = registry.get_llm(
                     provider=provider,
                     model=model,
                     api_key=api_key,
                     api_base=api_base,
                 )
-                self.prompt = ChatPromptTemplate.from_messages(
-                    [
-                        ("system", system_prompt),
-                        ("human", human_message_template),
-                    ]
-                )
+                self.prompt = registry.get_prompt(system_prompt, human_message_template)
+                self._hedge = self._build_hedge_target(api_key=api_key, api_base=api_base)
             except Exception as e:
                 logger.warning(f"Failed to initialize LLM for provider {provider}: {e}")
                 logger.info("Using stub instead")
@@ -264,10 +307,38 @@ class BaseAgent:
     def has_provider(self) -> bool:
         return self._llm is not None and self.prompt is not None
 
+    def _build_hedge_target(self, *, api_key: str, api_base: str | None) -> _LLMTarget | None:
+        """Resolve the client hedged requests go to, or ``None`` when hedging is off.
+
+        ``llm_hedge_model`` may name a model on another provider; without it the
+        hedge is a duplicate request to this agent's own model.
+        """
+        if settings.llm_hedge_after_ms <= 0:
+            return None
+        requested = settings.llm_hedge_model or self.model
+        info = get_model_info(requested)
+        provider = info.provider if info else self.provider
+        model = info.id if info else requested
+        if provider != self.provider:
+            api_key = settings.get_api_key_for_provider(provider) or ""
+            api_base = None
+        if not api_key:
+            logger.warning(
+                "No API key for hedge provider; hedging disabled", extra={"provider": provider}
+            )
+            return None
+        # Build the client now so a misconfigured hedge shows up at startup.
+        get_llm_registry().get_llm(
+            provider=provider, model=model, api_key=api_key, api_base=api_base
+        )
+        return _LLMTarget(provider=provider, model=model, api_key=api_key, api_base=api_base)
+
     async def stream(
         self,
         *,
         trace: TraceContext | None = None,
+        priority: Priority = Priority.INTERACTIVE,
+        usage: CallUsage | None = None,
         **format_kwargs,
     ) -> AsyncGenerator[str, None]:
         """Stream formatted messages through the LLM.
@@ -275,6 +346,10 @@ class BaseAgent:
         Args:
             trace: Optional Langfuse trace context (name, session_id, user_id,
                 metadata, tags). When omitted, the call is not observed.
+            priority: Scheduling class with the provider's rate limiter;
+                background work yields to interactive calls.
+            usage: Optional accumulator for latency and token usage of the call.
+                Left untouched on the stub path.
             **format_kwargs: Arguments to format the prompt template with.
                 Must include all variables from system and human message templates.
 
@@ -292,36 +367,131 @@ class BaseAgent:
                 yield chunk
             return
 
+        primary = _LLMTarget(
+            provider=self.provider,
+            model=self.model,
+            api_key=self._api_key or "",
+            api_base=self._api_base,
+        )
+        hedge = self._hedge
+        usage = usage if usage is not None else CallUsage()
+        started = time.monotonic()
+        outcome = "cancelled"
+        opened = 0
+
+        def open_primary() -> AsyncGenerator[str | object, None]:
+            nonlocal opened
+            kind = "retry" if opened else "primary"
+            opened += 1
+            return self._provider_stream(
+                primary, format_kwargs, trace=trace, priority=priority, usage=usage, kind=kind
+            )
+
+        def open_hedge() -> AsyncGenerator[str | object, None]:
+            assert hedge is not None
+            return self._provider_stream(
+                hedge, format_kwargs, trace=trace, priority=priority, usage=usage, kind="hedge"
+            )
+
+        LLM_IN_FLIGHT.inc(provider=self.provider)
+        try:
+            async for delta in resilient_stream(
+                open_primary,
+                policy=StreamPolicy.from_settings(),
+                open_hedge=open_hedge if hedge is not None else None,
+                announces_start=True,
+            ):
+                if usage.ttft_ms is None:
+                    usage.ttft_ms = round((time.monotonic() - started) * 1000)
+                yield delta
+            outcome = "ok"
+        except Exception:
+            outcome = "error"
+            logger.exception("Streaming failed")
+            raise
+        finally:
+            usage.duration_ms = round((time.monotonic() - started) * 1000)
+            LLM_IN_FLIGHT.dec(provider=self.provider)
+            LLM_REQUESTS_TOTAL.inc(provider=self.provider, outcome=outcome)
+            LLM_STREAM_SECONDS.observe(usage.duration_ms / 1000, provider=self.provider)
+            if usage.ttft_ms is not None:
+                LLM_FIRST_TOKEN_SECONDS.observe(usage.ttft_ms / 1000, provider=self.provider)
+
+    async def _provider_stream(
+        self,
+        target: _LLMTarget,
+        format_kwargs: dict[str, Any],
+        *,
+        trace: TraceContext | None,
+        priority: Priority,
+        usage: CallUsage,
+        kind: str,
+    ) -> AsyncGenerator[str | object, None]:
+        """One streamed request to ``target``, holding a slot with its rate limiter.
+
+        Yields ``STREAM_STARTED`` once the slot is granted, then text deltas. The
+        request is added to ``usage.attempts`` however it ends.
+        """
+        assert self.prompt is not None
         messages = self.prompt.format_messages(**format_kwargs)
-        if self.provider == "openrouter":
+        if target.provider == "openrouter":
             system_text = next((m.content for m in messages if isinstance(m, SystemMessage)), None)
             human_text = next((m.content for m in messages if isinstance(m, HumanMessage)), None)
             if isinstance(system_text, str) and isinstance(human_text, str):
                 messages = build_cached_system_messages(system_text, human_text)
 
-        try:
-            final_chunk = None
-            with observed_span(trace, provider=self.provider, model=self.model) as obs:
-                stream_kwargs: dict[str, Any] = {}
-                if obs.config is not None:
-                    stream_kwargs["config"] = obs.config
-                if self.provider == "openrouter" and obs.trace_id is not None:
-                    stream_kwargs["trace"] = build_openrouter_trace(obs.trace_id, trace)
-                async for chunk in self._llm.astream(messages, **stream_kwargs):
-                    final_chunk = chunk
-                    delta = _chunk_content_to_text(chunk.content)
-                    if delta:
-                        yield delta
-            if final_chunk is not None:
-                log_cache_usage(
-                    getattr(final_chunk, "response_metadata", None),
-                    getattr(final_chunk, "usage_metadata", None),
-                    provider=self.provider,
-                    model=self.model,
-                )
-        except Exception:  # pragma: no cover
-            logger.exception("Streaming failed")
-            raise
+        limiter = get_provider_limiter(target.provider)
+        prompt_text = "".join(_chunk_content_to_text(m.content) for m in messages)
+        final_chunk = None
+        async with limiter.slot(priority, tokens=estimate_tokens(prompt_text)) as permit:
+            yield STREAM_STARTED
+            attempt = CallAttempt(provider=target.provider, model=target.model, kind=kind)
+            usage.attempts.append(attempt)
+            sent = time.monotonic()
+            try:
+                with (
+                    get_llm_registry().use_llm(
+                        provider=target.provider,
+                        model=target.model,
+                        api_key=target.api_key,
+                        api_base=target.api_base,
+                    ) as llm,
+                    observed_span(trace, provider=target.provider, model=target.model) as obs,
+                ):
+                    stream_kwargs: dict[str, Any] = {}
+                    if obs.config is not None:
+                        stream_kwargs["config"] = obs.config
+                    if target.provider == "openrouter" and obs.trace_id is not None:
+                        stream_kwargs["trace"] = build_openrouter_trace(obs.trace_id, trace)
+                    async for chunk in llm.astream(messages, **stream_kwargs):
+                        if attempt.ttft_ms is None:
+                            attempt.ttft_ms = round((time.monotonic() - sent) * 1000)
+                        final_chunk = chunk
+                        delta = _chunk_content_to_text(chunk.content)
+                        if delta:
+                            yield delta
+                attempt.outcome = "ok"
+            except Exception:
+                attempt.outcome = "error"
+                raise
+            finally:
+                # Anything else (GeneratorExit, cancellation) leaves it "cancelled".
+                attempt.duration_ms = round((time.monotonic() - sent) * 1000)
+            usage_metadata = getattr(final_chunk, "usage_metadata", None) or {}
+            attempt.record_usage_metadata(usage_metadata)
+            if usage_metadata.get("total_tokens") is not None:
+                permit.tokens_used = usage_metadata["total_tokens"]
+        # Only the stream that runs to completion reports; a cancelled hedge never does.
+        usage.provider = target.provider
+        usage.model = target.model
+        usage.record_usage_metadata(usage_metadata)
+        if final_chunk is not None:
+            log_cache_usage(
+                getattr(final_chunk, "response_metadata", None),
+                getattr(final_chunk, "usage_metadata", None),
+                provider=target.provider,
+                model=target.model,
+            )
 
     async def generate(
         self,
@@ -346,6 +516,9 @@ class BaseAgent:
 
 __all__ = [
     "BaseAgent",
+    "CallAttempt",
+    "CallUsage",
+    "Priority",
     "SegmentContext",
     "SegmentContextInput",
     "TraceContext",
@@ -3,6 +3,7 @@ from __future__ import annotations
 import asyncio
 import logging
 from collections.abc import AsyncGenerator
+from contextlib import AbstractContextManager
 from typing import Literal
 
 from agents.base_agent import (
@@ -10,11 +11,11 @@ from agents.base_agent import (
     TraceContext,
     build_cached_system_messages,
     build_openrouter_trace,
-    create_llm,
     log_cache_usage,
     render_block,
 )
 from agents.furigana import get_reading
+from agents.llm_registry import get_llm_registry
 from agents.prompts import (
     FACET_GRAMMAR_DENSE,
     FACET_GRAMMAR_SPARSE,
@@ -26,6 +27,7 @@ from agents.prompts import (
     FACET_VOCABULARY_SPARSE,
     render_facet_prompt,
 )
+from agents.rate_limiter import Priority, estimate_tokens, get_provider_limiter
 from app.config import settings
 from app.explanation_schemas import (
     FACET_LABELS,
@@ -133,11 +135,13 @@ class ExplanationGeneratorV2:
     ) -> None:
         self.model = model
         self.provider = provider
+        self._api_key = api_key
+        self._api_base = api_base
         self._llm = None
 
         if api_key:
             try:
-                self._llm = create_llm(
+                self._llm = get_llm_registry().get_llm(
                     provider=provider,
                     model=model,
                     api_key=api_key,
@@ -151,10 +155,6 @@ class ExplanationGeneratorV2:
         else:
             logger.info("ExplanationGeneratorV2: no API key, using stub")
 
-        # Cache one structured-output runnable per facet type (schema only,
-        # no system prompt baked in — system prompt is passed per-call).
-        self._structured_llms: dict[FacetType, object] = {}
-
     # ------------------------------------------------------------------
     # Public interface
     # ------------------------------------------------------------------
@@ -263,16 +263,25 @@ class ExplanationGeneratorV2:
                 tags=list(trace.tags) if trace.tags else [],
             )
 
-        structured_llm = self._get_structured_llm(facet_type)
+        # Explanations are requested by a reader, so facet calls run interactive.
+        limiter = get_provider_limiter(self.provider)
+        tokens = estimate_tokens(system_prompt + human_message)
         try:
-            with observed_span(facet_trace, provider=self.provider, model=self.model) as obs:
-                invoke_kwargs: dict = {}
-                if obs.config is not None:
-                    invoke_kwargs["config"] = obs.config
-                if self.provider == "openrouter" and obs.trace_id is not None:
-                    invoke_kwargs["trace"] = build_openrouter_trace(obs.trace_id, facet_trace)
-                wrapped = await structured_llm.ainvoke(messages, **invoke_kwargs)
-            raw = wrapped.get("raw") if isinstance(wrapped, dict) else None
+            async with limiter.slot(Priority.INTERACTIVE, tokens=tokens) as permit:
+                with (
+                    self._structured_llm(facet_type) as structured_llm,
+                    observed_span(facet_trace, provider=self.provider, model=self.model) as obs,
+                ):
+                    invoke_kwargs: dict = {}
+                    if obs.config is not None:
+                        invoke_kwargs["config"] = obs.config
+                    if self.provider == "openrouter" and obs.trace_id is not None:
+                        invoke_kwargs["trace"] = build_openrouter_trace(obs.trace_id, facet_trace)
+                    wrapped = await structured_llm.ainvoke(messages, **invoke_kwargs)
+                raw = wrapped.get("raw") if isinstance(wrapped, dict) else None
+                usage = getattr(raw, "usage_metadata", None) or {}
+                if usage.get("total_tokens") is not None:
+                    permit.tokens_used = usage["total_tokens"]
             parsed = wrapped.get("parsed") if isinstance(wrapped, dict) else wrapped
             if raw is not None:
                 log_cache_usage(
@@ -300,14 +309,19 @@ class ExplanationGeneratorV2:
             )
             return (facet_type, None, str(exc))
 
-    def _get_structured_llm(self, facet_type: FacetType):
-        """Return a cached ``llm.with_structured_output(schema, include_raw=True)`` for this facet."""
-        if facet_type not in self._structured_llms:
-            schema = FACET_SCHEMA_MAP[facet_type]
-            self._structured_llms[facet_type] = self._llm.with_structured_output(
-                schema, include_raw=True
-            )
-        return self._structured_llms[facet_type]
+    def _structured_llm(self, facet_type: FacetType) -> AbstractContextManager:
+        """Lease the shared ``with_structured_output(schema, include_raw=True)`` runnable.
+
+        Cached in the LLM registry per (client, facet schema) — schema only, no
+        system prompt baked in — so it outlives this per-request generator.
+        """
+        return get_llm_registry().use_structured_llm(
+            provider=self.provider,
+            model=self.model,
+            api_key=self._api_key,
+            api_base=self._api_base,
+            schema=FACET_SCHEMA_MAP[facet_type],
+        )
 
 
 # ---------------------------------------------------------------------------
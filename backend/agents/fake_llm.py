@@ -0,0 +1,271 @@
+"""Deterministic fake chat model for offline load and resilience testing.
+
+Selected with the ``fake`` model (provider ``fake``), e.g.
+``TRANSLATION_MODEL=fake``. It goes through the same registry, rate limiter,
+deadlines and usage accounting as a real provider, but answers locally:
+
+- time to first token is drawn from a lognormal distribution around
+  ``fake_llm_ttft_ms``, then tokens stream at a normally distributed rate
+  around ``fake_llm_tokens_per_s``;
+- ``fake_llm_rate_limit_rate`` of calls fail with a 429 before any output, and
+  ``fake_llm_error_rate`` fail with a 500 at a random point of the stream;
+- ``with_structured_output`` returns a placeholder instance of the schema.
+
+Every call draws from its own RNG seeded by ``fake_llm_seed`` and the call's
+sequence number, so the same sequence of calls behaves the same across runs.
+"""
+
+from __future__ import annotations
+
+import asyncio
+import itertools
+import json
+import math
+import random
+import types
+from collections.abc import AsyncIterator, Iterator
+from dataclasses import dataclass
+from typing import Any, Literal, Union, get_args, get_origin
+
+from langchain_core.callbacks import AsyncCallbackManagerForLLMRun, CallbackManagerForLLMRun
+from langchain_core.language_models.chat_models import BaseChatModel
+from langchain_core.messages import AIMessage, AIMessageChunk, BaseMessage, convert_to_messages
+from langchain_core.outputs import ChatGeneration, ChatGenerationChunk, ChatResult
+from langchain_core.runnables import RunnableLambda
+from pydantic import BaseModel, PrivateAttr
+
+FAKE_PROVIDER = "fake"
+
+# Roughly the characters per token of English output.
+_CHARS_PER_TOKEN = 4
+_WORDS = (
+    "the quiet rain fell over the old town while she waited by the window and "
+    "thought about what he had said before the train left the station"
+).split()
+
+
+class FakeProviderError(Exception):
+    """Injected provider failure; ``status_code`` drives retry and backoff decisions."""
+
+    def __init__(self, status_code: int) -> None:
+        super().__init__(f"fake provider error (status {status_code})")
+        self.status_code = status_code
+
+
+@dataclass(frozen=True, slots=True)
+class FakeCallPlan:
+    """What one call will do, drawn up front from its RNG."""
+
+    ttft_s: float
+    tokens_per_s: float
+    output_tokens: int
+    # 429 before output, or a 500 after this many tokens (0 = before output).
+    status_code: int | None = None
+    fail_after_tokens: int = 0
+
+
+def _message_text(messages: list[BaseMessage]) -> str:
+    parts: list[str] = []
+    for message in messages:
+        content = message.content
+        if isinstance(content, str):
+            parts.append(content)
+        elif isinstance(content, list):
+            parts.extend(
+                str(item.get("text", "")) if isinstance(item, dict) else str(item)
+                for item in content
+            )
+    return "".join(parts)
+
+
+def _request_text(messages: list[BaseMessage]) -> str:
+    """The text being worked on: the ``<source>`` element if present, else the last message.
+
+    Output is sized from this, not from the system prompt or the context blocks,
+    which would otherwise feed earlier (fake) translations back into the length.
+    """
+    text = _message_text(messages[-1:])
+    start = text.find("<source>")
+    end = text.find("</source>", start)
+    if start != -1 and end != -1:
+        return text[start + len("<source>") : end].strip()
+    return text
+
+
+def fake_value(annotation: Any, name: str) -> Any:
+    """Placeholder value for a field annotation; models are filled recursively."""
+    origin = get_origin(annotation)
+    args = get_args(annotation)
+    if origin in (Union, types.UnionType):
+        concrete = [arg for arg in args if arg is not type(None)]
+        return fake_value(concrete[0], name) if concrete else None
+    if origin is Literal:
+        return args[0]
+    if origin in (list, tuple, set):
+        return [fake_value(args[0], name)] if args else []
+    if origin is dict:
+        return {}
+    if isinstance(annotation, type) and issubclass(annotation, BaseModel):
+        return fake_instance(annotation)
+    if annotation is bool:
+        return False
+    if annotation is int:
+        return 0
+    if annotation is float:
+        return 0.0
+    if annotation is str:
+        return f"[fake] {name}"
+    return None
+
+
+def fake_instance(schema: type[BaseModel]) -> BaseModel:
+    """A valid instance of ``schema`` with every field set to a placeholder."""
+    return schema(
+        **{name: fake_value(field.annotation, name) for name, field in schema.model_fields.items()}
+    )
+
+
+class FakeChatModel(BaseChatModel):
+    """Chat model that streams locally generated text with configurable timing."""
+
+    model: str = "fake"
+    ttft_ms: float = 400.0
+    ttft_sigma: float = 0.5
+    tokens_per_s: float = 60.0
+    tokens_per_s_stddev: float = 15.0
+    error_rate: float = 0.0
+    rate_limit_rate: float = 0.0
+    max_output_tokens: int = 1024
+    seed: int = 0
+
+    _calls: Iterator[int] = PrivateAttr(default_factory=itertools.count)
+
+    @classmethod
+    def from_settings(cls, *, model: str) -> FakeChatModel:
+        from app.config import settings
+
+        return cls(
+            model=model,
+            ttft_ms=settings.fake_llm_ttft_ms,
+            ttft_sigma=settings.fake_llm_ttft_sigma,
+            tokens_per_s=settings.fake_llm_tokens_per_s,
+            tokens_per_s_stddev=settings.fake_llm_tokens_per_s_stddev,
+            error_rate=settings.fake_llm_error_rate,
+            rate_limit_rate=settings.fake_llm_rate_limit_rate,
+            seed=settings.fake_llm_seed,
+        )
+
+    @property
+    def _llm_type(self) -> str:
+        return FAKE_PROVIDER
+
+    def plan_call(self, messages: list[BaseMessage]) -> tuple[FakeCallPlan, random.Random]:
+        """Draw timing, length and failure for the next call."""
+        rng = random.Random(f"{self.seed}:{next(self._calls)}")
+        ttft_s = rng.lognormvariate(math.log(max(self.ttft_ms, 1.0) / 1000), self.ttft_sigma)
+        tokens_per_s = max(1.0, rng.gauss(self.tokens_per_s, self.tokens_per_s_stddev))
+        output_tokens = min(self.max_output_tokens, max(8, len(_request_text(messages)) // 2))
+        status_code: int | None = None
+        fail_after = 0
+        roll = rng.random()
+        if roll < self.rate_limit_rate:
+            status_code = 429
+        elif roll < self.rate_limit_rate + self.error_rate:
+            status_code = 500
+            fail_after = rng.randrange(output_tokens)
+        plan = FakeCallPlan(
+            ttft_s=ttft_s,
+            tokens_per_s=tokens_per_s,
+            output_tokens=output_tokens,
+            status_code=status_code,
+            fail_after_tokens=fail_after,
+        )
+        return plan, rng
+
+    @staticmethod
+    def _usage(prompt_text: str, output_tokens: int) -> dict[str, int]:
+        input_tokens = max(1, len(prompt_text) // _CHARS_PER_TOKEN)
+        return {
+            "input_tokens": input_tokens,
+            "output_tokens": output_tokens,
+            "total_tokens": input_tokens + output_tokens,
+        }
+
+    async def _astream(
+        self,
+        messages: list[BaseMessage],
+        stop: list[str] | None = None,
+        run_manager: AsyncCallbackManagerForLLMRun | None = None,
+        **kwargs: Any,
+    ) -> AsyncIterator[ChatGenerationChunk]:
+        prompt_text = _message_text(messages)
+        plan, rng = self.plan_call(messages)
+        await asyncio.sleep(plan.ttft_s)
+        if plan.status_code is not None and plan.fail_after_tokens == 0:
+            raise FakeProviderError(plan.status_code)
+        interval = 1 / plan.tokens_per_s
+        for index in range(plan.output_tokens):
+            if index and plan.status_code is not None and index == plan.fail_after_tokens:
+                raise FakeProviderError(plan.status_code)
+            if index:
+                await asyncio.sleep(interval)
+            word = rng.choice(_WORDS)
+            yield ChatGenerationChunk(message=AIMessageChunk(content=f"{word} "))
+        # Marked last so langchain does not append its own empty final chunk.
+        yield ChatGenerationChunk(
+            message=AIMessageChunk(
+                content="",
+                usage_metadata=self._usage(prompt_text, plan.output_tokens),
+                chunk_position="last",
+            )
+        )
+
+    def _generate(
+        self,
+        messages: list[BaseMessage],
+        stop: list[str] | None = None,
+        run_manager: CallbackManagerForLLMRun | None = None,
+        **kwargs: Any,
+    ) -> ChatResult:
+        prompt_text = _message_text(messages)
+        plan, rng = self.plan_call(messages)
+        if plan.status_code is not None:
+            raise FakeProviderError(plan.status_code)
+        text = " ".join(rng.choice(_WORDS) for _ in range(plan.output_tokens))
+        message = AIMessage(
+            content=text, usage_metadata=self._usage(prompt_text, plan.output_tokens)
+        )
+        return ChatResult(generations=[ChatGeneration(message=message)])
+
+    def with_structured_output(
+        self, schema: Any, *, include_raw: bool = False, **kwargs: Any
+    ) -> RunnableLambda:
+        """Answer with a placeholder ``schema`` instance after a simulated response time."""
+
+        async def respond(messages: Any) -> Any:
+            messages = convert_to_messages(messages)
+            prompt_text = _message_text(messages)
+            plan, _ = self.plan_call(messages)
+            await asyncio.sleep(plan.ttft_s + plan.output_tokens / plan.tokens_per_s)
+            if plan.status_code is not None:
+                raise FakeProviderError(plan.status_code)
+            parsed = fake_instance(schema)
+            if not include_raw:
+                return parsed
+            raw = AIMessage(
+                content=json.dumps(parsed.model_dump()),
+                usage_metadata=self._usage(prompt_text, plan.output_tokens),
+            )
+            return {"raw": raw, "parsed": parsed, "parsing_error": None}
+
+        # Async-only, like every structured call in this app.
+        return RunnableLambda(respond)
+
+
+__all__ = [
+    "FAKE_PROVIDER",
+    "FakeCallPlan",
+    "FakeChatModel",
+    "FakeProviderError",
+    "fake_instance",
+]
@@ -0,0 +1,370 @@
+from __future__ import annotations
+
+import asyncio
+import hashlib
+import logging
+import threading
+from collections import OrderedDict
+from collections.abc import Callable, Iterator
+from contextlib import contextmanager
+from dataclasses import dataclass
+from typing import Any
+
+import httpx
+import openai
+from langchain_core.language_models.chat_models import BaseChatModel
+from langchain_core.prompts import ChatPromptTemplate
+from langchain_openai import ChatOpenAI
+from langchain_openrouter import ChatOpenRouter
+
+from agents.fake_llm import FAKE_PROVIDER, FakeChatModel
+from app.config import settings
+from observability.metrics import (
+    LLM_CLIENT_CACHE_SIZE,
+    LLM_CLIENT_CACHE_TOTAL,
+    LLM_HTTP_REQUESTS_TOTAL,
+)
+
+logger = logging.getLogger(__name__)
+
+# LRU bounds. Clients hold an HTTP connection pool each, so keep that one small.
+MAX_CLIENTS = 16
+MAX_PROMPT_TEMPLATES = 256
+MAX_STRUCTURED_RUNNABLES = 64
+
+# Pool closes scheduled on the event loop, kept referenced until they finish.
+_closing: set[asyncio.Future] = set()
+
+
+def create_llm(
+    provider: str,
+    model: str,
+    api_key: str,
+    api_base: str | None,
+) -> BaseChatModel:
+    """Create the appropriate LLM based on the provider.
+
+    OpenAI clients get HTTP pools of their own instead of langchain's process-wide
+    defaults, so that closing an evicted client cannot close another one's pool.
+    """
+    if provider == "openai":
+        llm = ChatOpenAI(
+            api_key=api_key,
+            model=model,
+            base_url=api_base or None,
+            temperature=0.2,
+            streaming=True,
+            stream_usage=True,
+            http_client=openai.DefaultHttpxClient(),
+            http_async_client=openai.DefaultAsyncHttpxClient(),
+        )
+    elif provider == "openrouter":
+        llm = ChatOpenRouter(
+            api_key=api_key,
+            model=model,
+            base_url=api_base or None,
+            temperature=0.2,
+            streaming=True,
+            stream_usage=True,
+        )
+    elif provider == FAKE_PROVIDER and settings.enable_fake_llm:
+        return FakeChatModel.from_settings(model=model)
+    else:
+        raise ValueError(f"Unsupported provider: {provider}")
+    for pool in http_pools(llm):
+        _count_connections(pool, provider)
+    return llm
+
+
+def http_pools(llm: BaseChatModel) -> list[httpx.Client | httpx.AsyncClient]:
+    """The httpx clients (sync and async) a chat model sends its requests through."""
+    if isinstance(llm, ChatOpenAI):
+        pools = [llm.http_client, llm.http_async_client]
+    elif isinstance(llm, ChatOpenRouter):
+        config = llm.client.sdk_configuration
+        pools = [config.client, config.async_client]
+    else:
+        return []
+    return [pool for pool in pools if isinstance(pool, httpx.Client | httpx.AsyncClient)]
+
+
+def _count_connections(pool: httpx.Client | httpx.AsyncClient, provider: str) -> None:
+    """Count every request on ``pool`` as opening a new connection or reusing one.
+
+    httpcore reports connection setup through the ``trace`` request extension;
+    a request whose headers go out without a TCP connect rode a pooled connection.
+    """
+
+    def tracer() -> Callable[[str, dict], None]:
+        opened = False
+
+        def trace(event: str, info: dict) -> None:
+            nonlocal opened
+            if event == "connection.connect_tcp.started":
+                opened = True
+            elif event.endswith(".send_request_headers.started"):
+                connection = "new" if opened else "reused"
+                LLM_HTTP_REQUESTS_TOTAL.inc(provider=provider, connection=connection)
+
+        return trace
+
+    if isinstance(pool, httpx.AsyncClient):
+
+        async def on_async_request(request: httpx.Request) -> None:
+            trace = tracer()
+
+            async def async_trace(event: str, info: dict) -> None:
+                trace(event, info)
+
+            request.extensions["trace"] = async_trace
+
+        pool.event_hooks["request"].append(on_async_request)
+    else:
+
+        def on_request(request: httpx.Request) -> None:
+            request.extensions["trace"] = tracer()
+
+        pool.event_hooks["request"].append(on_request)
+
+
+@dataclass(frozen=True, slots=True)
+class LLMClientKey:
+    provider: str
+    model: str
+    api_base: str | None
+    # Keeps clients built with a rotated key apart without holding the key itself.
+    api_key_fingerprint: str
+
+
+class _LRU:
+    def __init__(
+        self,
+        name: str,
+        maxsize: int,
+        on_evict: Callable[[Any, Any], None] | None = None,
+    ) -> None:
+        self.name = name
+        self.maxsize = maxsize
+        self.entries: OrderedDict[Any, Any] = OrderedDict()
+        self._on_evict = on_evict
+
+    def get_or_create(self, key: Any, factory: Callable[[], Any]) -> Any:
+        if key in self.entries:
+            self.entries.move_to_end(key)
+            LLM_CLIENT_CACHE_TOTAL.inc(cache=self.name, outcome="hit")
+            return self.entries[key]
+        LLM_CLIENT_CACHE_TOTAL.inc(cache=self.name, outcome="miss")
+        value = factory()
+        self.entries[key] = value
+        while len(self.entries) > self.maxsize:
+            evicted_key, evicted = self.entries.popitem(last=False)
+            LLM_CLIENT_CACHE_TOTAL.inc(cache=self.name, outcome="eviction")
+            if self._on_evict is not None:
+                self._on_evict(evicted_key, evicted)
+        LLM_CLIENT_CACHE_SIZE.set(len(self.entries), cache=self.name)
+        return value
+
+    def discard(self, predicate: Callable[[Any], bool]) -> None:
+        for key in [key for key in self.entries if predicate(key)]:
+            del self.entries[key]
+        LLM_CLIENT_CACHE_SIZE.set(len(self.entries), cache=self.name)
+
+
+class LLMClientRegistry:
+    """Process-wide cache of chat model clients and the runnables built on them.
+
+    Clients are keyed by (provider, model, api_base) plus a fingerprint of the
+    API key. Each client owns its SDK's HTTP connection pool, so every agent
+    resolving the same key reuses warm keep-alive connections instead of paying
+    client construction and a TLS handshake per request. Prompt templates are
+    cached per (system prompt, human template), and structured-output runnables
+    per (client, schema). All three are LRU-bounded.
+
+    An evicted client's pools are closed once no call leased through
+    ``use_llm`` / ``use_structured_llm`` is still running on it.
+    """
+
+    def __init__(
+        self,
+        *,
+        max_clients: int = MAX_CLIENTS,
+        max_prompt_templates: int = MAX_PROMPT_TEMPLATES,
+        max_structured_runnables: int = MAX_STRUCTURED_RUNNABLES,
+        llm_factory: Callable[..., BaseChatModel] = create_llm,
+    ) -> None:
+        self._llm_factory = llm_factory
+        self._clients = _LRU("clients", max_clients, on_evict=self._retire)
+        self._prompts = _LRU("prompt_templates", max_prompt_templates)
+        self._structured = _LRU("structured_runnables", max_structured_runnables)
+        # Leases held per client (by id), evicted clients still leased, and
+        # evicted clients ready to close once the lock is released.
+        self._leases: dict[int, int] = {}
+        self._retired: dict[int, BaseChatModel] = {}
+        self._to_close: list[BaseChatModel] = []
+        # The loop async pools are used on; they must be closed on it too.
+        self._loop: asyncio.AbstractEventLoop | None = None
+        # Agents are built from request handlers and worker threads alike.
+        self._lock = threading.Lock()
+
+    @staticmethod
+    def client_key(
+        *, provider: str, model: str, api_key: str, api_base: str | None
+    ) -> LLMClientKey:
+        fingerprint = hashlib.sha256(api_key.encode("utf-8")).hexdigest()[:16]
+        return LLMClientKey(
+            provider=provider,
+            model=model,
+            api_base=api_base or None,
+            api_key_fingerprint=fingerprint,
+        )
+
+    def _client(
+        self, *, provider: str, model: str, api_key: str, api_base: str | None
+    ) -> tuple[LLMClientKey, BaseChatModel]:
+        """Look the client up (or build it); the caller holds the lock."""
+        key = self.client_key(provider=provider, model=model, api_key=api_key, api_base=api_base)
+
+        def build() -> BaseChatModel:
+            logger.info(
+                "Creating LLM client",
+                extra={"provider": provider, "model": model, "api_base": key.api_base},
+            )
+            return self._llm_factory(
+                provider=provider, model=model, api_key=api_key, api_base=api_base
+            )
+
+        return key, self._clients.get_or_create(key, build)
+
+    def get_llm(
+        self, *, provider: str, model: str, api_key: str, api_base: str | None
+    ) -> BaseChatModel:
+        """Return the shared client for this provider/model/base URL.
+
+        The client may be evicted and closed later; calls go through ``use_llm``.
+        """
+        with self._lock:
+            _, llm = self._client(
+                provider=provider, model=model, api_key=api_key, api_base=api_base
+            )
+        self._close_retired()
+        return llm
+
+    @contextmanager
+    def use_llm(
+        self, *, provider: str, model: str, api_key: str, api_base: str | None
+    ) -> Iterator[BaseChatModel]:
+        """Lease the shared client for one call; eviction won't close it until released."""
+        with self._lock:
+            _, llm = self._client(
+                provider=provider, model=model, api_key=api_key, api_base=api_base
+            )
+            self._acquire(llm)
+        try:
+            self._close_retired()
+            yield llm
+        finally:
+            self._release(llm)
+
+    @contextmanager
+    def use_structured_llm(
+        self,
+        *,
+        provider: str,
+        model: str,
+        api_key: str,
+        api_base: str | None,
+        schema: type,
+    ) -> Iterator[Any]:
+        """Lease ``llm.with_structured_output(schema, include_raw=True)`` for one call."""
+        with self._lock:
+            key, llm = self._client(
+                provider=provider, model=model, api_key=api_key, api_base=api_base
+            )
+            structured = self._structured.get_or_create(
+                (key, schema), lambda: llm.with_structured_output(schema, include_raw=True)
+            )
+            self._acquire(llm)
+        try:
+            self._close_retired()
+            yield structured
+        finally:
+            self._release(llm)
+
+    def get_prompt(self, system_prompt: str, human_template: str) -> ChatPromptTemplate:
+        """Return the compiled chat template for a system prompt / human template pair."""
+
+        def build() -> ChatPromptTemplate:
+            return ChatPromptTemplate.from_messages(
+                [("system", system_prompt), ("human", human_template)]
+            )
+
+        with self._lock:
+            return self._prompts.get_or_create((system_prompt, human_template), build)
+
+    def _acquire(self, llm: BaseChatModel) -> None:
+        """Count a lease on ``llm``; the caller holds the lock."""
+        self._leases[id(llm)] = self._leases.get(id(llm), 0) + 1
+        try:
+            self._loop = asyncio.get_running_loop()
+        except RuntimeError:
+            pass
+
+    def _release(self, llm: BaseChatModel) -> None:
+        with self._lock:
+            remaining = self._leases.pop(id(llm)) - 1
+            if remaining:
+                self._leases[id(llm)] = remaining
+            elif id(llm) in self._retired:
+                self._to_close.append(self._retired.pop(id(llm)))
+        self._close_retired()
+
+    def _retire(self, key: LLMClientKey, llm: BaseChatModel) -> None:
+        """Eviction hook for clients; runs under the lock."""
+        self._structured.discard(lambda structured_key: structured_key[0] == key)
+        if id(llm) in self._leases:
+            self._retired[id(llm)] = llm
+        else:
+            self._to_close.append(llm)
+
+    def _close_retired(self) -> None:
+        with self._lock:
+            to_close, self._to_close = self._to_close, []
+        for llm in to_close:
+            for pool in http_pools(llm):
+                try:
+                    if isinstance(pool, httpx.AsyncClient):
+                        self._aclose(pool)
+                    else:
+                        pool.close()
+                except Exception:
+                    logger.warning("Failed to close an evicted LLM client", exc_info=True)
+
+    def _aclose(self, pool: httpx.AsyncClient) -> None:
+        """Close an async pool on the loop its connections belong to."""
+        try:
+            running = asyncio.get_running_loop()
+        except RuntimeError:
+            running = None
+        loop = self._loop if self._loop is not None and not self._loop.is_closed() else running
+        if loop is None:
+            asyncio.run(pool.aclose())
+        elif loop is running:
+            _schedule_aclose(pool)
+        else:
+            loop.call_soon_threadsafe(_schedule_aclose, pool)
+
+
+def _schedule_aclose(pool: httpx.AsyncClient) -> None:
+    task = asyncio.ensure_future(pool.aclose())
+    _closing.add(task)
+    task.add_done_callback(_closing.discard)
+
+
+_registry: LLMClientRegistry | None = None
+
+
+def get_llm_registry() -> LLMClientRegistry:
+    global _registry
+    if _registry is None:
+        _registry = LLMClientRegistry()
+    return _registry
@@ -0,0 +1,227 @@
+from __future__ import annotations
+
+import asyncio
+import heapq
+import itertools
+import logging
+import math
+import time
+from collections.abc import AsyncIterator, Callable
+from contextlib import asynccontextmanager
+from dataclasses import dataclass
+from enum import IntEnum
+
+from app.config import settings
+
+logger = logging.getLogger(__name__)
+
+
+class Priority(IntEnum):
+    """Scheduling class for a provider call; lower values are served first."""
+
+    INTERACTIVE = 0  # a reader is waiting on this output
+    BACKGROUND = 1  # prefetch and batch work
+
+
+def estimate_tokens(prompt_text: str, *, max_output_tokens: int = 512) -> int:
+    """Rough pre-call token reservation, reconciled with real usage afterwards."""
+    return len(prompt_text) // 3 + max_output_tokens
+
+
+def is_throttle_error(exc: BaseException) -> bool:
+    """Whether ``exc`` is a provider 429 or 5xx, i.e. a signal to back off."""
+    status = getattr(exc, "status_code", None)
+    if status is None:
+        status = getattr(getattr(exc, "response", None), "status_code", None)
+    if isinstance(status, int):
+        return status == 429 or status >= 500
+    return type(exc).__name__ in {"RateLimitError", "InternalServerError", "APITimeoutError"}
+
+
+class TokenBucket:
+    """Continuously refilled budget of ``per_minute`` units; 0 disables the limit.
+
+    Takes may overdraw the bucket (e.g. when real usage exceeds the estimate);
+    later callers then wait until it refills past zero.
+    """
+
+    def __init__(self, per_minute: int, *, clock: Callable[[], float] = time.monotonic) -> None:
+        self.capacity = float(max(0, per_minute))
+        self._rate = self.capacity / 60.0
+        self._clock = clock
+        self.level = self.capacity
+        self._updated = clock()
+
+    @property
+    def enabled(self) -> bool:
+        return self.capacity > 0
+
+    def _refill(self) -> None:
+        now = self._clock()
+        self.level = min(self.capacity, self.level + (now - self._updated) * self._rate)
+        self._updated = now
+
+    def delay_for(self, amount: float) -> float:
+        """Seconds until ``amount`` (capped at capacity) can be taken."""
+        if not self.enabled:
+            return 0.0
+        self._refill()
+        needed = min(amount, self.capacity)
+        if self.level >= needed:
+            return 0.0
+        return (needed - self.level) / self._rate
+
+    def take(self, amount: float) -> None:
+        if self.enabled:
+            self._refill()
+            self.level -= amount
+
+    def give(self, amount: float) -> None:
+        if self.enabled:
+            self._refill()
+            self.level = min(self.capacity, self.level + amount)
+
+
+@dataclass
+class Permit:
+    """Granted slot for one provider call. Set ``tokens_used`` once usage is known."""
+
+    tokens_reserved: int
+    tokens_used: int | None = None
+
+
+class ProviderLimiter:
+    """Requests/tokens-per-minute buckets plus AIMD concurrency for one provider.
+
+    The concurrency limit grows by one per limit's worth of successful calls
+    and halves on a 429/5xx, staying within ``[min_concurrency,
+    max_concurrency]``. Callers waiting for a slot are served by priority,
+    then in arrival order.
+    """
+
+    def __init__(
+        self,
+        provider: str,
+        *,
+        rpm: int,
+        tpm: int,
+        max_concurrency: int,
+        min_concurrency: int = 1,
+    ) -> None:
+        self.provider = provider
+        self.max_concurrency = max(1, max_concurrency)
+        self.min_concurrency = max(1, min(min_concurrency, self.max_concurrency))
+        self.limit = float(self.max_concurrency)
+        self.in_flight = 0
+        self._requests = TokenBucket(rpm)
+        self._tokens = TokenBucket(tpm)
+        self._waiters: list[tuple[int, int, asyncio.Future[None]]] = []
+        self._order = itertools.count()
+        self.granted = 0
+        self.throttled = 0
+        self.waited_s = 0.0
+
+    @asynccontextmanager
+    async def slot(
+        self, priority: Priority = Priority.INTERACTIVE, *, tokens: int = 1
+    ) -> AsyncIterator[Permit]:
+        """Hold a concurrency slot and rate budget for the duration of one call."""
+        started = time.monotonic()
+        await self._acquire_slot(priority)
+        try:
+            await self._acquire_budget(tokens)
+        except BaseException:
+            self._release_slot()
+            raise
+        self.waited_s += time.monotonic() - started
+        self.granted += 1
+
+        permit = Permit(tokens_reserved=tokens)
+        throttled = False
+        try:
+            yield permit
+        except Exception as exc:
+            throttled = is_throttle_error(exc)
+            raise
+        finally:
+            if permit.tokens_used is not None:
+                # Settle the reservation against what the provider reported.
+                delta = permit.tokens_used - permit.tokens_reserved
+                if delta > 0:
+                    self._tokens.take(delta)
+                elif delta < 0:
+                    self._tokens.give(-delta)
+            self._adjust(throttled=throttled)
+            self._release_slot()
+
+    def stats(self) -> dict[str, float | int]:
+        return {
+            "limit": round(self.limit, 2),
+            "in_flight": self.in_flight,
+            "waiting": len(self._waiters),
+            "granted": self.granted,
+            "throttled": self.throttled,
+            "waited_s": round(self.waited_s, 3),
+        }
+
+    async def _acquire_slot(self, priority: Priority) -> None:
+        if not self._waiters and self.in_flight < self._capacity():
+            self.in_flight += 1
+            return
+        future: asyncio.Future[None] = asyncio.get_running_loop().create_future()
+        heapq.heappush(self._waiters, (int(priority), next(self._order), future))
+        try:
+            await future
+        except asyncio.CancelledError:
+            if future.done() and not future.cancelled():
+                # Granted just as we were cancelled; hand the slot on.
+                self._release_slot()
+            else:
+                self._waiters = [w for w in self._waiters if w[2] is not future]
+                heapq.heapify(self._waiters)
+            raise
+
+    async def _acquire_budget(self, tokens: int) -> None:
+        while True:
+            delay = max(self._requests.delay_for(1), self._tokens.delay_for(tokens))
+            if delay <= 0:
+                self._requests.take(1)
+                self._tokens.take(tokens)
+                return
+            await asyncio.sleep(delay)
+
+    def _capacity(self) -> int:
+        return max(self.min_concurrency, math.floor(self.limit))
+
+    def _adjust(self, *, throttled: bool) -> None:
+        if throttled:
+            self.throttled += 1
+            self.limit = max(float(self.min_concurrency), self.limit / 2)
+            logger.warning(
+                "LLM provider throttled; reducing concurrency",
+                extra={"provider": self.provider, "limit": self.limit},
+            )
+        else:
+            self.limit = min(float(self.max_concurrency), self.limit + 1 / self.limit)
+
+    def _release_slot(self) -> None:
+        self.in_flight -= 1
+        while self._waiters and self.in_flight < self._capacity():
+            _, _, future = heapq.heappop(self._waiters)
+            if future.done():
+                continue
+            self.in_flight += 1
+            future.set_result(None)
+
+
+_limiters: dict[str, ProviderLimiter] = {}
+
+
+def get_provider_limiter(provider: str) -> ProviderLimiter:
+    """Process-wide limiter for ``provider``, configured from settings."""
+    limiter = _limiters.get(provider)
+    if limiter is None:
+        rpm, tpm, max_concurrency = settings.get_llm_limits_for_provider(provider)
+        limiter = ProviderLimiter(provider, rpm=rpm, tpm=tpm, max_concurrency=max_concurrency)
+        _limiters[provider] = limiter
+    return limiter
@@ -0,0 +1,250 @@
+from __future__ import annotations
+
+import asyncio
+import contextlib
+import logging
+import random
+from collections.abc import AsyncGenerator, AsyncIterator, Callable
+from dataclasses import dataclass
+from typing import Any, Generic, TypeVar
+
+from agents.rate_limiter import is_throttle_error
+from app.config import settings
+
+logger = logging.getLogger(__name__)
+
+T = TypeVar("T")
+
+_DONE = object()
+
+# Yielded by a stream when it stops queueing and its request is actually sent
+# (see ``announces_start``); never passed on to the caller.
+STREAM_STARTED = object()
+
+
+class FirstTokenTimeoutError(TimeoutError):
+    """The provider produced no output within the first-token deadline."""
+
+
+class InterTokenTimeoutError(TimeoutError):
+    """The provider stalled between two chunks of a stream."""
+
+
+@dataclass(frozen=True, slots=True)
+class StreamPolicy:
+    """Deadlines, retries and hedging for one streamed LLM call. 0 disables a limit."""
+
+    first_token_timeout_s: float = 0.0
+    inter_token_timeout_s: float = 0.0
+    max_retries: int = 0
+    retry_base_delay_s: float = 0.5
+    hedge_after_s: float = 0.0
+
+    @classmethod
+    def from_settings(cls) -> StreamPolicy:
+        return cls(
+            first_token_timeout_s=settings.llm_first_token_timeout_s,
+            inter_token_timeout_s=settings.llm_inter_token_timeout_s,
+            max_retries=settings.llm_stream_max_retries,
+            retry_base_delay_s=settings.llm_retry_base_delay_s,
+            hedge_after_s=settings.llm_hedge_after_ms / 1000,
+        )
+
+
+def is_retryable(exc: BaseException) -> bool:
+    """Transient failures worth another attempt: throttling, 5xx, timeouts, dropped connections."""
+    if is_throttle_error(exc) or isinstance(exc, TimeoutError | ConnectionError):
+        return True
+    return type(exc).__name__ in {"APIConnectionError", "RemoteProtocolError", "ReadError"}
+
+
+def retry_delay(attempt: int, base_delay_s: float) -> float:
+    """Full-jitter exponential backoff for the ``attempt``-th retry (0-based)."""
+    return random.uniform(0, base_delay_s * (2**attempt))
+
+
+async def resilient_stream(
+    open_stream: Callable[[], AsyncIterator[T]],
+    *,
+    policy: StreamPolicy,
+    open_hedge: Callable[[], AsyncIterator[T]] | None = None,
+    announces_start: bool = False,
+) -> AsyncGenerator[T, None]:
+    """Stream from ``open_stream`` with deadlines, retries and an optional hedge.
+
+    Failures before the first chunk (including a missed first-token deadline)
+    are retried with jittered backoff, since nothing has reached the caller
+    yet. Once a chunk has been yielded a failure propagates: replaying the
+    call would duplicate output the caller already has.
+
+    With ``open_hedge`` and ``policy.hedge_after_s`` set, a duplicate request
+    is started if the first chunk is late; whichever stream produces a chunk
+    first is kept and the other is cancelled.
+
+    With ``announces_start`` the streams yield ``STREAM_STARTED`` once they
+    hold their rate-limiter slot, and the first-token deadline and hedge timer
+    only start then: time spent queued is not the provider being slow.
+
+    Each stream is driven by a single task of its own from open to close, so
+    context variables it sets (tracing spans) stay valid across chunks.
+    """
+    attempt = 0
+    while True:
+        pump: _Pump[T] | None = None
+        emitted = False
+        try:
+            pump, first = await _first_chunk(
+                open_stream,
+                open_hedge if policy.hedge_after_s > 0 else None,
+                policy,
+                announces_start=announces_start,
+            )
+            if first is _DONE:
+                return
+            emitted = True
+            yield first  # type: ignore[misc]
+            while True:
+                try:
+                    if policy.inter_token_timeout_s > 0:
+                        chunk = await asyncio.wait_for(
+                            pump.get(), timeout=policy.inter_token_timeout_s
+                        )
+                    else:
+                        chunk = await pump.get()
+                except TimeoutError as exc:
+                    raise InterTokenTimeoutError(
+                        f"no output for {policy.inter_token_timeout_s}s mid-stream"
+                    ) from exc
+                if chunk is _DONE:
+                    return
+                yield chunk
+        except Exception as exc:
+            if emitted or attempt >= policy.max_retries or not is_retryable(exc):
+                raise
+            delay = retry_delay(attempt, policy.retry_base_delay_s)
+            attempt += 1
+            logger.warning(
+                "LLM stream failed before first token; retrying",
+                extra={"attempt": attempt, "delay_s": round(delay, 3), "error": repr(exc)},
+            )
+            await asyncio.sleep(delay)
+        finally:
+            if pump is not None:
+                await pump.close()
+
+
+class _Pump(Generic[T]):
+    """Iterates one stream in a task of its own and hands its chunks over a queue.
+
+    The stream is opened, advanced and closed by that one task, so it never
+    sees a context other than its own. ``get`` returns ``_DONE`` at the end
+    and re-raises the stream's exception if it failed.
+    """
+
+    def __init__(self, stream: AsyncIterator[T]) -> None:
+        self._queue: asyncio.Queue[Any] = asyncio.Queue(maxsize=1)
+        self._task = asyncio.ensure_future(self._run(stream))
+
+    async def _run(self, stream: AsyncIterator[T]) -> None:
+        try:
+            async for chunk in stream:
+                await self._queue.put(chunk)
+            await self._queue.put(_DONE)
+        except Exception as exc:
+            await self._queue.put(_Failed(exc))
+        finally:
+            await _close(stream)
+
+    async def get(self) -> T | object:
+        item = await self._queue.get()
+        if isinstance(item, _Failed):
+            raise item.error
+        return item
+
+    async def close(self) -> None:
+        self._task.cancel()
+        with contextlib.suppress(asyncio.CancelledError):
+            await self._task
+
+
+@dataclass(frozen=True, slots=True)
+class _Failed:
+    error: Exception
+
+
+async def _first_chunk(
+    open_stream: Callable[[], AsyncIterator[T]],
+    open_hedge: Callable[[], AsyncIterator[T]] | None,
+    policy: StreamPolicy,
+    *,
+    announces_start: bool,
+) -> tuple[_Pump[T], T | object]:
+    """Race the primary (and late-started hedge) stream to its first chunk."""
+    loop = asyncio.get_running_loop()
+    deadline: float | None = None
+    hedge_at: float | None = None
+
+    def start_clock() -> None:
+        nonlocal deadline, hedge_at
+        started = loop.time()
+        if policy.first_token_timeout_s > 0:
+            deadline = started + policy.first_token_timeout_s
+        if open_hedge is not None:
+            hedge_at = started + policy.hedge_after_s
+
+    primary = _Pump(open_stream())
+    if not announces_start:
+        start_clock()
+    racing: dict[asyncio.Future, _Pump[T]] = {asyncio.ensure_future(primary.get()): primary}
+    winner: _Pump[T] | None = None
+    try:
+        while True:
+            wake = min((t for t in (deadline, hedge_at) if t is not None), default=None)
+            timeout = None if wake is None else max(0.0, wake - loop.time())
+            done, _ = await asyncio.wait(
+                racing.keys(), timeout=timeout, return_when=asyncio.FIRST_COMPLETED
+            )
+            for task in done:
+                pump = racing.pop(task)
+                try:
+                    first = task.result()
+                except Exception:
+                    await pump.close()
+                    if racing:
+                        # The other request may still succeed.
+                        logger.warning("Hedged LLM request failed", exc_info=True)
+                        continue
+                    raise
+                if first is STREAM_STARTED:
+                    if pump is primary:
+                        start_clock()
+                    racing[asyncio.ensure_future(pump.get())] = pump
+                    continue
+                winner = pump
+                return pump, first
+            now = loop.time()
+            if hedge_at is not None and now >= hedge_at and open_hedge is not None:
+                hedge_at = None
+                logger.info(
+                    "LLM first token late; starting hedged request",
+                    extra={"after_s": policy.hedge_after_s},
+                )
+                hedge = _Pump(open_hedge())
+                racing[asyncio.ensure_future(hedge.get())] = hedge
+            if deadline is not None and now >= deadline:
+                raise FirstTokenTimeoutError(f"no output within {policy.first_token_timeout_s}s")
+    finally:
+        for task, pump in racing.items():
+            if not task.done():
+                task.cancel()
+                with contextlib.suppress(asyncio.CancelledError, Exception):
+                    await task
+            if pump is not winner:
+                await pump.close()
+
+
+async def _close(stream: AsyncIterator) -> None:
+    aclose = getattr(stream, "aclose", None)
+    if aclose is not None:
+        with contextlib.suppress(Exception):
+            await aclose()
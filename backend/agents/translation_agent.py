@@ -6,6 +6,8 @@ from functools import lru_cache
 
 from agents.base_agent import (
     BaseAgent,
+    CallUsage,
+    Priority,
     SegmentContext,
     SegmentContextInput,
     TraceContext,
@@ -57,6 +59,8 @@ class TranslationAgent(BaseAgent):
         instruction: str | None = None,
         current_translation: str | None = None,
         trace: TraceContext | None = None,
+        priority: Priority = Priority.INTERACTIVE,
+        usage: CallUsage | None = None,
     ) -> AsyncGenerator[str, None]:
         """Stream translation for a segment with preceding context.
 
@@ -68,6 +72,8 @@ class TranslationAgent(BaseAgent):
             current_translation: The existing translation to improve upon.
                 Required when instruction is provided.
             trace: Optional Langfuse trace context for observability.
+            priority: Rate limiter scheduling class for the provider call.
+            usage: Optional accumulator for the call's latency and token usage.
 
         Yields:
             Translation text chunks.
@@ -92,6 +98,8 @@ class TranslationAgent(BaseAgent):
         instruction_block = self._render_instruction_block(instruction, current_translation)
         async for chunk in self.stream(
             trace=trace,
+            priority=priority,
+            usage=usage,
             source_text=cleaned,
             preceding_block=preceding_block,
             instruction_block=instruction_block,
@@ -1,4 +1,12 @@
-from .base import HttpClient
-from .requests_client import RequestsClient
+from .base import HttpClient, Page, Validators
+from .exceptions import NotModifiedError
+from .requests_client import RequestsClient, get_http_client
 
-__all__ = ["HttpClient", "RequestsClient"]
+__all__ = [
+    "HttpClient",
+    "NotModifiedError",
+    "Page",
+    "RequestsClient",
+    "Validators",
+    "get_http_client",
+]
@@ -1,10 +1,52 @@
 from __future__ import annotations
 
 from collections.abc import Mapping
+from dataclasses import dataclass
 from typing import Protocol
 
 
+@dataclass(slots=True)
+class Validators:
+    """A response's ETag and Last-Modified, sent back to revalidate the page."""
+
+    etag: str | None = None
+    last_modified: str | None = None
+
+    @classmethod
+    def from_headers(cls, headers: Mapping[str, str]) -> Validators:
+        return cls(headers.get("ETag"), headers.get("Last-Modified"))
+
+    def headers(self) -> dict[str, str]:
+        headers = {}
+        if self.etag:
+            headers["If-None-Match"] = self.etag
+        if self.last_modified:
+            headers["If-Modified-Since"] = self.last_modified
+        return headers
+
+
+@dataclass(slots=True)
+class Page:
+    text: str
+    validators: Validators
+
+
 class HttpClient(Protocol):
-    """Protocol for HTTP clients used by scrapers."""
+    """Protocol for HTTP clients used by scrapers.
+
+    ``afetch_page`` also returns the response's validators. Given the ones a
+    page was stored with, the request is conditional, and a 304 raises
+    :class:`~app.clients.exceptions.NotModifiedError` instead of returning it.
+    """
 
     def fetch(self, url: str, headers: Mapping[str, str] | None = None) -> str: ...
+
+    async def afetch(self, url: str, headers: Mapping[str, str] | None = None) -> str: ...
+
+    async def afetch_page(
+        self,
+        url: str,
+        headers: Mapping[str, str] | None = None,
+        *,
+        validators: Validators | None = None,
+    ) -> Page: ...
@@ -0,0 +1,6 @@
+class NotModifiedError(Exception):
+    """Raised by a conditional fetch when the server answers 304 Not Modified."""
+
+    def __init__(self, url: str) -> None:
+        super().__init__(f"Not modified: {url}")
+        self.url = url
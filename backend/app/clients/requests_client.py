@@ -1,23 +1,222 @@
 from __future__ import annotations
 
-from collections.abc import Mapping
+import asyncio
+import random
+import threading
+import time
+from collections.abc import AsyncGenerator, Mapping
+from dataclasses import asdict, dataclass
+from urllib.parse import urlparse
 
+import httpx
 import requests
+from requests.adapters import HTTPAdapter
+from urllib3.util.request import ACCEPT_ENCODING
 
-from .base import HttpClient
+from observability.metrics import SCRAPE_HTTP_BYTES_TOTAL, SCRAPE_HTTP_REQUESTS_TOTAL
+
+from .base import HttpClient, Page, Validators
+from .exceptions import NotModifiedError
+
+# Answers retried in place. 429 and 503 are raised to the caller instead: the
+# scrape engine backs off the whole host for those, and retrying them here
+# would keep hammering a host that asked us to slow down.
+RETRY_STATUSES = frozenset({500, 502, 504})
+
+
+@dataclass(slots=True)
+class HostStats:
+    requests: int = 0
+    not_modified: int = 0
+    retried: int = 0
+    errors: int = 0
+    bytes: int = 0
+    seconds: float = 0.0
 
 
 class RequestsClient(HttpClient):
-    """Minimal requests-based HTTP client used by scrapers."""
+    """Pooled, retrying HTTP client used by scrapers.
+
+    ``fetch`` keeps connections alive in a ``requests.Session``; ``afetch``
+    does the same through an httpx ``AsyncClient``, so scrape jobs can keep
+    several requests in flight without a thread each. Both negotiate gzip (and
+    br when a brotli decoder is installed), retry connection errors and
+    :data:`RETRY_STATUSES` with jittered backoff. ``afetch_page`` returns the
+    page's validators too and revalidates with the ones passed in; the client
+    keeps none itself, since only the caller knows when a page has been stored.
+    Per-host counts are in :meth:`stats`.
+    """
 
-    def __init__(self, *, timeout: float = 20.0, user_agent: str | None = None) -> None:
+    def __init__(
+        self,
+        *,
+        timeout: float = 20.0,
+        user_agent: str | None = None,
+        max_retries: int = 3,
+        retry_base_delay_s: float = 0.5,
+        pool_maxsize: int = 10,
+    ) -> None:
         self.timeout = timeout
-        self.default_headers = {"User-Agent": user_agent or "tonari-prototype/0.1"}
+        self.default_headers = {
+            "User-Agent": user_agent or "tonari-prototype/0.1",
+            "Accept-Encoding": ACCEPT_ENCODING,
+        }
+        self.max_retries = max_retries
+        self.retry_base_delay_s = retry_base_delay_s
+        self.pool_maxsize = pool_maxsize
+        self._session = requests.Session()
+        self._session.headers.update(self.default_headers)
+        adapter = HTTPAdapter(pool_connections=pool_maxsize, pool_maxsize=pool_maxsize)
+        self._session.mount("https://", adapter)
+        self._session.mount("http://", adapter)
+        self._async_clients: dict[asyncio.AbstractEventLoop, httpx.AsyncClient] = {}
+        self._client_lifetimes: dict[asyncio.AbstractEventLoop, AsyncGenerator[None, None]] = {}
+        self._stats: dict[str, HostStats] = {}
+        self._stats_lock = threading.Lock()
 
     def fetch(self, url: str, headers: Mapping[str, str] | None = None) -> str:
-        final_headers = dict(self.default_headers)
-        if headers:
-            final_headers.update(headers)
-        resp = requests.get(url, headers=final_headers, timeout=self.timeout)
+        request_headers = dict(headers or {})
+        attempt = 0
+        while True:
+            started = time.perf_counter()
+            try:
+                resp = self._session.get(url, headers=request_headers, timeout=self.timeout)
+            except (requests.ConnectionError, requests.Timeout):
+                if attempt >= self.max_retries:
+                    self._record(url, "error", started)
+                    raise
+            else:
+                if resp.status_code not in RETRY_STATUSES or attempt >= self.max_retries:
+                    break
+            self._record(url, "retried", started)
+            time.sleep(self._retry_delay(attempt))
+            attempt += 1
+        self._settle(url, resp.status_code, len(resp.content), started)
         resp.raise_for_status()
         return resp.text
+
+    async def afetch(self, url: str, headers: Mapping[str, str] | None = None) -> str:
+        return (await self.afetch_page(url, headers)).text
+
+    async def afetch_page(
+        self,
+        url: str,
+        headers: Mapping[str, str] | None = None,
+        *,
+        validators: Validators | None = None,
+    ) -> Page:
+        request_headers = dict(headers or {})
+        if validators is not None:
+            request_headers.update(validators.headers())
+        client = await self._get_async_client()
+        attempt = 0
+        while True:
+            started = time.perf_counter()
+            try:
+                resp = await client.get(url, headers=request_headers)
+            except httpx.TransportError:
+                if attempt >= self.max_retries:
+                    self._record(url, "error", started)
+                    raise
+            else:
+                if resp.status_code not in RETRY_STATUSES or attempt >= self.max_retries:
+                    break
+            self._record(url, "retried", started)
+            await asyncio.sleep(self._retry_delay(attempt))
+            attempt += 1
+        self._settle(url, resp.status_code, len(resp.content), started)
+        resp.raise_for_status()
+        return Page(resp.text, Validators.from_headers(resp.headers))
+
+    def stats(self) -> dict[str, dict[str, float | int]]:
+        """Counts per host since the client was created."""
+        with self._stats_lock:
+            return {host: asdict(stats) for host, stats in self._stats.items()}
+
+    def close(self) -> None:
+        self._session.close()
+
+    async def aclose(self) -> None:
+        """Close the running loop's client now rather than when the loop shuts down."""
+        lifetime = self._client_lifetimes.get(asyncio.get_running_loop())
+        if lifetime is not None:
+            await lifetime.aclose()
+
+    def _retry_delay(self, attempt: int) -> float:
+        # Full jitter, so clients that failed together do not retry together.
+        return random.uniform(0, self.retry_base_delay_s * (2**attempt))
+
+    def _settle(self, url: str, status: int, size: int, started: float) -> None:
+        """Record the final answer, and raise on a 304."""
+        if status == 304:
+            self._record(url, "not_modified", started)
+            raise NotModifiedError(url)
+        if status >= 400:
+            self._record(url, "error", started, size)
+            return
+        self._record(url, "ok", started, size)
+
+    def _record(self, url: str, outcome: str, started: float, size: int = 0) -> None:
+        host = urlparse(url).netloc.lower()
+        SCRAPE_HTTP_REQUESTS_TOTAL.inc(host=host, outcome=outcome)
+        if size:
+            SCRAPE_HTTP_BYTES_TOTAL.inc(size, host=host)
+        with self._stats_lock:
+            stats = self._stats.setdefault(host, HostStats())
+            stats.requests += 1
+            stats.bytes += size
+            stats.seconds += time.perf_counter() - started
+            if outcome == "not_modified":
+                stats.not_modified += 1
+            elif outcome == "retried":
+                stats.retried += 1
+            elif outcome == "error":
+                stats.errors += 1
+
+    async def _get_async_client(self) -> httpx.AsyncClient:
+        # Pooled connections belong to the loop that opened them; scrapers are
+        # module-level singletons that can outlive a loop (e.g. across tests),
+        # so each loop gets its own client, closed when that loop shuts down.
+        loop = asyncio.get_running_loop()
+        client = self._async_clients.get(loop)
+        if client is None:
+            # A loop closed without shutting down its async generators never
+            # closes its client, and its connections cannot be closed from here.
+            for closed in [other for other in self._async_clients if other.is_closed()]:
+                del self._async_clients[closed], self._client_lifetimes[closed]
+            client = self._async_clients[loop] = httpx.AsyncClient(
+                headers=self.default_headers,
+                timeout=self.timeout,
+                follow_redirects=True,
+                limits=httpx.Limits(
+                    max_connections=self.pool_maxsize, max_keepalive_connections=self.pool_maxsize
+                ),
+            )
+            lifetime = self._client_lifetimes[loop] = self._client_lifetime(loop, client)
+            await anext(lifetime)
+        return client
+
+    async def _client_lifetime(
+        self, loop: asyncio.AbstractEventLoop, client: httpx.AsyncClient
+    ) -> AsyncGenerator[None, None]:
+        """Parked at its ``yield`` for as long as ``loop`` runs.
+
+        ``asyncio.run`` and uvicorn shut a loop down by closing every async
+        generator still open on it, which runs the ``finally`` on that loop.
+        """
+        try:
+            yield
+        finally:
+            del self._async_clients[loop], self._client_lifetimes[loop]
+            await client.aclose()
+
+
+_http_client: RequestsClient | None = None
+
+
+def get_http_client() -> RequestsClient:
+    """Process-wide client the scrapers share: one pool and one set of stats."""
+    global _http_client
+    if _http_client is None:
+        _http_client = RequestsClient()
+    return _http_client
@@ -1,10 +1,18 @@
 from datetime import datetime
 
-from sqlalchemy import DateTime, create_engine
-from sqlalchemy.orm import DeclarativeBase, Mapped, mapped_column, sessionmaker
-from sqlalchemy.pool import StaticPool
+from sqlalchemy import DateTime, create_engine, event
+from sqlalchemy.engine import make_url
+from sqlalchemy.ext.asyncio import (
+    AsyncEngine,
+    AsyncSession,
+    async_sessionmaker,
+    create_async_engine,
+)
+from sqlalchemy.orm import DeclarativeBase, Mapped, Session, mapped_column, sessionmaker
+from sqlalchemy.pool import NullPool, StaticPool
 
 from app.config import settings
+from observability.metrics import instrument_engine
 
 engine_kwargs = {"future": True, "pool_pre_ping": True}
 if settings.database_url.startswith("sqlite"):
@@ -13,9 +21,98 @@ if settings.database_url.startswith("sqlite"):
     engine_kwargs["poolclass"] = StaticPool
 
 engine = create_engine(settings.database_url, **engine_kwargs)
+instrument_engine(engine)
 SessionLocal = sessionmaker(bind=engine, autoflush=False, autocommit=False, future=True)
 
 
+def release_connection(session: Session) -> None:
+    """End ``session``'s transaction so its pooled connection is checked back in.
+
+    A session keeps its connection from the first statement until commit, so
+    long-lived sessions (SSE streams, background runs) call this after each
+    block of reads instead of pinning a connection across LLM calls. Loaded
+    objects are not expired; the session checks out a connection again on its
+    next statement.
+    """
+    if not session.in_transaction():
+        return
+    expire_on_commit = session.expire_on_commit
+    session.expire_on_commit = False
+    try:
+        session.commit()
+    finally:
+        session.expire_on_commit = expire_on_commit
+
+
+# Async drivers for the streaming hot paths, by dialect.
+ASYNC_DRIVERS = {"postgresql": "asyncpg", "sqlite": "aiosqlite"}
+
+
+def async_database_url(url: str) -> str:
+    """``url`` with its driver swapped for the dialect's async driver."""
+    parsed = make_url(url)
+    driver = ASYNC_DRIVERS.get(parsed.get_backend_name())
+    if driver is None:
+        raise ValueError(f"no async driver for {parsed.get_backend_name()!r}")
+    if parsed.get_backend_name() == "sqlite" and parsed.database in (None, "", ":memory:"):
+        # A second engine would open its own, empty in-memory database.
+        raise ValueError("in-memory SQLite cannot be shared with the async engine")
+    return parsed.set(drivername=f"{parsed.get_backend_name()}+{driver}").render_as_string(
+        hide_password=False
+    )
+
+
+_async_engine: AsyncEngine | None = None
+_async_sessionmaker: async_sessionmaker[AsyncSession] | None = None
+
+
+def get_async_engine() -> AsyncEngine:
+    """The async engine, created on first use so sync-only scripts never need a driver."""
+    global _async_engine
+    if _async_engine is None:
+        url = settings.async_database_url or async_database_url(settings.database_url)
+        async_kwargs: dict = {"pool_pre_ping": True}
+        if url.startswith("sqlite"):
+            # Connections are cheap, and pooled ones would be bound to the event
+            # loop that opened them (tests run one loop per test).
+            async_kwargs["poolclass"] = NullPool
+            # SQLite locks the whole file per write transaction. One held open
+            # across an await would stall sync writers running on the loop,
+            # which in turn keep the transaction from ever committing.
+            async_kwargs["isolation_level"] = "AUTOCOMMIT"
+        _async_engine = create_async_engine(url, **async_kwargs)
+        if _async_engine.dialect.name == "sqlite":
+            # An INSERT .. RETURNING keeps its autocommit transaction (and the
+            # file lock) open until its rows are fetched, which takes another
+            # trip through the event loop; a sync writer blocking the loop on
+            # that lock would then wait out its busy timeout. Use lastrowid.
+            _async_engine.dialect.insert_returning = False
+            # A SELECT likewise keeps its read lock until its rows are fetched.
+            # In WAL mode readers never hold up a writer's commit.
+            event.listen(_async_engine.sync_engine, "connect", _use_wal)
+        instrument_engine(_async_engine.sync_engine, name="async")
+    return _async_engine
+
+
+def _use_wal(dbapi_connection, connection_record) -> None:
+    cursor = dbapi_connection.cursor()
+    cursor.execute("PRAGMA journal_mode=WAL")
+    cursor.close()
+
+
+def get_async_sessionmaker() -> async_sessionmaker[AsyncSession]:
+    """Sessions for awaited writes from the streaming endpoints and background tasks.
+
+    Objects stay loaded after commit, like the sync sessions' callers expect.
+    """
+    global _async_sessionmaker
+    if _async_sessionmaker is None:
+        _async_sessionmaker = async_sessionmaker(
+            get_async_engine(), autoflush=False, expire_on_commit=False
+        )
+    return _async_sessionmaker
+
+
 class Base(DeclarativeBase):
     created_at: Mapped[datetime] = mapped_column(DateTime, default=datetime.utcnow)
 
@@ -0,0 +1,32 @@
+"""Kakuyomu episode parser on lxml directly; same output as ``parser.parse_chapter``."""
+
+from __future__ import annotations
+
+from lxml import etree
+
+from app.scrapers.lxml_text import class_names, element_text, has_class, parse_html
+from app.scrapers.text import normalize_text
+
+# p.widget-episodeTitle and div.js-episode-body, in one query.
+_CANDIDATES = etree.XPath(
+    f"//p[{has_class('widget-episodeTitle')}] | //div[{has_class('js-episode-body')}]"
+)
+
+
+def parse_chapter(html: str) -> tuple[str, str]:
+    """Parse a Kakuyomu episode page into ``(title, normalized_text)``."""
+    root = parse_html(html)
+    title_node = body_node = None
+    for element in _CANDIDATES(root) if root is not None else ():
+        if element.tag == "p":
+            title_node = element if title_node is None else title_node
+        elif "js-episode-body" in class_names(element):
+            body_node = element if body_node is None else body_node
+
+    title = element_text(title_node, strip=True) if title_node is not None else "Untitled"
+    if body_node is None:
+        return title, ""
+    paragraphs = [child for child in body_node if child.tag == "p"] or list(body_node.iter("p"))
+    lines = [element_text(p) for p in paragraphs]
+    body_text = "\n".join(lines) if lines else element_text(body_node, "\n")
+    return title, normalize_text(body_text)
@@ -1,13 +1,16 @@
+import asyncio
+import contextlib
 import json
 import logging
 from contextlib import asynccontextmanager
 
 from fastapi import FastAPI
 from fastapi.exceptions import RequestValidationError
-from fastapi.responses import JSONResponse
+from fastapi.responses import JSONResponse, PlainTextResponse
 
-from app.db import init_db
+from app.db import SessionLocal, init_db
 from observability import flush_langfuse
+from observability.metrics import REGISTRY, monitor_event_loop_lag
 
 
 class TranslationLogFormatter(logging.Formatter):
@@ -59,13 +62,27 @@ async def lifespan(app: FastAPI):
             TranslationLogFormatter("%(asctime)s - %(name)s - %(levelname)s - %(message)s")
         )
     init_db()
+    # Batch translations left pending or running by the previous process pick up
+    # where they stopped; already translated chapters complete immediately. Every
+    # worker resumes them, and each job runs in whichever one claims it.
+    from services.translation_batch import TranslationBatchManager
+
+    with SessionLocal() as db:
+        TranslationBatchManager(db).resume_incomplete_jobs()
+    lag_monitor = asyncio.create_task(monitor_event_loop_lag())
     try:
         yield
     finally:
+        lag_monitor.cancel()
+        with contextlib.suppress(asyncio.CancelledError):
+            await lag_monitor
         # Shutdown: flush buffered Langfuse events so the last batch of traces
         # is not lost on container stop. Lifespan fires under SIGTERM where
         # @app.on_event("shutdown") may not.
         flush_langfuse()
+        from services.parse_executor import shutdown_parse_executor
+
+        shutdown_parse_executor()
 
 
 app = FastAPI(title="tonari-backend", version="0.0.1", lifespan=lifespan)
@@ -104,6 +121,12 @@ def health():
     return {"ok": True}
 
 
+@app.get("/metrics", response_class=PlainTextResponse)
+def metrics():
+    """Process metrics in the Prometheus text exposition format."""
+    return PlainTextResponse(REGISTRY.render(), media_type="text/plain; version=0.0.4")
+
+
 from app.kakuyomu import scraper as _kakuyomu_scraper  # noqa: E402,F401  (registers scraper)
 from app.routers.chapter_groups import router as chapter_groups_router  # noqa: E402
 from app.routers.ingest import router as ingest_router  # noqa: E402
@@ -84,8 +84,14 @@ class Chapter(Base):
     # lets us detect upstream reordering/backdating independently of the positional sort_key.
     source_chapter_id: Mapped[str | None] = mapped_column(String(128), nullable=True)
     title: Mapped[str] = mapped_column(String(512))
-    normalized_text: Mapped[str] = mapped_column(Text)
+    # Chapter bodies run to tens of KB and most queries only list chapters, so the
+    # column loads on first access; readers and translators ``undefer`` it up front.
+    normalized_text: Mapped[str] = mapped_column(Text, deferred=True)
     text_hash: Mapped[str] = mapped_column(String(128))
+    # Validators of the page the stored text came from. Scrape jobs send them back,
+    # so a page unchanged since it was stored answers 304.
+    etag: Mapped[str | None] = mapped_column(String(256), nullable=True)
+    last_modified: Mapped[str | None] = mapped_column(String(64), nullable=True)
     last_read_at: Mapped[datetime | None] = mapped_column(
         DateTime(timezone=True), nullable=True, index=True
     )
@@ -118,6 +124,30 @@ class ScrapeJob(Base):
     error_details: Mapped[list | None] = mapped_column(JSON, default=None, nullable=True)
 
 
+class TranslationBatchJob(Base):
+    __tablename__ = "translation_batch_jobs"
+
+    id: Mapped[int] = mapped_column(Integer, primary_key=True, autoincrement=True)
+    work_id: Mapped[int] = mapped_column(ForeignKey("works.id", ondelete="CASCADE"), index=True)
+    chapter_group_id: Mapped[int | None] = mapped_column(
+        ForeignKey("chapter_groups.id", ondelete="SET NULL"), nullable=True
+    )
+    start: Mapped[Decimal | None] = mapped_column(Numeric(12, 4), nullable=True)
+    end: Mapped[Decimal | None] = mapped_column(Numeric(12, 4), nullable=True)
+    # Resolved when the job is created so a resumed job walks the same chapters.
+    chapter_ids: Mapped[list] = mapped_column(JSON, default=list)
+    status: Mapped[str] = mapped_column(String(32), default="pending", index=True)
+    progress: Mapped[int] = mapped_column(Integer, default=0)
+    total: Mapped[int] = mapped_column(Integer, default=0)
+    completed_count: Mapped[int] = mapped_column(Integer, default=0, server_default="0")
+    failed_count: Mapped[int] = mapped_column(Integer, default=0, server_default="0")
+    error_details: Mapped[list | None] = mapped_column(JSON, default=None, nullable=True)
+    created_at: Mapped[datetime] = mapped_column(DateTime(timezone=True), server_default=func.now())
+    updated_at: Mapped[datetime] = mapped_column(
+        DateTime(timezone=True), server_default=func.now(), onupdate=func.now()
+    )
+
+
 class ChapterTranslation(Base):
     __tablename__ = "chapter_translations"
     id: Mapped[int] = mapped_column(Integer, primary_key=True, autoincrement=True)
@@ -158,7 +188,8 @@ class TranslationSegment(Base):
         Text, nullable=True
     )  # markdown explanation of translation
     flags: Mapped[list | None] = mapped_column(JSON, default=list)
-    cache_key: Mapped[str | None] = mapped_column(String(128), nullable=True)
+    # Translation-memory key: (src_hash, prompt, model). Only set on completed model output.
+    cache_key: Mapped[str | None] = mapped_column(String(128), nullable=True, index=True)
     src_hash: Mapped[str] = mapped_column(String(128))
 
     chapter_translation: Mapped[ChapterTranslation] = relationship(
@@ -166,6 +197,39 @@ class TranslationSegment(Base):
     )
 
 
+class TranslationSegmentUsage(Base):
+    """One LLM request made to translate a segment: latency, tokens and cost.
+
+    Every request is recorded, including retries, hedges and calls that were
+    cancelled or failed (``kind`` and ``outcome``); those usually report no tokens.
+    """
+
+    __tablename__ = "translation_segment_usage"
+
+    id: Mapped[int] = mapped_column(Integer, primary_key=True, autoincrement=True)
+    work_id: Mapped[int] = mapped_column(ForeignKey("works.id", ondelete="CASCADE"), index=True)
+    chapter_translation_id: Mapped[int] = mapped_column(
+        ForeignKey("chapter_translations.id", ondelete="CASCADE"), index=True
+    )
+    segment_id: Mapped[int | None] = mapped_column(
+        ForeignKey("translation_segments.id", ondelete="SET NULL"), nullable=True, index=True
+    )
+    provider: Mapped[str] = mapped_column(String(32))
+    model: Mapped[str] = mapped_column(String(128), index=True)
+    kind: Mapped[str] = mapped_column(String(16), default="primary", server_default="primary")
+    outcome: Mapped[str] = mapped_column(String(16), default="ok", server_default="ok")
+    ttft_ms: Mapped[int | None] = mapped_column(Integer, nullable=True)
+    duration_ms: Mapped[int] = mapped_column(Integer)
+    input_tokens: Mapped[int | None] = mapped_column(Integer, nullable=True)
+    output_tokens: Mapped[int | None] = mapped_column(Integer, nullable=True)
+    cache_read_tokens: Mapped[int | None] = mapped_column(Integer, nullable=True)
+    cache_creation_tokens: Mapped[int | None] = mapped_column(Integer, nullable=True)
+    cost_usd: Mapped[Decimal | None] = mapped_column(Numeric(12, 6), nullable=True)
+    created_at: Mapped[datetime] = mapped_column(
+        DateTime(timezone=True), server_default=func.now(), index=True
+    )
+
+
 class Prompt(Base):
     __tablename__ = "prompts"
     __table_args__ = (UniqueConstraint("owner_work_id", "name", name="uq_prompt_owner_name"),)
@@ -1,9 +1,13 @@
 """Router for LLM model information."""
 
-from fastapi import APIRouter
+from datetime import UTC, datetime, timedelta
 
-from app.schemas import ModelInfoOut, ModelsListOut
+from fastapi import APIRouter, Query
+
+from app.db import SessionLocal
+from app.schemas import ModelInfoOut, ModelLatencyOut, ModelsListOut
 from constants.llm import AVAILABLE_MODELS
+from services.usage import UsageService
 
 router = APIRouter()
 
@@ -24,3 +28,14 @@ def list_models():
         for model in AVAILABLE_MODELS
     ]
     return ModelsListOut(items=model_items, total=len(model_items))
+
+
+@router.get("/latency", response_model=ModelLatencyOut)
+def get_model_latency(
+    model: str = Query(..., description="Model identifier"),
+    days: int = Query(7, ge=1, le=90, description="Look-back window in days"),
+):
+    """Time-to-first-token and duration percentiles of segment translations by a model."""
+    since = datetime.now(UTC) - timedelta(days=days)
+    with SessionLocal() as db:
+        return ModelLatencyOut(**UsageService(db).latency_summary(model, since=since))
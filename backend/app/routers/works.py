@@ -2,21 +2,22 @@ from __future__ import annotations
 
 import json
 import logging
+from collections.abc import AsyncGenerator, AsyncIterator
 from datetime import UTC, datetime
-from decimal import Decimal
+from decimal import Decimal, InvalidOperation
 from typing import Literal
 
-from fastapi import APIRouter, BackgroundTasks, HTTPException, Query, Request
+from fastapi import APIRouter, BackgroundTasks, Header, HTTPException, Query, Request, Response
 from sse_starlette.sse import EventSourceResponse
 
-from app.db import SessionLocal
+from app.config import settings
+from app.db import SessionLocal, release_connection
 from app.explanation_schemas import (
     ArtifactPayload,
     ExplanationArtifactOut,
     ExplanationStartRequest,
     ExplanationStartResponse,
 )
-from app.models import ChapterTranslation
 from app.prompt_overrides import (
     PromptOverrideExpiredError,
     PromptOverrideInvalidError,
@@ -37,17 +38,19 @@ from app.schemas import (
     ChapterTranslationStateOut,
     PaginatedWorksOut,
     RecentChapterOut,
-    SentenceSpanOut,
-    TranslationSegmentOut,
+    TranslationBatchJobOut,
+    TranslationBatchRequest,
     WorkImportRequest,
     WorkOut,
     WorkUpdateRequest,
+    WorkUsageOut,
 )
 from app.scrapers.exceptions import ScraperError, ScraperNotFoundError
-from app.utils.sentence_splitter import get_sentence_splitter
+from observability.metrics import SSE_STREAMS_ACTIVE
 from services.chapter_groups import ChapterGroupsService
 from services.chapters import ChaptersService
 from services.exceptions import (
+    ChapterGroupNotFoundError,
     ChapterNotFoundError,
     SegmentNotFoundError,
     SegmentNotTranslatedError,
@@ -63,6 +66,14 @@ from services.explanation_workflow_v2 import (
     FacetCompleteEvent,
 )
 from services.scrape_manager import ScrapeManager
+from services.translation_batch import BatchProgress, TranslationBatchManager
+from services.translation_coalescer import SSEStreamStats, coalesce_segment_deltas
+from services.translation_jobs import TranslationJobs, TranslationResyncEvent
+from services.translation_state import (
+    build_translation_state,
+    render_translation_state,
+    translation_state_etag,
+)
 from services.translation_stream import TranslationStreamService
 from services.translation_workflow import (
     SegmentCompleteEvent,
@@ -74,6 +85,7 @@ from services.translation_workflow import (
     TranslationStatusEvent,
     TranslationWorkflow,
 )
+from services.usage import UsageService
 from services.works import WorksService
 
 router = APIRouter()
@@ -85,19 +97,8 @@ logger = logging.getLogger(__name__)
 def list_recent_chapters(limit: int = Query(default=10, ge=1, le=50)):
     with SessionLocal() as db:
         chapters_service = ChaptersService(db)
-        chapters = chapters_service.get_recently_read(limit=limit)
-        return [
-            RecentChapterOut(
-                id=c.id,
-                work_id=c.work_id,
-                work_title=c.work.title,
-                idx=c.idx,
-                sort_key=float(c.sort_key),
-                title=c.title,
-                last_read_at=c.last_read_at,
-            )
-            for c in chapters
-        ]
+        rows = chapters_service.get_recently_read(limit=limit)
+        return [RecentChapterOut.model_validate(row) for row in rows]
 
 
 @router.get("/", response_model=PaginatedWorksOut)
@@ -152,21 +153,24 @@ def update_work(work_id: int, body: WorkUpdateRequest):
         return WorkOut.model_validate(work)
 
 
-def _get_completed_translation_chapter_ids(db, chapter_ids: list[int]) -> set[int]:
-    """Get set of chapter IDs that have a completed translation."""
-    if not chapter_ids:
-        return set()
-    from sqlalchemy import select
-
-    stmt = select(ChapterTranslation.chapter_id).where(
-        ChapterTranslation.chapter_id.in_(chapter_ids),
-        ChapterTranslation.status == "completed",
-    )
-    return set(db.execute(stmt).scalars().all())
+@router.get("/{work_id}/chapters", response_model=ChaptersWithGroupsResponse)
+def list_chapters_for_work(
+    work_id: int, limit: int = 50, offset: int = 0, cursor: str | None = None
+):
+    """List groups and ungrouped chapters by sort_key.
 
+    Pass a response's ``next_cursor`` as ``cursor`` to get the page after it;
+    ``offset`` is ignored when a cursor is given.
+    """
+    after = None
+    if cursor is not None:
+        try:
+            after = Decimal(cursor)
+        except InvalidOperation:
+            raise HTTPException(status_code=400, detail="invalid cursor") from None
+        if not after.is_finite():
+            raise HTTPException(status_code=400, detail="invalid cursor")
 
-@router.get("/{work_id}/chapters", response_model=ChaptersWithGroupsResponse)
-def list_chapters_for_work(work_id: int, limit: int = 50, offset: int = 0):
     with SessionLocal() as db:
         works_service = WorksService(db)
         groups_service = ChapterGroupsService(db)
@@ -175,36 +179,15 @@ def list_chapters_for_work(work_id: int, limit: int = 50, offset: int = 0):
         except WorkNotFoundError:
             raise HTTPException(status_code=404, detail="work not found") from None
 
-        items, total_chapters, total_groups, total_items, limit, offset = (
-            groups_service.get_chapters_with_groups(work_id, limit=limit, offset=offset)
+        page = groups_service.get_chapters_with_groups(
+            work_id, limit=limit, offset=offset, after=after
         )
 
-        # Collect all chapter IDs to query translation status
-        chapter_ids = []
-        for item_type, data, _sort_key in items:
-            if item_type == "chapter":
-                chapter_ids.append(data.id)
-            elif item_type == "group":
-                for member in data.members:
-                    chapter_ids.append(member.chapter_id)
-
-        # Get completed translation statuses in one query
-        completed_chapter_ids = _get_completed_translation_chapter_ids(db, chapter_ids)
-
         # Build response with mixed items
         response_items = []
-        for item_type, data, sort_key in items:
-            if item_type == "group":
-                # data is a ChapterGroup
-                group = data
-                members_count = len(group.members)
-                min_sort_key = float(sort_key)
-
-                group_chapter_ids = [m.chapter_id for m in group.members]
-                is_group_translated = len(group_chapter_ids) > 0 and all(
-                    cid in completed_chapter_ids for cid in group_chapter_ids
-                )
-
+        for item in page.items:
+            if item.item_type == "group":
+                group = item.data
                 response_items.append(
                     ChapterOrGroup(
                         item_type="group",
@@ -214,26 +197,26 @@ def list_chapters_for_work(work_id: int, limit: int = 50, offset: int = 0):
                             name=group.name,
                             created_at=group.created_at,
                             updated_at=group.updated_at,
-                            member_count=members_count,
-                            min_sort_key=min_sort_key,
+                            member_count=item.member_count,
+                            min_sort_key=float(item.sort_key),
                             item_type="group",
-                            is_fully_translated=is_group_translated,
+                            is_fully_translated=item.is_fully_translated,
                         ),
                     )
                 )
             else:
-                # data is a Chapter
-                chapter_out = ChapterOut.model_validate(data)
-                chapter_out.is_fully_translated = data.id in completed_chapter_ids
+                chapter_out = ChapterOut.model_validate(item.data)
+                chapter_out.is_fully_translated = item.is_fully_translated
                 response_items.append(ChapterOrGroup(item_type="chapter", data=chapter_out))
 
         return ChaptersWithGroupsResponse(
             items=response_items,
-            total_chapters=total_chapters,
-            total_groups=total_groups,
-            total_items=total_items,  # Total number of items available (before pagination)
-            offset=offset,
-            limit=limit,
+            total_chapters=page.total_chapters,
+            total_groups=page.total_groups,
+            total_items=page.total_items,  # Total number of items available (before pagination)
+            offset=page.offset,
+            limit=page.limit,
+            next_cursor=str(page.next_cursor) if page.next_cursor is not None else None,
         )
 
 
@@ -247,7 +230,7 @@ def get_chapter_for_work(work_id: int, chapter_id: int):
         except WorkNotFoundError:
             raise HTTPException(status_code=404, detail="work not found") from None
         try:
-            chapter = chapters_service.get_chapter(chapter_id)
+            chapter = chapters_service.get_chapter(chapter_id, with_text=True)
         except ChapterNotFoundError:
             raise HTTPException(status_code=404, detail="chapter not found") from None
         if chapter.work_id != work.id:
@@ -337,18 +320,17 @@ async def stream_scrape_status(work_id: int, request: Request):
     # Note: Using ScrapeManager with a ephemeral session just for setup if needed
 
     async def event_generator():
-        # Short-lived session to check work existence/current status
-        db = SessionLocal()
-        scrape_manager = ScrapeManager(db)
-
-        try:
+        # Short-lived session to check work existence/current status; closed
+        # before the first frame is sent, so the stream holds no connection.
+        with SessionLocal() as db:
+            scrape_manager = ScrapeManager(db)
             # Check active job to send initial state
             job = scrape_manager.get_active_job(work_id)
             if not job:
                 job = scrape_manager.get_latest_job(work_id)
 
             if job:
-                yield _sse_event(
+                initial = _sse_event(
                     "job-status",
                     {
                         "status": job.status,
@@ -362,29 +344,100 @@ async def stream_scrape_status(work_id: int, request: Request):
                     },
                 )
             else:
-                yield _sse_event("job-status", {"status": "idle"})
-        finally:
-            db.close()
+                initial = _sse_event("job-status", {"status": "idle"})
+        yield initial
 
-        # Subscribe to broadcast (_subscribers is module-global, any instance works)
+        # Subscribe to broadcast (_subscribers is module-global, any instance
+        # works, and subscribing never touches its session)
+        async for event in scrape_manager.subscribe(work_id):
+            if await request.is_disconnected():
+                break
+            yield _sse_event(event["event"], event["data"])
+
+    return EventSourceResponse(_counted_sse("scrape-status", event_generator()))
+
+
+@router.post("/{work_id}/translation-batch", response_model=TranslationBatchJobOut)
+async def request_translation_batch(work_id: int, payload: TranslationBatchRequest):
+    """Queue a background translation of a chapter range or chapter group."""
+    with SessionLocal() as db:
+        works_service = WorksService(db)
+        batch_manager = TranslationBatchManager(db)
 
-        db_sub = SessionLocal()
-        manager = ScrapeManager(db_sub)
         try:
-            async for event in manager.subscribe(work_id):
-                if await request.is_disconnected():
-                    break
-                yield _sse_event(event["event"], event["data"])
-        finally:
-            db_sub.close()
+            work = works_service.get_work(work_id)
+        except WorkNotFoundError:
+            raise HTTPException(status_code=404, detail="work not found") from None
 
-    return EventSourceResponse(event_generator())
+        existing_job = batch_manager.get_active_job(work_id)
+        if existing_job:
+            raise HTTPException(
+                status_code=409,
+                detail=f"Batch translation already in progress (job {existing_job.id})",
+            )
+
+        try:
+            job = batch_manager.create_job(
+                work.id,
+                start=Decimal(str(payload.start)) if payload.start is not None else None,
+                end=Decimal(str(payload.end)) if payload.end is not None else None,
+                chapter_group_id=payload.chapter_group_id,
+            )
+        except ChapterGroupNotFoundError:
+            raise HTTPException(status_code=404, detail="group not found") from None
+
+        batch_manager.start_job(job.id)
+        return TranslationBatchJobOut.model_validate(job)
+
+
+@router.post("/{work_id}/translation-batch-cancel")
+def cancel_translation_batch(work_id: int):
+    """Cancel an active batch translation job."""
+    with SessionLocal() as db:
+        job = TranslationBatchManager(db).cancel_job(work_id)
+        if not job:
+            return {"status": "no_active_job"}
+        return {"status": "cancelled", "job_id": job.id}
+
+
+@router.get("/{work_id}/usage", response_model=WorkUsageOut)
+def get_work_usage(work_id: int):
+    """LLM token usage and cost of the work's segment translations, per model."""
+    with SessionLocal() as db:
+        try:
+            WorksService(db).get_work(work_id)
+        except WorkNotFoundError:
+            raise HTTPException(status_code=404, detail="work not found") from None
+        return WorkUsageOut(**UsageService(db).work_usage(work_id))
+
+
+@router.get("/{work_id}/translation-batch-status")
+async def stream_translation_batch_status(work_id: int, request: Request):
+    """Stream batch translation progress events for a work."""
+
+    async def event_generator():
+        # Short-lived session to send the current state before tailing broadcasts
+        with SessionLocal() as db:
+            batch_manager = TranslationBatchManager(db)
+            job = batch_manager.get_active_job(work_id) or batch_manager.get_latest_job(work_id)
+            current = BatchProgress.from_job(job).payload() if job else {"status": "idle"}
+        yield _sse_event("job-status", current)
+
+        async for event in TranslationBatchManager.subscribe(work_id):
+            if await request.is_disconnected():
+                break
+            yield _sse_event(event["event"], event["data"])
+
+    return EventSourceResponse(_counted_sse("translation-batch-status", event_generator()))
 
 
 @router.get(
     "/{work_id}/chapters/{chapter_id}/translation", response_model=ChapterTranslationStateOut
 )
-def get_chapter_translation_state(work_id: int, chapter_id: int):
+def get_chapter_translation_state(
+    work_id: int, chapter_id: int, if_none_match: str | None = Header(default=None)
+):
+    """Current translation state, with an ETag; a matching If-None-Match gets a 304."""
     with SessionLocal() as db:
         works_service = WorksService(db)
         chapters_service = ChaptersService(db)
@@ -396,6 +449,7 @@ def get_chapter_translation_state(work_id: int, chapter_id: int):
             raise HTTPException(status_code=404, detail="work not found") from None
 
         try:
+            # The text is only read if the state has to be rendered.
             chapter = chapters_service.get_chapter(chapter_id)
         except ChapterNotFoundError:
             raise HTTPException(status_code=404, detail="chapter not found") from None
@@ -404,14 +458,33 @@ def get_chapter_translation_state(work_id: int, chapter_id: int):
             raise HTTPException(status_code=404, detail="chapter not found") from None
 
         translation = translation_service.get_or_create_translation(chapter.id)
-        segments = translation_service.ensure_segments(translation, chapter.normalized_text)
-        return _build_translation_state(chapter, translation, segments)
+        segments = list(translation_service.get_segments_for_translation(translation.id))
+        if not segments:
+            segments = translation_service.ensure_segments(translation, chapter.normalized_text)
+
+        etag = translation_state_etag(chapter, translation, segments)
+        headers = {"ETag": etag, "Cache-Control": "no-cache"}
+        if _etag_matches(if_none_match, etag):
+            return Response(status_code=304, headers=headers)
+        return Response(
+            content=render_translation_state(chapter, translation, segments, etag),
+            media_type="application/json",
+            headers=headers,
+        )
+
+
+def _etag_matches(if_none_match: str | None, etag: str) -> bool:
+    if not if_none_match:
+        return False
+    candidates = {tag.strip().removeprefix("W/") for tag in if_none_match.split(",")}
+    return "*" in candidates or etag in candidates
 
 
 @router.delete(
     "/{work_id}/chapters/{chapter_id}/translation", response_model=ChapterTranslationStateOut
 )
-def reset_chapter_translation(work_id: int, chapter_id: int):
+async def reset_chapter_translation(work_id: int, chapter_id: int):
+    """Discard the chapter's translation, cancelling any run in progress first."""
     with SessionLocal() as db:
         works_service = WorksService(db)
         chapters_service = ChaptersService(db)
@@ -421,26 +494,28 @@ def reset_chapter_translation(work_id: int, chapter_id: int):
         except WorkNotFoundError:
             raise HTTPException(status_code=404, detail="work not found") from None
         try:
-            chapter = chapters_service.get_chapter(chapter_id)
+            chapter = chapters_service.get_chapter(chapter_id, with_text=True)
         except ChapterNotFoundError:
             raise HTTPException(status_code=404, detail="chapter not found") from None
         if chapter.work_id != work.id:
             raise HTTPException(status_code=404, detail="chapter not found") from None
 
+        await TranslationJobs(db).cancel(chapter)
         translation = translation_service.reset_translation(chapter.id)
         segments = translation_service.ensure_segments(
             translation, chapter.normalized_text, force=True
         )
-        return _build_translation_state(chapter, translation, segments)
+        return build_translation_state(chapter, translation, segments)
 
 
 @router.post("/{work_id}/chapters/{chapter_id}/regenerate-segments")
-def regenerate_chapter_segments(work_id: int, chapter_id: int):
+async def regenerate_chapter_segments(work_id: int, chapter_id: int):
     """Regenerate all segments for a chapter, discarding existing translations.
 
     This endpoint deletes all existing segments for all translations of the chapter
     and recreates them based on the current chapter text. This is useful when the
-    chapter source text changes and needs to be re-segmented.
+    chapter source text changes and needs to be re-segmented. A running translation
+    is cancelled first so it cannot write into the discarded segments.
     """
     with SessionLocal() as db:
         works_service = WorksService(db)
@@ -451,16 +526,17 @@ def regenerate_chapter_segments(work_id: int, chapter_id: int):
         except WorkNotFoundError:
             raise HTTPException(status_code=404, detail="work not found") from None
         try:
-            chapter = chapters_service.get_chapter(chapter_id)
+            chapter = chapters_service.get_chapter(chapter_id, with_text=True)
         except ChapterNotFoundError:
             raise HTTPException(status_code=404, detail="chapter not found") from None
         if chapter.work_id != work.id:
             raise HTTPException(status_code=404, detail="chapter not found") from None
 
+        await TranslationJobs(db).cancel(chapter)
         translation_service.regenerate_chapter_segments(chapter)
         translation = translation_service.get_or_create_translation(chapter.id)
         segments = list(translation_service.get_segments_for_translation(translation.id))
-        return _build_translation_state(chapter, translation, segments)
+        return build_translation_state(chapter, translation, segments)
 
 
 @router.patch(
@@ -485,7 +561,7 @@ def batch_update_segments(work_id: int, chapter_id: int, payload: BatchSegmentUp
             raise HTTPException(status_code=404, detail="work not found") from None
 
         try:
-            chapter = chapters_service.get_chapter(chapter_id)
+            chapter = chapters_service.get_chapter(chapter_id, with_text=True)
         except ChapterNotFoundError:
             raise HTTPException(status_code=404, detail="chapter not found") from None
 
@@ -498,7 +574,7 @@ def batch_update_segments(work_id: int, chapter_id: int, payload: BatchSegmentUp
         translation_service.batch_update_segment_translations(translation.id, edits)
 
         segments = list(translation_service.get_segments_for_translation(translation.id))
-        return _build_translation_state(chapter, translation, segments)
+        return build_translation_state(chapter, translation, segments)
 
 
 def _resolve_prompt_override(token: str | None, work_id: int, chapter_id: int):
@@ -563,42 +639,63 @@ def _sse_event(event: str, payload: dict) -> dict:
     return {"event": event, "data": json.dumps(payload)}
 
 
-def _build_translation_state(chapter, translation, segments) -> ChapterTranslationStateOut:
-    chapter_text = chapter.normalized_text
-    splitter = get_sentence_splitter()
-    payload_segments = []
-    for segment in segments:
-        src = chapter_text[segment.start : segment.end]
-        raw_spans = splitter.split(src) if src.strip() else []
-        sentences = [
-            SentenceSpanOut(
-                span_start=span.span_start,
-                span_end=span.span_end,
-                text=span.text,
-            )
-            for span in raw_spans
-        ]
-        payload_segments.append(
-            TranslationSegmentOut(
-                id=segment.id,
-                start=segment.start,
-                end=segment.end,
-                order_index=segment.order_index,
-                src=src,
-                tgt=segment.tgt or "",
-                flags=segment.flags or [],
-                sentences=sentences,
-            )
-        )
-
-    return ChapterTranslationStateOut(
-        chapter_translation_id=translation.id,
-        status=translation.status,
-        segments=payload_segments,
+async def _counted_sse(stream: str, frames: AsyncIterator[dict]) -> AsyncGenerator[dict, None]:
+    """Count the response as an open SSE stream until the client goes away."""
+    SSE_STREAMS_ACTIVE.inc(stream=stream)
+    try:
+        async for frame in frames:
+            yield frame
+    finally:
+        SSE_STREAMS_ACTIVE.dec(stream=stream)
+        aclose = getattr(frames, "aclose", None)
+        if aclose is not None:
+            await aclose()
+
+
+async def _without_event_ids(
+    events: AsyncIterator[TranslationEvent],
+) -> AsyncGenerator[tuple[str | None, TranslationEvent], None]:
+    async for event in events:
+        yield None, event
+
+
+async def _translation_sse_frames(
+    events: AsyncIterator[tuple[str | None, TranslationEvent | TranslationResyncEvent]],
+    *,
+    coalesce_chars: int | None,
+    coalesce_ms: int | None,
+) -> AsyncGenerator[dict, None]:
+    """Coalesce deltas, encode SSE frames, and log the frame/byte rate on close."""
+    max_chars = (
+        settings.translation_delta_coalesce_chars if coalesce_chars is None else coalesce_chars
     )
+    max_delay_ms = settings.translation_delta_coalesce_ms if coalesce_ms is None else coalesce_ms
+    stats = SSEStreamStats()
+    try:
+        async for event_id, event in coalesce_segment_deltas(
+            events, max_chars=max_chars, max_delay_ms=max_delay_ms
+        ):
+            frame = _translation_event_to_sse(event)
+            if event_id is not None:
+                frame["id"] = event_id
+            stats.record(frame)
+            yield frame
+    finally:
+        logger.info(
+            "Translation SSE stream closed",
+            extra={
+                "frames": stats.frames,
+                "bytes": stats.bytes,
+                "elapsed_s": round(stats.elapsed_s, 3),
+                "frames_per_s": round(stats.frames_per_second, 1),
+                "bytes_per_s": round(stats.bytes_per_second, 1),
+                "coalesce_chars": max_chars,
+                "coalesce_ms": max_delay_ms,
+            },
+        )
 
 
-def _translation_event_to_sse(event: TranslationEvent) -> dict:
+def _translation_event_to_sse(event: TranslationEvent | TranslationResyncEvent) -> dict:
     match event:
         case TranslationStatusEvent():
             return _sse_event(
@@ -652,6 +749,10 @@ def _translation_event_to_sse(event: TranslationEvent) -> dict:
             if event.order_index is not None:
                 payload["order_index"] = event.order_index
             return _sse_event("translation-error", payload)
+        case TranslationResyncEvent():
+            return _sse_event(
+                "translation-resync", {"chapter_translation_id": event.chapter_translation_id}
+            )
 
 
 @router.get("/{work_id}/chapters/{chapter_id}/translate/stream")
@@ -660,9 +761,23 @@ async def stream_chapter_translation(
     chapter_id: int,
     request: Request,
     prompt_override_token: str | None = Query(default=None),
+    coalesce_chars: int | None = Query(default=None, ge=0, le=4096),
+    coalesce_ms: int | None = Query(default=None, ge=0, le=5000),
+    last_event_id: str | None = Header(default=None),
 ):
-    # TODO: Gate concurrent translators per chapter translation.
-    # TODO: Handle reset invalidating in-flight segments.
+    """SSE endpoint that tails the chapter's background translation run.
+
+    A run is started if none is in progress; otherwise this subscribes to the
+    existing run and first replays the events it has already emitted. Client
+    disconnect only unsubscribes; use ``translate/cancel`` to stop the run.
+
+    Events carry ids, so a reconnecting EventSource sends ``Last-Event-ID`` and
+    resumes right after it. When the replay buffer no longer reaches back that
+    far, a ``translation-resync`` event asks the client to reload the state.
+
+    ``coalesce_chars``/``coalesce_ms`` bound how many delta characters are merged
+    into one frame and how long they may be held (0 disables either limit).
+    """
     db = SessionLocal()
     try:
         works_service = WorksService(db)
@@ -679,26 +794,57 @@ async def stream_chapter_translation(
             raise HTTPException(status_code=404, detail="chapter not found") from None
 
         prompt_override = _resolve_prompt_override(prompt_override_token, work_id, chapter_id)
-        workflow = TranslationWorkflow(db)
+        jobs = TranslationJobs(db)
+        # The session stays open for the stream but checks out a connection only
+        # around its reads; see release_connection.
+        release_connection(db)
 
         async def event_generator():
             try:
-                async for event in workflow.start_or_resume(
-                    chapter,
-                    work_id,
-                    prompt_override=prompt_override,
-                    is_disconnected=request.is_disconnected,
+                async for frame in _translation_sse_frames(
+                    jobs.subscribe(
+                        chapter,
+                        work_id,
+                        prompt_override=prompt_override,
+                        is_disconnected=request.is_disconnected,
+                        last_event_id=last_event_id,
+                    ),
+                    coalesce_chars=coalesce_chars,
+                    coalesce_ms=coalesce_ms,
                 ):
-                    yield _translation_event_to_sse(event)
+                    yield frame
             finally:
                 db.close()
 
-        return EventSourceResponse(event_generator())
+        return EventSourceResponse(_counted_sse("translation", event_generator()))
     except Exception:
         db.close()
         raise
 
 
+@router.post("/{work_id}/chapters/{chapter_id}/translate/cancel")
+async def cancel_chapter_translation(work_id: int, chapter_id: int):
+    """Cancel the chapter's background translation run, if any."""
+    with SessionLocal() as db:
+        works_service = WorksService(db)
+        chapters_service = ChaptersService(db)
+        try:
+            work = works_service.get_work(work_id)
+        except WorkNotFoundError:
+            raise HTTPException(status_code=404, detail="work not found") from None
+        try:
+            chapter = chapters_service.get_chapter(chapter_id)
+        except ChapterNotFoundError:
+            raise HTTPException(status_code=404, detail="chapter not found") from None
+        if chapter.work_id != work.id:
+            raise HTTPException(status_code=404, detail="chapter not found") from None
+
+        translation_id = await TranslationJobs(db).cancel(chapter)
+        if translation_id is None:
+            return {"status": "no_active_job"}
+        return {"status": "cancelled", "chapter_translation_id": translation_id}
+
+
 @router.get("/{work_id}/chapters/{chapter_id}/segments/{segment_id}/retranslate/stream")
 async def retranslate_segment(
     work_id: int,
@@ -707,12 +853,16 @@ async def retranslate_segment(
     request: Request,
     prompt_override_token: str | None = Query(default=None),
     instruction: str | None = Query(default=None, max_length=2000),
+    coalesce_chars: int | None = Query(default=None, ge=0, le=4096),
+    coalesce_ms: int | None = Query(default=None, ge=0, le=5000),
 ):
     """Retranslate a single segment in a chapter translation.
 
     Args:
         instruction: Optional user instruction to guide the retranslation
             (e.g., "make it more casual", "keep the honorific").
+        coalesce_chars, coalesce_ms: Delta coalescing limits, as for the chapter
+            translation stream.
     """
     db = SessionLocal()
     try:
@@ -723,7 +873,7 @@ async def retranslate_segment(
         except WorkNotFoundError:
             raise HTTPException(status_code=404, detail="work not found") from None
         try:
-            chapter = chapters_service.get_chapter(chapter_id)
+            chapter = chapters_service.get_chapter(chapter_id, with_text=True)
         except ChapterNotFoundError:
             raise HTTPException(status_code=404, detail="chapter not found") from None
         if chapter.work_id != work.id:
@@ -738,21 +888,34 @@ async def retranslate_segment(
             db.close()
             raise HTTPException(status_code=404, detail="segment not found") from None
 
+        if await TranslationJobs(db).is_running(chapter):
+            db.close()
+            raise HTTPException(
+                status_code=409, detail="chapter translation is already running"
+            ) from None
+        release_connection(db)
+
         async def event_generator():
             try:
-                async for event in workflow.retranslate_segment(
-                    chapter,
-                    segment_id,
-                    work_id,
-                    prompt_override=prompt_override,
-                    instruction=instruction,
-                    is_disconnected=request.is_disconnected,
+                async for frame in _translation_sse_frames(
+                    _without_event_ids(
+                        workflow.retranslate_segment(
+                            chapter,
+                            segment_id,
+                            work_id,
+                            prompt_override=prompt_override,
+                            instruction=instruction,
+                            is_disconnected=request.is_disconnected,
+                        )
+                    ),
+                    coalesce_chars=coalesce_chars,
+                    coalesce_ms=coalesce_ms,
                 ):
-                    yield _translation_event_to_sse(event)
+                    yield frame
             finally:
                 db.close()
 
-        return EventSourceResponse(event_generator())
+        return EventSourceResponse(_counted_sse("segment-retranslate", event_generator()))
     except Exception:
         db.close()
         raise
@@ -795,7 +958,7 @@ def _resolve_chapter_for_segment(db, work_id: int, chapter_id: int, segment_id:
     except WorkNotFoundError:
         raise HTTPException(status_code=404, detail="work not found") from None
     try:
-        chapter = chapters_service.get_chapter(chapter_id)
+        chapter = chapters_service.get_chapter(chapter_id, with_text=True)
     except ChapterNotFoundError:
         raise HTTPException(status_code=404, detail="chapter not found") from None
     if chapter.work_id != work.id:
@@ -913,6 +1076,7 @@ async def stream_sentence_explanation(
             raise HTTPException(status_code=400, detail=str(exc)) from None
 
         work_jlpt_level = work.jlpt_level
+        release_connection(db)
 
         async def event_generator():
             try:
@@ -929,7 +1093,7 @@ async def stream_sentence_explanation(
             finally:
                 db.close()
 
-        return EventSourceResponse(event_generator())
+        return EventSourceResponse(_counted_sse("explanation", event_generator()))
     except Exception:
         db.close()
         raise
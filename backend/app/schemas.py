@@ -4,7 +4,7 @@ from typing import Any, Literal
 
 from pydantic import AnyHttpUrl, BaseModel, Field, field_validator, model_validator
 
-from constants.llm import AVAILABLE_MODELS, MODEL_BY_ID
+from constants.llm import AVAILABLE_MODELS, FAKE, MODEL_BY_ID, get_model_info
 
 
 class IngestSyosetuRequest(BaseModel):
@@ -150,6 +150,50 @@ class ChapterScrapeResponse(BaseModel):
     errors: list[ChapterScrapeErrorItem] = Field(default_factory=list)
 
 
+class TranslationBatchRequest(BaseModel):
+    start: float | None = Field(default=None, ge=1, description="First chapter number")
+    end: float | None = Field(default=None, ge=1, description="Last chapter number")
+    chapter_group_id: int | None = Field(
+        default=None, description="Translate this group's chapters instead of a range"
+    )
+
+    @model_validator(mode="after")
+    def validate_target(self):
+        has_range = self.start is not None or self.end is not None
+        if has_range == (self.chapter_group_id is not None):
+            raise ValueError("provide either start/end or chapter_group_id")
+        if has_range:
+            if self.start is None or self.end is None:
+                raise ValueError("start and end are both required")
+            if self.end < self.start:
+                raise ValueError("end must be greater than or equal to start")
+        return self
+
+
+class TranslationBatchErrorItem(BaseModel):
+    chapter_id: int
+    reason: str
+
+
+class TranslationBatchJobOut(BaseModel):
+    id: int
+    work_id: int
+    chapter_group_id: int | None = None
+    start: float | None = None
+    end: float | None = None
+    status: str
+    progress: int
+    total: int
+    completed_count: int = 0
+    failed_count: int = 0
+    error_details: list[TranslationBatchErrorItem] | None = None
+    created_at: datetime
+    updated_at: datetime
+
+    class Config:
+        from_attributes = True
+
+
 class SentenceSpanOut(BaseModel):
     span_start: int
     span_end: int
@@ -304,7 +348,8 @@ class PromptVersionCreateRequest(BaseModel):
     @classmethod
     def validate_model(cls, v):
         """Ensure model is in the list of supported models"""
-        if v not in MODEL_BY_ID:
+        # get_model_info only returns the fake model while it is enabled.
+        if v not in MODEL_BY_ID and get_model_info(v) is not FAKE:
             available = ", ".join(m.id for m in AVAILABLE_MODELS)
             raise ValueError(f"Invalid model '{v}'. Supported models: {available}")
         return v
@@ -343,6 +388,44 @@ class ModelsListOut(BaseModel):
     total: int
 
 
+class UsageTotalsOut(BaseModel):
+    calls: int = 0
+    input_tokens: int = 0
+    output_tokens: int = 0
+    cache_read_tokens: int = 0
+    cache_creation_tokens: int = 0
+    cost_usd: float = 0.0
+
+
+class ModelUsageOut(UsageTotalsOut):
+    provider: str
+    model: str
+
+
+class WorkUsageOut(BaseModel):
+    """LLM usage and cost of translating a work, overall and per model."""
+
+    work_id: int
+    totals: UsageTotalsOut
+    by_model: list[ModelUsageOut]
+
+
+class LatencyPercentilesOut(BaseModel):
+    p50: int | None = None
+    p95: int | None = None
+    p99: int | None = None
+
+
+class ModelLatencyOut(BaseModel):
+    """Time-to-first-token and call duration percentiles of a model's completed calls, in ms."""
+
+    model: str
+    since: datetime
+    calls: int
+    ttft_ms: LatencyPercentilesOut
+    duration_ms: LatencyPercentilesOut
+
+
 class LabStreamRequest(BaseModel):
     text: str = Field(..., min_length=1, description="Text to translate")
     model: str = Field(..., description="Model identifier")
@@ -431,6 +514,8 @@ class ChaptersWithGroupsResponse(BaseModel):
     total_items: int
     offset: int
     limit: int
+    # Cursor for the next page (pass as ``cursor``); null on the last page.
+    next_cursor: str | None = None
 
 
 # Translation improvement schemas
@@ -1,14 +1,21 @@
 from __future__ import annotations
 
+from collections.abc import Awaitable, Callable
 from decimal import Decimal
-from typing import Protocol
+from typing import Any, Protocol
+
+from app.clients import HttpClient, Page, Validators
 
 from .types import SourceDescriptor, WorkMetadata
 
+# Runs ``fn(html)`` elsewhere (e.g. ParseExecutor.parse); ``fn`` must be picklable.
+PageParse = Callable[[Callable[[str], Any], str], Awaitable[Any]]
+
 
 class WorkScraper(Protocol):
     source: str
     hostnames: set[str]
+    http_client: HttpClient
 
     def matches(self, url: str) -> bool: ...
 
@@ -16,4 +23,26 @@ class WorkScraper(Protocol):
 
     def fetch_work_metadata(self, descriptor: SourceDescriptor) -> WorkMetadata: ...
 
+    async def aload_toc(
+        self, source_id: str, fetch: Callable[[str], Awaitable[str]], parse: PageParse
+    ) -> None:
+        """Load whatever ``build_chapter_url`` reads from the network, via ``fetch(url)``.
+
+        Scrape jobs call this once before resolving any chapter url, so that
+        request goes through the host's politeness limits, and the page is
+        parsed with ``parse(fn, html)`` in the parse workers.
+        """
+        ...
+
     def build_chapter_url(self, source_id: str, chapter_number: Decimal) -> str: ...
+
+    def scrape_chapter(self, url: str) -> tuple[str, str]: ...
+
+    @property
+    def parse_chapter(self) -> Callable[[str], tuple[str, str]]:
+        """The chapter page parser; a module-level function, so worker processes can run it."""
+        ...
+
+    async def afetch_chapter(self, url: str, *, validators: Validators | None = None) -> Page:
+        """A chapter page and its validators; given stored ones, a 304 raises NotModifiedError."""
+        ...
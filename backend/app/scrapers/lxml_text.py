@@ -0,0 +1,43 @@
+"""Text extraction on raw lxml trees, matching the BeautifulSoup parsers' output.
+
+The fast chapter parsers skip BeautifulSoup: they parse with lxml directly,
+find every element they need with one XPath query, and read text through the
+helpers here, which reproduce ``Tag.get_text`` as used by the BeautifulSoup
+parsers (ruby readings and script/style/template contents excluded, one string
+per text node).
+"""
+
+from __future__ import annotations
+
+from lxml import etree
+
+# BeautifulSoup keeps strings under these tags out of get_text(); for rt/rp this
+# is what remove_ruby_annotations achieves in the BeautifulSoup parsers.
+_STRINGS = etree.XPath(
+    ".//text()[not(ancestor::rt or ancestor::rp or ancestor::script"
+    " or ancestor::style or ancestor::template)]",
+    smart_strings=False,
+)
+
+
+def has_class(name: str) -> str:
+    """XPath predicate body for a class token, like the CSS ``.name`` selector."""
+    return f"contains(concat(' ', normalize-space(@class), ' '), ' {name} ')"
+
+
+def class_names(element: etree._Element) -> list[str]:
+    return (element.get("class") or "").split()
+
+
+def parse_html(html: str) -> etree._Element | None:
+    """The document root, or None for a document with no elements."""
+    parser = etree.HTMLParser(encoding="utf-8")
+    return etree.fromstring(html.encode("utf-8"), parser)
+
+
+def element_text(element: etree._Element, separator: str = "", *, strip: bool = False) -> str:
+    """``element.get_text(separator, strip=strip)`` as BeautifulSoup computes it."""
+    strings = _STRINGS(element)
+    if strip:
+        strings = [stripped for stripped in (s.strip() for s in strings) if stripped]
+    return separator.join(strings)
@@ -4,7 +4,7 @@ from collections.abc import Iterable
 from urllib.parse import urlparse
 
 from .base import WorkScraper
-from .exceptions import ScraperNotFoundError
+from .exceptions import ScraperError, ScraperNotFoundError
 
 
 class ScraperRegistry:
@@ -33,5 +33,13 @@ class ScraperRegistry:
                 return scraper
         raise ScraperNotFoundError(f"No scraper registered for source: {source}")
 
+    def use_chapter_parser(self, name: str) -> None:
+        """Parse chapters with ``name`` in every scraper offering it (see ``chapter_parsers``)."""
+        scrapers = [s for s in self._scrapers if name in getattr(s, "chapter_parsers", {})]
+        if not scrapers:
+            raise ScraperError(f"No scraper offers chapter parser: {name}")
+        for scraper in scrapers:
+            scraper.chapter_parser = name
+
 
 scraper_registry = ScraperRegistry()
@@ -0,0 +1,85 @@
+"""Syosetu chapter parser on lxml directly; same output as ``parser.parse_chapter``.
+
+One XPath query collects every title and body candidate in document order,
+then the same selector precedence as the BeautifulSoup parser picks among them.
+"""
+
+from __future__ import annotations
+
+from lxml import etree
+
+from app.scrapers.lxml_text import class_names, element_text, has_class, parse_html
+from app.scrapers.text import normalize_text
+
+from .parser import _BODY_SELECTORS, _TITLE_SELECTORS
+
+_IDS = ("novel_subtitle", "novel_title", "novel_honbun", "honbun")
+
+_CANDIDATES = etree.XPath(
+    "//*[" + " or ".join(f"@id='{id_}'" for id_ in _IDS) + "]"
+    f" | //h1[{has_class('p-novel__title')}]"
+    f" | //div[{has_class('p-novel__body')}]"
+)
+_NOVEL_TEXT_BLOCKS = etree.XPath(f".//*[{has_class('js-novel-text')}]")
+
+
+def parse_chapter(html: str) -> tuple[str, str]:
+    root = parse_html(html)
+    found = _find_candidates(root) if root is not None else {}
+    title = _extract_title(found)
+    body_text = _extract_body(found)
+    return title, normalize_text(body_text)
+
+
+def _find_candidates(root: etree._Element) -> dict[str, etree._Element]:
+    """The first element matching each selector, keyed by the selector."""
+    found: dict[str, etree._Element] = {}
+    for element in _CANDIDATES(root):
+        keys = [f"#{element.get('id')}"] if element.get("id") in _IDS else []
+        classes = class_names(element)
+        if element.tag == "h1" and "p-novel__title" in classes:
+            keys.append("h1.p-novel__title")
+        if element.tag == "div" and "p-novel__body" in classes:
+            keys.append("div.p-novel__body")
+        for key in keys:
+            found.setdefault(key, element)
+    return found
+
+
+def _paragraph_text(element: etree._Element) -> str:
+    children = [child for child in element if child.tag in ("p", "div")]
+    if children:
+        return "\n".join(element_text(child) for child in children)
+    return element_text(element)
+
+
+def _extract_title(found: dict[str, etree._Element]) -> str:
+    for selector in _TITLE_SELECTORS:
+        tag = found.get(selector)
+        if tag is not None:
+            return element_text(tag, strip=True)
+    return "Untitled"
+
+
+def _extract_body(found: dict[str, etree._Element]) -> str:
+    for selector in _BODY_SELECTORS:
+        node = found.get(selector)
+        if node is None:
+            continue
+        if selector == "div.p-novel__body":
+            blocks = _NOVEL_TEXT_BLOCKS(node)
+            if blocks:
+                text = "\n".join(_paragraph_text(block) for block in blocks)
+            else:
+                text = _paragraph_text(node)
+        else:
+            text = "\n".join(_paragraph_text(child) for child in node if child.tag in ("p", "div"))
+        text = text or _paragraph_text(node)
+        if text.strip():
+            return text
+    fallback = found.get("#novel_honbun")
+    if fallback is None:
+        fallback = found.get("#honbun")
+    if fallback is not None:
+        return _paragraph_text(fallback)
+    return ""
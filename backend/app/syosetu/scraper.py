@@ -1,16 +1,19 @@
 from __future__ import annotations
 
+from collections.abc import Awaitable, Callable
 from decimal import Decimal
 from urllib.parse import urlparse
 
 from bs4 import BeautifulSoup
 
-from app.clients import HttpClient, RequestsClient
+from app.clients import HttpClient, Page, Validators, get_http_client
+from app.config import settings
 from app.scrapers import scraper_registry
+from app.scrapers.base import PageParse
 from app.scrapers.exceptions import ScraperError
 from app.scrapers.types import SourceDescriptor, WorkMetadata
 
-from . import parser as syosetu_parser
+from . import fast_parser, parser as syosetu_parser
 
 _WORK_TITLE_SELECTORS = ["#novel_title", "h1.p-novel__title"]
 _WORK_AUTHOR_SELECTORS = ["#novel_writername", ".p-novel__author"]
@@ -23,8 +26,19 @@ class SyosetuScraper:
     source = "syosetu"
     hostnames = {"ncode.syosetu.com"}
 
-    def __init__(self, http_client: HttpClient | None = None) -> None:
-        self.http_client = http_client or RequestsClient()
+    # Interchangeable chapter parsers; "lxml" matches "bs4" output, several times faster.
+    chapter_parsers: dict[str, Callable[[str], tuple[str, str]]] = {
+        "bs4": syosetu_parser.parse_chapter,
+        "lxml": fast_parser.parse_chapter,
+    }
+
+    def __init__(
+        self, http_client: HttpClient | None = None, chapter_parser: str | None = None
+    ) -> None:
+        self.http_client = http_client or get_http_client()
+        self.chapter_parser = chapter_parser or settings.chapter_parser
+        if self.chapter_parser not in self.chapter_parsers:
+            raise ScraperError(f"Unknown chapter parser: {self.chapter_parser}")
 
     def matches(self, url: str) -> bool:
         parsed = urlparse(url)
@@ -70,9 +84,25 @@ class SyosetuScraper:
             extra=extra,
         )
 
+    @property
+    def parse_chapter(self) -> Callable[[str], tuple[str, str]]:
+        # A plain module function, so it can be shipped to parse worker processes.
+        return self.chapter_parsers[self.chapter_parser]
+
     def scrape_chapter(self, url: str) -> tuple[str, str]:
-        html = self.http_client.fetch(url)
-        return syosetu_parser.parse_chapter(html)
+        return self.parse_chapter(self.fetch_chapter(url))
+
+    def fetch_chapter(self, url: str) -> str:
+        return self.http_client.fetch(url)
+
+    async def afetch_chapter(self, url: str, *, validators: Validators | None = None) -> Page:
+        """A chapter page and its validators; given stored ones, a 304 raises NotModifiedError."""
+        return await self.http_client.afetch_page(url, validators=validators)
+
+    async def aload_toc(
+        self, source_id: str, fetch: Callable[[str], Awaitable[str]], parse: PageParse
+    ) -> None:
+        """Nothing to load: Syosetu chapter urls are numbered, not listed on a TOC."""
 
     def build_chapter_url(self, source_id: str, chapter_number: Decimal) -> str:
         integer_value = chapter_number.to_integral_value()
@@ -2,6 +2,8 @@
 
 from dataclasses import dataclass
 
+from app.config import settings
+
 
 @dataclass
 class ModelInfo:
@@ -15,6 +17,12 @@ class ModelInfo:
     cost_per_1m_input: float = 0.0  # Cost per 1M input tokens in USD
     cost_per_1m_output: float = 0.0  # Cost per 1M output tokens in USD
 
+    def cost_usd(self, input_tokens: int, output_tokens: int) -> float:
+        """Cost of one call at list price. Cached input is billed as regular input."""
+        return (
+            input_tokens * self.cost_per_1m_input + output_tokens * self.cost_per_1m_output
+        ) / 1_000_000
+
 
 # GPT-5 Series (Latest flagship models)
 GPT_5_5 = ModelInfo(
@@ -258,6 +266,15 @@ AVAILABLE_MODELS: list[ModelInfo] = [
     GEMINI_2_0_FLASH_LITE,
 ]
 
+# Local fake provider for load tests (agents/fake_llm.py). Selectable by id only
+# when ``enable_fake_llm`` is set, and never listed in the model picker.
+FAKE = ModelInfo(
+    id="fake",
+    name="Fake (load testing)",
+    provider="fake",
+    max_tokens=128000,
+)
+
 # Model lookup by ID
 MODEL_BY_ID = {model.id: model for model in AVAILABLE_MODELS}
 
@@ -278,6 +295,8 @@ def get_model_info(model_id: str) -> ModelInfo | None:
     """Get model information by ID, transparently resolving legacy aliases."""
     if model_id in MODEL_BY_ID:
         return MODEL_BY_ID[model_id]
+    if model_id == FAKE.id:
+        return FAKE if settings.enable_fake_llm else None
     aliased = LEGACY_MODEL_ALIASES.get(model_id)
     if aliased is not None:
         return MODEL_BY_ID.get(aliased)
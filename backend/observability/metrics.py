@@ -0,0 +1,418 @@
+"""In-process metrics with Prometheus text exposition.
+
+Metrics are module-level singletons registered in ``REGISTRY`` and rendered
+by ``GET /metrics``. Recording is a lock-free update of a per-thread shard,
+so it is safe from worker threads (sync endpoints, SQLAlchemy pool events),
+and must stay within ``RECORD_BUDGET_NS`` per event;
+``scripts/bench_metrics.py`` checks it.
+"""
+
+from __future__ import annotations
+
+import asyncio
+import logging
+import math
+import operator
+import threading
+import time
+from bisect import bisect_left
+from collections.abc import Callable, Iterable, Sequence
+from typing import Any
+
+logger = logging.getLogger(__name__)
+
+# Per-event recording overhead allowed on hot paths (per token, per statement).
+RECORD_BUDGET_NS = 1_000
+
+# Latency buckets in seconds, from sub-millisecond DB work up to long LLM streams.
+DEFAULT_BUCKETS = (
+    0.0005,
+    0.001,
+    0.0025,
+    0.005,
+    0.01,
+    0.025,
+    0.05,
+    0.1,
+    0.25,
+    0.5,
+    1.0,
+    2.5,
+    5.0,
+    10.0,
+    30.0,
+    60.0,
+)
+
+LabelValues = tuple[str, ...]
+
+
+def _format_value(value: float) -> str:
+    if value == math.inf:
+        return "+Inf"
+    if float(value).is_integer():
+        return str(int(value))
+    return repr(float(value))
+
+
+def _escape(value: str) -> str:
+    return value.replace("\\", "\\\\").replace("\n", "\\n").replace('"', '\\"')
+
+
+def _label_text(names: Sequence[str], values: LabelValues, extra: str = "") -> str:
+    pairs = [f'{name}="{_escape(value)}"' for name, value in zip(names, values, strict=True)]
+    if extra:
+        pairs.append(extra)
+    return "{" + ",".join(pairs) + "}" if pairs else ""
+
+
+def _no_labels(labels: dict[str, str]) -> tuple[()]:
+    return ()
+
+
+class _Metric:
+    """Base for metrics whose samples are kept in per-thread shards.
+
+    Each thread records into its own dict, so the hot path takes no lock; the
+    shards are summed when the metric is rendered or read.
+    """
+
+    kind = ""
+
+    def __init__(self, name: str, documentation: str, labelnames: Sequence[str] = ()) -> None:
+        self.name = name
+        self.documentation = documentation
+        self.labelnames = tuple(labelnames)
+        # Label values are expected to be strings already; no coercion on the hot path.
+        # A single label keys by the bare value, several by a tuple.
+        if not self.labelnames:
+            self._key: Callable[[dict[str, str]], Any] = _no_labels
+        else:
+            self._key = operator.itemgetter(*self.labelnames)
+        self._local = threading.local()
+        self._shards: list[dict[Any, Any]] = []
+        self._shards_lock = threading.Lock()
+
+    def _shard(self) -> dict[Any, Any]:
+        try:
+            return self._local.shard
+        except AttributeError:
+            shard: dict[Any, Any] = {}
+            with self._shards_lock:
+                self._shards.append(shard)
+            self._local.shard = shard
+            return shard
+
+    def _snapshots(self) -> list[dict[Any, Any]]:
+        with self._shards_lock:
+            # dict.copy() is atomic under the GIL, so writers never need the lock.
+            return [shard.copy() for shard in self._shards]
+
+    def _label_values(self, key: Any) -> LabelValues:
+        return (key,) if len(self.labelnames) == 1 else key
+
+    def header(self) -> list[str]:
+        return [f"# HELP {self.name} {self.documentation}", f"# TYPE {self.name} {self.kind}"]
+
+    def samples(self) -> Iterable[str]:
+        raise NotImplementedError
+
+
+class Counter(_Metric):
+    """Monotonically increasing count."""
+
+    kind = "counter"
+
+    def inc(self, amount: float = 1.0, **labels: str) -> None:
+        key = self._key(labels)
+        try:
+            shard = self._local.shard
+        except AttributeError:
+            shard = self._shard()
+        shard[key] = shard.get(key, 0.0) + amount
+
+    def _totals(self) -> dict[Any, float]:
+        totals: dict[Any, float] = {}
+        for shard in self._snapshots():
+            for key, value in shard.items():
+                totals[key] = totals.get(key, 0.0) + value
+        return totals
+
+    def value(self, **labels: str) -> float:
+        return self._totals().get(self._key(labels), 0.0)
+
+    def samples(self) -> Iterable[str]:
+        for key, value in self._totals().items():
+            labels = _label_text(self.labelnames, self._label_values(key))
+            yield f"{self.name}{labels} {_format_value(value)}"
+
+
+class Gauge(Counter):
+    """Value that goes up and down, e.g. things currently in flight."""
+
+    kind = "gauge"
+
+    def dec(self, amount: float = 1.0, **labels: str) -> None:
+        self.inc(-amount, **labels)
+
+    def set(self, value: float, **labels: str) -> None:
+        key = self._key(labels)
+        with self._shards_lock:
+            for shard in self._shards:
+                shard.pop(key, None)
+        self._shard()[key] = value
+
+
+class _HistogramState:
+    __slots__ = ("buckets", "count", "sum")
+
+    def __init__(self, size: int) -> None:
+        self.buckets = [0] * size
+        self.count = 0
+        self.sum = 0.0
+
+
+class Histogram(_Metric):
+    """Distribution of observed values over fixed upper bounds."""
+
+    kind = "histogram"
+
+    def __init__(
+        self,
+        name: str,
+        documentation: str,
+        labelnames: Sequence[str] = (),
+        buckets: Sequence[float] = DEFAULT_BUCKETS,
+    ) -> None:
+        super().__init__(name, documentation, labelnames)
+        self.bounds = tuple(sorted(buckets))
+
+    def observe(self, value: float, **labels: str) -> None:
+        key = self._key(labels)
+        try:
+            shard = self._local.shard
+        except AttributeError:
+            shard = self._shard()
+        state = shard.get(key)
+        if state is None:
+            state = shard[key] = _HistogramState(len(self.bounds) + 1)
+        state.buckets[bisect_left(self.bounds, value)] += 1
+        state.count += 1
+        state.sum += value
+
+    def _totals(self) -> dict[Any, tuple[list[int], int, float]]:
+        totals: dict[Any, tuple[list[int], int, float]] = {}
+        for shard in self._snapshots():
+            for key, state in shard.items():
+                buckets, count, total = totals.get(key, ([0] * (len(self.bounds) + 1), 0, 0.0))
+                merged = [a + b for a, b in zip(buckets, state.buckets, strict=True)]
+                totals[key] = (merged, count + state.count, total + state.sum)
+        return totals
+
+    def count(self, **labels: str) -> int:
+        entry = self._totals().get(self._key(labels))
+        return entry[1] if entry else 0
+
+    def samples(self) -> Iterable[str]:
+        for key, (buckets, count, total) in self._totals().items():
+            values = self._label_values(key)
+            cumulative = 0
+            for bound, bucket in zip((*self.bounds, math.inf), buckets, strict=True):
+                cumulative += bucket
+                le = f'le="{_format_value(bound)}"'
+                yield f"{self.name}_bucket{_label_text(self.labelnames, values, le)} {cumulative}"
+            labels = _label_text(self.labelnames, values)
+            yield f"{self.name}_sum{labels} {_format_value(total)}"
+            yield f"{self.name}_count{labels} {count}"
+
+
+class MetricsRegistry:
+    def __init__(self) -> None:
+        self._metrics: dict[str, _Metric] = {}
+
+    def register(self, metric: _Metric) -> None:
+        if metric.name in self._metrics:
+            raise ValueError(f"metric {metric.name} already registered")
+        self._metrics[metric.name] = metric
+
+    def counter(self, name: str, documentation: str, labelnames: Sequence[str] = ()) -> Counter:
+        metric = Counter(name, documentation, labelnames)
+        self.register(metric)
+        return metric
+
+    def gauge(self, name: str, documentation: str, labelnames: Sequence[str] = ()) -> Gauge:
+        metric = Gauge(name, documentation, labelnames)
+        self.register(metric)
+        return metric
+
+    def histogram(
+        self,
+        name: str,
+        documentation: str,
+        labelnames: Sequence[str] = (),
+        buckets: Sequence[float] = DEFAULT_BUCKETS,
+    ) -> Histogram:
+        metric = Histogram(name, documentation, labelnames, buckets)
+        self.register(metric)
+        return metric
+
+    def render(self) -> str:
+        """Prometheus text exposition format (version 0.0.4)."""
+        lines: list[str] = []
+        for metric in self._metrics.values():
+            lines.extend(metric.header())
+            lines.extend(metric.samples())
+        return "\n".join(lines) + "\n"
+
+
+REGISTRY = MetricsRegistry()
+
+# -- Process ----------------------------------------------------------------
+EVENT_LOOP_LAG_SECONDS = REGISTRY.histogram(
+    "tonari_event_loop_lag_seconds", "Delay of a periodic event loop wake-up beyond its schedule."
+)
+SSE_STREAMS_ACTIVE = REGISTRY.gauge(
+    "tonari_sse_streams_active", "Open server-sent event responses.", ["stream"]
+)
+
+# -- Database ---------------------------------------------------------------
+DB_POOL_CHECKED_OUT = REGISTRY.gauge(
+    "tonari_db_pool_checked_out",
+    "Database connections currently checked out of the pool.",
+    ["engine"],
+)
+DB_POOL_CHECKOUT_SECONDS = REGISTRY.histogram(
+    "tonari_db_pool_checkout_seconds",
+    "Time spent waiting to check a connection out of the pool.",
+    ["engine"],
+)
+DB_QUERY_SECONDS = REGISTRY.histogram(
+    "tonari_db_query_seconds", "Duration of individual SQL statements.", ["engine"]
+)
+
+# -- LLM --------------------------------------------------------------------
+LLM_IN_FLIGHT = REGISTRY.gauge(
+    "tonari_llm_in_flight", "Streamed LLM calls currently running.", ["provider"]
+)
+LLM_REQUESTS_TOTAL = REGISTRY.counter(
+    "tonari_llm_requests_total", "Streamed LLM calls by outcome.", ["provider", "outcome"]
+)
+LLM_FIRST_TOKEN_SECONDS = REGISTRY.histogram(
+    "tonari_llm_first_token_seconds", "Time to first streamed token.", ["provider"]
+)
+LLM_STREAM_SECONDS = REGISTRY.histogram(
+    "tonari_llm_stream_seconds", "Total duration of streamed LLM calls.", ["provider"]
+)
+LLM_CLIENT_CACHE_TOTAL = REGISTRY.counter(
+    "tonari_llm_client_cache_total",
+    "LLM client registry lookups by cache and outcome (hit, miss, eviction).",
+    ["cache", "outcome"],
+)
+LLM_CLIENT_CACHE_SIZE = REGISTRY.gauge(
+    "tonari_llm_client_cache_size", "Entries held by each LLM client registry cache.", ["cache"]
+)
+LLM_HTTP_REQUESTS_TOTAL = REGISTRY.counter(
+    "tonari_llm_http_requests_total",
+    "HTTP requests to LLM providers by whether they opened or reused a connection.",
+    ["provider", "connection"],
+)
+
+# -- Translation ------------------------------------------------------------
+TRANSLATION_RUNS_ACTIVE = REGISTRY.gauge(
+    "tonari_translation_runs_active", "Chapter translation runs currently streaming."
+)
+TRANSLATION_SEGMENTS_TOTAL = REGISTRY.counter(
+    "tonari_translation_segments_total",
+    "Translated segments by outcome (completed, memory, cancelled, error).",
+    ["outcome"],
+)
+TRANSLATION_SEGMENT_SECONDS = REGISTRY.histogram(
+    "tonari_translation_segment_seconds", "Time from segment start to its completion."
+)
+
+# -- Background generations -------------------------------------------------
+GENERATIONS_ACTIVE = REGISTRY.gauge(
+    "tonari_generations_active", "Background generations currently running.", ["kind"]
+)
+GENERATIONS_STARTED_TOTAL = REGISTRY.counter(
+    "tonari_generations_started_total", "Background generations started.", ["kind"]
+)
+
+# -- Scraping ---------------------------------------------------------------
+SCRAPE_JOBS_ACTIVE = REGISTRY.gauge("tonari_scrape_jobs_active", "Scrape jobs currently running.")
+SCRAPE_QUEUE_DEPTH = REGISTRY.gauge(
+    "tonari_scrape_queue_depth", "Chapters still to be scraped across running jobs."
+)
+SCRAPE_CHAPTERS_TOTAL = REGISTRY.counter(
+    "tonari_scrape_chapters_total",
+    "Scraped chapters by outcome (created, updated, skipped, error).",
+    ["outcome"],
+)
+SCRAPE_CHAPTER_SECONDS = REGISTRY.histogram(
+    "tonari_scrape_chapter_seconds", "Time to fetch, parse and store one chapter."
+)
+SCRAPE_HTTP_REQUESTS_TOTAL = REGISTRY.counter(
+    "tonari_scrape_http_requests_total",
+    "Scraper HTTP attempts by host and outcome (ok, not_modified, retried, error).",
+    ["host", "outcome"],
+)
+SCRAPE_HTTP_BYTES_TOTAL = REGISTRY.counter(
+    "tonari_scrape_http_bytes_total", "Decoded response bytes downloaded by scrapers.", ["host"]
+)
+
+
+def instrument_engine(engine, *, name: str = "sync") -> None:
+    """Record pool checkout wait, checked-out connections and statement timings.
+
+    ``engine`` is a sync ``Engine``; pass ``AsyncEngine.sync_engine`` for the
+    async one. ``name`` labels its series.
+    """
+    from sqlalchemy import event
+
+    pool = engine.pool
+    connect = pool.connect
+
+    # The pool has no "before checkout" event, so time the checkout call itself.
+    def timed_connect():
+        started = time.perf_counter()
+        try:
+            return connect()
+        finally:
+            DB_POOL_CHECKOUT_SECONDS.observe(time.perf_counter() - started, engine=name)
+
+    pool.connect = timed_connect
+
+    @event.listens_for(pool, "checkout")
+    def _on_checkout(dbapi_connection, connection_record, connection_proxy) -> None:
+        DB_POOL_CHECKED_OUT.inc(engine=name)
+
+    # "reset" fires for every connection handed back; "checkin" fires only once
+    # per record, which a StaticPool shares between overlapping checkouts.
+    @event.listens_for(pool, "reset")
+    def _on_reset(dbapi_connection, connection_record, reset_state) -> None:
+        DB_POOL_CHECKED_OUT.dec(engine=name)
+
+    @event.listens_for(pool, "checkin")
+    def _on_checkin(dbapi_connection, connection_record) -> None:
+        if dbapi_connection is None:
+            # Invalidated while checked out, so it came back without a reset.
+            DB_POOL_CHECKED_OUT.dec(engine=name)
+
+    @event.listens_for(engine, "before_cursor_execute")
+    def _before_execute(conn, cursor, statement, parameters, context, executemany) -> None:
+        conn.info.setdefault("query_started", []).append(time.perf_counter())
+
+    @event.listens_for(engine, "after_cursor_execute")
+    def _after_execute(conn, cursor, statement, parameters, context, executemany) -> None:
+        started = conn.info.get("query_started")
+        if started:
+            DB_QUERY_SECONDS.observe(time.perf_counter() - started.pop(), engine=name)
+
+
+async def monitor_event_loop_lag(interval_s: float = 0.5) -> None:
+    """Sample event loop lag until cancelled; run as a background task."""
+    loop = asyncio.get_running_loop()
+    while True:
+        expected = loop.time() + interval_s
+        await asyncio.sleep(interval_s)
+        EVENT_LOOP_LAG_SECONDS.observe(max(0.0, loop.time() - expected))
@@ -0,0 +1,221 @@
+"""Measure event-loop stalls while many translation streams commit segments.
+
+Each stream translates a run of segments token by token and persists every
+finished segment together with its usage row. The ``sync`` mode commits through
+a ``SessionLocal`` session on the event loop (the previous path); ``async``
+commits through ``TranslationWriter`` on the async engine. The loop is probed
+every ``--tick-ms``; lag is how late each probe wakes up.
+
+Usage (from backend/):
+    DATABASE_URL=postgresql+psycopg2://... python scripts/bench_async_db.py
+    python scripts/bench_async_db.py --streams 50 --segments 20 --db-latency-ms 2
+
+Without DATABASE_URL a throwaway SQLite file is used. SQLite commits are local
+and fast, so run against Postgres (asyncpg is derived from DATABASE_URL) to see
+the round trips the sync path spends on the loop.
+"""
+
+import argparse
+import asyncio
+import os
+import statistics
+import sys
+import tempfile
+import time
+from decimal import Decimal
+
+# Add backend directory to path so we can import app modules
+sys.path.append(os.getcwd())
+os.environ.setdefault(
+    "DATABASE_URL", f"sqlite+pysqlite:///{tempfile.mkdtemp(prefix='tonari-bench-')}/bench.db"
+)
+
+from sqlalchemy import delete, event, select
+
+from agents.base_agent import CallAttempt, CallUsage
+from app.db import Base, SessionLocal, engine, get_async_engine
+from app.models import (
+    Chapter,
+    ChapterTranslation,
+    TranslationSegment,
+    TranslationSegmentUsage,
+    Work,
+)
+from services.translation_stream import TranslationStreamService
+from services.translation_writer import TranslationWriter
+from services.usage import UsageService
+
+BENCH_SOURCE = "bench-async-db"
+
+
+def seed(streams: int, segments: int) -> tuple[int, list[int]]:
+    """One chapter translation per stream, each with ``segments`` segments."""
+    with SessionLocal() as db:
+        work = Work(title="Async DB bench", source=BENCH_SOURCE, source_id="bench")
+        db.add(work)
+        db.flush()
+        translation_ids = []
+        for n in range(streams):
+            chapter = Chapter(
+                work_id=work.id,
+                idx=n + 1,
+                sort_key=Decimal(n + 1),
+                title="Bench",
+                normalized_text="bench",
+                text_hash=f"bench-{n}",
+            )
+            db.add(chapter)
+            db.flush()
+            translation = ChapterTranslation(chapter_id=chapter.id, status="running")
+            db.add(translation)
+            db.flush()
+            db.add_all(
+                TranslationSegment(
+                    chapter_translation_id=translation.id,
+                    order_index=i,
+                    start=0,
+                    end=1,
+                    tgt="",
+                    flags=[],
+                    src_hash=f"bench-{n}-{i}",
+                )
+                for i in range(segments)
+            )
+            translation_ids.append(translation.id)
+        db.commit()
+        return work.id, translation_ids
+
+
+def cleanup(work_id: int) -> None:
+    # Delete children explicitly; SQLite does not enforce ON DELETE CASCADE by default.
+    with SessionLocal() as db:
+        chapter_ids = select(Chapter.id).where(Chapter.work_id == work_id)
+        translation_ids = select(ChapterTranslation.id).where(
+            ChapterTranslation.chapter_id.in_(chapter_ids)
+        )
+        db.execute(
+            delete(TranslationSegmentUsage).where(TranslationSegmentUsage.work_id == work_id)
+        )
+        db.execute(
+            delete(TranslationSegment).where(
+                TranslationSegment.chapter_translation_id.in_(translation_ids)
+            )
+        )
+        db.execute(delete(ChapterTranslation).where(ChapterTranslation.id.in_(translation_ids)))
+        db.execute(delete(Chapter).where(Chapter.work_id == work_id))
+        db.execute(delete(Work).where(Work.id == work_id))
+        db.commit()
+
+
+def add_latency(latency_ms: float) -> None:
+    """Sleep before every statement on both engines, like a network round trip."""
+    if latency_ms <= 0:
+        return
+
+    def before_execute(*_args) -> None:
+        time.sleep(latency_ms / 1000)
+
+    for sync_engine in (engine, get_async_engine().sync_engine):
+        event.listen(sync_engine, "before_cursor_execute", before_execute)
+
+
+def call_usage(tokens: int) -> CallUsage:
+    attempt = CallAttempt(
+        provider="fake",
+        model="fake",
+        outcome="ok",
+        ttft_ms=1,
+        duration_ms=tokens,
+        input_tokens=tokens,
+        output_tokens=tokens,
+    )
+    return CallUsage(provider="fake", model="fake", attempts=[attempt])
+
+
+async def measure_lag(stop: asyncio.Event, tick_s: float, samples: list[float]) -> None:
+    while not stop.is_set():
+        started = time.perf_counter()
+        await asyncio.sleep(tick_s)
+        samples.append(time.perf_counter() - started - tick_s)
+
+
+async def stream(mode: str, work_id: int, translation_id: int, args: argparse.Namespace) -> None:
+    with SessionLocal() as db:
+        translation = db.get(ChapterTranslation, translation_id)
+        service = TranslationStreamService(db)
+        writer = TranslationWriter()
+        for segment in service.get_segments_for_translation(translation_id):
+            collected = ""
+            for i in range(args.tokens):
+                await asyncio.sleep(args.token_ms / 1000)
+                collected += f"t{i} "
+            usage = call_usage(args.tokens)
+            rows = UsageService.build_call_rows(translation, segment, usage, work_id=work_id)
+            if mode == "sync":
+                db.add_all(rows)
+                translation.meta, translation.cost_cents = UsageService.rolled_up(
+                    translation.meta, rows
+                )
+                service.persist_completed_segment_translation(segment, collected)
+            else:
+                await writer.complete_segment(
+                    segment, collected, translation=translation, usage_rows=rows
+                )
+
+
+async def run(mode: str, work_id: int, translation_ids: list[int], args) -> dict:
+    samples: list[float] = []
+    stop = asyncio.Event()
+    ticker = asyncio.create_task(measure_lag(stop, args.tick_ms / 1000, samples))
+
+    started = time.perf_counter()
+    await asyncio.gather(*(stream(mode, work_id, tid, args) for tid in translation_ids))
+    elapsed = time.perf_counter() - started
+
+    stop.set()
+    await ticker
+    lags_ms = sorted(sample * 1000 for sample in samples)
+    return {
+        "mode": mode,
+        "elapsed_s": elapsed,
+        "lag_p50_ms": statistics.median(lags_ms),
+        "lag_p99_ms": lags_ms[min(len(lags_ms) - 1, int(len(lags_ms) * 0.99))],
+        "lag_max_ms": lags_ms[-1],
+    }
+
+
+def main() -> None:
+    parser = argparse.ArgumentParser(description=__doc__.splitlines()[0])
+    parser.add_argument("--streams", type=int, default=50)
+    parser.add_argument("--segments", type=int, default=10, help="segments per stream")
+    parser.add_argument("--tokens", type=int, default=20, help="tokens per segment")
+    parser.add_argument("--token-ms", type=float, default=10.0)
+    parser.add_argument(
+        "--db-latency-ms", type=float, default=0.0, help="simulated round trip per statement"
+    )
+    parser.add_argument("--tick-ms", type=float, default=5.0, help="lag probe interval (ms)")
+    args = parser.parse_args()
+
+    if engine.dialect.name == "sqlite":
+        Base.metadata.create_all(bind=engine)
+    add_latency(args.db_latency_ms)
+
+    print(
+        f"Database: {engine.dialect.name}; {args.streams} streams x {args.segments} segments, "
+        f"{args.db_latency_ms:g}ms per statement"
+    )
+    for mode in ("sync", "async"):
+        work_id, translation_ids = seed(args.streams, args.segments)
+        try:
+            result = asyncio.run(run(mode, work_id, translation_ids, args))
+        finally:
+            cleanup(work_id)
+        print(
+            f"{mode:>6}: elapsed {result['elapsed_s']:.2f}s  "
+            f"lag p50 {result['lag_p50_ms']:.2f}ms  p99 {result['lag_p99_ms']:.2f}ms  "
+            f"max {result['lag_max_ms']:.2f}ms"
+        )
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,192 @@
+"""Measure /works/{id}/chapters page latency against a large work.
+
+Seeds one work with ``--chapters`` chapters (``--text-kb`` of text each), puts
+every ``--group-every``-th run of ``--group-size`` chapters into a group, and
+marks a share of chapters translated. Then it times the mixed chapter/group
+listing at pages spread across the list, three ways:
+
+    legacy  the previous in-Python merge: every group with its members'
+            chapters and every ungrouped chapter (text included) is loaded,
+            sorted and sliced per request
+    offset  ChapterGroupsService with ``offset``
+    cursor  ChapterGroupsService with ``after`` (keyset), as the API's
+            ``cursor`` parameter
+
+Usage (from backend/):
+    python scripts/bench_chapter_list.py
+    DATABASE_URL=postgresql+psycopg2://... python scripts/bench_chapter_list.py --chapters 20000
+
+Without DATABASE_URL a throwaway SQLite file is used.
+"""
+
+import argparse
+import os
+import statistics
+import sys
+import tempfile
+import time
+from decimal import Decimal
+
+# Add backend directory to path so we can import app modules
+sys.path.append(os.getcwd())
+os.environ.setdefault(
+    "DATABASE_URL", f"sqlite+pysqlite:///{tempfile.mkdtemp(prefix='tonari-bench-')}/bench.db"
+)
+
+from sqlalchemy import delete, select
+from sqlalchemy.orm import joinedload
+
+from app.db import Base, SessionLocal, engine
+from app.models import Chapter, ChapterGroup, ChapterGroupMember, ChapterTranslation, Work
+from services.chapter_groups import ChapterGroupsService
+
+BENCH_SOURCE = "bench-chapter-list"
+
+
+def seed(args: argparse.Namespace) -> int:
+    text = "あ" * (args.text_kb * 1024 // 3)
+    with SessionLocal() as db:
+        work = Work(title="Chapter list bench", source=BENCH_SOURCE, source_id="bench")
+        db.add(work)
+        db.flush()
+        chapters = [
+            Chapter(
+                work_id=work.id,
+                idx=n,
+                sort_key=Decimal(n),
+                title=f"Chapter {n}",
+                normalized_text=text,
+                text_hash=f"bench-{n}",
+            )
+            for n in range(1, args.chapters + 1)
+        ]
+        db.add_all(chapters)
+        db.flush()
+        db.add_all(
+            ChapterTranslation(chapter_id=chapter.id, status="completed")
+            for chapter in chapters[::3]
+        )
+        for start in range(0, len(chapters), args.group_every):
+            members = chapters[start : start + args.group_size]
+            group = ChapterGroup(work_id=work.id, name=f"Arc {start}")
+            db.add(group)
+            db.flush()
+            db.add_all(
+                ChapterGroupMember(group_id=group.id, chapter_id=chapter.id, order_index=i)
+                for i, chapter in enumerate(members)
+            )
+        db.commit()
+        return work.id
+
+
+def cleanup(work_id: int) -> None:
+    # Delete children explicitly; SQLite does not enforce ON DELETE CASCADE by default.
+    with SessionLocal() as db:
+        chapter_ids = select(Chapter.id).where(Chapter.work_id == work_id)
+        group_ids = select(ChapterGroup.id).where(ChapterGroup.work_id == work_id)
+        db.execute(delete(ChapterGroupMember).where(ChapterGroupMember.group_id.in_(group_ids)))
+        db.execute(delete(ChapterGroup).where(ChapterGroup.work_id == work_id))
+        db.execute(delete(ChapterTranslation).where(ChapterTranslation.chapter_id.in_(chapter_ids)))
+        db.execute(delete(Chapter).where(Chapter.work_id == work_id))
+        db.execute(delete(Work).where(Work.id == work_id))
+        db.commit()
+
+
+def legacy_page(db, work_id: int, limit: int, offset: int) -> list:
+    groups = (
+        db.execute(
+            select(ChapterGroup)
+            .where(ChapterGroup.work_id == work_id)
+            .options(joinedload(ChapterGroup.members).joinedload(ChapterGroupMember.chapter))
+        )
+        .scalars()
+        .unique()
+        .all()
+    )
+    items, grouped = [], set()
+    for group in groups:
+        if group.members:
+            items.append(("group", group, min(m.chapter.sort_key for m in group.members)))
+            grouped.update(m.chapter_id for m in group.members)
+    ungrouped = db.execute(
+        select(Chapter).where(Chapter.work_id == work_id, ~Chapter.id.in_(grouped))
+    ).scalars()
+    items.extend(("chapter", ch, ch.sort_key) for ch in ungrouped)
+    page = sorted(items, key=lambda item: item[2])[offset : offset + limit]
+    ids = [data.id for kind, data, _ in page if kind == "chapter"]
+    ids += [m.chapter_id for kind, data, _ in page if kind == "group" for m in data.members]
+    db.execute(
+        select(ChapterTranslation.chapter_id).where(
+            ChapterTranslation.chapter_id.in_(ids), ChapterTranslation.status == "completed"
+        )
+    ).all()
+    return page
+
+
+def time_ms(fn, repeat: int) -> float:
+    samples = []
+    for _ in range(repeat):
+        with SessionLocal() as db:
+            started = time.perf_counter()
+            fn(db)
+            samples.append((time.perf_counter() - started) * 1000)
+    return statistics.median(samples)
+
+
+def main() -> None:
+    parser = argparse.ArgumentParser(description=__doc__.splitlines()[0])
+    parser.add_argument("--chapters", type=int, default=5000)
+    parser.add_argument("--text-kb", type=int, default=8, help="chapter text size")
+    parser.add_argument("--group-every", type=int, default=100)
+    parser.add_argument("--group-size", type=int, default=10)
+    parser.add_argument("--limit", type=int, default=50, help="page size")
+    parser.add_argument("--repeat", type=int, default=5)
+    args = parser.parse_args()
+
+    if engine.dialect.name == "sqlite":
+        Base.metadata.create_all(bind=engine)
+    work_id = seed(args)
+    try:
+        with SessionLocal() as db:
+            service = ChapterGroupsService(db)
+            total = service.get_chapters_with_groups(work_id).total_items
+            # The key each sampled page starts after, found by walking the list once.
+            cursors: dict[int, Decimal | None] = {0: None}
+            after, position = None, 0
+            while True:
+                page = service.get_chapters_with_groups(work_id, limit=100, after=after)
+                position += len(page.items)
+                if page.next_cursor is None:
+                    break
+                after = cursors[position] = page.next_cursor
+
+        positions = sorted({0, 1000, total // 200 * 100, (total - args.limit) // 100 * 100})
+        print(
+            f"Database: {engine.dialect.name}; {args.chapters} chapters x {args.text_kb}KB, "
+            f"{total} list items, page size {args.limit}"
+        )
+        print(f"{'page starting at':>16} {'legacy':>10} {'offset':>10} {'cursor':>10}")
+        for position in positions:
+            after = cursors.get(position)
+            legacy = time_ms(
+                lambda db, p=position: legacy_page(db, work_id, args.limit, p), args.repeat
+            )
+            offset = time_ms(
+                lambda db, p=position: ChapterGroupsService(db).get_chapters_with_groups(
+                    work_id, limit=args.limit, offset=p
+                ),
+                args.repeat,
+            )
+            cursor = time_ms(
+                lambda db, a=after: ChapterGroupsService(db).get_chapters_with_groups(
+                    work_id, limit=args.limit, after=a
+                ),
+                args.repeat,
+            )
+            print(f"{position:>16} {legacy:>8.1f}ms {offset:>8.1f}ms {cursor:>8.1f}ms")
+    finally:
+        cleanup(work_id)
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,191 @@
+"""Measure what loading chapter bodies costs the list and navigation queries.
+
+Seeds one work with ``--chapters`` chapters of ``--text-kb`` each (all marked
+read), then runs each ChaptersService list/navigation query two ways:
+
+    eager     the same query with ``normalized_text`` undeferred, as every
+              ``select(Chapter)`` loaded it before the column was deferred
+    deferred  the service method as it is now (list columns only)
+
+and reports median latency plus peak Python allocations (tracemalloc) per call.
+
+Usage (from backend/):
+    python scripts/bench_chapter_text.py
+    DATABASE_URL=postgresql+psycopg2://... python scripts/bench_chapter_text.py --text-kb 40
+"""
+
+import argparse
+import os
+import statistics
+import sys
+import tempfile
+import time
+import tracemalloc
+from datetime import UTC, datetime, timedelta
+from decimal import Decimal
+
+# Add backend directory to path so we can import app modules
+sys.path.append(os.getcwd())
+os.environ.setdefault(
+    "DATABASE_URL", f"sqlite+pysqlite:///{tempfile.mkdtemp(prefix='tonari-bench-')}/bench.db"
+)
+
+from sqlalchemy import delete, select
+from sqlalchemy.orm import undefer
+
+from app.db import Base, SessionLocal, engine
+from app.models import Chapter, Work
+from services.chapters import ChaptersService
+
+BENCH_SOURCE = "bench-chapter-text"
+
+
+def seed(chapters: int, text_kb: int) -> int:
+    text = "あ" * (text_kb * 1024 // 3)
+    read_at = datetime.now(UTC)
+    with SessionLocal() as db:
+        work = Work(title="Chapter text bench", source=BENCH_SOURCE, source_id="bench")
+        db.add(work)
+        db.flush()
+        db.add_all(
+            Chapter(
+                work_id=work.id,
+                idx=n,
+                sort_key=Decimal(n),
+                title=f"Chapter {n}",
+                normalized_text=text,
+                text_hash=f"bench-{n}",
+                last_read_at=read_at - timedelta(minutes=n),
+            )
+            for n in range(1, chapters + 1)
+        )
+        db.commit()
+        return work.id
+
+
+def cleanup(work_id: int) -> None:
+    with SessionLocal() as db:
+        db.execute(delete(Chapter).where(Chapter.work_id == work_id))
+        db.execute(delete(Work).where(Work.id == work_id))
+        db.commit()
+
+
+def eager(stmt):
+    return stmt.options(undefer(Chapter.normalized_text))
+
+
+def cases(work_id: int, chapters: int) -> dict:
+    """``name -> (eager_fn, deferred_fn)``; each takes a session."""
+    middle = Decimal(chapters // 2)
+    keys = [Decimal(n).quantize(Decimal("0.0001")) for n in range(1, 101)]
+
+    def eager_page(db):
+        return (
+            db.execute(
+                eager(select(Chapter))
+                .where(Chapter.work_id == work_id)
+                .order_by(Chapter.sort_key)
+                .limit(100)
+                .offset(chapters // 2)
+            )
+            .scalars()
+            .all()
+        )
+
+    def eager_neighbours(db):
+        after = eager(select(Chapter)).where(Chapter.work_id == work_id, Chapter.sort_key > middle)
+        before = eager(select(Chapter)).where(Chapter.work_id == work_id, Chapter.sort_key < middle)
+        return (
+            db.execute(after.order_by(Chapter.sort_key.asc()).limit(1)).scalars().first(),
+            db.execute(before.order_by(Chapter.sort_key.desc()).limit(1)).scalars().first(),
+        )
+
+    def eager_recent(db):
+        rows = (
+            db.execute(
+                eager(select(Chapter))
+                .where(Chapter.last_read_at.is_not(None))
+                .order_by(Chapter.last_read_at.desc())
+                .limit(50)
+            )
+            .scalars()
+            .all()
+        )
+        return [(row.title, row.work.title) for row in rows]
+
+    def eager_existing(db):
+        return (
+            db.execute(
+                eager(select(Chapter)).where(Chapter.work_id == work_id, Chapter.sort_key.in_(keys))
+            )
+            .scalars()
+            .all()
+        )
+
+    return {
+        "list page (100)": (
+            eager_page,
+            lambda db: ChaptersService(db).get_chapters_for_work(
+                work_id, limit=100, offset=chapters // 2
+            ),
+        ),
+        "next + previous": (
+            eager_neighbours,
+            lambda db: (
+                ChaptersService(db).get_next_chapter(work_id, middle),
+                ChaptersService(db).get_previous_chapter(work_id, middle),
+            ),
+        ),
+        "recently read (50)": (eager_recent, lambda db: ChaptersService(db).get_recently_read(50)),
+        "scrape lookup (100)": (
+            eager_existing,
+            lambda db: ChaptersService(db)._load_existing_chapters(work_id, keys),
+        ),
+    }
+
+
+def measure(fn, repeat: int) -> tuple[float, float]:
+    """Median ms and peak KiB allocated for one call, each in a fresh session."""
+    samples = []
+    for _ in range(repeat):
+        with SessionLocal() as db:
+            started = time.perf_counter()
+            fn(db)
+            samples.append((time.perf_counter() - started) * 1000)
+    with SessionLocal() as db:
+        tracemalloc.start()
+        fn(db)
+        _, peak = tracemalloc.get_traced_memory()
+        tracemalloc.stop()
+    return statistics.median(samples), peak / 1024
+
+
+def main() -> None:
+    parser = argparse.ArgumentParser(description=__doc__.splitlines()[0])
+    parser.add_argument("--chapters", type=int, default=5000)
+    parser.add_argument("--text-kb", type=int, default=16, help="chapter text size")
+    parser.add_argument("--repeat", type=int, default=7)
+    args = parser.parse_args()
+
+    if engine.dialect.name == "sqlite":
+        Base.metadata.create_all(bind=engine)
+    work_id = seed(args.chapters, args.text_kb)
+    try:
+        print(
+            f"Database: {engine.dialect.name}; {args.chapters} chapters x {args.text_kb}KB, "
+            f"median of {args.repeat}"
+        )
+        print(f"{'query':>20} {'eager':>22} {'deferred':>22}")
+        for name, (eager_fn, deferred_fn) in cases(work_id, args.chapters).items():
+            eager_ms, eager_kib = measure(eager_fn, args.repeat)
+            deferred_ms, deferred_kib = measure(deferred_fn, args.repeat)
+            print(
+                f"{name:>20} {eager_ms:>8.2f}ms {eager_kib:>9.0f}KiB "
+                f"{deferred_ms:>8.2f}ms {deferred_kib:>9.0f}KiB"
+            )
+    finally:
+        cleanup(work_id)
+
+
+if __name__ == "__main__":
+    main()
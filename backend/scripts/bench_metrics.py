@@ -0,0 +1,71 @@
+"""Measure the per-event cost of recording metrics.
+
+Times counter increments, gauge updates and histogram observations (with and
+without labels) against RECORD_BUDGET_NS, the overhead allowed on hot paths
+such as per-token LLM streaming and per-statement DB hooks. Exits non-zero
+if any operation is over budget.
+
+Usage (from backend/):
+    python scripts/bench_metrics.py
+    python scripts/bench_metrics.py --events 1000000
+"""
+
+import argparse
+import os
+import sys
+import time
+
+# Add backend directory to path so we can import app modules
+sys.path.append(os.getcwd())
+
+from observability.metrics import RECORD_BUDGET_NS, MetricsRegistry
+
+
+def time_per_event(record, events: int) -> float:
+    started = time.perf_counter_ns()
+    for _ in range(events):
+        record()
+    return (time.perf_counter_ns() - started) / events
+
+
+def noop(**labels) -> None:
+    pass
+
+
+def main() -> int:
+    parser = argparse.ArgumentParser(description=__doc__.splitlines()[0])
+    parser.add_argument("--events", type=int, default=200_000)
+    args = parser.parse_args()
+
+    registry = MetricsRegistry()
+    counter = registry.counter("bench_total", "bench")
+    labelled = registry.counter("bench_labelled_total", "bench", ["provider", "outcome"])
+    gauge = registry.gauge("bench_in_flight", "bench", ["provider"])
+    histogram = registry.histogram("bench_seconds", "bench")
+    labelled_histogram = registry.histogram("bench_labelled_seconds", "bench", ["provider"])
+
+    cases = {
+        "counter.inc": lambda: counter.inc(),
+        "counter.inc (2 labels)": lambda: labelled.inc(provider="openai", outcome="ok"),
+        "gauge.inc (1 label)": lambda: gauge.inc(provider="openai"),
+        "histogram.observe": lambda: histogram.observe(0.042),
+        "histogram.observe (1 label)": lambda: labelled_histogram.observe(0.042, provider="openai"),
+    }
+    over_budget = False
+    # Loop and call overhead the instrumented code pays anyway.
+    baseline = time_per_event(lambda: noop(provider="openai"), args.events)
+    print(f"budget: {RECORD_BUDGET_NS} ns/event, {args.events} events per case")
+    print(f"  (call baseline {baseline:.0f} ns subtracted)")
+    for name, record in cases.items():
+        ns = max(0.0, time_per_event(record, args.events) - baseline)
+        flag = "" if ns <= RECORD_BUDGET_NS else "  OVER BUDGET"
+        over_budget = over_budget or bool(flag)
+        print(f"  {name:<30} {ns:8.0f} ns{flag}")
+    render_started = time.perf_counter()
+    registry.render()
+    print(f"render: {(time.perf_counter() - render_started) * 1000:.2f} ms")
+    return 1 if over_budget else 0
+
+
+if __name__ == "__main__":
+    sys.exit(main())
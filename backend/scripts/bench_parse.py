@@ -0,0 +1,139 @@
+"""Measure chapter parsing throughput per parser, inline, in threads, and in worker processes.
+
+The workload mixes the Kakuyomu episode fixture (tests/fixtures/kakuyomu) with
+synthetic Syosetu chapter pages (ruby-annotated paragraphs, page chrome around
+the body). ``inline`` parses every page on one thread, once with each chapter
+parser (``bs4``, ``lxml``); ``threads`` spreads them over a thread pool, where
+the GIL serialises the parsing; ``processes`` sends them through
+``ParseExecutor`` to warmed worker processes, the way scrape jobs do. The last
+two use ``--parser``. Throughput is reported in chapters per second and per
+core used.
+
+Usage (from backend/):
+    python scripts/bench_parse.py
+    python scripts/bench_parse.py --pages 2000 --workers 4 --paragraphs 300 --parser bs4
+"""
+
+import argparse
+import asyncio
+import multiprocessing
+import os
+import statistics
+import sys
+import time
+from concurrent.futures import ProcessPoolExecutor, ThreadPoolExecutor
+from pathlib import Path
+
+# Add backend directory to path so we can import app modules
+sys.path.append(os.getcwd())
+
+from app.kakuyomu.scraper import KakuyomuScraper
+from app.syosetu.scraper import SyosetuScraper
+from services.parse_executor import ParseExecutor, _warm_worker
+
+FIXTURE = Path("tests/fixtures/kakuyomu/episode.html")
+
+
+def syosetu_page(n: int, paragraphs: int) -> str:
+    """A Syosetu chapter page of ``paragraphs`` lines, every fifth one with ruby."""
+    lines = []
+    for i in range(paragraphs):
+        ruby = "<ruby>魔法<rp>(</rp><rt>まほう</rt><rp>)</rp></ruby>" if i % 5 == 0 else "魔法"
+        lines.append(f'<p id="L{i + 1}">第{n}話の{i + 1}行目、{ruby}の光が森を照らした。</p>')
+    nav = "".join(f'<li><a href="/n0000aa/{k}/">第{k}話</a></li>' for k in range(1, 40))
+    return (
+        '<!DOCTYPE html><html lang="ja"><head><meta charset="UTF-8">'
+        f"<title>第{n}話</title></head><body>"
+        f'<div id="novel_header"><ul>{nav}</ul></div>'
+        f'<div id="novel_contents"><p class="novel_subtitle" id="novel_subtitle">第{n}話</p>'
+        f'<div id="novel_honbun" class="novel_view">{"".join(lines)}</div></div>'
+        '<div id="novel_footer"><ul><li><a href="/">トップ</a></li></ul></div>'
+        "</body></html>"
+    )
+
+
+def workload(pages: int, paragraphs: int, parser: str) -> list[tuple[object, str]]:
+    """``(parse_chapter, html)`` pairs: every fourth page Kakuyomu, the rest Syosetu."""
+    episode = FIXTURE.read_text(encoding="utf-8")
+    parse_kakuyomu = KakuyomuScraper.chapter_parsers[parser]
+    parse_syosetu = SyosetuScraper.chapter_parsers[parser]
+    return [
+        (parse_kakuyomu, episode) if n % 4 == 0 else (parse_syosetu, syosetu_page(n, paragraphs))
+        for n in range(pages)
+    ]
+
+
+def run_inline(pages) -> None:
+    for parse, html in pages:
+        parse(html)
+
+
+def run_threads(pool: ThreadPoolExecutor, pages) -> None:
+    list(pool.map(lambda page: page[0](page[1]), pages))
+
+
+def run_processes(executor: ParseExecutor, pages) -> None:
+    async def parse_all():
+        await asyncio.gather(*(executor.parse(parse, html) for parse, html in pages))
+
+    asyncio.run(parse_all())
+
+
+def measure(fn, repeat: int) -> float:
+    timings = []
+    for _ in range(repeat):
+        started = time.perf_counter()
+        fn()
+        timings.append(time.perf_counter() - started)
+    return statistics.median(timings)
+
+
+def main() -> None:
+    parser = argparse.ArgumentParser(description=__doc__.splitlines()[0])
+    parser.add_argument("--pages", type=int, default=400)
+    parser.add_argument("--paragraphs", type=int, default=150, help="lines per Syosetu page")
+    parser.add_argument("--workers", type=int, default=os.cpu_count() or 1)
+    parser.add_argument("--batch-size", type=int, default=8)
+    parser.add_argument("--repeat", type=int, default=5)
+    parser.add_argument("--parser", choices=["bs4", "lxml"], default="lxml")
+    args = parser.parse_args()
+
+    by_parser = {name: workload(args.pages, args.paragraphs, name) for name in ("bs4", "lxml")}
+    pages = by_parser[args.parser]
+    size_kb = sum(len(html.encode("utf-8")) for _, html in pages) / len(pages) / 1024
+    print(f"{args.pages} pages, {size_kb:.0f} KB on average, {args.workers} workers")
+
+    threads = ThreadPoolExecutor(max_workers=args.workers)
+    processes = ProcessPoolExecutor(
+        max_workers=args.workers,
+        mp_context=multiprocessing.get_context("spawn"),
+        initializer=_warm_worker,
+    )
+    executor = ParseExecutor(processes, batch_size=args.batch_size)
+    # Workers are started and warmed before timing, as scrape jobs do on start.
+    run_processes(executor, pages[: args.workers * args.batch_size])
+    try:
+        modes = [
+            ("inline", "bs4", 1, lambda: run_inline(by_parser["bs4"])),
+            ("inline", "lxml", 1, lambda: run_inline(by_parser["lxml"])),
+            ("threads", args.parser, args.workers, lambda: run_threads(threads, pages)),
+            ("processes", args.parser, args.workers, lambda: run_processes(executor, pages)),
+        ]
+        print(
+            f"{'mode':>10} {'parser':>6} {'cores':>6} {'seconds':>9} "
+            f"{'chapters/s':>11} {'per core':>9}"
+        )
+        for name, parser_name, cores, fn in modes:
+            seconds = measure(fn, args.repeat)
+            rate = args.pages / seconds
+            print(
+                f"{name:>10} {parser_name:>6} {cores:>6} {seconds:>9.3f} "
+                f"{rate:>11.1f} {rate / cores:>9.1f}"
+            )
+    finally:
+        threads.shutdown()
+        processes.shutdown()
+
+
+if __name__ == "__main__":
+    main()
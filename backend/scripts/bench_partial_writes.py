@@ -0,0 +1,189 @@
+"""Measure event-loop lag while many translation streams persist partial text.
+
+Compares the old inline path (each stream commits its own partial text at most
+once per interval, on the event loop) with PartialSegmentWriter (streams only
+stage text; one batched UPDATE per interval goes through the async engine).
+
+Usage (from backend/):
+    DATABASE_URL=postgresql+psycopg://... python scripts/bench_partial_writes.py
+    python scripts/bench_partial_writes.py --streams 50 --tokens 200
+
+Without DATABASE_URL a throwaway SQLite file is used (the async engine needs
+to see the same data); run against Postgres to see the effect of moving
+commits off the loop.
+"""
+
+import argparse
+import asyncio
+import os
+import statistics
+import sys
+import tempfile
+import time
+from decimal import Decimal
+
+# Add backend directory to path so we can import app modules
+sys.path.append(os.getcwd())
+os.environ.setdefault(
+    "DATABASE_URL", f"sqlite+pysqlite:///{tempfile.mkdtemp(prefix='tonari-bench-')}/bench.db"
+)
+
+from sqlalchemy import delete, select
+
+from app.db import Base, SessionLocal, engine
+from app.models import Chapter, ChapterTranslation, TranslationSegment, Work
+from services.partial_segment_writer import PartialSegmentWriter
+from services.translation_stream import TranslationStreamService
+
+BENCH_SOURCE = "bench-partial-writes"
+
+
+def seed(streams: int) -> tuple[int, list[int]]:
+    with SessionLocal() as db:
+        work = Work(title="Partial write bench", source=BENCH_SOURCE, source_id="bench")
+        db.add(work)
+        db.flush()
+        chapter = Chapter(
+            work_id=work.id,
+            idx=1,
+            sort_key=Decimal(1),
+            title="Bench",
+            normalized_text="bench",
+            text_hash="bench",
+        )
+        db.add(chapter)
+        db.flush()
+        translation = ChapterTranslation(chapter_id=chapter.id, status="running")
+        db.add(translation)
+        db.flush()
+        segments = [
+            TranslationSegment(
+                chapter_translation_id=translation.id,
+                order_index=i,
+                start=0,
+                end=1,
+                tgt="",
+                flags=[],
+                src_hash=f"bench-{i}",
+            )
+            for i in range(streams)
+        ]
+        db.add_all(segments)
+        db.commit()
+        return work.id, [segment.id for segment in segments]
+
+
+def cleanup(work_id: int) -> None:
+    # Delete children explicitly; SQLite does not enforce ON DELETE CASCADE by default.
+    with SessionLocal() as db:
+        chapter_ids = select(Chapter.id).where(Chapter.work_id == work_id)
+        translation_ids = select(ChapterTranslation.id).where(
+            ChapterTranslation.chapter_id.in_(chapter_ids)
+        )
+        db.execute(
+            delete(TranslationSegment).where(
+                TranslationSegment.chapter_translation_id.in_(translation_ids)
+            )
+        )
+        db.execute(delete(ChapterTranslation).where(ChapterTranslation.id.in_(translation_ids)))
+        db.execute(delete(Chapter).where(Chapter.work_id == work_id))
+        db.execute(delete(Work).where(Work.id == work_id))
+        db.commit()
+
+
+async def measure_lag(stop: asyncio.Event, tick_s: float, samples: list[float]) -> None:
+    while not stop.is_set():
+        started = time.perf_counter()
+        await asyncio.sleep(tick_s)
+        samples.append(time.perf_counter() - started - tick_s)
+
+
+async def inline_stream(segment_id: int, tokens: int, token_s: float, interval_s: float) -> None:
+    with SessionLocal() as db:
+        service = TranslationStreamService(db)
+        segment = db.get(TranslationSegment, segment_id)
+        collected = ""
+        last_persist_at = 0.0
+        for i in range(tokens):
+            await asyncio.sleep(token_s)
+            collected += f"t{i} "
+            now = time.monotonic()
+            if now - last_persist_at >= interval_s:
+                service.persist_partial_segment_translation(segment, collected)
+                last_persist_at = now
+        service.persist_completed_segment_translation(segment, collected)
+
+
+async def buffered_stream(
+    writer: PartialSegmentWriter, segment_id: int, tokens: int, token_s: float
+) -> None:
+    with SessionLocal() as db:
+        service = TranslationStreamService(db)
+        segment = db.get(TranslationSegment, segment_id)
+        flags = service._with_partial_flag(segment.flags, partial=True)
+        collected = ""
+        for i in range(tokens):
+            await asyncio.sleep(token_s)
+            collected += f"t{i} "
+            writer.stage(segment_id, collected, flags)
+        await writer.settle(segment_id)
+        service.persist_completed_segment_translation(segment, collected)
+
+
+async def run(mode: str, segment_ids: list[int], args: argparse.Namespace) -> dict:
+    samples: list[float] = []
+    stop = asyncio.Event()
+    ticker = asyncio.create_task(measure_lag(stop, args.tick_ms / 1000, samples))
+    token_s = args.token_ms / 1000
+    writer = PartialSegmentWriter(interval_s=args.interval)
+
+    started = time.perf_counter()
+    if mode == "inline":
+        streams = [inline_stream(sid, args.tokens, token_s, args.interval) for sid in segment_ids]
+    else:
+        streams = [buffered_stream(writer, sid, args.tokens, token_s) for sid in segment_ids]
+    await asyncio.gather(*streams)
+    elapsed = time.perf_counter() - started
+
+    stop.set()
+    await ticker
+    lags_ms = sorted(sample * 1000 for sample in samples)
+    return {
+        "mode": mode,
+        "elapsed_s": elapsed,
+        "lag_p50_ms": statistics.median(lags_ms),
+        "lag_p99_ms": lags_ms[min(len(lags_ms) - 1, int(len(lags_ms) * 0.99))],
+        "lag_max_ms": lags_ms[-1],
+        "flushes": writer.flush_count if mode == "buffered" else None,
+    }
+
+
+def main() -> None:
+    parser = argparse.ArgumentParser(description=__doc__.splitlines()[0])
+    parser.add_argument("--streams", type=int, default=50)
+    parser.add_argument("--tokens", type=int, default=200)
+    parser.add_argument("--token-ms", type=float, default=20.0)
+    parser.add_argument("--interval", type=float, default=1.0, help="partial write interval (s)")
+    parser.add_argument("--tick-ms", type=float, default=5.0, help="lag probe interval (ms)")
+    args = parser.parse_args()
+
+    if engine.dialect.name == "sqlite":
+        Base.metadata.create_all(bind=engine)
+
+    print(f"Database: {engine.dialect.name}; {args.streams} streams x {args.tokens} tokens")
+    for mode in ("inline", "buffered"):
+        work_id, segment_ids = seed(args.streams)
+        try:
+            result = asyncio.run(run(mode, segment_ids, args))
+        finally:
+            cleanup(work_id)
+        flushes = "" if result["flushes"] is None else f"  flushes {result['flushes']}"
+        print(
+            f"{mode:>8}: elapsed {result['elapsed_s']:.2f}s  "
+            f"lag p50 {result['lag_p50_ms']:.2f}ms  p99 {result['lag_p99_ms']:.2f}ms  "
+            f"max {result['lag_max_ms']:.2f}ms{flushes}"
+        )
+
+
+if __name__ == "__main__":
+    main()
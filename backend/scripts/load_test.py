@@ -0,0 +1,412 @@
+"""Load-test the streaming endpoints against the fake LLM provider.
+
+Serves the app in-process with uvicorn, seeds a work, then drives concurrent
+chapter translation streams, segment retranslation streams and sentence
+explanation streams over HTTP, one phase after the other. For each phase it
+reports throughput, time to first content event and to completion
+(p50/p95/p99), the app's event loop lag sampled on the server loop, and the
+peak number of pooled DB connections checked out on each engine.
+
+All LLM calls go to the ``fake`` model (agents/fake_llm.py), so results are
+repeatable offline; the ``--ttft-ms``/``--tokens-per-s``/``--error-rate``/
+``--rate-limit-rate`` flags shape its behaviour.
+
+Usage (from backend/):
+    python scripts/load_test.py --concurrency 20
+    python scripts/load_test.py --concurrency 50 --requests 200 --ttft-ms 800
+    DATABASE_URL=postgresql+psycopg://... python scripts/load_test.py --concurrency 100
+
+Without DATABASE_URL a throwaway SQLite file is used; it locks the whole file
+per write, so run against Postgres for capacity numbers.
+"""
+
+import argparse
+import asyncio
+import itertools
+import json
+import logging
+import os
+import socket
+import sys
+import tempfile
+import threading
+import time
+from dataclasses import dataclass, field
+from decimal import Decimal
+
+# Add backend directory to path so we can import app modules
+sys.path.append(os.getcwd())
+# A file, not :memory:, so the async engine sees the same database.
+os.environ.setdefault(
+    "DATABASE_URL", f"sqlite+pysqlite:///{tempfile.mkdtemp(prefix='tonari-load-')}/load.db"
+)
+
+LOAD_TEST_SOURCE = "load-test"
+PARAGRAPH = "雨の夜、{n}番目の町で彼女は窓辺に座っていた。遠くで列車の音が聞こえた。"
+
+
+def parse_args() -> argparse.Namespace:
+    parser = argparse.ArgumentParser(description=__doc__.splitlines()[0])
+    parser.add_argument("--concurrency", type=int, default=20, help="streams open at once")
+    parser.add_argument("--requests", type=int, default=None, help="per phase (default: N)")
+    parser.add_argument("--segments", type=int, default=6, help="segments per chapter")
+    parser.add_argument(
+        "--phases",
+        default="translate,retranslate,explain",
+        help="comma-separated subset of translate, retranslate, explain",
+    )
+    parser.add_argument("--ttft-ms", type=float, default=400.0)
+    parser.add_argument("--ttft-sigma", type=float, default=0.5)
+    parser.add_argument("--tokens-per-s", type=float, default=60.0)
+    parser.add_argument("--tokens-per-s-stddev", type=float, default=15.0)
+    parser.add_argument("--error-rate", type=float, default=0.0)
+    parser.add_argument("--rate-limit-rate", type=float, default=0.0)
+    parser.add_argument("--seed", type=int, default=0)
+    parser.add_argument("--tick-ms", type=float, default=10.0, help="lag probe interval (ms)")
+    return parser.parse_args()
+
+
+def configure_fake_provider(args: argparse.Namespace) -> None:
+    # Settings are read at import time, so this must run before any app import.
+    os.environ["ENABLE_FAKE_LLM"] = "true"
+    os.environ["TRANSLATION_MODEL"] = "fake"
+    os.environ["FAKE_LLM_TTFT_MS"] = str(args.ttft_ms)
+    os.environ["FAKE_LLM_TTFT_SIGMA"] = str(args.ttft_sigma)
+    os.environ["FAKE_LLM_TOKENS_PER_S"] = str(args.tokens_per_s)
+    os.environ["FAKE_LLM_TOKENS_PER_S_STDDEV"] = str(args.tokens_per_s_stddev)
+    os.environ["FAKE_LLM_ERROR_RATE"] = str(args.error_rate)
+    os.environ["FAKE_LLM_RATE_LIMIT_RATE"] = str(args.rate_limit_rate)
+    os.environ["FAKE_LLM_SEED"] = str(args.seed)
+
+
+@dataclass
+class StreamResult:
+    ok: bool
+    events: int
+    first_event_s: float | None
+    total_s: float
+    error: str | None = None
+
+
+@dataclass
+class PhaseResult:
+    name: str
+    elapsed_s: float
+    results: list[StreamResult]
+    lag_ms: list[float] = field(default_factory=list)
+    pool_peak: dict[str, int] = field(default_factory=dict)
+
+
+class ServerThread:
+    """Runs the app under uvicorn on its own thread and event loop."""
+
+    def __init__(self, app) -> None:
+        import uvicorn
+
+        with socket.socket() as sock:
+            sock.bind(("127.0.0.1", 0))
+            self.port = sock.getsockname()[1]
+        config = uvicorn.Config(app, host="127.0.0.1", port=self.port, log_level="warning")
+        self.server = uvicorn.Server(config)
+        self.loop: asyncio.AbstractEventLoop | None = None
+        self.thread = threading.Thread(target=self._run, daemon=True)
+
+    def _run(self) -> None:
+        async def serve() -> None:
+            self.loop = asyncio.get_running_loop()
+            await self.server.serve()
+
+        asyncio.run(serve())
+
+    def start(self) -> None:
+        self.thread.start()
+        while not self.server.started:
+            time.sleep(0.01)
+
+    def stop(self) -> None:
+        self.server.should_exit = True
+        self.thread.join()
+
+
+def seed(chapters: int, segments: int) -> tuple[int, list[int]]:
+    from app.db import SessionLocal
+    from app.models import Chapter, Work
+
+    with SessionLocal() as db:
+        work = Work(title="Load test", source=LOAD_TEST_SOURCE, source_id=str(time.time_ns()))
+        db.add(work)
+        db.flush()
+        rows = []
+        for idx in range(1, chapters + 1):
+            # Distinct text per segment, so translation memory never short-circuits a call.
+            text = "\n\n".join(PARAGRAPH.format(n=idx * segments + i) for i in range(segments))
+            rows.append(
+                Chapter(
+                    work_id=work.id,
+                    idx=idx,
+                    sort_key=Decimal(idx),
+                    title=f"Load test {idx}",
+                    normalized_text=text,
+                    text_hash=f"load-test-{work.source_id}-{idx}",
+                )
+            )
+        db.add_all(rows)
+        db.commit()
+        return work.id, [row.id for row in rows]
+
+
+def cleanup(work_id: int) -> None:
+    from sqlalchemy import delete
+
+    from app.db import SessionLocal, engine
+    from app.models import Work
+
+    if engine.dialect.name == "sqlite":
+        return  # A throwaway file.
+    with SessionLocal() as db:
+        db.execute(delete(Work).where(Work.id == work_id))  # Children cascade.
+        db.commit()
+
+
+async def consume_sse(
+    client, url: str, *, content_events: set[str], done_events: set[str]
+) -> StreamResult:
+    """Read one SSE response to its end, timing the first content event."""
+    started = time.perf_counter()
+    first: float | None = None
+    events = 0
+    error: str | None = None
+    completed = False
+    event_name = ""
+    try:
+        async with client.stream("GET", url) as response:
+            if response.status_code != 200:
+                body = (await response.aread()).decode(errors="replace")
+                return StreamResult(
+                    False, 0, None, time.perf_counter() - started, f"{response.status_code} {body}"
+                )
+            async for line in response.aiter_lines():
+                if line.startswith("event:"):
+                    event_name = line[6:].strip()
+                elif line.startswith("data:"):
+                    events += 1
+                    if first is None and event_name in content_events:
+                        first = time.perf_counter() - started
+                    if event_name.endswith("-error"):
+                        error = line[5:].strip()
+                    if event_name in done_events:
+                        completed = True
+    except Exception as exc:  # noqa: BLE001 - report, don't abort the phase
+        error = repr(exc)
+    return StreamResult(
+        completed and error is None, events, first, time.perf_counter() - started, error
+    )
+
+
+async def run_phase(
+    name: str,
+    jobs: list,
+    concurrency: int,
+    server: ServerThread,
+    tick_s: float,
+) -> PhaseResult:
+    from observability.metrics import DB_POOL_CHECKED_OUT
+
+    lag_ms: list[float] = []
+    pool_peak = {"sync": 0, "async": 0}
+    stop = threading.Event()
+
+    async def probe() -> None:
+        while not stop.is_set():
+            started = time.perf_counter()
+            await asyncio.sleep(tick_s)
+            lag_ms.append(max(0.0, time.perf_counter() - started - tick_s) * 1000)
+            for engine_name in pool_peak:
+                checked_out = int(DB_POOL_CHECKED_OUT.value(engine=engine_name))
+                pool_peak[engine_name] = max(pool_peak[engine_name], checked_out)
+
+    # Lag is measured on the server's loop, where request handling runs.
+    assert server.loop is not None
+    probe_future = asyncio.run_coroutine_threadsafe(probe(), server.loop)
+
+    gate = asyncio.Semaphore(concurrency)
+
+    async def limited(job) -> StreamResult:
+        async with gate:
+            return await job()
+
+    started = time.perf_counter()
+    results = await asyncio.gather(*(limited(job) for job in jobs))
+    elapsed = time.perf_counter() - started
+    stop.set()
+    await asyncio.wrap_future(probe_future)
+    return PhaseResult(name, elapsed, list(results), lag_ms, pool_peak)
+
+
+async def drive(args: argparse.Namespace, server: ServerThread, work_id: int, chapter_ids):
+    import httpx
+
+    requests = args.requests or args.concurrency
+    phases = [p.strip() for p in args.phases.split(",") if p.strip()]
+    limits = httpx.Limits(max_connections=args.concurrency * 2, max_keepalive_connections=None)
+    base_url = f"http://127.0.0.1:{server.port}"
+    tick_s = args.tick_ms / 1000
+    results: list[PhaseResult] = []
+
+    async with httpx.AsyncClient(base_url=base_url, timeout=None, limits=limits) as client:
+
+        def translate_job(chapter_id: int):
+            url = f"/works/{work_id}/chapters/{chapter_id}/translate/stream"
+            return lambda: consume_sse(
+                client,
+                url,
+                content_events={"segment-delta"},
+                done_events={"translation-complete"},
+            )
+
+        if "translate" in phases:
+            jobs = [translate_job(chapter_id) for chapter_id in chapter_ids]
+            results.append(await run_phase("translate", jobs, args.concurrency, server, tick_s))
+
+        if "translate" not in phases:
+            # Later phases need translated segments.
+            await asyncio.gather(*(translate_job(chapter_id)() for chapter_id in chapter_ids))
+
+        # Text segments (not the blank separators), interleaved across chapters so
+        # concurrent retranslations rarely share a chapter.
+        per_chapter: list[list[tuple[int, dict]]] = []
+        for chapter_id in chapter_ids:
+            state = (await client.get(f"/works/{work_id}/chapters/{chapter_id}/translation")).json()
+            per_chapter.append(
+                [(chapter_id, seg) for seg in state.get("segments", []) if seg["sentences"]]
+            )
+        targets = [pair for row in itertools.zip_longest(*per_chapter) for pair in row if pair]
+
+        if "retranslate" in phases:
+            jobs = []
+            for chapter_id, segment in targets[:requests]:
+                # An instruction bypasses translation memory, so every request calls the model.
+                url = (
+                    f"/works/{work_id}/chapters/{chapter_id}/segments/{segment['id']}"
+                    "/retranslate/stream?instruction=make+it+more+natural"
+                )
+                jobs.append(
+                    lambda url=url: consume_sse(
+                        client,
+                        url,
+                        content_events={"segment-delta"},
+                        done_events={"translation-complete"},
+                    )
+                )
+            results.append(await run_phase("retranslate", jobs, args.concurrency, server, tick_s))
+
+        if "explain" in phases:
+
+            def explain_job(chapter_id: int, segment: dict):
+                sentence = segment["sentences"][0]
+                base = f"/works/{work_id}/chapters/{chapter_id}/segments/{segment['id']}"
+                span = {"span_start": sentence["span_start"], "span_end": sentence["span_end"]}
+
+                async def job() -> StreamResult:
+                    started = time.perf_counter()
+                    response = await client.post(f"{base}/sentences/explanation", json=span)
+                    if response.status_code != 200:
+                        return StreamResult(
+                            False, 0, None, time.perf_counter() - started, response.text
+                        )
+                    result = await consume_sse(
+                        client,
+                        f"{base}/sentences/explanation/stream"
+                        f"?span_start={span['span_start']}&span_end={span['span_end']}",
+                        content_events={"explanation-facet-complete"},
+                        done_events={"explanation-complete"},
+                    )
+                    # Include the POST in the measured latency.
+                    offset = (time.perf_counter() - started) - result.total_s
+                    if result.first_event_s is not None:
+                        result.first_event_s += offset
+                    result.total_s += offset
+                    return result
+
+                return job
+
+            jobs = [explain_job(chapter_id, segment) for chapter_id, segment in targets[:requests]]
+            results.append(await run_phase("explain", jobs, args.concurrency, server, tick_s))
+
+    return results
+
+
+def percentiles_ms(values_s: list[float]) -> str:
+    from services.usage import percentile
+
+    ordered = sorted(value * 1000 for value in values_s)
+    if not ordered:
+        return "n/a"
+    return "  ".join(f"p{p} {percentile(ordered, p):8.1f}ms" for p in (50, 95, 99))
+
+
+def report(phase: PhaseResult) -> None:
+    ok = [r for r in phase.results if r.ok]
+    events = sum(r.events for r in phase.results)
+    print(
+        f"{phase.name:>11}: {len(phase.results)} streams, {len(ok)} ok, "
+        f"{len(phase.results) - len(ok)} failed in {phase.elapsed_s:.2f}s  "
+        f"({len(ok) / phase.elapsed_s:.2f} streams/s, {events / phase.elapsed_s:.1f} events/s)"
+    )
+    firsts = [r.first_event_s for r in ok if r.first_event_s is not None]
+    print(f"{'first event':>24}  {percentiles_ms(firsts)}")
+    print(f"{'complete':>24}  {percentiles_ms([r.total_s for r in ok])}")
+    lags = sorted(phase.lag_ms)
+    if lags:
+        print(
+            f"{'event loop lag':>24}  {percentiles_ms([lag / 1000 for lag in lags])}  "
+            f"max {lags[-1]:.1f}ms"
+        )
+    print(
+        f"{'db connections':>24}  peak checked out: sync {phase.pool_peak.get('sync', 0)}, "
+        f"async {phase.pool_peak.get('async', 0)}"
+    )
+    errors = {r.error for r in phase.results if r.error}
+    for error in sorted(errors)[:3]:
+        print(f"{'error':>24}  {error[:160]}")
+
+
+def main() -> None:
+    args = parse_args()
+    configure_fake_provider(args)
+
+    from app.db import Base, engine
+    from app.main import app
+    from observability.metrics import LLM_REQUESTS_TOTAL
+
+    if engine.dialect.name == "sqlite":
+        Base.metadata.create_all(bind=engine)
+
+    # One chapter per translate stream; later phases pick segments across them.
+    requests = args.requests or args.concurrency
+    work_id, chapter_ids = seed(requests, args.segments)
+    server = ServerThread(app)
+    server.start()
+    # The app configures INFO logging on startup; per-request lines would swamp the report.
+    logging.getLogger().setLevel(logging.WARNING)
+    print(
+        f"Database: {engine.dialect.name}; concurrency {args.concurrency}, "
+        f"{requests} requests per phase, fake TTFT {args.ttft_ms:.0f}ms, "
+        f"{args.tokens_per_s:.0f} tok/s, errors {args.error_rate:.0%}, "
+        f"429s {args.rate_limit_rate:.0%}"
+    )
+    try:
+        for phase in asyncio.run(drive(args, server, work_id, chapter_ids)):
+            report(phase)
+    finally:
+        server.stop()
+        cleanup(work_id)
+    outcomes = {
+        outcome: int(LLM_REQUESTS_TOTAL.value(provider="fake", outcome=outcome))
+        for outcome in ("ok", "error", "cancelled")
+    }
+    print(f"LLM stream calls: {json.dumps(outcomes)}")
+
+
+if __name__ == "__main__":
+    main()
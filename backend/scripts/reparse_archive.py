@@ -0,0 +1,63 @@
+"""Re-parse archived chapter pages with the current parsers; nothing is downloaded.
+
+Run after a parser fix. Chapters whose parsed text changed are updated and
+their segments realigned; the rest are left alone.
+
+Usage (from backend/):
+    python scripts/reparse_archive.py             # every work with archived pages
+    python scripts/reparse_archive.py --work 3 --work 7
+    python scripts/reparse_archive.py --parser lxml
+"""
+
+import argparse
+import asyncio
+import os
+import sys
+
+# Add backend directory to path so we can import app modules
+sys.path.append(os.getcwd())
+
+from app.config import settings
+from app.db import SessionLocal
+from app.kakuyomu import scraper as _kakuyomu_scraper  # noqa: F401  (registers scraper)
+from app.scrapers import scraper_registry
+from app.syosetu import scraper as _syosetu_scraper  # noqa: F401  (registers scraper)
+from services.parse_executor import shutdown_parse_executor
+from services.reparse import ReparseService, reparse_archived_works
+
+
+async def run(work_ids: list[int]) -> None:
+    try:
+        with SessionLocal() as db:
+            if work_ids:
+                service = ReparseService(db)
+                summaries = [await service.reparse_work(work_id) for work_id in work_ids]
+            else:
+                summaries = await reparse_archived_works(db)
+    finally:
+        shutdown_parse_executor()
+    for summary in summaries:
+        print(
+            f"Work {summary.work_id}: {summary.changed} changed, {summary.unchanged} unchanged, "
+            f"{summary.missing} not archived, {len(summary.errors)} failed"
+        )
+        for error in summary.errors:
+            print(f"  chapter {error['chapter']:g}: {error['reason']}")
+
+
+def main() -> None:
+    parser = argparse.ArgumentParser(description=__doc__.splitlines()[0])
+    parser.add_argument("--work", type=int, action="append", default=[], help="work id")
+    parser.add_argument(
+        "--parser", choices=["bs4", "lxml"], help="chapter parser (default: CHAPTER_PARSER)"
+    )
+    args = parser.parse_args()
+    if not settings.html_archive_dir:
+        sys.exit("HTML_ARCHIVE_DIR is empty; there is no archive to re-parse")
+    if args.parser:
+        scraper_registry.use_chapter_parser(args.parser)
+    asyncio.run(run(args.work))
+
+
+if __name__ == "__main__":
+    main()
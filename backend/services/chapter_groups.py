@@ -1,12 +1,14 @@
 from __future__ import annotations
 
+from dataclasses import dataclass
 from decimal import Decimal
 
-from sqlalchemy import select
-from sqlalchemy.orm import Session, joinedload
+from sqlalchemy import and_, distinct, exists, func, literal_column, select, union_all
+from sqlalchemy.orm import Session, joinedload, load_only
 
-from app.models import Chapter, ChapterGroup, ChapterGroupMember
+from app.models import Chapter, ChapterGroup, ChapterGroupMember, ChapterTranslation
 
+from .chapters import CHAPTER_LIST_COLUMNS
 from .exceptions import (
     ChapterGroupConflictError,
     ChapterGroupNotFoundError,
@@ -15,6 +17,27 @@ from .exceptions import (
 from .utils import sanitize_pagination
 
 
+@dataclass(slots=True)
+class ChapterListItem:
+    item_type: str  # "chapter" or "group"
+    data: Chapter | ChapterGroup
+    sort_key: Decimal  # a group's is its members' lowest
+    member_count: int = 0
+    is_fully_translated: bool = False
+
+
+@dataclass(slots=True)
+class ChapterListPage:
+    items: list[ChapterListItem]
+    total_chapters: int
+    total_groups: int
+    total_items: int
+    limit: int
+    offset: int
+    # sort_key of the last item when more follow; pass back as ``after``.
+    next_cursor: Decimal | None = None
+
+
 class ChapterGroupsService:
     """Service for managing chapter groups."""
 
@@ -86,59 +109,166 @@ class ChapterGroupsService:
         return list(self.session.execute(stmt).scalars().unique().all())
 
     def get_chapters_with_groups(
-        self, work_id: int, limit: int = 10, offset: int = 0
-    ) -> tuple[list[tuple[str, ChapterGroup | Chapter, Decimal]], int, int, int, int, int]:
+        self,
+        work_id: int,
+        limit: int = 10,
+        offset: int = 0,
+        after: Decimal | None = None,
+    ) -> ChapterListPage:
         """Get mixed list of groups and ungrouped chapters, sorted by sort_key.
 
-        Returns:
-            (items, total_chapters, total_groups, total_items, limit, offset)
-            where items is list of tuples: (item_type, data, sort_key)
+        Groups sort by their members' lowest sort_key. Pages are cut in SQL:
+        pass the previous page's ``next_cursor`` as ``after`` to continue from
+        there (keyset), or use ``offset``. Chapters are loaded without their
+        text.
         """
         limit, offset = sanitize_pagination(limit, offset, max_limit=100)
-
-        # 1. Fetch all groups for work with members
-        groups_stmt = (
-            select(ChapterGroup)
-            .where(ChapterGroup.work_id == work_id)
-            .options(joinedload(ChapterGroup.members).joinedload(ChapterGroupMember.chapter))
+        if after is not None:
+            offset = 0
+
+        # Chapters belong to at most one group and sort_key is unique per work,
+        # so group heads and ungrouped chapters never share a key: it alone is
+        # a total order for the list, and the keyset cursor.
+        head_sort_key = func.min(Chapter.sort_key)
+        group_heads = (
+            select(
+                literal_column("'group'").label("item_type"),
+                ChapterGroupMember.group_id.label("id"),
+                head_sort_key.label("sort_key"),
+            )
+            .join(Chapter, Chapter.id == ChapterGroupMember.chapter_id)
+            .where(Chapter.work_id == work_id)
+            .group_by(ChapterGroupMember.group_id)
         )
-        groups = list(self.session.execute(groups_stmt).scalars().unique().all())
-
-        # 2. Calculate min_sort_key for each group and create items list
-        group_items = []
-        grouped_chapter_ids = set()
-        for group in groups:
-            if group.members:
-                min_sort_key = min(member.chapter.sort_key for member in group.members)
-                group_items.append(("group", group, min_sort_key))
-                grouped_chapter_ids.update(member.chapter_id for member in group.members)
-
-        # 3. Fetch all ungrouped chapters
-        ungrouped_stmt = (
-            select(Chapter)
-            .where(
-                Chapter.work_id == work_id,
-                ~Chapter.id.in_(grouped_chapter_ids) if grouped_chapter_ids else True,
+        ungrouped = select(
+            literal_column("'chapter'").label("item_type"),
+            Chapter.id.label("id"),
+            Chapter.sort_key.label("sort_key"),
+        ).where(
+            Chapter.work_id == work_id,
+            ~exists().where(ChapterGroupMember.chapter_id == Chapter.id),
+        )
+        if after is not None:
+            group_heads = group_heads.having(head_sort_key > after)
+            ungrouped = ungrouped.where(Chapter.sort_key > after)
+
+        # Cut each side before merging so neither is read past the page; one
+        # extra row tells whether another page follows.
+        window = offset + limit + 1
+        sides = [
+            select(side.c.item_type, side.c.id, side.c.sort_key)
+            for side in (
+                group_heads.order_by(head_sort_key).limit(window).subquery(),
+                ungrouped.order_by(Chapter.sort_key).limit(window).subquery(),
             )
-            .order_by(Chapter.sort_key.asc(), Chapter.idx.asc(), Chapter.id.asc())
+        ]
+        merged = union_all(*sides).subquery()
+        page_stmt = (
+            select(merged.c.item_type, merged.c.id, merged.c.sort_key)
+            .order_by(merged.c.sort_key)
+            .limit(limit + 1)
+            .offset(offset)
+        )
+        rows = self.session.execute(page_stmt).all()
+        has_more = len(rows) > limit
+        rows = rows[:limit]
+
+        items = self._load_list_items(rows)
+        total_chapters, total_groups, total_items = self._count_list_items(work_id)
+        next_cursor = items[-1].sort_key if has_more else None
+        return ChapterListPage(
+            items=items,
+            total_chapters=total_chapters,
+            total_groups=total_groups,
+            total_items=total_items,
+            limit=limit,
+            offset=offset,
+            next_cursor=next_cursor,
         )
-        ungrouped_chapters = list(self.session.execute(ungrouped_stmt).scalars().all())
-
-        # Create chapter items
-        chapter_items = [("chapter", ch, ch.sort_key) for ch in ungrouped_chapters]
-
-        # 4. Merge and sort by sort_key
-        all_items = sorted(group_items + chapter_items, key=lambda x: x[2])
-
-        # 5. Count totals
-        total_chapters = len(ungrouped_chapters) + sum(len(g.members) for _, g, _ in group_items)
-        total_groups = len(group_items)
-        total_items = len(all_items)  # Total number of items in the mixed list
-
-        # 6. Apply pagination
-        paginated_items = all_items[offset : offset + limit]
 
-        return paginated_items, total_chapters, total_groups, total_items, limit, offset
+    def _load_list_items(self, rows) -> list[ChapterListItem]:
+        """Load a page's chapters (list columns only) and groups, with translation status."""
+        chapter_ids = [row.id for row in rows if row.item_type == "chapter"]
+        group_ids = [row.id for row in rows if row.item_type == "group"]
+
+        chapters: dict[int, Chapter] = {}
+        completed_chapter_ids: set[int] = set()
+        if chapter_ids:
+            chapters_stmt = (
+                select(Chapter)
+                .options(load_only(*CHAPTER_LIST_COLUMNS))
+                .where(Chapter.id.in_(chapter_ids))
+            )
+            chapters = {ch.id: ch for ch in self.session.execute(chapters_stmt).scalars()}
+            completed_stmt = select(ChapterTranslation.chapter_id).where(
+                ChapterTranslation.chapter_id.in_(chapter_ids),
+                ChapterTranslation.status == "completed",
+            )
+            completed_chapter_ids = set(self.session.execute(completed_stmt).scalars())
+
+        groups: dict[int, ChapterGroup] = {}
+        group_counts: dict[int, tuple[int, int]] = {}
+        if group_ids:
+            groups_stmt = select(ChapterGroup).where(ChapterGroup.id.in_(group_ids))
+            groups = {g.id: g for g in self.session.execute(groups_stmt).scalars()}
+            # Members, and members with a completed translation, per group.
+            counts_stmt = (
+                select(
+                    ChapterGroupMember.group_id,
+                    func.count(distinct(ChapterGroupMember.chapter_id)),
+                    func.count(distinct(ChapterTranslation.chapter_id)),
+                )
+                .outerjoin(
+                    ChapterTranslation,
+                    and_(
+                        ChapterTranslation.chapter_id == ChapterGroupMember.chapter_id,
+                        ChapterTranslation.status == "completed",
+                    ),
+                )
+                .where(ChapterGroupMember.group_id.in_(group_ids))
+                .group_by(ChapterGroupMember.group_id)
+            )
+            group_counts = {
+                group_id: (members, completed)
+                for group_id, members, completed in self.session.execute(counts_stmt)
+            }
+
+        items = []
+        for row in rows:
+            if row.item_type == "group":
+                member_count, completed = group_counts.get(row.id, (0, 0))
+                items.append(
+                    ChapterListItem(
+                        item_type="group",
+                        data=groups[row.id],
+                        sort_key=row.sort_key,
+                        member_count=member_count,
+                        is_fully_translated=member_count > 0 and completed == member_count,
+                    )
+                )
+            else:
+                items.append(
+                    ChapterListItem(
+                        item_type="chapter",
+                        data=chapters[row.id],
+                        sort_key=row.sort_key,
+                        is_fully_translated=row.id in completed_chapter_ids,
+                    )
+                )
+        return items
+
+    def _count_list_items(self, work_id: int) -> tuple[int, int, int]:
+        """``(total_chapters, total_groups, total_items)`` for a work's mixed list."""
+        total_chapters = self.session.execute(
+            select(func.count()).select_from(Chapter).where(Chapter.work_id == work_id)
+        ).scalar_one()
+        grouped_chapters, total_groups = self.session.execute(
+            select(func.count(), func.count(distinct(ChapterGroupMember.group_id)))
+            .select_from(ChapterGroupMember)
+            .join(Chapter, Chapter.id == ChapterGroupMember.chapter_id)
+            .where(Chapter.work_id == work_id)
+        ).one()
+        return total_chapters, total_groups, total_groups + total_chapters - grouped_chapters
 
     def update_group_name(self, group_id: int, name: str) -> ChapterGroup:
         """Update group name."""
@@ -6,7 +6,8 @@ from datetime import UTC, datetime
 from decimal import ROUND_CEILING, ROUND_FLOOR, Decimal
 
 from sqlalchemy import func, select
-from sqlalchemy.orm import Session
+from sqlalchemy.engine import Row
+from sqlalchemy.orm import Session, load_only, undefer
 
 from app.models import Chapter, Work
 from app.scrapers import scraper_registry
@@ -17,6 +18,16 @@ from .utils import sanitize_pagination
 
 SORT_KEY_STEP = Decimal("0.0001")
 
+# What chapter lists and navigation read; the body is never among them.
+CHAPTER_LIST_COLUMNS = (
+    Chapter.id,
+    Chapter.work_id,
+    Chapter.idx,
+    Chapter.sort_key,
+    Chapter.source_chapter_id,
+    Chapter.title,
+)
+
 
 @dataclass(slots=True)
 class ChapterScrapeErrorEntry:
@@ -63,6 +74,7 @@ class ChaptersService:
 
         stmt = (
             select(Chapter)
+            .options(load_only(*CHAPTER_LIST_COLUMNS))
             .where(Chapter.work_id == work_id)
             .order_by(Chapter.sort_key.asc(), Chapter.idx.asc(), Chapter.id.asc())
             .limit(limit)
@@ -73,8 +85,14 @@ class ChaptersService:
         total = self.session.execute(count_stmt).scalar_one()
         return rows, total, limit, offset
 
-    def get_chapter(self, chapter_id: int) -> Chapter:
-        chapter = self.session.get(Chapter, chapter_id)
+    def get_chapter(self, chapter_id: int, *, with_text: bool = False) -> Chapter:
+        """Load a chapter; ``with_text`` fetches its body in the same query.
+
+        Without it ``normalized_text`` is still available, at the cost of a second
+        query on first access.
+        """
+        options = [undefer(Chapter.normalized_text)] if with_text else None
+        chapter = self.session.get(Chapter, chapter_id, options=options)
         if not chapter:
             raise ChapterNotFoundError(f"chapter {chapter_id} not found")
         return chapter
@@ -82,6 +100,7 @@ class ChaptersService:
     def get_next_chapter(self, work_id: int, current_sort_key: Decimal) -> Chapter | None:
         stmt = (
             select(Chapter)
+            .options(load_only(*CHAPTER_LIST_COLUMNS))
             .where(
                 Chapter.work_id == work_id,
                 Chapter.sort_key > current_sort_key,
@@ -96,19 +115,26 @@ class ChaptersService:
         self.session.add(chapter)
         self.session.commit()
 
-    def get_recently_read(self, limit: int = 10) -> list[Chapter]:
+    def get_recently_read(self, limit: int = 10) -> list[Row]:
+        """Recently read chapters as rows of list columns, ``work_title`` and ``last_read_at``."""
         limit = max(1, min(limit, 50))
         stmt = (
-            select(Chapter)
+            select(
+                *CHAPTER_LIST_COLUMNS,
+                Work.title.label("work_title"),
+                Chapter.last_read_at,
+            )
+            .join(Work, Work.id == Chapter.work_id)
             .where(Chapter.last_read_at.is_not(None))
             .order_by(Chapter.last_read_at.desc())
             .limit(limit)
         )
-        return list(self.session.execute(stmt).scalars().all())
+        return list(self.session.execute(stmt).all())
 
     def get_previous_chapter(self, work_id: int, current_sort_key: Decimal) -> Chapter | None:
         stmt = (
             select(Chapter)
+            .options(load_only(*CHAPTER_LIST_COLUMNS))
             .where(
                 Chapter.work_id == work_id,
                 Chapter.sort_key < current_sort_key,
@@ -193,6 +219,7 @@ class ChaptersService:
     ) -> dict[Decimal, Chapter]:
         if not sort_keys:
             return {}
+        # Bodies stay unloaded: callers compare text_hash and only assign new text.
         stmt = select(Chapter).where(
             Chapter.work_id == work_id,
             Chapter.sort_key.in_(sort_keys),
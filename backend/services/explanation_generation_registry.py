@@ -5,6 +5,8 @@ import logging
 from collections.abc import AsyncGenerator, Callable
 from typing import Any
 
+from observability.metrics import GENERATIONS_ACTIVE, GENERATIONS_STARTED_TOTAL
+
 logger = logging.getLogger(__name__)
 
 
@@ -55,9 +57,18 @@ class GenerationRegistry:
 
     Keys are artifact IDs. Only one generation runs per artifact at a time; a
     regenerate request cancels the existing task and starts a fresh one.
+    ``handle_factory`` lets producers with other buffering needs supply a
+    ``GenerationHandle`` subclass. ``kind`` labels the registry's metrics.
     """
 
-    def __init__(self) -> None:
+    def __init__(
+        self,
+        handle_factory: Callable[[], GenerationHandle] = GenerationHandle,
+        *,
+        kind: str = "explanation",
+    ) -> None:
+        self._handle_factory = handle_factory
+        self.kind = kind
         self._handles: dict[int, GenerationHandle] = {}
         self._lock: asyncio.Lock = asyncio.Lock()
 
@@ -79,10 +90,11 @@ class GenerationRegistry:
             existing = self._handles.get(artifact_id)
             if existing is not None and not existing.done.is_set():
                 return existing
-            handle = GenerationHandle()
+            handle = self._handle_factory()
             self._handles[artifact_id] = handle
 
         async def runner() -> None:
+            GENERATIONS_ACTIVE.inc(kind=self.kind)
             try:
                 async for event in producer_factory():
                     handle.emit(event)
@@ -94,11 +106,13 @@ class GenerationRegistry:
                     extra={"artifact_id": artifact_id},
                 )
             finally:
+                GENERATIONS_ACTIVE.dec(kind=self.kind)
                 handle.close()
                 async with self._lock:
                     if self._handles.get(artifact_id) is handle:
                         del self._handles[artifact_id]
 
+        GENERATIONS_STARTED_TOTAL.inc(kind=self.kind)
         handle.task = asyncio.create_task(runner())
         return handle
 
@@ -4,6 +4,7 @@ import logging
 from typing import Literal
 
 from sqlalchemy import select
+from sqlalchemy.ext.asyncio import AsyncSession
 from sqlalchemy.orm import Session
 
 from app.explanation_schemas import AnyFacetData, ArtifactPayload, FacetEntry, FacetType
@@ -209,3 +210,68 @@ class ExplanationService:
                     extra={"artifact_id": artifact.id},
                 )
         return ArtifactPayload()
+
+
+class AsyncExplanationService:
+    """The writes a background generation makes, on an ``AsyncSession``.
+
+    Mirrors the matching ``ExplanationService`` methods so generation can
+    persist each facet without blocking the event loop.
+    """
+
+    def __init__(self, session: AsyncSession) -> None:
+        self.session = session
+
+    async def get_by_id(self, artifact_id: int) -> TranslationExplanation | None:
+        stmt = select(TranslationExplanation).where(TranslationExplanation.id == artifact_id)
+        return (await self.session.execute(stmt)).scalars().first()
+
+    async def update_facet(
+        self,
+        artifact_id: int,
+        facet_type: FacetType,
+        data: AnyFacetData | None,
+        *,
+        error: str | None = None,
+    ) -> None:
+        """Persist a completed (or errored) facet into the artifact payload."""
+        artifact = await self.get_by_id(artifact_id)
+        if artifact is None:
+            return
+
+        payload = ExplanationService._load_payload(artifact)
+        entry = FacetEntry(
+            status="error" if error else "complete",
+            data=data.model_dump() if data is not None else None,
+            error=error,
+        )
+        setattr(payload, facet_type, entry)
+        artifact.payload_json = payload.model_dump()
+        artifact.status = "generating"
+        await self.session.commit()
+
+    async def mark_complete(self, artifact_id: int) -> None:
+        """Set artifact status to ``complete``."""
+        artifact = await self.get_by_id(artifact_id)
+        if artifact is None:
+            return
+        artifact.status = "complete"
+        await self.session.commit()
+
+    async def mark_error(self, artifact_id: int, message: str) -> None:
+        """Set artifact status to ``error`` and record the message."""
+        artifact = await self.get_by_id(artifact_id)
+        if artifact is None:
+            return
+        artifact.status = "error"
+        payload = ExplanationService._load_payload(artifact)
+        payload.error = message
+        artifact.payload_json = payload.model_dump()
+        await self.session.commit()
+
+    async def get_payload(self, artifact_id: int) -> ArtifactPayload:
+        """Return the persisted payload for an artifact, or an empty payload."""
+        artifact = await self.get_by_id(artifact_id)
+        if artifact is None:
+            return ArtifactPayload()
+        return ExplanationService._load_payload(artifact)
@@ -6,17 +6,17 @@ from collections.abc import AsyncGenerator, Awaitable, Callable
 from dataclasses import dataclass
 from typing import Literal
 
-from sqlalchemy.orm import Session
+from sqlalchemy.orm import Session, undefer
 
 from agents.base_agent import SegmentContext, TraceContext
 from agents.explanation_generator_v2 import build_explanation_generator_v2
 from app.config import settings
-from app.db import SessionLocal
+from app.db import SessionLocal, get_async_sessionmaker, release_connection
 from app.explanation_schemas import FACET_ORDER, ArtifactPayload, FacetType
 from app.models import Chapter, TranslationSegment
 from services.exceptions import SegmentNotFoundError, SegmentNotTranslatedError, SpanValidationError
 from services.explanation_generation_registry import GenerationHandle, get_registry
-from services.explanation_service import ExplanationService
+from services.explanation_service import AsyncExplanationService, ExplanationService
 from services.prompt import PromptService
 from services.translation_stream import PARTIAL_TRANSLATION_FLAG, TranslationStreamService
 
@@ -208,6 +208,8 @@ class ExplanationWorkflowV2:
             span_start=span_start,
             span_end=span_end,
         )
+        # Replay and tailing need no database; hold no connection while they run.
+        release_connection(self.db)
 
         if artifact.status in ("complete", "error") and artifact.payload_json:
             async for event in self._replay_from_cache(artifact.id, artifact.payload_json):
@@ -339,14 +341,8 @@ def _resolve_model_for_work(db: Session, work_id: int) -> str:
     """Mirror translation_workflow._resolve_agent: latest version of the
     work's assigned prompt → its model. Falls back to settings.translation_model.
     """
-    prompt_service = PromptService(db)
-    prompt = prompt_service.get_prompt_for_work(work_id)
-    if prompt is None:
-        return settings.translation_model
-    versions, _, _, _ = prompt_service.get_prompt_versions(prompt.id, limit=1, offset=0)
-    if not versions:
-        return settings.translation_model
-    return versions[0].model
+    resolved = PromptService(db).resolve_prompt_for_work(work_id)
+    return resolved.model or settings.translation_model
 
 
 def _get_preceding_context(segments, current, chapter_text, limit: int = 1):
@@ -389,20 +385,34 @@ async def _run_generation(
     """Background producer: drives the LLM and persists each facet.
 
     Opens its own DB session because the request-scoped session that kicked
-    this off will be closed long before generation finishes.
+    this off will be closed long before generation finishes. It is an
+    ``AsyncSession``, so persisting facets never blocks the event loop.
     """
     from sqlalchemy import select
 
     from app.models import Chapter, TranslationSegment
 
-    with SessionLocal() as db:
-        explanation_svc = ExplanationService(db)
-        translation_svc = TranslationStreamService(db)
+    async with get_async_sessionmaker()() as db:
+        explanation_svc = AsyncExplanationService(db)
 
         try:
-            chapter = db.execute(select(Chapter).where(Chapter.id == chapter_id)).scalars().first()
+            chapter = (
+                (
+                    await db.execute(
+                        select(Chapter)
+                        .options(undefer(Chapter.normalized_text))
+                        .where(Chapter.id == chapter_id)
+                    )
+                )
+                .scalars()
+                .first()
+            )
             segment = (
-                db.execute(select(TranslationSegment).where(TranslationSegment.id == segment_id))
+                (
+                    await db.execute(
+                        select(TranslationSegment).where(TranslationSegment.id == segment_id)
+                    )
+                )
                 .scalars()
                 .first()
             )
@@ -415,7 +425,7 @@ async def _run_generation(
                         "segment_id": segment_id,
                     },
                 )
-                explanation_svc.mark_error(artifact_id, "chapter or segment not found")
+                await explanation_svc.mark_error(artifact_id, "chapter or segment not found")
                 yield ArtifactErrorEvent(
                     artifact_id=artifact_id, error="chapter or segment not found"
                 )
@@ -426,14 +436,25 @@ async def _run_generation(
             translation_text = segment.tgt or ""
 
             all_segments = list(
-                translation_svc.get_segments_for_translation(segment.chapter_translation_id)
+                (
+                    await db.execute(
+                        select(TranslationSegment)
+                        .where(
+                            TranslationSegment.chapter_translation_id
+                            == segment.chapter_translation_id
+                        )
+                        .order_by(TranslationSegment.order_index.asc(), TranslationSegment.id.asc())
+                    )
+                )
+                .scalars()
+                .all()
             )
             preceding = _get_preceding_context(all_segments, segment, chapter_text)
             following = _get_following_context(all_segments, segment, chapter_text)
 
             # Resume support: replay facets already persisted in payload_json, and
             # skip them on the LLM pass.
-            artifact = explanation_svc.get_by_id(artifact_id)
+            artifact = await explanation_svc.get_by_id(artifact_id)
             done_facets: set[FacetType] = set()
             if artifact is not None and artifact.payload_json:
                 try:
@@ -453,10 +474,15 @@ async def _run_generation(
                         )
 
             if len(done_facets) == len(FACET_ORDER):
-                yield _finalize_artifact(explanation_svc, artifact_id)
+                yield await _finalize_artifact(explanation_svc, artifact_id)
                 return
 
-            resolved_model = _resolve_model_for_work(db, chapter.work_id)
+            # End the read transaction; facets are written one short transaction
+            # each, so no connection is held while the model runs.
+            await db.commit()
+            # Prompt resolution is cached per work, so this is rarely a query.
+            with SessionLocal() as sync_db:
+                resolved_model = _resolve_model_for_work(sync_db, chapter.work_id)
             generator = build_explanation_generator_v2(model=resolved_model)
 
             trace = TraceContext(
@@ -488,7 +514,7 @@ async def _run_generation(
                 skip_facets=done_facets,
                 trace=trace,
             ):
-                explanation_svc.update_facet(artifact_id, facet_type, data, error=error)
+                await explanation_svc.update_facet(artifact_id, facet_type, data, error=error)
                 if error:
                     yield ArtifactErrorEvent(
                         artifact_id=artifact_id,
@@ -502,7 +528,7 @@ async def _run_generation(
                         payload=data.model_dump(),
                     )
 
-            yield _finalize_artifact(explanation_svc, artifact_id)
+            yield await _finalize_artifact(explanation_svc, artifact_id)
 
         except asyncio.CancelledError:
             raise
@@ -512,7 +538,8 @@ async def _run_generation(
                 extra={"artifact_id": artifact_id, "segment_id": segment_id},
             )
             try:
-                explanation_svc.mark_error(artifact_id, str(exc))
+                await db.rollback()
+                await explanation_svc.mark_error(artifact_id, str(exc))
             except Exception:
                 logger.exception(
                     "ExplanationWorkflowV2: failed to persist terminal error status",
@@ -521,9 +548,11 @@ async def _run_generation(
             yield ArtifactErrorEvent(artifact_id=artifact_id, error=str(exc))
 
 
-def _finalize_artifact(svc: ExplanationService, artifact_id: int) -> ArtifactCompleteEvent:
+async def _finalize_artifact(
+    svc: AsyncExplanationService, artifact_id: int
+) -> ArtifactCompleteEvent:
     """Derive final artifact status from the persisted payload."""
-    payload = svc.get_payload(artifact_id)
+    payload = await svc.get_payload(artifact_id)
     failed: list[FacetType] = []
     for facet_type in FACET_ORDER:
         entry = getattr(payload, facet_type)
@@ -532,10 +561,10 @@ def _finalize_artifact(svc: ExplanationService, artifact_id: int) -> ArtifactCom
 
     if failed:
         message = f"facet generation failed: {', '.join(failed)}"
-        svc.mark_error(artifact_id, message)
+        await svc.mark_error(artifact_id, message)
         return ArtifactCompleteEvent(artifact_id=artifact_id, status="error")
 
-    svc.mark_complete(artifact_id)
+    await svc.mark_complete(artifact_id)
     return ArtifactCompleteEvent(artifact_id=artifact_id, status="complete")
 
 
@@ -0,0 +1,136 @@
+from __future__ import annotations
+
+import gzip
+import hashlib
+import os
+import sqlite3
+import tempfile
+import threading
+from dataclasses import dataclass
+from datetime import UTC, datetime
+from decimal import Decimal
+from pathlib import Path
+
+from app.config import settings
+
+_SCHEMA = """
+CREATE TABLE IF NOT EXISTS pages (
+    source TEXT NOT NULL,
+    source_id TEXT NOT NULL,
+    chapter TEXT NOT NULL,
+    url TEXT NOT NULL,
+    content_hash TEXT NOT NULL,
+    fetched_at TEXT NOT NULL,
+    PRIMARY KEY (source, source_id, chapter)
+)
+"""
+
+
+def chapter_key(sort_key: Decimal) -> str:
+    """Index key for a chapter number: ``Decimal("1.5000")`` and ``Decimal("1.5")`` agree."""
+    return format(Decimal(sort_key).normalize(), "f")
+
+
+@dataclass(slots=True)
+class ArchivedPage:
+    source: str
+    source_id: str
+    chapter: str
+    url: str
+    content_hash: str
+    fetched_at: str
+
+
+class HtmlArchive:
+    """Raw chapter pages on disk, gzip-compressed and addressed by their sha256.
+
+    Page bodies live under ``objects/<2 hex>/<sha256>.html.gz``, so a page
+    fetched twice unchanged is stored once. ``index.sqlite3`` maps each
+    (source, source_id, chapter) to the hash of its latest fetch. Both sit in
+    ``root``, independent of the application database: the archive can be
+    copied between machines and survives a database reset.
+    """
+
+    def __init__(self, root: str | os.PathLike[str]) -> None:
+        self.root = Path(root)
+        self.objects = self.root / "objects"
+        self.objects.mkdir(parents=True, exist_ok=True)
+        self._index = sqlite3.connect(
+            self.root / "index.sqlite3", timeout=30, check_same_thread=False
+        )
+        self._index.execute(_SCHEMA)
+        self._index.commit()
+        self._lock = threading.Lock()
+
+    def put(self, source: str, source_id: str, sort_key: Decimal, url: str, html: str) -> str:
+        """Archive ``html`` as the latest fetch of a chapter; returns its content hash."""
+        data = html.encode("utf-8")
+        content_hash = hashlib.sha256(data).hexdigest()
+        path = self.path_for(content_hash)
+        if not path.exists():
+            path.parent.mkdir(exist_ok=True)
+            # Written under a temporary name first, so readers never see a partial page.
+            fd, tmp = tempfile.mkstemp(dir=path.parent, suffix=".tmp")
+            with os.fdopen(fd, "wb") as handle:
+                handle.write(gzip.compress(data, compresslevel=6))
+            os.replace(tmp, path)
+        with self._lock:
+            self._index.execute(
+                "INSERT OR REPLACE INTO pages VALUES (?, ?, ?, ?, ?, ?)",
+                (
+                    source,
+                    source_id,
+                    chapter_key(sort_key),
+                    url,
+                    content_hash,
+                    datetime.now(UTC).isoformat(),
+                ),
+            )
+            self._index.commit()
+        return content_hash
+
+    def get(self, source: str, source_id: str, sort_key: Decimal) -> ArchivedPage | None:
+        with self._lock:
+            row = self._index.execute(
+                "SELECT * FROM pages WHERE source = ? AND source_id = ? AND chapter = ?",
+                (source, source_id, chapter_key(sort_key)),
+            ).fetchone()
+        return ArchivedPage(*row) if row else None
+
+    def pages(self, source: str, source_id: str) -> dict[str, ArchivedPage]:
+        """A work's archived pages by :func:`chapter_key`."""
+        with self._lock:
+            rows = self._index.execute(
+                "SELECT * FROM pages WHERE source = ? AND source_id = ?", (source, source_id)
+            ).fetchall()
+        return {row[2]: ArchivedPage(*row) for row in rows}
+
+    def works(self) -> list[tuple[str, str]]:
+        """Every (source, source_id) with at least one archived page."""
+        with self._lock:
+            return self._index.execute("SELECT DISTINCT source, source_id FROM pages").fetchall()
+
+    def path_for(self, content_hash: str) -> Path:
+        return self.objects / content_hash[:2] / f"{content_hash}.html.gz"
+
+    def read(self, content_hash: str) -> str:
+        return read_archived(self.path_for(content_hash))
+
+    def close(self) -> None:
+        self._index.close()
+
+
+def read_archived(path: str | os.PathLike[str]) -> str:
+    """A page body by its object path; runs in parse workers, so it takes no archive."""
+    return gzip.decompress(Path(path).read_bytes()).decode("utf-8")
+
+
+_archive: HtmlArchive | None = None
+
+
+def get_html_archive() -> HtmlArchive | None:
+    """The process-wide archive, or None when ``html_archive_dir`` is empty."""
+    global _archive
+    if _archive is None and settings.html_archive_dir:
+        _archive = HtmlArchive(settings.html_archive_dir)
+    return _archive
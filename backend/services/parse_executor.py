@@ -0,0 +1,164 @@
+from __future__ import annotations
+
+import asyncio
+import multiprocessing
+import os
+import threading
+from collections.abc import Callable, Sequence
+from concurrent.futures import BrokenExecutor, Executor, ProcessPoolExecutor
+from functools import partial
+from typing import Any
+
+from app.config import settings
+
+
+def _warm_worker() -> None:
+    """Process initializer: import every chapter parser and run each once before real work."""
+    from app.kakuyomu.scraper import KakuyomuScraper
+    from app.syosetu.scraper import SyosetuScraper
+
+    for scraper in (SyosetuScraper, KakuyomuScraper):
+        for parse_chapter in scraper.chapter_parsers.values():
+            parse_chapter("<html><body><p>warm</p></body></html>")
+
+
+def _ready() -> int:
+    return os.getpid()
+
+
+def _run_batch(fn: Callable[[Any], Any], inputs: Sequence[Any]) -> list[tuple[bool, Any]]:
+    """Run ``fn`` over ``inputs`` in a worker; errors are returned, not raised, per input."""
+    results: list[tuple[bool, Any]] = []
+    for value in inputs:
+        try:
+            results.append((True, fn(value)))
+        except Exception as exc:  # noqa: BLE001 - handed back to the awaiting caller
+            results.append((False, exc))
+    return results
+
+
+class ParseExecutor:
+    """Runs HTML parsing in worker processes, sending pages over in batches.
+
+    ``parse`` is for pages arriving one at a time (a scrape job's fetches): calls
+    made within ``batch_wait_s`` of each other travel to a worker together, up
+    to ``batch_size`` per batch. ``parse_all`` splits a known list of pages
+    into batches directly. The functions passed in must be picklable, i.e.
+    defined at module level, like the parsers in ``app.syosetu.parser`` and
+    ``app.kakuyomu.parser``.
+    """
+
+    def __init__(self, pool: Executor, *, batch_size: int = 8, batch_wait_s: float = 0.005):
+        self.pool = pool
+        self.batch_size = max(1, batch_size)
+        self.batch_wait_s = batch_wait_s
+        self._pending: list[tuple[Callable[[Any], Any], Any, asyncio.Future[Any]]] = []
+        self._flush_handle: asyncio.TimerHandle | None = None
+
+    async def parse(self, fn: Callable[[Any], Any], value: Any) -> Any:
+        """``fn(value)``, run in a worker as part of the next batch."""
+        loop = asyncio.get_running_loop()
+        future: asyncio.Future[Any] = loop.create_future()
+        self._pending.append((fn, value, future))
+        if len(self._pending) >= self.batch_size:
+            self._flush()
+        elif self._flush_handle is None:
+            self._flush_handle = loop.call_later(self.batch_wait_s, self._flush)
+        return await future
+
+    async def parse_all(self, fn: Callable[[Any], Any], values: Sequence[Any]) -> list[Any]:
+        """``fn`` over ``values`` in order; a failed input's entry is its exception."""
+        loop = asyncio.get_running_loop()
+        batches = [
+            values[start : start + self.batch_size]
+            for start in range(0, len(values), self.batch_size)
+        ]
+        done = await asyncio.gather(
+            *(loop.run_in_executor(self.pool, _run_batch, fn, batch) for batch in batches)
+        )
+        return [value for batch in done for _, value in batch]
+
+    def warm(self) -> None:
+        """Start the workers now rather than on the first parse."""
+        workers = getattr(self.pool, "_max_workers", 1)
+        for _ in range(workers):
+            self.pool.submit(_ready)
+
+    @property
+    def broken(self) -> bool:
+        """Whether a worker died and took the pool down with it."""
+        return bool(getattr(self.pool, "_broken", False))
+
+    def shutdown(self) -> None:
+        self.pool.shutdown(wait=False, cancel_futures=True)
+
+    def _flush(self) -> None:
+        if self._flush_handle is not None:
+            self._flush_handle.cancel()
+            self._flush_handle = None
+        pending, self._pending = self._pending, []
+        # A batch holds one function; interleaved sources become separate batches.
+        by_fn: dict[Callable[[Any], Any], list[tuple[Any, asyncio.Future[Any]]]] = {}
+        for fn, value, future in pending:
+            by_fn.setdefault(fn, []).append((value, future))
+        for fn, entries in by_fn.items():
+            futures = [future for _, future in entries]
+            try:
+                submitted = self.pool.submit(_run_batch, fn, [value for value, _ in entries])
+            except BrokenExecutor as exc:
+                _fail(futures, exc)
+                continue
+            asyncio.wrap_future(submitted).add_done_callback(partial(_settle, futures))
+
+
+def _settle(futures: list[asyncio.Future[Any]], done: asyncio.Future[list[tuple[bool, Any]]]):
+    if done.cancelled():
+        _fail(futures, asyncio.CancelledError())
+        return
+    if done.exception() is not None:
+        _fail(futures, done.exception())
+        return
+    for future, (ok, value) in zip(futures, done.result(), strict=True):
+        if future.done():
+            continue  # its caller was cancelled meanwhile
+        if ok:
+            future.set_result(value)
+        else:
+            future.set_exception(value)
+
+
+def _fail(futures: list[asyncio.Future[Any]], exc: BaseException) -> None:
+    for future in futures:
+        if not future.done():
+            future.set_exception(exc)
+
+
+_executor: ParseExecutor | None = None
+_executor_lock = threading.Lock()
+
+
+def get_parse_executor() -> ParseExecutor:
+    """Process-wide parse executor; its workers stay up between scrape jobs."""
+    global _executor
+    with _executor_lock:
+        if _executor is None or _executor.broken:
+            pool = ProcessPoolExecutor(
+                max_workers=max(1, min(settings.parse_workers, os.cpu_count() or 1)),
+                # Not fork: the server process runs threads and an event loop.
+                mp_context=multiprocessing.get_context("spawn"),
+                initializer=_warm_worker,
+            )
+            _executor = ParseExecutor(
+                pool,
+                batch_size=settings.parse_batch_size,
+                batch_wait_s=settings.parse_batch_wait_ms / 1000,
+            )
+        return _executor
+
+
+def shutdown_parse_executor() -> None:
+    global _executor
+    with _executor_lock:
+        if _executor is not None:
+            _executor.shutdown()
+            _executor = None
@@ -0,0 +1,114 @@
+from __future__ import annotations
+
+import asyncio
+import logging
+
+from sqlalchemy import bindparam, update
+from sqlalchemy.ext.asyncio import AsyncSession, async_sessionmaker
+
+from app.db import get_async_sessionmaker
+from app.models import TranslationSegment
+
+logger = logging.getLogger(__name__)
+
+# How often buffered in-flight text is written. Final text is written by
+# TranslationWriter on segment-complete or cancel, after the segment is settled,
+# so resumability does not depend on the interval.
+PARTIAL_COMMIT_INTERVAL_S = 1.0
+
+_segments = TranslationSegment.__table__
+_UPDATE_PARTIAL = (
+    update(_segments)
+    .where(_segments.c.id == bindparam("b_id"))
+    .values(
+        tgt=bindparam("b_tgt"),
+        flags=bindparam("b_flags"),
+        explanation=None,
+        cache_key=None,
+    )
+)
+
+
+class PartialSegmentWriter:
+    """Write-behind buffer for the text of segments that are still streaming.
+
+    ``stage`` only records the latest text per segment; a background flusher
+    writes everything staged since the last flush as one batched UPDATE on a
+    short-lived ``AsyncSession``, so streaming never blocks the event loop on a
+    commit. Callers must ``settle`` a segment before persisting its final text,
+    so a late flush cannot overwrite it.
+    """
+
+    def __init__(
+        self,
+        session_factory: async_sessionmaker[AsyncSession] | None = None,
+        *,
+        interval_s: float | None = None,
+    ) -> None:
+        self._session_factory = session_factory or get_async_sessionmaker()
+        self._interval_s = interval_s
+        self._pending: dict[int, tuple[str, list[str]]] = {}
+        self._loop: asyncio.AbstractEventLoop | None = None
+        self._lock: asyncio.Lock | None = None
+        self._task: asyncio.Task[None] | None = None
+        self.flush_count = 0
+        self.rows_written = 0
+
+    def stage(self, segment_id: int, text: str, flags: list[str]) -> None:
+        """Record the latest in-flight ``text`` (and partial ``flags``) for a segment."""
+        self._pending[segment_id] = (text, flags)
+        self._bind_loop()
+        if self._task is None or self._task.done():
+            self._task = asyncio.create_task(self._run())
+
+    async def settle(self, segment_id: int) -> None:
+        """Drop staged text for a segment and wait out any flush writing it."""
+        self._pending.pop(segment_id, None)
+        async with self._bind_loop():
+            pass
+
+    async def flush(self) -> None:
+        """Write everything staged so far."""
+        async with self._bind_loop():
+            if not self._pending:
+                return
+            batch, self._pending = self._pending, {}
+            rows = [
+                {"b_id": segment_id, "b_tgt": text, "b_flags": flags}
+                for segment_id, (text, flags) in batch.items()
+            ]
+            try:
+                async with self._session_factory() as session:
+                    await session.execute(_UPDATE_PARTIAL, rows)
+                    await session.commit()
+            except Exception:
+                logger.exception("Partial segment flush failed", extra={"rows": len(rows)})
+                return
+            self.flush_count += 1
+            self.rows_written += len(rows)
+
+    def _bind_loop(self) -> asyncio.Lock:
+        # The writer is process-wide but asyncio primitives belong to one loop;
+        # rebind if a new loop (e.g. a fresh asyncio.run in tests) is in use.
+        loop = asyncio.get_running_loop()
+        if self._loop is not loop or self._lock is None:
+            self._loop = loop
+            self._lock = asyncio.Lock()
+            self._task = None
+        return self._lock
+
+    async def _run(self) -> None:
+        interval = self._interval_s
+        while self._pending:
+            await asyncio.sleep(PARTIAL_COMMIT_INTERVAL_S if interval is None else interval)
+            await self.flush()
+
+
+_writer: PartialSegmentWriter | None = None
+
+
+def get_partial_writer() -> PartialSegmentWriter:
+    global _writer
+    if _writer is None:
+        _writer = PartialSegmentWriter()
+    return _writer
@@ -1,16 +1,52 @@
 from __future__ import annotations
 
+import time
+from dataclasses import dataclass
 from datetime import UTC, datetime
 
 from sqlalchemy import func, select
 from sqlalchemy.orm import Session
 
+from app.config import settings
 from app.models import Prompt, PromptVersion, WorkPrompt
 
 from .exceptions import PromptNotFoundError, PromptVersionNotFoundError
 from .utils import sanitize_pagination
 
 
+@dataclass(frozen=True, slots=True)
+class ResolvedPrompt:
+    """A work's assigned prompt and its latest version, as used to run models.
+
+    All fields are ``None`` when the work has no prompt (or none with versions
+    for the version fields).
+    """
+
+    prompt_id: int | None
+    template: str | None
+    model: str | None
+    parameters: dict | None
+    prompt_version_id: int | None
+
+
+# Resolved prompts by work_id, with the monotonic time they were loaded. Entries
+# are dropped whenever a work's assignment or a prompt's versions change; the
+# TTL only bounds staleness across processes, which share no invalidation.
+_resolved_prompts: dict[int, tuple[float, ResolvedPrompt]] = {}
+
+
+def invalidate_resolved_prompts(
+    *, work_id: int | None = None, prompt_id: int | None = None
+) -> None:
+    """Drop cached resolutions for a work, for every work using a prompt, or all."""
+    if work_id is None and prompt_id is None:
+        _resolved_prompts.clear()
+        return
+    for cached_work_id, (_, resolved) in list(_resolved_prompts.items()):
+        if cached_work_id == work_id or (prompt_id is not None and resolved.prompt_id == prompt_id):
+            _resolved_prompts.pop(cached_work_id, None)
+
+
 class PromptService:
     """Encapsulates queries and operations for Prompt and PromptVersion entities."""
 
@@ -80,6 +116,52 @@ class PromptService:
         )
         return self.session.execute(stmt).scalar_one_or_none()
 
+    def resolve_prompt_for_work(self, work_id: int) -> ResolvedPrompt:
+        """Return the work's prompt and latest version, served from cache when fresh.
+
+        Translation runs, retranslations and explanations all resolve the work's
+        prompt; this keeps that lookup off the database between prompt changes.
+        """
+        cached = _resolved_prompts.get(work_id)
+        now = time.monotonic()
+        if cached is not None and now - cached[0] < settings.prompt_cache_ttl_seconds:
+            return cached[1]
+
+        latest_version_id = (
+            select(PromptVersion.id)
+            .where(PromptVersion.prompt_id == Prompt.id)
+            .order_by(PromptVersion.version_number.desc())
+            .limit(1)
+            .correlate(Prompt)
+            .scalar_subquery()
+        )
+        stmt = (
+            select(
+                Prompt.id,
+                PromptVersion.id,
+                PromptVersion.template,
+                PromptVersion.model,
+                PromptVersion.parameters,
+            )
+            .join(WorkPrompt, WorkPrompt.prompt_id == Prompt.id)
+            .outerjoin(PromptVersion, PromptVersion.id == latest_version_id)
+            .where(WorkPrompt.work_id == work_id, Prompt.deleted_at.is_(None))
+        )
+        row = self.session.execute(stmt).first()
+        if row is None:
+            resolved = ResolvedPrompt(None, None, None, None, None)
+        else:
+            prompt_id, version_id, template, model, parameters = row
+            resolved = ResolvedPrompt(
+                prompt_id=prompt_id,
+                template=template,
+                model=model,
+                parameters=parameters,
+                prompt_version_id=version_id,
+            )
+        _resolved_prompts[work_id] = (now, resolved)
+        return resolved
+
     def get_prompts_for_work(
         self,
         work_id: int,
@@ -185,6 +267,7 @@ class PromptService:
         prompt.deleted_at = datetime.now(UTC)
         self.session.add(prompt)
         self.session.commit()
+        invalidate_resolved_prompts(prompt_id=prompt_id)
 
     def get_prompt_versions(
         self, prompt_id: int, limit: int = 50, offset: int = 0, max_limit: int = 100
@@ -308,5 +391,6 @@ class PromptService:
         self.session.add(version)
         self.session.flush()
         self.session.commit()
+        invalidate_resolved_prompts(prompt_id=prompt_id)
         self.session.refresh(version)
         return version
@@ -0,0 +1,115 @@
+from __future__ import annotations
+
+import logging
+from collections.abc import Callable
+from dataclasses import dataclass, field
+from functools import partial
+
+from sqlalchemy import select
+from sqlalchemy.orm import Session, load_only
+
+from app.models import Chapter, Work
+from app.scrapers import scraper_registry
+from services.chapters import ChaptersService
+from services.exceptions import WorkNotFoundError
+from services.html_archive import HtmlArchive, chapter_key, get_html_archive, read_archived
+from services.parse_executor import get_parse_executor
+from services.translation_jobs import TranslationJobs
+from services.translation_stream import TranslationStreamService
+
+logger = logging.getLogger(__name__)
+
+
+@dataclass(slots=True)
+class ReparseSummary:
+    work_id: int
+    changed: int = 0
+    unchanged: int = 0
+    # Stored chapters with no archived page (scraped before archiving, or by a
+    # scraper that does not archive).
+    missing: int = 0
+    errors: list[dict] = field(default_factory=list)
+
+
+def _parse_archived(parse: Callable[[str], tuple[str, str]], path: str) -> tuple[str, str]:
+    return parse(read_archived(path))
+
+
+class ReparseService:
+    """Replays archived chapter pages through the current parsers.
+
+    Pages are read and parsed in the shared parse worker processes. Only chapters whose parsed
+    text hash differs from the stored one are written; those have running
+    translations cancelled and their segments realigned, exactly as when a
+    re-scrape finds changed text. Nothing is downloaded.
+    """
+
+    def __init__(self, db: Session, archive: HtmlArchive | None = None) -> None:
+        self.db = db
+        self.archive = archive or get_html_archive()
+        self.chapters_service = ChaptersService(db)
+
+    async def reparse_work(self, work_id: int) -> ReparseSummary:
+        work = self.db.get(Work, work_id)
+        if work is None:
+            raise WorkNotFoundError(f"work {work_id} not found")
+        summary = ReparseSummary(work_id=work_id)
+        if self.archive is None or not work.source or not work.source_id:
+            return summary
+
+        scraper = scraper_registry.resolve_by_source(work.source)
+        pages = self.archive.pages(work.source, work.source_id)
+        stmt = (
+            select(Chapter)
+            .where(Chapter.work_id == work_id)
+            .options(load_only(Chapter.id, Chapter.sort_key, Chapter.title, Chapter.text_hash))
+            .order_by(Chapter.sort_key)
+        )
+        archived: list[tuple[Chapter, str]] = []
+        for chapter in self.db.execute(stmt).scalars():
+            page = pages.get(chapter_key(chapter.sort_key))
+            if page is None:
+                summary.missing += 1
+            else:
+                archived.append((chapter, str(self.archive.path_for(page.content_hash))))
+
+        results = await get_parse_executor().parse_all(
+            partial(_parse_archived, scraper.parse_chapter), [path for _, path in archived]
+        )
+        for (chapter, _), result in zip(archived, results, strict=True):
+            if isinstance(result, BaseException):
+                logger.error(f"Error re-parsing chapter {chapter.sort_key}: {result}")
+                summary.errors.append({"chapter": float(chapter.sort_key), "reason": str(result)})
+                continue
+            title, normalized_text = result
+            text_hash = self.chapters_service._hash_text(normalized_text)
+            if text_hash == chapter.text_hash:
+                summary.unchanged += 1
+                continue
+            await self._store(chapter, title, normalized_text, text_hash)
+            summary.changed += 1
+        return summary
+
+    async def _store(
+        self, chapter: Chapter, title: str, normalized_text: str, text_hash: str
+    ) -> None:
+        chapter.title = title
+        chapter.normalized_text = normalized_text
+        chapter.text_hash = text_hash
+        await TranslationJobs(self.db).cancel(chapter)
+        TranslationStreamService(self.db).resegment_chapter(chapter)
+        self.db.commit()
+
+
+async def reparse_archived_works(db: Session) -> list[ReparseSummary]:
+    """Re-parse every work that has archived pages."""
+    archive = get_html_archive()
+    if archive is None:
+        return []
+    keys = archive.works()
+    work_ids: list[int] = []
+    for source, source_id in keys:
+        stmt = select(Work.id).where(Work.source == source, Work.source_id == source_id)
+        work_ids.extend(db.execute(stmt).scalars())
+    service = ReparseService(db, archive)
+    return [await service.reparse_work(work_id) for work_id in work_ids]
@@ -0,0 +1,314 @@
+from __future__ import annotations
+
+import asyncio
+import logging
+import math
+import sqlite3
+import time
+from collections import deque
+from collections.abc import AsyncIterator, Awaitable, Callable, Mapping
+from contextlib import asynccontextmanager
+from dataclasses import dataclass
+from decimal import Decimal
+from typing import TypeVar
+from urllib.parse import urlparse
+
+from fastapi.concurrency import run_in_threadpool
+
+from app.clients import NotModifiedError, Validators
+from app.config import settings
+from app.scrapers.base import WorkScraper
+from services.html_archive import HtmlArchive, get_html_archive
+from services.parse_executor import get_parse_executor
+
+logger = logging.getLogger(__name__)
+
+T = TypeVar("T")
+
+# Longest a host is paused for, whatever its Retry-After says.
+_MAX_PAUSE_S = 120.0
+
+
+def response_status(exc: BaseException) -> int | None:
+    """HTTP status behind a requests/httpx error, if it carries a response."""
+    status = getattr(getattr(exc, "response", None), "status_code", None)
+    return status if isinstance(status, int) else None
+
+
+def is_backoff_error(exc: BaseException) -> bool:
+    """Whether the host answered 429/503, i.e. asked us to slow down."""
+    return response_status(exc) in (429, 503)
+
+
+def _retry_after_s(exc: BaseException) -> float | None:
+    headers = getattr(getattr(exc, "response", None), "headers", None) or {}
+    try:
+        return max(0.0, float(headers.get("Retry-After")))
+    except (TypeError, ValueError):
+        return None  # absent, or an HTTP date
+
+
+class HostLimiter:
+    """Politeness towards one host: AIMD concurrency and spaced-out request starts.
+
+    The concurrency limit grows by one per limit's worth of successful fetches
+    and halves on a 429/503, within ``[1, max_concurrency]``. A 429/503 also
+    pauses new requests to the host for its Retry-After, or for a backoff that
+    doubles with each consecutive throttled answer.
+    """
+
+    def __init__(
+        self,
+        host: str,
+        *,
+        max_concurrency: int,
+        min_interval_s: float,
+        backoff_s: float,
+        clock: Callable[[], float] = time.monotonic,
+    ) -> None:
+        self.host = host
+        self.max_concurrency = max(1, max_concurrency)
+        self.min_interval_s = max(0.0, min_interval_s)
+        self.backoff_s = backoff_s
+        self.limit = float(self.max_concurrency)
+        self.in_flight = 0
+        self._clock = clock
+        self._next_start = 0.0
+        self._paused_until = 0.0
+        self._consecutive_throttles = 0
+        self._waiters: deque[asyncio.Future[None]] = deque()
+        self.fetched = 0
+        self.throttled = 0
+
+    @asynccontextmanager
+    async def slot(self) -> AsyncIterator[None]:
+        """Hold one of the host's request slots for the duration of a fetch."""
+        await self._acquire_slot()
+        try:
+            await self._wait_turn()
+            try:
+                yield
+            except Exception as exc:
+                throttled = is_backoff_error(exc)
+                if throttled:
+                    self._pause(_retry_after_s(exc))
+                self._adjust(throttled=throttled)
+                raise
+            self._adjust(throttled=False)
+        finally:
+            self._release_slot()
+
+    def stats(self) -> dict[str, float | int]:
+        return {
+            "limit": round(self.limit, 2),
+            "in_flight": self.in_flight,
+            "waiting": len(self._waiters),
+            "fetched": self.fetched,
+            "throttled": self.throttled,
+        }
+
+    async def _acquire_slot(self) -> None:
+        if not self._waiters and self.in_flight < self._capacity():
+            self.in_flight += 1
+            return
+        future: asyncio.Future[None] = asyncio.get_running_loop().create_future()
+        self._waiters.append(future)
+        try:
+            await future
+        except asyncio.CancelledError:
+            if future.done() and not future.cancelled():
+                # Granted just as we were cancelled; hand the slot on.
+                self._release_slot()
+            else:
+                self._waiters.remove(future)
+            raise
+
+    async def _wait_turn(self) -> None:
+        while True:
+            now = self._clock()
+            start = max(self._next_start, self._paused_until)
+            if start <= now:
+                self._next_start = now + self.min_interval_s
+                return
+            await asyncio.sleep(start - now)
+
+    def _pause(self, retry_after_s: float | None) -> None:
+        self._consecutive_throttles += 1
+        if retry_after_s is None:
+            retry_after_s = self.backoff_s * 2 ** (self._consecutive_throttles - 1)
+        pause_s = min(retry_after_s, _MAX_PAUSE_S)
+        self._paused_until = max(self._paused_until, self._clock() + pause_s)
+        logger.warning(
+            "Scrape host throttled; backing off",
+            extra={"host": self.host, "pause_s": pause_s, "limit": self.limit},
+        )
+
+    def _capacity(self) -> int:
+        return max(1, math.floor(self.limit))
+
+    def _adjust(self, *, throttled: bool) -> None:
+        if throttled:
+            self.throttled += 1
+            self.limit = max(1.0, self.limit / 2)
+        else:
+            self.fetched += 1
+            self._consecutive_throttles = 0
+            self.limit = min(float(self.max_concurrency), self.limit + 1 / self.limit)
+
+    def _release_slot(self) -> None:
+        self.in_flight -= 1
+        while self._waiters and self.in_flight < self._capacity():
+            future = self._waiters.popleft()
+            if future.done():
+                continue
+            self.in_flight += 1
+            future.set_result(None)
+
+
+_host_limiters: dict[str, HostLimiter] = {}
+
+
+def get_host_limiter(host: str) -> HostLimiter:
+    """Process-wide limiter for ``host``, so concurrent jobs share its politeness."""
+    limiter = _host_limiters.get(host)
+    if limiter is None:
+        limiter = HostLimiter(
+            host,
+            max_concurrency=settings.scrape_host_max_concurrency,
+            min_interval_s=settings.scrape_host_min_interval_s,
+            backoff_s=settings.scrape_throttle_backoff_s,
+        )
+        _host_limiters[host] = limiter
+    return limiter
+
+
+@dataclass(slots=True)
+class ChapterFetch:
+    """One chapter's fetch outcome: title and text, a 304, or the error that ended it.
+
+    ``validators`` are the fetched page's; they are only worth keeping once the
+    parsed chapter has been stored.
+    """
+
+    sort_key: Decimal
+    url: str | None = None
+    title: str = ""
+    text: str = ""
+    validators: Validators | None = None
+    not_modified: bool = False
+    error: Exception | None = None
+    seconds: float = 0.0
+
+
+class ScrapeEngine:
+    """Fetches a work's chapters concurrently and hands them back in order.
+
+    Up to ``prefetch`` chapters are in flight ahead of the consumer; how many
+    actually hit a host at once is up to that host's :class:`HostLimiter`.
+    Each page comes from the scraper's ``afetch_chapter``, is archived (see
+    :mod:`services.html_archive`), then parsed with its ``parse_chapter`` off
+    the event loop.
+
+    Chapters with stored ``validators`` are fetched conditionally, so a page
+    unchanged since it was stored comes back as a 304 (``not_modified``)
+    without being downloaded or parsed.
+    """
+
+    def __init__(
+        self,
+        scraper: WorkScraper,
+        source_id: str,
+        *,
+        prefetch: int | None = None,
+        validators: Mapping[Decimal, Validators] | None = None,
+        archive: HtmlArchive | None = None,
+    ) -> None:
+        self.scraper = scraper
+        self.source_id = source_id
+        self.validators = validators or {}
+        self.prefetch = max(1, prefetch or settings.scrape_prefetch_chapters)
+        self.archive = archive or get_html_archive()
+        # Some sources resolve chapter urls from a cached TOC, loaded up front but
+        # re-fetched if it turns out stale; one at a time, only one fetch re-loads it.
+        self._url_lock = asyncio.Lock()
+
+    async def chapters(self, sort_keys: list[Decimal]) -> AsyncIterator[ChapterFetch]:
+        """Yield a :class:`ChapterFetch` per key, in ``sort_keys`` order.
+
+        The scraper's TOC, if it needs one, is loaded first, within the host's
+        politeness, and parsed in the parse workers like the chapters; failing
+        to load it ends the iteration with its error.
+        Closing the iterator early (e.g. a cancelled job) cancels the fetches
+        still in flight.
+        """
+        await self.scraper.aload_toc(
+            self.source_id, self._fetch_politely, get_parse_executor().parse
+        )
+        pending: deque[asyncio.Task[ChapterFetch]] = deque()
+        keys = iter(sort_keys)
+        try:
+            for sort_key in keys:
+                pending.append(asyncio.create_task(self._fetch(sort_key)))
+                if len(pending) >= self.prefetch:
+                    break
+            while pending:
+                fetched = await pending.popleft()
+                next_key = next(keys, None)
+                if next_key is not None:
+                    pending.append(asyncio.create_task(self._fetch(next_key)))
+                yield fetched
+        finally:
+            for task in pending:
+                task.cancel()
+            if pending:
+                await asyncio.gather(*pending, return_exceptions=True)
+
+    async def _fetch(self, sort_key: Decimal) -> ChapterFetch:
+        started = time.perf_counter()
+        result = ChapterFetch(sort_key=sort_key)
+        try:
+            async with self._url_lock:
+                url = result.url = await run_in_threadpool(
+                    self.scraper.build_chapter_url, self.source_id, sort_key
+                )
+            host = urlparse(url).netloc.lower()
+            validators = self.validators.get(sort_key)
+            page = await self._politely(
+                host, lambda: self.scraper.afetch_chapter(url, validators=validators)
+            )
+            result.validators = page.validators
+            if self.archive is not None:
+                await run_in_threadpool(self._archive_page, sort_key, url, page.text)
+            result.title, result.text = await get_parse_executor().parse(
+                self.scraper.parse_chapter, page.text
+            )
+        except NotModifiedError:
+            result.not_modified = True
+        except Exception as exc:
+            result.error = exc
+        result.seconds = time.perf_counter() - started
+        return result
+
+    async def _fetch_politely(self, url: str) -> str:
+        host = urlparse(url).netloc.lower()
+        return await self._politely(host, lambda: self.scraper.http_client.afetch(url))
+
+    async def _politely(self, host: str, request: Callable[[], Awaitable[T]]) -> T:
+        """Run ``request`` in one of the host's slots, retrying it when throttled."""
+        limiter = get_host_limiter(host)
+        attempt = 0
+        while True:
+            try:
+                async with limiter.slot():
+                    return await request()
+            except Exception as exc:
+                if attempt == settings.scrape_throttle_retries or not is_backoff_error(exc):
+                    raise
+            attempt += 1
+
+    def _archive_page(self, sort_key: Decimal, url: str, html: str) -> None:
+        try:
+            self.archive.put(self.scraper.source, self.source_id, sort_key, url, html)
+        except (OSError, sqlite3.Error):
+            # The page still gets stored; only a later offline re-parse misses it.
+            logger.exception("Failed to archive chapter page", extra={"url": url})
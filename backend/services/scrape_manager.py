@@ -2,19 +2,31 @@ from __future__ import annotations
 
 import asyncio
 import logging
+import time
 from collections.abc import AsyncGenerator
+from contextlib import aclosing, suppress
 from datetime import UTC, datetime, timedelta
 from decimal import Decimal
 from urllib.parse import urlparse
 
-from fastapi.concurrency import run_in_threadpool
-from sqlalchemy import select
+from sqlalchemy import select, update
 from sqlalchemy.orm import Session
+from sqlalchemy.orm.attributes import set_committed_value
 
-from app.db import SessionLocal
+from app.clients import Validators
+from app.db import SessionLocal, get_async_sessionmaker, release_connection
 from app.models import ScrapeJob, Work
 from app.scrapers import scraper_registry
+from observability.metrics import (
+    SCRAPE_CHAPTER_SECONDS,
+    SCRAPE_CHAPTERS_TOTAL,
+    SCRAPE_JOBS_ACTIVE,
+    SCRAPE_QUEUE_DEPTH,
+)
 from services.chapters import ChaptersService
+from services.parse_executor import get_parse_executor
+from services.scrape_engine import ScrapeEngine
+from services.translation_jobs import TranslationJobs
 from services.translation_stream import TranslationStreamService
 
 logger = logging.getLogger(__name__)
@@ -31,6 +43,13 @@ def _source_chapter_id_from_url(url: str) -> str | None:
     segments = [segment for segment in urlparse(url).path.split("/") if segment]
     return segments[-1] if segments else None
 
+
+# A running job writes a heartbeat on this timer, so one whose host is paused
+# for minutes (see scrape_engine._MAX_PAUSE_S) still looks alive; a job with no
+# heartbeat for _STALE_AFTER is presumed dead.
+_HEARTBEAT_INTERVAL_S = 30.0
+_STALE_AFTER = timedelta(minutes=2)
+
 # In-memory broadcaster for SSE
 # Map: work_id -> list of queues
 _subscribers: dict[int, list[asyncio.Queue]] = {}
@@ -72,7 +91,7 @@ class ScrapeManager:
         if not job:
             return None
 
-        # Check for timeout (2 minutes since last update)
+        # Check for timeout (no heartbeat within _STALE_AFTER)
         # Assuming updated_at is timezone aware or UTC
         now = datetime.now(UTC)
         # Ensure updated_at has timezone info for comparison
@@ -80,7 +99,7 @@ class ScrapeManager:
         if last_update.tzinfo is None:
             last_update = last_update.replace(tzinfo=UTC)
 
-        if now - last_update > timedelta(minutes=2):
+        if now - last_update > _STALE_AFTER:
             logger.warning(f"Marking stale scrape job {job.id} as failed (timeout)")
             job.status = "failed"
             self.db.add(job)
@@ -109,9 +128,11 @@ class ScrapeManager:
                 logger.error(f"Scrape job {job_id} not found")
                 return
 
+            remaining = 0
+            SCRAPE_JOBS_ACTIVE.inc()
+            heartbeat = asyncio.create_task(self._heartbeat(job))
             try:
-                job.status = "running"
-                db.commit()
+                await self._update_job(job, status="running")
                 await self._broadcast(job.work_id, "job-status", {"status": "running"})
 
                 # Fetch work
@@ -130,8 +151,9 @@ class ScrapeManager:
 
                 # Expand specific keys to scrape
                 keys_to_scrape = chapters_service._expand_sort_keys(start_key, end_key)
-                job.total = len(keys_to_scrape)
-                db.commit()
+                await self._update_job(job, total=len(keys_to_scrape))
+                remaining = job.total
+                SCRAPE_QUEUE_DEPTH.inc(remaining)
                 await self._broadcast(
                     job.work_id,
                     "job-status",
@@ -145,114 +167,152 @@ class ScrapeManager:
                 skipped_count = 0
                 chapter_errors: list[dict] = []
 
-                for i, sort_key in enumerate(keys_to_scrape):
-                    # Check for cancellation/freshness
-                    db.refresh(job)
-                    if job.status not in ["running", "pending"]:
-                        logger.info(f"Job {job.id} cancelled or usurped")
-                        return
-
-                    # Update heartbeat
-                    job.updated_at = datetime.now(UTC)
-                    db.commit()
-
-                    try:
-                        # Scrape Logic. build_chapter_url is wrapped in a threadpool
-                        # because some sources (e.g. Kakuyomu) do a blocking HTTP fetch
-                        # to resolve opaque chapter ids, which would otherwise stall the
-                        # event loop and every work's SSE broadcasts.
-                        chapter_url = await run_in_threadpool(
-                            scraper.build_chapter_url, work.source_id, sort_key
-                        )
-                        source_chapter_id = _source_chapter_id_from_url(chapter_url)
-
-                        # Run synchronous scrape in threadpool to avoid blocking event loop
-                        title, normalized_text = await run_in_threadpool(
-                            scraper.scrape_chapter, chapter_url
-                        )
-
-                        # Verify we can persist
-                        db.refresh(work)  # Ensure work attached
-
-                        # Replicate chapter save logic for granular control
-
-                        text_hash = chapters_service._hash_text(normalized_text)
-
-                        # Check existing
-                        existing = chapters_service._load_existing_chapters(work.id, [sort_key])
-                        existing_chapter = existing.get(sort_key)
-                        idx = chapters_service._idx_from_sort_key(sort_key)
-
-                        if existing_chapter:
-                            text_changed = existing_chapter.text_hash != text_hash
-                            if force or text_changed:
-                                existing_chapter.idx = idx
-                                existing_chapter.sort_key = sort_key
-                                existing_chapter.source_chapter_id = source_chapter_id
-                                existing_chapter.title = title
-                                existing_chapter.normalized_text = normalized_text
-                                existing_chapter.text_hash = text_hash
-                                db.add(existing_chapter)
-
-                                # Regenerate segments if text changed
-                                if text_changed:
-                                    translation_service = TranslationStreamService(db)
-                                    translation_service.regenerate_chapter_segments(
-                                        existing_chapter
+                # Chapters are fetched ahead concurrently (politely, per host) and
+                # stored here one at a time, in sort_key order. Unless forced, the
+                # ones already stored are revalidated with their page's validators.
+                stored_validators = (
+                    {}
+                    if force
+                    else {
+                        key: Validators(chapter.etag, chapter.last_modified)
+                        for key, chapter in chapters_service._load_existing_chapters(
+                            work.id, keys_to_scrape
+                        ).items()
+                    }
+                )
+                engine = ScrapeEngine(scraper, work.source_id, validators=stored_validators)
+                # Parse workers start while the first pages download.
+                get_parse_executor().warm()
+                release_connection(db)
+                async with aclosing(engine.chapters(keys_to_scrape)) as fetched_chapters:
+                    i = 0
+                    async for fetched in fetched_chapters:
+                        sort_key = fetched.sort_key
+                        # Check for cancellation/freshness; leaving the loop
+                        # cancels the fetches still in flight.
+                        status = await self._job_status(job.id)
+                        if status not in ["running", "pending"]:
+                            logger.info(f"Job {job.id} cancelled or usurped")
+                            return
+
+                        store_started = time.perf_counter()
+                        try:
+                            if fetched.error is not None:
+                                raise fetched.error
+                            if fetched.not_modified:
+                                # Unchanged since stored: nothing downloaded or parsed.
+                                skipped_count += 1
+                                SCRAPE_CHAPTERS_TOTAL.inc(outcome="skipped")
+                                continue
+                            title, normalized_text = fetched.title, fetched.text
+                            source_chapter_id = _source_chapter_id_from_url(fetched.url)
+
+                            # Verify we can persist
+                            db.refresh(work)  # Ensure work attached
+
+                            # Replicate chapter save logic for granular control
+
+                            text_hash = chapters_service._hash_text(normalized_text)
+
+                            # Check existing
+                            existing = chapters_service._load_existing_chapters(work.id, [sort_key])
+                            existing_chapter = existing.get(sort_key)
+                            idx = chapters_service._idx_from_sort_key(sort_key)
+
+                            if existing_chapter:
+                                # Saved with this chapter's commit, never ahead of it,
+                                # so a page that failed to store is fetched in full again.
+                                if fetched.validators is not None:
+                                    existing_chapter.etag = fetched.validators.etag
+                                    existing_chapter.last_modified = (
+                                        fetched.validators.last_modified
                                     )
-
+                                text_changed = existing_chapter.text_hash != text_hash
+                                if force or text_changed:
+                                    existing_chapter.idx = idx
+                                    existing_chapter.sort_key = sort_key
+                                    existing_chapter.source_chapter_id = source_chapter_id
+                                    existing_chapter.title = title
+                                    existing_chapter.normalized_text = normalized_text
+                                    existing_chapter.text_hash = text_hash
+                                    db.add(existing_chapter)
+
+                                    # Re-align segments if text changed, keeping the
+                                    # translations of paragraphs the edit did not touch
+                                    if text_changed:
+                                        await TranslationJobs(db).cancel(existing_chapter)
+                                        translation_service = TranslationStreamService(db)
+                                        translation_service.resegment_chapter(existing_chapter)
+
+                                    await self._broadcast(
+                                        job.work_id,
+                                        "chapter-found",
+                                        {
+                                            "idx": float(sort_key),
+                                            "title": title,
+                                            "status": "updated",
+                                        },
+                                    )
+                                    updated_count += 1
+                                    SCRAPE_CHAPTERS_TOTAL.inc(outcome="updated")
+                                else:
+                                    skipped_count += 1
+                                    SCRAPE_CHAPTERS_TOTAL.inc(outcome="skipped")
+                            else:
+                                # Create new
+                                from app.models import Chapter
+
+                                new_chapter = Chapter(
+                                    work_id=work.id,
+                                    idx=idx,
+                                    sort_key=sort_key,
+                                    source_chapter_id=source_chapter_id,
+                                    title=title,
+                                    normalized_text=normalized_text,
+                                    text_hash=text_hash,
+                                )
+                                if fetched.validators is not None:
+                                    new_chapter.etag = fetched.validators.etag
+                                    new_chapter.last_modified = fetched.validators.last_modified
+                                db.add(new_chapter)
                                 await self._broadcast(
                                     job.work_id,
                                     "chapter-found",
-                                    {"idx": float(sort_key), "title": title, "status": "updated"},
+                                    {"idx": float(sort_key), "title": title, "status": "created"},
                                 )
-                                updated_count += 1
-                            else:
-                                skipped_count += 1
-                        else:
-                            # Create new
-                            from app.models import Chapter
-
-                            new_chapter = Chapter(
-                                work_id=work.id,
-                                idx=idx,
-                                sort_key=sort_key,
-                                source_chapter_id=source_chapter_id,
-                                title=title,
-                                normalized_text=normalized_text,
-                                text_hash=text_hash,
+                                created_count += 1
+                                SCRAPE_CHAPTERS_TOTAL.inc(outcome="created")
+
+                            db.commit()
+
+                        except Exception as e:
+                            logger.error(f"Error scraping chapter {sort_key}: {e}")
+                            chapter_errors.append({"chapter": float(sort_key), "reason": str(e)})
+                            SCRAPE_CHAPTERS_TOTAL.inc(outcome="error")
+                            await self._broadcast(
+                                job.work_id,
+                                "chapter-error",
+                                {"chapter": float(sort_key), "reason": str(e)},
                             )
-                            db.add(new_chapter)
+                        finally:
+                            SCRAPE_CHAPTER_SECONDS.observe(
+                                fetched.seconds + time.perf_counter() - store_started
+                            )
+                            remaining -= 1
+                            SCRAPE_QUEUE_DEPTH.dec()
+                            i += 1
+                            await self._update_job(job, progress=i)
                             await self._broadcast(
                                 job.work_id,
-                                "chapter-found",
-                                {"idx": float(sort_key), "title": title, "status": "created"},
+                                "job-status",
+                                {
+                                    "status": "running",
+                                    "progress": job.progress,
+                                    "total": job.total,
+                                },
                             )
-                            created_count += 1
-
-                        db.commit()
-
-                    except Exception as e:
-                        logger.error(f"Error scraping chapter {sort_key}: {e}")
-                        chapter_errors.append({"chapter": float(sort_key), "reason": str(e)})
-                        await self._broadcast(
-                            job.work_id,
-                            "chapter-error",
-                            {"chapter": float(sort_key), "reason": str(e)},
-                        )
-                    finally:
-                        job.updated_at = datetime.now(UTC)
-                        job.progress = i + 1
-                        db.commit()
-                        await self._broadcast(
-                            job.work_id,
-                            "job-status",
-                            {
-                                "status": "running",
-                                "progress": job.progress,
-                                "total": job.total,
-                            },
-                        )
+                        # No connection held while the next chapter is awaited.
+                        release_connection(db)
 
                 # Determine terminal status
                 has_successes = (created_count + updated_count + skipped_count) > 0
@@ -261,14 +321,16 @@ class ScrapeManager:
                 else:
                     terminal_status = "completed"
 
-                job.status = terminal_status
-                job.progress = job.total
-                job.created_count = created_count
-                job.updated_count = updated_count
-                job.skipped_count = skipped_count
-                job.failed_count = len(chapter_errors)
-                job.error_details = chapter_errors if chapter_errors else None
-                db.commit()
+                await self._update_job(
+                    job,
+                    status=terminal_status,
+                    progress=job.total,
+                    created_count=created_count,
+                    updated_count=updated_count,
+                    skipped_count=skipped_count,
+                    failed_count=len(chapter_errors),
+                    error_details=chapter_errors if chapter_errors else None,
+                )
                 await self._broadcast(
                     job.work_id,
                     "job-status",
@@ -286,12 +348,46 @@ class ScrapeManager:
 
             except Exception as e:
                 logger.error(f"Job {job_id} failed: {e}")
-                job.status = "failed"
                 # TODO: Store error reason
-                db.commit()
+                await self._update_job(job, status="failed")
                 await self._broadcast(
                     job.work_id, "job-status", {"status": "failed", "error": str(e)}
                 )
+            finally:
+                heartbeat.cancel()
+                with suppress(asyncio.CancelledError):
+                    await heartbeat
+                SCRAPE_JOBS_ACTIVE.dec()
+                SCRAPE_QUEUE_DEPTH.dec(remaining)
+
+    @staticmethod
+    async def _update_job(job: ScrapeJob, **values) -> None:
+        """Write job bookkeeping (and a heartbeat) through the async engine.
+
+        The chapters themselves still go through the job's sync session; the
+        new values are mirrored onto ``job`` as committed so it stays current.
+        """
+        values["updated_at"] = datetime.now(UTC)
+        async with get_async_sessionmaker()() as session:
+            await session.execute(update(ScrapeJob).where(ScrapeJob.id == job.id).values(**values))
+            await session.commit()
+        for key, value in values.items():
+            set_committed_value(job, key, value)
+
+    @staticmethod
+    async def _heartbeat(job: ScrapeJob) -> None:
+        """Refresh the job's heartbeat on a timer, including while no chapter arrives."""
+        while True:
+            await asyncio.sleep(_HEARTBEAT_INTERVAL_S)
+            try:
+                await ScrapeManager._update_job(job)
+            except Exception:
+                logger.warning(f"Heartbeat for scrape job {job.id} failed", exc_info=True)
+
+    @staticmethod
+    async def _job_status(job_id: int) -> str | None:
+        async with get_async_sessionmaker()() as session:
+            return await session.scalar(select(ScrapeJob.status).where(ScrapeJob.id == job_id))
 
     async def subscribe(self, work_id: int) -> AsyncGenerator[dict, None]:
         """Subscribe to SSE events for a work."""
@@ -0,0 +1,439 @@
+from __future__ import annotations
+
+import asyncio
+import logging
+from collections.abc import AsyncGenerator, Coroutine
+from contextlib import suppress
+from dataclasses import dataclass, field
+from datetime import UTC, datetime, timedelta
+from decimal import Decimal
+from typing import Any
+
+from sqlalchemy import and_, or_, select, update
+from sqlalchemy.orm import Session
+
+from app.config import settings
+from app.db import SessionLocal, get_async_sessionmaker
+from app.models import (
+    Chapter,
+    ChapterGroup,
+    ChapterGroupMember,
+    ChapterTranslation,
+    TranslationBatchJob,
+)
+from services.exceptions import ChapterGroupNotFoundError
+from services.translation_jobs import TranslationJobs
+from services.translation_stream import TranslationStreamService
+from services.translation_workflow import TranslationErrorEvent
+
+logger = logging.getLogger(__name__)
+
+ACTIVE_BATCH_STATUSES = ("pending", "running")
+
+# The process running a job refreshes its heartbeat (``updated_at``) on this
+# timer; a running job with no heartbeat for _STALE_AFTER may be claimed by
+# another process, as for scrape jobs.
+_HEARTBEAT_INTERVAL_S = 30.0
+_STALE_AFTER = timedelta(minutes=2)
+
+# In-memory broadcaster for SSE
+# Map: work_id -> list of queues
+_subscribers: dict[int, list[asyncio.Queue]] = {}
+
+# Running batch tasks by job id, kept so they are not garbage collected mid-run.
+_job_tasks: dict[int, asyncio.Task[None]] = {}
+
+# Process-wide budget shared by every batch job, created lazily on the running loop.
+_chapter_slots: asyncio.Semaphore | None = None
+_segment_slots: asyncio.Semaphore | None = None
+
+
+def _get_chapter_slots() -> asyncio.Semaphore:
+    global _chapter_slots
+    if _chapter_slots is None:
+        _chapter_slots = asyncio.Semaphore(max(1, settings.translation_batch_chapter_concurrency))
+    return _chapter_slots
+
+
+def _get_segment_slots() -> asyncio.Semaphore:
+    global _segment_slots
+    if _segment_slots is None:
+        _segment_slots = asyncio.Semaphore(max(1, settings.translation_batch_segment_concurrency))
+    return _segment_slots
+
+
+@dataclass(slots=True)
+class BatchProgress:
+    """A batch job's status and counts, in the shape progress events carry."""
+
+    job_id: int
+    status: str
+    total: int
+    progress: int = 0
+    completed: int = 0
+    errors: list[dict] = field(default_factory=list)
+
+    @classmethod
+    def from_job(cls, job: TranslationBatchJob) -> BatchProgress:
+        return cls(
+            job_id=job.id,
+            status=job.status,
+            total=job.total,
+            progress=job.progress,
+            completed=job.completed_count,
+            errors=list(job.error_details or []),
+        )
+
+    def columns(self) -> dict[str, Any]:
+        """The job row's values for these counts."""
+        return {
+            "progress": self.progress,
+            "total": self.total,
+            "completed_count": self.completed,
+            "failed_count": len(self.errors),
+            "error_details": list(self.errors) or None,
+        }
+
+    def payload(self) -> dict[str, Any]:
+        return {
+            "job_id": self.job_id,
+            "status": self.status,
+            "progress": self.progress,
+            "total": self.total,
+            "completed": self.completed,
+            "failed": len(self.errors),
+            "errors": list(self.errors),
+        }
+
+
+class TranslationBatchManager:
+    """Schedules work-level batch translations and broadcasts their progress.
+
+    Each chapter is translated through the chapter translation registry, so a
+    reader opening a chapter mid-batch tails the same run. Chapters and segment
+    requests are capped by a budget shared across all works.
+
+    A job runs in the process that claims it; that process keeps a heartbeat
+    on the row, so the job is taken over if it dies (see :meth:`_claim`).
+    """
+
+    def __init__(self, db: Session):
+        self.db = db
+
+    def resolve_chapter_ids(
+        self,
+        work_id: int,
+        *,
+        start: Decimal | None = None,
+        end: Decimal | None = None,
+        chapter_group_id: int | None = None,
+    ) -> list[int]:
+        """Return the chapter ids a batch should walk, in reading order."""
+        if chapter_group_id is not None:
+            group = self.db.get(ChapterGroup, chapter_group_id)
+            if group is None or group.work_id != work_id:
+                raise ChapterGroupNotFoundError(f"Group {chapter_group_id} not found")
+            stmt = (
+                select(ChapterGroupMember.chapter_id)
+                .where(ChapterGroupMember.group_id == chapter_group_id)
+                .order_by(ChapterGroupMember.order_index)
+            )
+            return list(self.db.execute(stmt).scalars().all())
+
+        stmt = select(Chapter.id).where(Chapter.work_id == work_id)
+        if start is not None:
+            stmt = stmt.where(Chapter.sort_key >= start)
+        if end is not None:
+            stmt = stmt.where(Chapter.sort_key <= end)
+        return list(self.db.execute(stmt.order_by(Chapter.sort_key)).scalars().all())
+
+    def create_job(
+        self,
+        work_id: int,
+        *,
+        start: Decimal | None = None,
+        end: Decimal | None = None,
+        chapter_group_id: int | None = None,
+    ) -> TranslationBatchJob:
+        """Create a new batch translation job record."""
+        chapter_ids = self.resolve_chapter_ids(
+            work_id, start=start, end=end, chapter_group_id=chapter_group_id
+        )
+        job = TranslationBatchJob(
+            work_id=work_id,
+            chapter_group_id=chapter_group_id,
+            start=start,
+            end=end,
+            chapter_ids=chapter_ids,
+            status="pending",
+            progress=0,
+            total=len(chapter_ids),
+        )
+        self.db.add(job)
+        self.db.commit()
+        self.db.refresh(job)
+        return job
+
+    def get_active_job(self, work_id: int) -> TranslationBatchJob | None:
+        stmt = select(TranslationBatchJob).where(
+            TranslationBatchJob.work_id == work_id,
+            TranslationBatchJob.status.in_(ACTIVE_BATCH_STATUSES),
+        )
+        return self.db.execute(stmt).scalars().first()
+
+    def get_latest_job(self, work_id: int) -> TranslationBatchJob | None:
+        """Return the most recent batch job for a work."""
+        stmt = (
+            select(TranslationBatchJob)
+            .where(TranslationBatchJob.work_id == work_id)
+            .order_by(TranslationBatchJob.created_at.desc(), TranslationBatchJob.id.desc())
+        )
+        return self.db.execute(stmt).scalars().first()
+
+    def cancel_job(self, work_id: int) -> TranslationBatchJob | None:
+        """Mark the work's active batch cancelled.
+
+        Chapters already translating finish their run; no further chapters start.
+        """
+        job = self.get_active_job(work_id)
+        if job is None:
+            return None
+        job.status = "cancelled"
+        self.db.add(job)
+        self.db.commit()
+        return job
+
+    def start_job(self, job_id: int) -> None:
+        """Run the job in the background on the current event loop."""
+        self._spawn(job_id, self.run_job(job_id))
+
+    def resume_incomplete_jobs(self) -> list[int]:
+        """Take over jobs left pending or running by a previous process.
+
+        Every worker process calls this on startup; each job runs in the one
+        that claims it, and the others keep watching in case that one dies.
+        """
+        stmt = select(TranslationBatchJob.id).where(
+            TranslationBatchJob.status.in_(ACTIVE_BATCH_STATUSES)
+        )
+        job_ids = list(self.db.execute(stmt).scalars().all())
+        for job_id in job_ids:
+            logger.info(f"Resuming batch translation job {job_id}")
+            self._spawn(job_id, self._resume(job_id))
+        return job_ids
+
+    @staticmethod
+    def _spawn(job_id: int, run: Coroutine[Any, Any, None]) -> None:
+        existing = _job_tasks.get(job_id)
+        if existing is not None and not existing.done():
+            run.close()
+            return
+        task = asyncio.create_task(run)
+        _job_tasks[job_id] = task
+        task.add_done_callback(lambda _: _job_tasks.pop(job_id, None))
+
+    async def _resume(self, job_id: int) -> None:
+        """Claim the job once its owner's heartbeat goes stale, unless it ends first."""
+        while not await self._claim(job_id):
+            if await self._job_status(job_id) not in ACTIVE_BATCH_STATUSES:
+                return
+            await asyncio.sleep(_HEARTBEAT_INTERVAL_S)
+        await self._run_claimed(job_id)
+
+    async def run_job(self, job_id: int) -> None:
+        """Translate every chapter of the job within the shared budget.
+
+        Chapters that are already fully translated complete immediately, so a
+        resumed job only spends tokens on what is left. The job only runs if
+        this call claims it (see :meth:`_claim`).
+        """
+        if not await self._claim(job_id):
+            logger.info(f"Batch translation job {job_id} is not claimable; not running")
+            return
+        await self._run_claimed(job_id)
+
+    async def _run_claimed(self, job_id: int) -> None:
+        async with get_async_sessionmaker()() as session:
+            job = await session.get(TranslationBatchJob, job_id)
+        if job is None:
+            logger.error(f"Batch translation job {job_id} not found")
+            return
+
+        work_id = job.work_id
+        chapter_ids = list(job.chapter_ids or [])
+        state = BatchProgress(job_id=job_id, status="running", total=len(chapter_ids))
+        # Chapter runs finish in any order; writes go out one at a time so an
+        # older snapshot never lands after a newer one.
+        write_lock = asyncio.Lock()
+
+        async def save() -> None:
+            async with write_lock:
+                await self._update_job(job_id, **state.columns())
+
+        heartbeat = asyncio.create_task(self._heartbeat(job_id))
+        try:
+            await save()
+            await self._broadcast(work_id, "job-status", state.payload())
+
+            chapter_slots = _get_chapter_slots()
+
+            async def run_chapter(chapter_id: int) -> None:
+                async with chapter_slots:
+                    if await self._job_status(job_id) != "running":
+                        return
+                    await self._broadcast(
+                        work_id,
+                        "chapter-status",
+                        {"chapter_id": chapter_id, "status": "running"},
+                    )
+                    try:
+                        error = await self._translate_chapter(work_id, chapter_id)
+                    except Exception as e:
+                        logger.error(f"Error translating chapter {chapter_id}: {e}")
+                        error = str(e)
+
+                if error is None:
+                    state.completed += 1
+                else:
+                    state.errors.append({"chapter_id": chapter_id, "reason": error})
+                state.progress += 1
+                await save()
+                await self._broadcast(
+                    work_id,
+                    "chapter-status",
+                    {
+                        "chapter_id": chapter_id,
+                        "status": "completed" if error is None else "failed",
+                        **({"reason": error} if error is not None else {}),
+                    },
+                )
+                await self._broadcast(work_id, "job-status", state.payload())
+
+            await asyncio.gather(*(run_chapter(chapter_id) for chapter_id in chapter_ids))
+
+            if state.errors:
+                status = "partial" if state.completed else "failed"
+            else:
+                status = "completed"
+            if await self._update_job(job_id, from_status="running", status=status):
+                state.status = status
+            else:
+                state.status = await self._job_status(job_id) or state.status
+                logger.info(f"Batch translation job {job_id} is {state.status}")
+            await self._broadcast(work_id, "job-status", state.payload())
+
+        except asyncio.CancelledError:
+            # Process shutdown: hand the job back so the next process resumes it
+            # without waiting for the heartbeat to go stale.
+            await self._update_job(job_id, from_status="running", status="pending")
+            raise
+        except Exception as e:
+            logger.error(f"Batch translation job {job_id} failed: {e}")
+            await self._update_job(job_id, from_status="running", status="failed")
+            await self._broadcast(work_id, "job-status", {"status": "failed", "error": str(e)})
+        finally:
+            heartbeat.cancel()
+            with suppress(asyncio.CancelledError):
+                await heartbeat
+
+    @staticmethod
+    async def _claim(job_id: int) -> bool:
+        """Atomically mark the job running here, if it is pending or its owner died.
+
+        Only one process's ``UPDATE`` matches, however many resume the job.
+        """
+        now = datetime.now(UTC)
+        stmt = (
+            update(TranslationBatchJob)
+            .where(
+                TranslationBatchJob.id == job_id,
+                or_(
+                    TranslationBatchJob.status == "pending",
+                    and_(
+                        TranslationBatchJob.status == "running",
+                        TranslationBatchJob.updated_at < now - _STALE_AFTER,
+                    ),
+                ),
+            )
+            .values(status="running", updated_at=now)
+        )
+        async with get_async_sessionmaker()() as session:
+            result = await session.execute(stmt)
+            await session.commit()
+        return result.rowcount == 1
+
+    @staticmethod
+    async def _update_job(job_id: int, *, from_status: str | None = None, **values) -> bool:
+        """Write job bookkeeping (and a heartbeat); ``from_status`` guards a transition."""
+        values["updated_at"] = datetime.now(UTC)
+        stmt = update(TranslationBatchJob).where(TranslationBatchJob.id == job_id)
+        if from_status is not None:
+            stmt = stmt.where(TranslationBatchJob.status == from_status)
+        async with get_async_sessionmaker()() as session:
+            result = await session.execute(stmt.values(**values))
+            await session.commit()
+        return result.rowcount == 1
+
+    @staticmethod
+    async def _heartbeat(job_id: int) -> None:
+        """Refresh the claim on a timer, including while chapters take minutes."""
+        while True:
+            await asyncio.sleep(_HEARTBEAT_INTERVAL_S)
+            try:
+                await TranslationBatchManager._update_job(job_id, from_status="running")
+            except Exception:
+                logger.warning(f"Heartbeat for batch job {job_id} failed", exc_info=True)
+
+    @staticmethod
+    async def _job_status(job_id: int) -> str | None:
+        async with get_async_sessionmaker()() as session:
+            return await session.scalar(
+                select(TranslationBatchJob.status).where(TranslationBatchJob.id == job_id)
+            )
+
+    async def _translate_chapter(self, work_id: int, chapter_id: int) -> str | None:
+        """Run (or join) the chapter's translation; return an error reason on failure."""
+        # A session of its own, closed before the run is awaited: chapters of a
+        # job run concurrently and must not flush or expire each other's objects.
+        with SessionLocal() as db:
+            chapter = db.get(Chapter, chapter_id)
+            if chapter is None or chapter.work_id != work_id:
+                return "chapter not found"
+            translation_id = TranslationStreamService(db).get_or_create_translation(chapter_id).id
+            handle = await TranslationJobs(db).ensure(
+                chapter, work_id, prompt_override=None, segment_slots=_get_segment_slots()
+            )
+        await handle.done.wait()
+
+        async with get_async_sessionmaker()() as session:
+            status = await session.scalar(
+                select(ChapterTranslation.status).where(ChapterTranslation.id == translation_id)
+            )
+        if status == "completed":
+            return None
+        errors = [ev.error for _, ev in handle.buffer if isinstance(ev, TranslationErrorEvent)]
+        return errors[-1] if errors else f"translation ended with status {status}"
+
+    @staticmethod
+    async def subscribe(work_id: int) -> AsyncGenerator[dict, None]:
+        """Subscribe to SSE events for a work's batch translations; needs no session."""
+        queue: asyncio.Queue = asyncio.Queue()
+        if work_id not in _subscribers:
+            _subscribers[work_id] = []
+        _subscribers[work_id].append(queue)
+
+        try:
+            while True:
+                msg = await queue.get()
+                yield msg
+        finally:
+            if work_id in _subscribers:
+                if queue in _subscribers[work_id]:
+                    _subscribers[work_id].remove(queue)
+                if not _subscribers[work_id]:
+                    del _subscribers[work_id]
+
+    async def _broadcast(self, work_id: int, event_type: str, data: dict):
+        """Push event to all subscribers."""
+        for q in _subscribers.get(work_id, []):
+            await q.put({"event": event_type, "data": data})
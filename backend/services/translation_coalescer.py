@@ -0,0 +1,123 @@
+from __future__ import annotations
+
+import asyncio
+import contextlib
+import time
+from collections.abc import AsyncGenerator, AsyncIterator
+from dataclasses import dataclass, field, replace
+from typing import Any
+
+from services.translation_workflow import SegmentDeltaEvent
+
+# ``(event_id, event)`` as streamed to SSE; the id is ``None`` for streams that
+# are not resumable.
+IdentifiedEvent = tuple[str | None, Any]
+
+
+async def coalesce_segment_deltas(
+    events: AsyncIterator[IdentifiedEvent],
+    *,
+    max_chars: int,
+    max_delay_ms: int,
+) -> AsyncGenerator[IdentifiedEvent, None]:
+    """Merge consecutive deltas of a segment into fewer, larger delta events.
+
+    Buffered text is released once it reaches ``max_chars``, once ``max_delay_ms``
+    has passed since its first delta, or before any other event, so ordering is
+    unchanged. A merged delta carries the id of the last delta it absorbed. A
+    limit of 0 disables that limit; with both at 0 (or ``max_chars`` of 1)
+    events pass through untouched.
+    """
+    if max_delay_ms <= 0 and max_chars <= 1:
+        async for item in events:
+            yield item
+        return
+
+    loop = asyncio.get_running_loop()
+    max_delay_s = max_delay_ms / 1000
+    pending: SegmentDeltaEvent | None = None
+    pending_id: str | None = None
+    deadline: float | None = None
+    next_item: asyncio.Future[IdentifiedEvent] | None = None
+    try:
+        while True:
+            if next_item is None:
+                next_item = asyncio.ensure_future(anext(events))
+            timeout = None if deadline is None else max(0.0, deadline - loop.time())
+            done, _ = await asyncio.wait({next_item}, timeout=timeout)
+            if not done:
+                # Upstream is slow; release what we have and keep waiting on it.
+                yield pending_id, pending
+                pending, deadline = None, None
+                continue
+
+            try:
+                event_id, event = next_item.result()
+            except StopAsyncIteration:
+                next_item = None
+                break
+            next_item = None
+
+            if isinstance(event, SegmentDeltaEvent):
+                if pending is not None and (
+                    pending.chapter_translation_id == event.chapter_translation_id
+                    and pending.segment_id == event.segment_id
+                ):
+                    pending = replace(pending, delta=pending.delta + event.delta)
+                else:
+                    if pending is not None:
+                        yield pending_id, pending
+                    pending = event
+                    deadline = loop.time() + max_delay_s if max_delay_s > 0 else None
+                pending_id = event_id
+                if max_chars > 0 and len(pending.delta) >= max_chars:
+                    yield pending_id, pending
+                    pending, deadline = None, None
+                continue
+
+            if pending is not None:
+                yield pending_id, pending
+                pending, deadline = None, None
+            yield event_id, event
+
+        if pending is not None:
+            yield pending_id, pending
+    finally:
+        if next_item is not None and not next_item.done():
+            next_item.cancel()
+            with contextlib.suppress(asyncio.CancelledError, StopAsyncIteration):
+                await next_item
+        aclose = getattr(events, "aclose", None)
+        if aclose is not None:
+            await aclose()
+
+
+@dataclass
+class SSEStreamStats:
+    """Frame and byte counts for one SSE response, as written to the client."""
+
+    frames: int = 0
+    bytes: int = 0
+    started_at: float = field(default_factory=time.monotonic)
+
+    def record(self, frame: dict) -> None:
+        self.frames += 1
+        # sse-starlette frames each event as "[id: ...\r\n]event: ...\r\ndata: ...\r\n\r\n".
+        text = f"event: {frame['event']}\r\ndata: {frame['data']}\r\n\r\n"
+        if frame.get("id") is not None:
+            text = f"id: {frame['id']}\r\n{text}"
+        self.bytes += len(text.encode())
+
+    @property
+    def elapsed_s(self) -> float:
+        return time.monotonic() - self.started_at
+
+    @property
+    def frames_per_second(self) -> float:
+        elapsed = self.elapsed_s
+        return self.frames / elapsed if elapsed > 0 else 0.0
+
+    @property
+    def bytes_per_second(self) -> float:
+        elapsed = self.elapsed_s
+        return self.bytes / elapsed if elapsed > 0 else 0.0
@@ -0,0 +1,269 @@
+from __future__ import annotations
+
+import asyncio
+import logging
+import secrets
+from collections.abc import AsyncGenerator, Awaitable, Callable
+from dataclasses import dataclass
+from typing import Any, cast
+
+from sqlalchemy import select
+from sqlalchemy.orm import Session, undefer
+
+from app.config import settings
+from app.db import SessionLocal, release_connection
+from app.models import Chapter, ChapterTranslation
+from services.explanation_generation_registry import GenerationHandle, GenerationRegistry
+from services.translation_stream import TranslationStreamService
+from services.translation_workflow import (
+    SegmentCompleteEvent,
+    SegmentDeltaEvent,
+    TranslationEvent,
+    TranslationStatusEvent,
+    TranslationWorkflow,
+)
+
+logger = logging.getLogger(__name__)
+
+# Poll cadence when waiting on the subscriber queue. Small enough to notice
+# client disconnects promptly, large enough to stay idle most of the time.
+_SUBSCRIBE_POLL_INTERVAL_S = 1.0
+
+
+@dataclass
+class TranslationResyncEvent:
+    """Tells a subscriber its replay is incomplete and it must reload the state."""
+
+    chapter_translation_id: int
+
+
+class TranslationJobHandle(GenerationHandle):
+    """Generation handle for a chapter translation run.
+
+    Every event is numbered as it is emitted; the buffer and subscriber queues
+    carry ``(seq, event)`` pairs so a reconnecting client can resume after the
+    last event it saw. ``event_id`` combines the sequence with a per-run token,
+    so ids from an earlier run are never mistaken for this one.
+
+    Translation runs emit token-level deltas, so the replay buffer drops a
+    segment's deltas once its ``SegmentCompleteEvent`` (which carries the full
+    text) arrives. The buffer then holds one start/complete pair per finished
+    segment plus the deltas of the segment currently streaming, capped at
+    ``translation_replay_buffer_events`` by evicting the oldest entries.
+    """
+
+    def __init__(self, replay_limit: int | None = None) -> None:
+        super().__init__()
+        self.run_id = secrets.token_hex(4)
+        self.last_seq = 0
+        # Highest sequence number evicted by the cap (0 when nothing was lost).
+        self.evicted_seq = 0
+        self._replay_limit = max(
+            1,
+            replay_limit if replay_limit is not None else settings.translation_replay_buffer_events,
+        )
+
+    def event_id(self, seq: int) -> str:
+        return f"{self.run_id}-{seq}"
+
+    def parse_event_id(self, event_id: str | None) -> int | None:
+        """Return the sequence number of an id from this run, else ``None``."""
+        if not event_id:
+            return None
+        run_id, _, seq = event_id.strip().rpartition("-")
+        if run_id != self.run_id or not seq.isdigit():
+            return None
+        return int(seq)
+
+    def emit(self, event: Any) -> None:
+        if isinstance(event, SegmentCompleteEvent):
+            self.buffer = [
+                (seq, ev)
+                for seq, ev in self.buffer
+                if not (isinstance(ev, SegmentDeltaEvent) and ev.segment_id == event.segment_id)
+            ]
+        self.last_seq += 1
+        super().emit((self.last_seq, event))
+        overflow = len(self.buffer) - self._replay_limit
+        if overflow > 0:
+            self.evicted_seq = self.buffer[overflow - 1][0]
+            del self.buffer[:overflow]
+
+    def subscribe(self, after_seq: int | None = None) -> asyncio.Queue[Any]:
+        """Subscribe, replaying buffered events numbered after ``after_seq``."""
+        q: asyncio.Queue[Any] = asyncio.Queue()
+        for seq, ev in self.buffer:
+            if after_seq is None or seq > after_seq:
+                q.put_nowait((seq, ev))
+        if self.done.is_set():
+            q.put_nowait(None)
+        self.subscribers.add(q)
+        return q
+
+    def replay_is_complete(self, after_seq: int | None) -> bool:
+        """Whether replaying after ``after_seq`` misses no evicted events."""
+        return self.evicted_seq <= (after_seq or 0)
+
+
+_registry: GenerationRegistry | None = None
+
+
+def get_translation_registry() -> GenerationRegistry:
+    """Registry of running chapter translations, keyed by ``ChapterTranslation`` id."""
+    global _registry
+    if _registry is None:
+        _registry = GenerationRegistry(handle_factory=TranslationJobHandle, kind="translation")
+    return _registry
+
+
+class TranslationJobs:
+    """Start, tail and cancel background chapter translation runs.
+
+    At most one run exists per ``ChapterTranslation``. SSE connections only
+    subscribe to it, so closing a tab no longer cancels the run and a second
+    tab on the same chapter tails the same run instead of starting another.
+    """
+
+    def __init__(self, db: Session) -> None:
+        self.db = db
+        self._stream_service = TranslationStreamService(db)
+
+    async def is_running(self, chapter: Chapter) -> bool:
+        translation = self._stream_service.get_or_create_translation(chapter.id)
+        handle = await get_translation_registry().get(translation.id)
+        return handle is not None and not handle.done.is_set()
+
+    async def ensure(
+        self,
+        chapter: Chapter,
+        work_id: int,
+        *,
+        prompt_override: dict[str, Any] | None,
+        segment_slots: asyncio.Semaphore | None = None,
+    ) -> TranslationJobHandle:
+        """Return the running handle for this chapter, or start a new run.
+
+        When a run is already in progress ``prompt_override`` and
+        ``segment_slots`` are ignored; the existing run keeps its settings.
+        """
+        translation = self._stream_service.get_or_create_translation(chapter.id)
+        chapter_id = chapter.id
+
+        def producer_factory() -> AsyncGenerator[TranslationEvent, None]:
+            return _run_translation(
+                chapter_id=chapter_id,
+                work_id=work_id,
+                prompt_override=prompt_override,
+                segment_slots=segment_slots,
+            )
+
+        handle = await get_translation_registry().ensure(translation.id, producer_factory)
+        return cast(TranslationJobHandle, handle)
+
+    async def subscribe(
+        self,
+        chapter: Chapter,
+        work_id: int,
+        *,
+        prompt_override: dict[str, Any] | None,
+        is_disconnected: Callable[[], Awaitable[bool]],
+        last_event_id: str | None = None,
+    ) -> AsyncGenerator[tuple[str | None, TranslationEvent | TranslationResyncEvent], None]:
+        """Yield ``(event_id, event)`` pairs of this chapter's run.
+
+        A run is started if none is running. Late subscribers first receive the
+        run's replay buffer; when ``last_event_id`` names an event of the current
+        run, replay starts right after it instead. If the buffer has already
+        evicted events the subscriber needs, a ``TranslationResyncEvent`` (with
+        no id) comes first. Client disconnection only unsubscribes; the run
+        continues to completion.
+        """
+        handle = await self.ensure(chapter, work_id, prompt_override=prompt_override)
+        after_seq = handle.parse_event_id(last_event_id)
+        resync = not handle.replay_is_complete(after_seq)
+        queue = handle.subscribe(after_seq)
+        try:
+            if resync:
+                translation_id = self._stream_service.get_or_create_translation(chapter.id).id
+                release_connection(self.db)
+                yield None, TranslationResyncEvent(chapter_translation_id=translation_id)
+            # Tailing can take minutes; do it without a connection checked out.
+            release_connection(self.db)
+            while True:
+                if await is_disconnected():
+                    return
+                try:
+                    event = await asyncio.wait_for(queue.get(), timeout=_SUBSCRIBE_POLL_INTERVAL_S)
+                except TimeoutError:
+                    continue
+                if event is None:
+                    return
+                seq, event = event
+                yield handle.event_id(seq), event
+        finally:
+            handle.unsubscribe(queue)
+
+    async def cancel(self, chapter: Chapter) -> int | None:
+        """Cancel the chapter's running translation.
+
+        Returns the ``ChapterTranslation`` id when a run was cancelled, or
+        ``None`` if nothing was running. Subscribers receive a final
+        ``idle`` status event before their streams close.
+        """
+        # Look up without creating: a chapter with no translation has nothing to cancel.
+        stmt = (
+            select(ChapterTranslation.id)
+            .where(ChapterTranslation.chapter_id == chapter.id)
+            .order_by(ChapterTranslation.id.asc())
+        )
+        translation_id = self.db.execute(stmt).scalars().first()
+        if translation_id is None:
+            return None
+        registry = get_translation_registry()
+        handle = await registry.get(translation_id)
+        if handle is None or handle.done.is_set():
+            return None
+        final = TranslationStatusEvent(chapter_translation_id=translation_id, status="idle")
+        await registry.cancel(translation_id, emit_final=final)
+        return translation_id
+
+
+async def _never_disconnected() -> bool:
+    return False
+
+
+async def _run_translation(
+    *,
+    chapter_id: int,
+    work_id: int,
+    prompt_override: dict[str, Any] | None,
+    segment_slots: asyncio.Semaphore | None = None,
+) -> AsyncGenerator[TranslationEvent, None]:
+    """Background producer: drives ``TranslationWorkflow.start_or_resume``.
+
+    Opens its own DB session because the request-scoped session that kicked
+    this off may be closed long before the run finishes. The run is only
+    stopped through ``TranslationJobs.cancel``, never by a subscriber leaving.
+    """
+    with SessionLocal() as db:
+        chapter = (
+            db.execute(
+                select(Chapter)
+                .options(undefer(Chapter.normalized_text))
+                .where(Chapter.id == chapter_id)
+            )
+            .scalars()
+            .first()
+        )
+        if chapter is None:
+            logger.warning("translation task: chapter not found", extra={"chapter_id": chapter_id})
+            return
+        workflow = TranslationWorkflow(db)
+        async for event in workflow.start_or_resume(
+            chapter,
+            work_id,
+            prompt_override=prompt_override,
+            is_disconnected=_never_disconnected,
+            segment_slots=segment_slots,
+        ):
+            yield event
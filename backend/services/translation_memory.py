@@ -0,0 +1,47 @@
+from __future__ import annotations
+
+from sqlalchemy import select
+from sqlalchemy.orm import Session
+
+from app.models import Chapter, ChapterTranslation, TranslationSegment
+from app.segment_utils import hash_text
+
+# ChapterTranslation.cache_policy values.
+CACHE_POLICY_REUSE = "reuse"
+CACHE_POLICY_BYPASS = "bypass"
+
+
+class TranslationMemoryService:
+    """Exact-match translation memory over completed segments of a work.
+
+    A segment's ``cache_key`` identifies the (source text, system prompt, model)
+    triple that produced its ``tgt``. It is only set when a segment completes from
+    an un-instructed translation, and cleared whenever ``tgt`` is reset or edited by
+    hand, so any keyed segment holds reusable model output.
+    """
+
+    def __init__(self, session: Session) -> None:
+        self.session = session
+
+    @staticmethod
+    def build_cache_key(src_hash: str, *, model: str, system_prompt: str | None) -> str:
+        return hash_text(f"{src_hash}\x1f{model}\x1f{system_prompt or ''}")
+
+    def lookup(self, work_id: int, cache_key: str) -> str | None:
+        """Return a remembered translation for ``cache_key`` within the work, if any."""
+        stmt = (
+            select(TranslationSegment.tgt)
+            .join(
+                ChapterTranslation,
+                ChapterTranslation.id == TranslationSegment.chapter_translation_id,
+            )
+            .join(Chapter, Chapter.id == ChapterTranslation.chapter_id)
+            .where(
+                TranslationSegment.cache_key == cache_key,
+                TranslationSegment.tgt != "",
+                Chapter.work_id == work_id,
+            )
+            .order_by(TranslationSegment.id.desc())
+            .limit(1)
+        )
+        return self.session.execute(stmt).scalars().first()
@@ -0,0 +1,130 @@
+from __future__ import annotations
+
+import hashlib
+import json
+import threading
+from collections import OrderedDict
+from collections.abc import Callable, Sequence
+from typing import Any
+
+from app.config import settings
+from app.models import Chapter, ChapterTranslation, TranslationSegment
+from app.schemas import ChapterTranslationStateOut, SentenceSpanOut, TranslationSegmentOut
+from app.segment_utils import hash_text
+from app.utils.sentence_splitter import SentenceSpan, get_sentence_splitter
+
+
+class _BoundedCache:
+    """Least-recently-used map; sync routes call in from several threadpool threads."""
+
+    def __init__(self, maxsize: int) -> None:
+        self.maxsize = maxsize
+        self._entries: OrderedDict[str, Any] = OrderedDict()
+        self._lock = threading.Lock()
+
+    def get_or_create(self, key: str, factory: Callable[[], Any]) -> Any:
+        with self._lock:
+            if key in self._entries:
+                self._entries.move_to_end(key)
+                return self._entries[key]
+        value = factory()
+        with self._lock:
+            self._entries[key] = value
+            while len(self._entries) > self.maxsize:
+                self._entries.popitem(last=False)
+        return value
+
+    def __len__(self) -> int:
+        return len(self._entries)
+
+
+# Sentence spans by source hash: a pure function of the source text, so
+# entries never go stale. Rendered state bodies by ETag, which fingerprints
+# everything the body is built from; any edit to a segment, from any writer or
+# process, yields a new ETag, and the old body simply ages out.
+_sentence_spans = _BoundedCache(settings.sentence_span_cache_entries)
+_state_bodies = _BoundedCache(settings.translation_state_cache_entries)
+
+
+def sentence_spans(src: str) -> tuple[SentenceSpan, ...]:
+    """Sentence spans of a segment's source, split once per distinct source.
+
+    Keyed by the source's hash as stored in ``src_hash``, but recomputed from the
+    text itself: a chapter whose text changed without a re-segment keeps stale
+    hashes on its segments.
+    """
+    if not src.strip():
+        return ()
+    return _sentence_spans.get_or_create(
+        hash_text(src), lambda: tuple(get_sentence_splitter().split(src))
+    )
+
+
+def build_translation_state(
+    chapter: Chapter,
+    translation: ChapterTranslation,
+    segments: Sequence[TranslationSegment],
+) -> ChapterTranslationStateOut:
+    chapter_text = chapter.normalized_text
+    payload_segments = []
+    for segment in segments:
+        src = chapter_text[segment.start : segment.end]
+        sentences = [
+            SentenceSpanOut(span_start=span.span_start, span_end=span.span_end, text=span.text)
+            for span in sentence_spans(src)
+        ]
+        payload_segments.append(
+            TranslationSegmentOut(
+                id=segment.id,
+                start=segment.start,
+                end=segment.end,
+                order_index=segment.order_index,
+                src=src,
+                tgt=segment.tgt or "",
+                flags=segment.flags or [],
+                sentences=sentences,
+            )
+        )
+
+    return ChapterTranslationStateOut(
+        chapter_translation_id=translation.id,
+        status=translation.status,
+        segments=payload_segments,
+    )
+
+
+def translation_state_etag(
+    chapter: Chapter,
+    translation: ChapterTranslation,
+    segments: Sequence[TranslationSegment],
+) -> str:
+    """Strong ETag over every input of the state body; needs no chapter text."""
+    digest = hashlib.blake2b(digest_size=16)
+    digest.update(
+        json.dumps([chapter.id, chapter.text_hash, translation.id, translation.status]).encode()
+    )
+    for segment in segments:
+        fields = [
+            segment.id,
+            segment.start,
+            segment.end,
+            segment.order_index,
+            segment.src_hash,
+            segment.tgt or "",
+            segment.flags or [],
+        ]
+        digest.update(json.dumps(fields, ensure_ascii=False).encode())
+    return f'"{digest.hexdigest()}"'
+
+
+def render_translation_state(
+    chapter: Chapter,
+    translation: ChapterTranslation,
+    segments: Sequence[TranslationSegment],
+    etag: str,
+) -> bytes:
+    """The JSON body for ``etag``, built (loading the chapter text) only on a miss."""
+    return _state_bodies.get_or_create(
+        etag,
+        lambda: build_translation_state(chapter, translation, segments).model_dump_json().encode(),
+    )
@@ -1,17 +1,29 @@
 from __future__ import annotations
 
-from collections.abc import Sequence
+from collections.abc import Mapping, Sequence
+from dataclasses import dataclass
+from difflib import SequenceMatcher
 from typing import cast
 
 from sqlalchemy import select
 from sqlalchemy.orm import Session
+from sqlalchemy.orm.attributes import flag_modified
 
-from app.models import Chapter, ChapterTranslation, TranslationSegment
+from app.models import Chapter, ChapterTranslation, TranslationExplanation, TranslationSegment
 from app.segment_utils import hash_text, newline_segment_slices
 
 PARTIAL_TRANSLATION_FLAG = "partial"
 
 
+@dataclass
+class SegmentReconciliation:
+    """Segment counts from ``resegment_chapter``, summed over translations."""
+
+    kept: int = 0
+    added: int = 0
+    removed: int = 0
+
+
 class TranslationStreamService:
     """Helpers for initializing and tracking streaming chapter translations."""
 
@@ -113,7 +125,15 @@ class TranslationStreamService:
         chapter_text: str,
         *,
         limit: int = 3,
+        translated: Mapping[int, str] | None = None,
+        include_untranslated: bool = False,
     ) -> list[dict[str, str]]:
+        """Collect up to ``limit`` preceding segments as ``{"src", "tgt"}`` context.
+
+        ``translated`` supplies finished text for segments whose translation is not
+        persisted yet. With ``include_untranslated`` a preceding segment that has no
+        finished translation contributes its source alone instead of being skipped.
+        """
         if limit <= 0:
             return []
         context: list[dict[str, str]] = []
@@ -121,10 +141,13 @@ class TranslationStreamService:
         for segment in reversed(segments):
             if segment.order_index >= current.order_index:
                 continue
-            if PARTIAL_TRANSLATION_FLAG in (segment.flags or []):
-                continue
-            tgt = (segment.tgt or "").strip()
-            if not tgt:
+            if translated is not None and segment.id in translated:
+                tgt = translated[segment.id].strip()
+            elif PARTIAL_TRANSLATION_FLAG in (segment.flags or []):
+                tgt = ""
+            else:
+                tgt = (segment.tgt or "").strip()
+            if not tgt and not include_untranslated:
                 continue
             src = chapter_text[segment.start : segment.end].strip()
             if not src:
@@ -159,6 +182,7 @@ class TranslationStreamService:
 
         segment.tgt = ""
         segment.explanation = None
+        segment.cache_key = None
         segment.flags = self._with_partial_flag(segment.flags, partial=False)
         self.session.add(segment)
         self.session.commit()
@@ -171,18 +195,26 @@ class TranslationStreamService:
         """Persist an in-flight translation while keeping the segment resumable."""
         segment.tgt = text
         segment.explanation = None
+        segment.cache_key = None
         segment.flags = self._with_partial_flag(segment.flags, partial=True)
+        self._mark_text_modified(segment)
         self.session.add(segment)
         self.session.commit()
         return segment
 
     def persist_completed_segment_translation(
-        self, segment: TranslationSegment, text: str
+        self, segment: TranslationSegment, text: str, *, cache_key: str | None = None
     ) -> TranslationSegment:
-        """Persist a finished translation and clear any partial marker."""
+        """Persist a finished translation and clear any partial marker.
+
+        ``cache_key`` registers the text in the translation memory; leave it unset
+        for output that should not be reused (e.g. instruction-guided retranslations).
+        """
         segment.tgt = text
         segment.explanation = None
+        segment.cache_key = cache_key
         segment.flags = self._with_partial_flag(segment.flags, partial=False)
+        self._mark_text_modified(segment)
         self.session.add(segment)
         self.session.commit()
         return segment
@@ -208,6 +240,74 @@ class TranslationStreamService:
 
         self.session.commit()
 
+    def resegment_chapter(self, chapter: Chapter) -> SegmentReconciliation:
+        """Re-slice changed chapter text while keeping unchanged segments.
+
+        New slices are aligned with each translation's existing segments by
+        ``src_hash``. Matched segments keep their translation, flags and
+        explanations (sentence spans are segment-relative) and only have their
+        offsets and order updated. Segments whose text changed or disappeared
+        are deleted with their explanations, and slices without a match become
+        new pending segments.
+        """
+        slices = newline_segment_slices(chapter.normalized_text)
+        new_hashes = [hash_text(slice_.text) for slice_ in slices]
+        stmt = select(ChapterTranslation).where(ChapterTranslation.chapter_id == chapter.id)
+        translations = self.session.execute(stmt).scalars().all()
+
+        result = SegmentReconciliation()
+        for translation in translations:
+            segments = list(self.get_segments_for_translation(translation.id))
+            matcher = SequenceMatcher(
+                None, [seg.src_hash for seg in segments], new_hashes, autojunk=False
+            )
+            removed_ids: list[int] = []
+            added_pending = False
+            for tag, old_lo, old_hi, new_lo, new_hi in matcher.get_opcodes():
+                if tag == "equal":
+                    for segment, idx in zip(
+                        segments[old_lo:old_hi], range(new_lo, new_hi), strict=True
+                    ):
+                        slice_ = slices[idx]
+                        segment.start = slice_.start
+                        segment.end = slice_.end
+                        segment.order_index = idx
+                        self.session.add(segment)
+                    result.kept += old_hi - old_lo
+                    continue
+                removed_ids.extend(seg.id for seg in segments[old_lo:old_hi])
+                for idx in range(new_lo, new_hi):
+                    slice_ = slices[idx]
+                    added_pending = added_pending or slice_.requires_translation
+                    self.session.add(
+                        TranslationSegment(
+                            chapter_translation_id=translation.id,
+                            start=slice_.start,
+                            end=slice_.end,
+                            order_index=idx,
+                            tgt="",
+                            flags=[] if slice_.requires_translation else ["whitespace"],
+                            cache_key=None,
+                            src_hash=new_hashes[idx],
+                        )
+                    )
+                result.added += new_hi - new_lo
+
+            if removed_ids:
+                self.session.query(TranslationExplanation).filter(
+                    TranslationExplanation.anchor_segment_id.in_(removed_ids)
+                ).delete(synchronize_session=False)
+                self.session.query(TranslationSegment).filter(
+                    TranslationSegment.id.in_(removed_ids)
+                ).delete(synchronize_session=False)
+                result.removed += len(removed_ids)
+            if added_pending and translation.status == "completed":
+                translation.status = "pending"
+                self.session.add(translation)
+
+        self.session.commit()
+        return result
+
     def batch_update_segment_translations(
         self, translation_id: int, edits: list[dict]
     ) -> list[TranslationSegment]:
@@ -239,6 +339,7 @@ class TranslationStreamService:
             if segment is not None:
                 segment.tgt = edit["tgt"]
                 segment.explanation = None  # Clear cached explanation
+                segment.cache_key = None  # Hand edits are not model output for the key
                 self.session.add(segment)
                 updated.append(segment)
 
@@ -247,6 +348,13 @@ class TranslationStreamService:
             self.session.refresh(seg)
         return updated
 
+    @staticmethod
+    def _mark_text_modified(segment: TranslationSegment) -> None:
+        # In-flight text is written behind this session by PartialSegmentWriter,
+        # so the loaded values may be stale; always emit tgt and flags.
+        flag_modified(segment, "tgt")
+        flag_modified(segment, "flags")
+
     @staticmethod
     def _with_partial_flag(flags: list | None, *, partial: bool) -> list[str]:
         next_flags = [str(flag) for flag in (flags or []) if flag != PARTIAL_TRANSLATION_FLAG]
@@ -3,27 +3,41 @@ from __future__ import annotations
 import asyncio
 import logging
 import time
-from collections.abc import AsyncGenerator, Awaitable, Callable
+from collections.abc import AsyncGenerator, AsyncIterator, Awaitable, Callable
 from dataclasses import dataclass, field
 from typing import Any
 
 from sqlalchemy.orm import Session
 
-from agents.base_agent import TraceContext
+from agents.base_agent import CallUsage, Priority, TraceContext
 from agents.translation_agent import TranslationAgent
 from app.config import settings
+from app.db import release_connection
 from app.models import Chapter, ChapterTranslation, TranslationSegment
 from constants.llm import get_model_info
+from observability.metrics import (
+    TRANSLATION_RUNS_ACTIVE,
+    TRANSLATION_SEGMENT_SECONDS,
+    TRANSLATION_SEGMENTS_TOTAL,
+)
 from services.exceptions import SegmentNotFoundError
+from services.partial_segment_writer import get_partial_writer
 from services.prompt import PromptService
+from services.translation_memory import CACHE_POLICY_REUSE, TranslationMemoryService
 from services.translation_stream import TranslationStreamService
+from services.translation_writer import TranslationWriter
+from services.usage import UsageService
 
 logger = logging.getLogger(__name__)
 
-# Throttle partial-segment commits: persist at most this often while streaming.
-# Final text is always persisted on segment-complete or cancel, so resumability
-# is preserved regardless of the interval.
-PARTIAL_COMMIT_INTERVAL_S = 1.0
+
+async def _holding_slot(
+    stream: AsyncIterator[str], slots: asyncio.Semaphore
+) -> AsyncGenerator[str, None]:
+    """Hold one of ``slots`` for as long as a segment request is streaming."""
+    async with slots:
+        async for delta in stream:
+            yield delta
 
 
 # ---------------------------------------------------------------------------
@@ -87,6 +101,60 @@ TranslationEvent = (
 )
 
 
+@dataclass
+class _PreparedSegment:
+    """Everything needed to translate one segment, resolved before streaming starts."""
+
+    segment: TranslationSegment
+    src: str
+    cache_key: str | None
+    remembered: str | None = None
+    context_segments: list[dict[str, str]] = field(default_factory=list)
+    trace: TraceContext | None = None
+    usage: CallUsage = field(default_factory=CallUsage)
+
+
+class _PrefetchedSegment:
+    """Streams one segment translation into a buffer ahead of in-order emission."""
+
+    def __init__(
+        self,
+        prepared: _PreparedSegment,
+        stream: AsyncIterator[str],
+        translated: dict[int, str],
+    ) -> None:
+        self.prepared = prepared
+        self.text = ""
+        self.finished = False
+        self._translated = translated
+        self._queue: asyncio.Queue[str | Exception | None] = asyncio.Queue()
+        self.task = asyncio.create_task(self._pump(stream))
+
+    async def _pump(self, stream: AsyncIterator[str]) -> None:
+        try:
+            async for delta in stream:
+                if not delta:
+                    continue
+                self.text += delta
+                self._queue.put_nowait(delta)
+        except Exception as exc:
+            self._queue.put_nowait(exc)
+            return
+        self.finished = True
+        # Later segments launched from here on can use this text as context.
+        self._translated[self.prepared.segment.id] = self.text
+        self._queue.put_nowait(None)
+
+    async def deltas(self) -> AsyncGenerator[str, None]:
+        while True:
+            item = await self._queue.get()
+            if item is None:
+                return
+            if isinstance(item, Exception):
+                raise item
+            yield item
+
+
 # ---------------------------------------------------------------------------
 # Workflow service
 # ---------------------------------------------------------------------------
@@ -97,6 +165,9 @@ class TranslationWorkflow:
         self.db = db
         self._stream_service = TranslationStreamService(db)
         self._prompt_service = PromptService(db)
+        self._memory = TranslationMemoryService(db)
+        self._writer = TranslationWriter()
+        self._partials = get_partial_writer()
 
     def preflight_segment_check(self, chapter: Chapter, segment_id: int) -> TranslationSegment:
         """Validate segment existence before opening an SSE stream.
@@ -123,13 +194,10 @@ class TranslationWorkflow:
         """Resolve and construct a TranslationAgent for the given work.
 
         Mirrors the former _get_work_translation_agent logic verbatim:
-        - fetches the work's assigned prompt
-        - fetches the latest prompt version
+        - resolves the work's assigned prompt and its latest version (cached)
         - applies prompt_override (template and model) if provided
         - falls back to settings.translation_model and settings.translation_api_key
         """
-        prompt = self._prompt_service.get_prompt_for_work(work_id)
-
         system_prompt = None
         model = settings.translation_model
         if prompt_override:
@@ -137,14 +205,11 @@ class TranslationWorkflow:
             override_model = prompt_override.get("model")
             if isinstance(override_model, str) and override_model.strip():
                 model = override_model
-        elif prompt:
-            versions, _, _, _ = self._prompt_service.get_prompt_versions(
-                prompt.id, limit=1, offset=0
-            )
-            if versions:
-                latest_version = versions[0]
-                system_prompt = latest_version.template
-                model = latest_version.model
+        else:
+            resolved = self._prompt_service.resolve_prompt_for_work(work_id)
+            if resolved.prompt_version_id is not None:
+                system_prompt = resolved.template
+                model = resolved.model
 
         model_info = get_model_info(model)
         provider = model_info.provider if model_info else "openai"
@@ -169,14 +234,19 @@ class TranslationWorkflow:
         *,
         prompt_override: dict[str, Any] | None,
         is_disconnected: Callable[[], Awaitable[bool]],
+        segment_slots: asyncio.Semaphore | None = None,
     ) -> AsyncGenerator[TranslationEvent, None]:
-        """Start a new chapter translation or resume a pending one."""
+        """Start a new chapter translation or resume a pending one.
+
+        ``segment_slots`` caps agent requests shared with other runs (e.g. a
+        batch translation budget); each segment request holds one slot.
+        """
         translation = self._stream_service.get_or_create_translation(chapter.id)
         segments = self._stream_service.ensure_segments(translation, chapter.normalized_text)
         is_not_complete = self._stream_service.first_pending_segment(segments) is not None
 
         agent = self._resolve_agent(work_id, prompt_override)
-        work_prompt = self._prompt_service.get_prompt_for_work(work_id)
+        work_prompt = self._prompt_service.resolve_prompt_for_work(work_id)
 
         logger.info(
             "Starting translation run",
@@ -188,15 +258,13 @@ class TranslationWorkflow:
                 "chunk_chars": settings.translation_chunk_chars,
                 "context_window": settings.translation_context_segments,
                 "api_base": settings.translation_api_base_url,
-                "has_custom_prompt": work_prompt is not None,
+                "has_custom_prompt": work_prompt.prompt_id is not None,
                 "has_prompt_override": prompt_override is not None,
             },
         )
 
         if not is_not_complete:
-            translation.status = "completed"
-            self.db.add(translation)
-            self.db.commit()
+            await self._writer.set_status(translation, "completed")
             yield TranslationCompleteEvent(
                 chapter_translation_id=translation.id,
                 status=translation.status,
@@ -217,6 +285,7 @@ class TranslationWorkflow:
             instruction=None,
             current_translation=None,
             is_disconnected=is_disconnected,
+            segment_slots=segment_slots,
         ):
             yield event
 
@@ -276,6 +345,94 @@ class TranslationWorkflow:
         ):
             yield event
 
+    def _prepare_segment(
+        self,
+        agent: TranslationAgent,
+        translation: ChapterTranslation,
+        current: TranslationSegment,
+        all_segments: list[TranslationSegment],
+        chapter_text: str,
+        work_id: int,
+        *,
+        use_memory: bool,
+        is_single_segment: bool,
+        instruction: str | None,
+        translated: dict[int, str] | None = None,
+    ) -> _PreparedSegment:
+        """Resolve the memory hit, context window and trace for one segment."""
+        src = chapter_text[current.start : current.end]
+        cache_key = None
+        if instruction is None:
+            cache_key = self._memory.build_cache_key(
+                current.src_hash, model=agent.model, system_prompt=agent.system_prompt
+            )
+        if use_memory and cache_key is not None:
+            remembered = self._memory.lookup(work_id, cache_key)
+            if remembered is not None:
+                return _PreparedSegment(current, src, cache_key, remembered=remembered)
+
+        # While pipelining, preceding segments may still be in flight; they
+        # contribute their source so the model keeps some continuity.
+        context_segments = self._stream_service.build_context_window(
+            all_segments,
+            current,
+            chapter_text,
+            limit=agent.context_window,
+            translated=translated,
+            include_untranslated=translated is not None,
+        )
+        trace = TraceContext(
+            name="translate.retranslate_segment" if is_single_segment else "translate.segment",
+            session_id=f"chapter_translation:{translation.id}",
+            metadata={
+                "work_id": work_id,
+                "chapter_id": translation.chapter_id,
+                "chapter_translation_id": translation.id,
+                "segment_id": current.id,
+                "order_index": current.order_index,
+                "has_instruction": instruction is not None,
+            },
+            tags=["translation", "retranslate"] if is_single_segment else ["translation"],
+        )
+        return _PreparedSegment(
+            current, src, cache_key, context_segments=context_segments, trace=trace
+        )
+
+    async def _persist_prefetched(
+        self,
+        prefetched: dict[int, _PrefetchedSegment],
+        translation: ChapterTranslation,
+        work_id: int,
+    ) -> None:
+        """Keep output and usage of segments translated ahead of an interrupted run."""
+        for item in prefetched.values():
+            usage_rows = UsageService.build_call_rows(
+                translation, item.prepared.segment, item.prepared.usage, work_id=work_id
+            )
+            if item.finished:
+                await self._writer.complete_segment(
+                    item.prepared.segment,
+                    item.text,
+                    cache_key=item.prepared.cache_key,
+                    translation=translation,
+                    usage_rows=usage_rows,
+                )
+                continue
+            if item.text:
+                await self._writer.save_partial(item.prepared.segment, item.text)
+            await self._writer.record_usage(translation, usage_rows)
+
+    async def _record_abandoned_usage(
+        self, translation: ChapterTranslation, prepared: _PreparedSegment, work_id: int
+    ) -> None:
+        """Record the provider calls of a segment that failed or was cancelled."""
+        await self._writer.record_usage(
+            translation,
+            UsageService.build_call_rows(
+                translation, prepared.segment, prepared.usage, work_id=work_id
+            ),
+        )
+
     async def _run_segment_loop(
         self,
         agent: TranslationAgent,
@@ -289,21 +446,49 @@ class TranslationWorkflow:
         instruction: str | None,
         current_translation: str | None,
         is_disconnected: Callable[[], Awaitable[bool]],
+        segment_slots: asyncio.Semaphore | None = None,
     ) -> AsyncGenerator[TranslationEvent, None]:
-        """Executes the per-segment translation loop."""
+        """Executes the per-segment translation loop.
+
+        Segments whose exact source was already translated in this work under the
+        same prompt and model are served from the translation memory instead of the
+        agent, unless the chapter translation's cache policy bypasses it.
+        Single-segment retranslations always call the agent.
+
+        When the provider's segment concurrency is above one, up to that many
+        segments are requested ahead of the one being emitted. Events are still
+        yielded strictly in ``order_index`` order and only the emitted segment is
+        persisted as it streams; output buffered ahead is kept if the run stops.
+        Prefetched segments and batch runs are scheduled as background work with
+        the provider's rate limiter.
+        """
+        use_memory = not is_single_segment and translation.cache_policy == CACHE_POLICY_REUSE
+        # Batch runs (sharing ``segment_slots``) never have a reader waiting.
+        priority = Priority.BACKGROUND if segment_slots is not None else Priority.INTERACTIVE
+        concurrency = (
+            1
+            if is_single_segment
+            else settings.get_segment_concurrency_for_provider(agent.provider)
+        )
+        pipelined = concurrency > 1
+        translated: dict[int, str] = {}
+        window: dict[int, _PreparedSegment] = {}
+        prefetched: dict[int, _PrefetchedSegment] = {}
         current_segment = None
+        # The segment streaming directly from the agent (not prefetched), if any.
+        streaming: _PreparedSegment | None = None
+        TRANSLATION_RUNS_ACTIVE.inc()
         try:
             if not is_single_segment:
-                translation.status = "running"
-                self.db.add(translation)
-                self.db.commit()
+                await self._writer.set_status(translation, "running")
                 yield TranslationStatusEvent(
                     chapter_translation_id=translation.id,
                     status=translation.status,
                 )
 
-            for current in segments_to_translate:
+            for position, current in enumerate(segments_to_translate):
                 current_segment = current
+                segment_started = time.perf_counter()
                 if await is_disconnected():
                     raise asyncio.CancelledError
 
@@ -328,56 +513,115 @@ class TranslationWorkflow:
                     src=src,
                 )
 
-                context_segments = self._stream_service.build_context_window(
-                    all_segments,
-                    current,
-                    chapter_text,
-                    limit=agent.context_window,
-                )
-
-                trace = TraceContext(
-                    name="translate.retranslate_segment"
-                    if is_single_segment
-                    else "translate.segment",
-                    session_id=f"chapter_translation:{translation.id}",
-                    metadata={
-                        "work_id": work_id,
-                        "chapter_id": translation.chapter_id,
-                        "chapter_translation_id": translation.id,
-                        "segment_id": current.id,
-                        "order_index": current.order_index,
-                        "has_instruction": instruction is not None,
-                    },
-                    tags=["translation", "retranslate"] if is_single_segment else ["translation"],
-                )
-
-                collected = ""
-                last_persisted = ""
-                last_persist_at = 0.0
-                try:
-                    async for delta in agent.stream_segment(
+                if pipelined:
+                    for ahead in segments_to_translate[position : position + concurrency]:
+                        if ahead.id in window:
+                            continue
+                        prepared = self._prepare_segment(
+                            agent,
+                            translation,
+                            ahead,
+                            all_segments,
+                            chapter_text,
+                            work_id,
+                            use_memory=use_memory,
+                            is_single_segment=is_single_segment,
+                            instruction=instruction,
+                            translated=translated,
+                        )
+                        window[ahead.id] = prepared
+                        if prepared.remembered is None:
+                            # Only the segment a reader is waiting on is interactive;
+                            # prefetch queues behind other runs' current segments.
+                            stream = agent.stream_segment(
+                                prepared.src,
+                                preceding_segments=prepared.context_segments,
+                                instruction=instruction,
+                                current_translation=current_translation,
+                                trace=prepared.trace,
+                                priority=(
+                                    priority if ahead.id == current.id else Priority.BACKGROUND
+                                ),
+                                usage=prepared.usage,
+                            )
+                            if segment_slots is not None:
+                                stream = _holding_slot(stream, segment_slots)
+                            prefetched[ahead.id] = _PrefetchedSegment(prepared, stream, translated)
+                    prepared = window.pop(current.id)
+                else:
+                    prepared = self._prepare_segment(
+                        agent,
+                        translation,
+                        current,
+                        all_segments,
+                        chapter_text,
+                        work_id,
+                        use_memory=use_memory,
+                        is_single_segment=is_single_segment,
+                        instruction=instruction,
+                    )
+
+                # Reads for this segment are done; hold no connection while it streams.
+                release_connection(self.db)
+
+                cache_key = prepared.cache_key
+                remembered = prepared.remembered
+                if remembered is not None:
+                    logger.info(
+                        "Translation memory hit",
+                        extra={
+                            "work_id": work_id,
+                            "chapter_translation_id": translation.id,
+                            "segment_id": current.id,
+                            "order_index": current.order_index,
+                        },
+                    )
+                    await self._writer.complete_segment(current, remembered, cache_key=cache_key)
+                    translated[current.id] = remembered
+                    TRANSLATION_SEGMENTS_TOTAL.inc(outcome="memory")
+                    yield SegmentDeltaEvent(
+                        chapter_translation_id=translation.id,
+                        segment_id=current.id,
+                        order_index=current.order_index,
+                        delta=remembered,
+                    )
+                    yield SegmentCompleteEvent(
+                        chapter_translation_id=translation.id,
+                        segment_id=current.id,
+                        order_index=current.order_index,
+                        text=remembered,
+                    )
+                    current_segment = None
+                    continue
+
+                source = prefetched.get(current.id)
+                if source is not None:
+                    deltas = source.deltas()
+                else:
+                    deltas = agent.stream_segment(
                         src,
-                        preceding_segments=context_segments,
+                        preceding_segments=prepared.context_segments,
                         instruction=instruction,
                         current_translation=current_translation,
-                        trace=trace,
-                    ):
+                        trace=prepared.trace,
+                        priority=priority,
+                        usage=prepared.usage,
+                    )
+                    if segment_slots is not None:
+                        deltas = _holding_slot(deltas, segment_slots)
+                    streaming = prepared
+
+                collected = ""
+                partial_flags = self._stream_service._with_partial_flag(current.flags, partial=True)
+                try:
+                    async for delta in deltas:
                         if await is_disconnected():
                             raise asyncio.CancelledError
                         if not delta:
                             continue
                         collected += delta
-                        now = time.monotonic()
-                        if (
-                            collected != last_persisted
-                            and now - last_persist_at >= PARTIAL_COMMIT_INTERVAL_S
-                        ):
-                            self._stream_service.persist_partial_segment_translation(
-                                current,
-                                collected,
-                            )
-                            last_persisted = collected
-                            last_persist_at = now
+                        # Written behind the stream in batches; nothing commits here.
+                        self._partials.stage(current.id, collected, partial_flags)
                         yield SegmentDeltaEvent(
                             chapter_translation_id=translation.id,
                             segment_id=current.id,
@@ -385,18 +629,32 @@ class TranslationWorkflow:
                             delta=delta,
                         )
                 except asyncio.CancelledError:
-                    # Flush any throttled-but-unsaved text so resume can pick it up.
-                    if collected and collected != last_persisted:
-                        self._stream_service.persist_partial_segment_translation(
-                            current,
-                            collected,
-                        )
+                    # Persist the latest text now so resume can pick it up.
+                    await self._partials.settle(current.id)
+                    if collected:
+                        await self._writer.save_partial(current, collected)
                     raise
-
-                self._stream_service.persist_completed_segment_translation(
+                finally:
+                    if source is None:
+                        # Release the slot and end the provider calls now rather than
+                        # when the generator is collected, so their usage is final.
+                        await deltas.aclose()
+
+                prefetched.pop(current.id, None)
+                await self._partials.settle(current.id)
+                await self._writer.complete_segment(
                     current,
                     collected,
+                    cache_key=cache_key,
+                    translation=translation,
+                    usage_rows=UsageService.build_call_rows(
+                        translation, current, prepared.usage, work_id=work_id
+                    ),
                 )
+                streaming = None
+                translated[current.id] = collected
+                TRANSLATION_SEGMENTS_TOTAL.inc(outcome="completed")
+                TRANSLATION_SEGMENT_SECONDS.observe(time.perf_counter() - segment_started)
                 yield SegmentCompleteEvent(
                     chapter_translation_id=translation.id,
                     segment_id=current.id,
@@ -406,9 +664,7 @@ class TranslationWorkflow:
                 current_segment = None
 
             if not is_single_segment:
-                translation.status = "completed"
-                self.db.add(translation)
-                self.db.commit()
+                await self._writer.set_status(translation, "completed")
 
             yield TranslationCompleteEvent(
                 chapter_translation_id=translation.id,
@@ -416,14 +672,18 @@ class TranslationWorkflow:
             )
 
         except asyncio.CancelledError:
-            translation.status = "idle"
-            self.db.add(translation)
-            self.db.commit()
+            if current_segment is not None:
+                TRANSLATION_SEGMENTS_TOTAL.inc(outcome="cancelled")
+            if streaming is not None:
+                await self._record_abandoned_usage(translation, streaming, work_id)
+            await self._writer.set_status(translation, "idle")
             raise
         except Exception as exc:  # pragma: no cover - surfaced via SSE
-            translation.status = "error"
-            self.db.add(translation)
-            self.db.commit()
+            if current_segment is not None:
+                TRANSLATION_SEGMENTS_TOTAL.inc(outcome="error")
+            if streaming is not None:
+                await self._record_abandoned_usage(translation, streaming, work_id)
+            await self._writer.set_status(translation, "error")
             if current_segment is not None:
                 yield TranslationErrorEvent(
                     chapter_translation_id=translation.id,
@@ -436,3 +696,12 @@ class TranslationWorkflow:
                     chapter_translation_id=translation.id,
                     error=str(exc),
                 )
+        finally:
+            TRANSLATION_RUNS_ACTIVE.dec()
+            if prefetched:
+                for item in prefetched.values():
+                    item.task.cancel()
+                await asyncio.gather(
+                    *(item.task for item in prefetched.values()), return_exceptions=True
+                )
+                await self._persist_prefetched(prefetched, translation, work_id)
@@ -0,0 +1,120 @@
+from __future__ import annotations
+
+from collections.abc import Sequence
+from typing import Any
+
+from sqlalchemy import update
+from sqlalchemy.ext.asyncio import AsyncSession, async_sessionmaker
+from sqlalchemy.orm.attributes import set_committed_value
+
+from app.db import get_async_sessionmaker
+from app.models import ChapterTranslation, TranslationSegment, TranslationSegmentUsage
+from services.translation_stream import TranslationStreamService
+from services.usage import UsageService
+
+_segments = TranslationSegment.__table__
+_translations = ChapterTranslation.__table__
+
+
+def _set_committed(instance: Any, **values: Any) -> None:
+    # The caller's sync session holds these objects; record the new values as
+    # already persisted so that session neither re-reads nor re-writes them.
+    for key, value in values.items():
+        set_committed_value(instance, key, value)
+
+
+class TranslationWriter:
+    """Awaited writes for a streaming chapter translation.
+
+    The translation loop reads through its request-scoped sync session, but every
+    commit while streaming goes through a short-lived ``AsyncSession`` so it does
+    not block the event loop. Each write is a single transaction of Core
+    statements; the loaded ORM objects are then updated in place as committed.
+    """
+
+    def __init__(self, session_factory: async_sessionmaker[AsyncSession] | None = None) -> None:
+        self._session_factory = session_factory or get_async_sessionmaker()
+
+    async def set_status(self, translation: ChapterTranslation, status: str) -> None:
+        async with self._session_factory() as session:
+            await session.execute(
+                update(_translations)
+                .where(_translations.c.id == translation.id)
+                .values(status=status)
+            )
+            await session.commit()
+        _set_committed(translation, status=status)
+
+    async def save_partial(self, segment: TranslationSegment, text: str) -> None:
+        """Persist in-flight text while keeping the segment resumable."""
+        await self._write_segment(segment, text, cache_key=None, partial=True)
+
+    async def complete_segment(
+        self,
+        segment: TranslationSegment,
+        text: str,
+        *,
+        cache_key: str | None = None,
+        translation: ChapterTranslation | None = None,
+        usage_rows: Sequence[TranslationSegmentUsage] = (),
+    ) -> None:
+        """Persist a finished segment, with its usage rows and roll-up if given."""
+        await self._write_segment(
+            segment,
+            text,
+            cache_key=cache_key,
+            partial=False,
+            translation=translation,
+            usage_rows=usage_rows,
+        )
+
+    async def record_usage(
+        self, translation: ChapterTranslation, usage_rows: Sequence[TranslationSegmentUsage]
+    ) -> None:
+        """Persist usage rows of a segment that did not complete, with their roll-up."""
+        if not usage_rows:
+            return
+        async with self._session_factory() as session:
+            translation_values = await self._add_usage(session, translation, usage_rows)
+            await session.commit()
+        _set_committed(translation, **translation_values)
+
+    async def _write_segment(
+        self,
+        segment: TranslationSegment,
+        text: str,
+        *,
+        cache_key: str | None,
+        partial: bool,
+        translation: ChapterTranslation | None = None,
+        usage_rows: Sequence[TranslationSegmentUsage] = (),
+    ) -> None:
+        flags = TranslationStreamService._with_partial_flag(segment.flags, partial=partial)
+        segment_values = {"tgt": text, "explanation": None, "cache_key": cache_key, "flags": flags}
+        translation_values: dict[str, Any] = {}
+        async with self._session_factory() as session:
+            await session.execute(
+                update(_segments).where(_segments.c.id == segment.id).values(**segment_values)
+            )
+            if translation is not None and usage_rows:
+                translation_values = await self._add_usage(session, translation, usage_rows)
+            await session.commit()
+        _set_committed(segment, **segment_values)
+        if translation_values:
+            _set_committed(translation, **translation_values)
+
+    @staticmethod
+    async def _add_usage(
+        session: AsyncSession,
+        translation: ChapterTranslation,
+        usage_rows: Sequence[TranslationSegmentUsage],
+    ) -> dict[str, Any]:
+        session.add_all(usage_rows)
+        meta, cost_cents = UsageService.rolled_up(translation.meta, usage_rows)
+        translation_values = {"meta": meta, "cost_cents": cost_cents}
+        await session.execute(
+            update(_translations)
+            .where(_translations.c.id == translation.id)
+            .values(**translation_values)
+        )
+        return translation_values
@@ -0,0 +1,164 @@
+from __future__ import annotations
+
+from collections.abc import Iterable
+from datetime import datetime
+from decimal import Decimal
+from typing import Any
+
+from sqlalchemy import ColumnElement, case, func, select
+from sqlalchemy.orm import InstrumentedAttribute, Session
+
+from agents.base_agent import CallUsage
+from app.models import ChapterTranslation, TranslationSegment, TranslationSegmentUsage
+from constants.llm import get_model_info
+
+_TOKEN_FIELDS = ("input_tokens", "output_tokens", "cache_read_tokens", "cache_creation_tokens")
+LATENCY_PERCENTILES = (50, 95, 99)
+
+
+class UsageService:
+    """Per-call latency, token and cost records for segment translations.
+
+    Every provider request made for a segment gets a ``TranslationSegmentUsage``
+    row: the call that produced the text, and also retries, hedges and calls
+    that failed or were cancelled with the segment. Their tokens and cost are
+    also rolled up into the chapter translation (``cost_cents`` and
+    ``meta["usage"]``) so the chapter total is available without an aggregate
+    query.
+    """
+
+    def __init__(self, session: Session) -> None:
+        self.session = session
+
+    @staticmethod
+    def build_call_rows(
+        translation: ChapterTranslation,
+        segment: TranslationSegment,
+        usage: CallUsage,
+        *,
+        work_id: int,
+    ) -> list[TranslationSegmentUsage]:
+        """One usage row per provider request in ``usage``; none for the stub."""
+        rows = []
+        for attempt in usage.attempts:
+            cost_usd = None
+            model_info = get_model_info(attempt.model)
+            if model_info is not None and attempt.input_tokens is not None:
+                cost = model_info.cost_usd(attempt.input_tokens, attempt.output_tokens or 0)
+                cost_usd = Decimal(str(round(cost, 6)))
+            rows.append(
+                TranslationSegmentUsage(
+                    work_id=work_id,
+                    chapter_translation_id=translation.id,
+                    segment_id=segment.id,
+                    provider=attempt.provider,
+                    model=attempt.model,
+                    kind=attempt.kind,
+                    outcome=attempt.outcome,
+                    ttft_ms=attempt.ttft_ms,
+                    duration_ms=attempt.duration_ms,
+                    input_tokens=attempt.input_tokens,
+                    output_tokens=attempt.output_tokens,
+                    cache_read_tokens=attempt.cache_read_tokens,
+                    cache_creation_tokens=attempt.cache_creation_tokens,
+                    cost_usd=cost_usd,
+                )
+            )
+        return rows
+
+    @staticmethod
+    def rolled_up(
+        meta: dict[str, Any] | None, rows: Iterable[TranslationSegmentUsage]
+    ) -> tuple[dict[str, Any], int]:
+        """A copy of a translation's ``meta`` with ``rows`` added, and its ``cost_cents``."""
+        meta = dict(meta or {})
+        totals = dict(meta.get("usage") or {})
+        for row in rows:
+            totals["calls"] = totals.get("calls", 0) + 1
+            for name in _TOKEN_FIELDS:
+                totals[name] = totals.get(name, 0) + (getattr(row, name) or 0)
+            totals["duration_ms"] = totals.get("duration_ms", 0) + row.duration_ms
+            totals["cost_usd"] = round(totals.get("cost_usd", 0.0) + float(row.cost_usd or 0), 6)
+        meta["usage"] = totals
+        return meta, round(totals.get("cost_usd", 0.0) * 100)
+
+    def work_usage(self, work_id: int) -> dict[str, Any]:
+        """Token and cost totals for a work, overall and per provider/model."""
+        stmt = (
+            select(
+                TranslationSegmentUsage.provider,
+                TranslationSegmentUsage.model,
+                func.count(TranslationSegmentUsage.id),
+                *(
+                    func.coalesce(func.sum(getattr(TranslationSegmentUsage, name)), 0)
+                    for name in _TOKEN_FIELDS
+                ),
+                func.coalesce(func.sum(TranslationSegmentUsage.cost_usd), 0),
+            )
+            .where(TranslationSegmentUsage.work_id == work_id)
+            .group_by(TranslationSegmentUsage.provider, TranslationSegmentUsage.model)
+            .order_by(TranslationSegmentUsage.provider, TranslationSegmentUsage.model)
+        )
+        by_model: list[dict[str, Any]] = []
+        for provider, model, calls, *tokens, cost in self.session.execute(stmt).all():
+            entry: dict[str, Any] = {"provider": provider, "model": model, "calls": calls}
+            entry.update(
+                {name: int(value) for name, value in zip(_TOKEN_FIELDS, tokens, strict=True)}
+            )
+            entry["cost_usd"] = round(float(cost), 6)
+            by_model.append(entry)
+
+        totals: dict[str, Any] = {"calls": sum(e["calls"] for e in by_model)}
+        for name in _TOKEN_FIELDS:
+            totals[name] = sum(e[name] for e in by_model)
+        totals["cost_usd"] = round(sum(e["cost_usd"] for e in by_model), 6)
+        return {"work_id": work_id, "totals": totals, "by_model": by_model}
+
+    def latency_summary(self, model: str, *, since: datetime) -> dict[str, Any]:
+        """Time-to-first-token and duration percentiles of ``model``'s completed calls.
+
+        Calls that failed or were cancelled (a losing hedge) are left out.
+        """
+        filters = (
+            TranslationSegmentUsage.model == model,
+            TranslationSegmentUsage.outcome == "ok",
+            TranslationSegmentUsage.created_at >= since,
+        )
+        _, ttft = self._percentiles(TranslationSegmentUsage.ttft_ms, filters)
+        calls, duration = self._percentiles(TranslationSegmentUsage.duration_ms, filters)
+        return {
+            "model": model,
+            "since": since,
+            "calls": calls,
+            "ttft_ms": ttft,
+            "duration_ms": duration,
+        }
+
+    def _percentiles(
+        self, column: InstrumentedAttribute[Any], filters: tuple[ColumnElement[bool], ...]
+    ) -> tuple[int, dict[str, int | None]]:
+        """Row count and nearest-rank ``LATENCY_PERCENTILES`` of ``column``, in one query.
+
+        The p-th percentile is the value at rank ceil(p/100 * n), i.e. the
+        smallest value whose rank r satisfies r * 100 >= p * n.
+        """
+        ranked = (
+            select(
+                column.label("value"),
+                func.row_number().over(order_by=column).label("rank"),
+                func.count().over().label("total"),
+            )
+            .where(*filters, column.is_not(None))
+            .subquery()
+        )
+        stmt = select(
+            func.max(ranked.c.total),
+            *(
+                func.min(case((ranked.c.rank * 100 >= p * ranked.c.total, ranked.c.value)))
+                for p in LATENCY_PERCENTILES
+            ),
+        )
+        total, *values = self.session.execute(stmt).one()
+        return total or 0, {
+            f"p{p}": value for p, value in zip(LATENCY_PERCENTILES, values, strict=True)
+        }
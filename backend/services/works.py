@@ -8,6 +8,7 @@ from app.scrapers import scraper_registry
 from app.scrapers.types import WorkMetadata
 
 from .exceptions import PromptNotFoundError, WorkNotFoundError
+from .prompt import invalidate_resolved_prompts
 from .utils import sanitize_pagination
 
 
@@ -100,6 +101,7 @@ class WorksService:
             self.session.add(work_prompt)
 
         self.session.commit()
+        invalidate_resolved_prompts(work_id=work_id)
         # Re-fetch to ensure we have the updated object
         result = self.session.execute(
             select(WorkPrompt).where(WorkPrompt.work_id == work_id)
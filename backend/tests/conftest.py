@@ -1,11 +1,16 @@
 import os
+import tempfile
 from collections.abc import Generator
 
-# Force in-memory SQLite for all tests — never run against the real database.
-# Using os.environ directly (not setdefault) so this cannot be overridden by
-# the container's DATABASE_URL env var, which would cause drop_all to wipe
-# live Postgres data.
-os.environ["DATABASE_URL"] = "sqlite+pysqlite:///:memory:"
+# Force a throwaway SQLite file for all tests — never run against the real
+# database. Using os.environ directly (not setdefault) so this cannot be
+# overridden by the container's DATABASE_URL env var, which would cause
+# drop_all to wipe live Postgres data. A file rather than :memory: so the
+# async engine (aiosqlite) sees the same database as the sync one.
+os.environ["DATABASE_URL"] = (
+    f"sqlite+pysqlite:///{tempfile.mkdtemp(prefix='tonari-tests-')}/test.db"
+)
+os.environ.pop("ASYNC_DATABASE_URL", None)
 
 import pytest
 from fastapi.testclient import TestClient
@@ -33,3 +38,57 @@ def clean_db() -> Generator[None, None, None]:
 def db_session():
     with SessionLocal() as session:
         yield session
+
+
+@pytest.fixture(autouse=True)
+def fresh_partial_writer(monkeypatch) -> None:
+    # The write-behind buffer is process-wide; never carry staged rows across tests.
+    monkeypatch.setattr("services.partial_segment_writer._writer", None)
+
+
+@pytest.fixture(autouse=True)
+def fresh_prompt_cache(monkeypatch) -> None:
+    # Work ids are reused across tests, so resolved prompts must not carry over.
+    monkeypatch.setattr("services.prompt._resolved_prompts", {})
+
+
+@pytest.fixture(autouse=True)
+def fresh_translation_state_cache(monkeypatch) -> None:
+    # Rendered states are keyed by ids and content, and ids are reused across tests.
+    from services.translation_state import _BoundedCache
+
+    monkeypatch.setattr("services.translation_state._state_bodies", _BoundedCache(maxsize=64))
+
+
+@pytest.fixture(autouse=True)
+def fresh_rate_limiters(monkeypatch) -> None:
+    # Limiters hold AIMD state and asyncio waiters; each test gets its own.
+    monkeypatch.setattr("agents.rate_limiter._limiters", {})
+
+
+@pytest.fixture(autouse=True)
+def fresh_host_limiters(monkeypatch) -> None:
+    # Per-host scrape politeness is process-wide; tests scrape fake hosts at full speed.
+    monkeypatch.setattr("services.scrape_engine._host_limiters", {})
+    monkeypatch.setattr("app.config.settings.scrape_host_min_interval_s", 0.0)
+
+
+@pytest.fixture(autouse=True)
+def fresh_html_archive(monkeypatch, tmp_path) -> None:
+    # Scraped pages are archived to disk; keep each test's in its own directory.
+    monkeypatch.setattr("app.config.settings.html_archive_dir", str(tmp_path / "html_archive"))
+    monkeypatch.setattr("services.html_archive._archive", None)
+
+
+@pytest.fixture(autouse=True)
+def fresh_parse_executor(monkeypatch) -> Generator[None, None, None]:
+    # Test scrapers define parsers locally, which cannot be pickled to worker
+    # processes; parse in threads instead. test_parse_executor covers processes.
+    from concurrent.futures import ThreadPoolExecutor
+
+    from services.parse_executor import ParseExecutor
+
+    executor = ParseExecutor(ThreadPoolExecutor(max_workers=2))
+    monkeypatch.setattr("services.parse_executor._executor", executor)
+    yield
+    executor.shutdown()
@@ -0,0 +1,66 @@
+"""Tests for the async engine used by the streaming write paths."""
+
+from __future__ import annotations
+
+import asyncio
+
+import pytest
+from sqlalchemy import select
+
+from agents.base_agent import CallAttempt, CallUsage
+from app.db import async_database_url
+from app.models import ChapterTranslation, TranslationSegmentUsage
+from services.translation_stream import TranslationStreamService
+from services.translation_writer import TranslationWriter
+from services.usage import UsageService
+from tests.test_usage import _make_chapter
+
+
+def test_async_database_url_swaps_in_the_async_driver():
+    assert (
+        async_database_url("postgresql+psycopg2://u:secret@db:5432/tonari")
+        == "postgresql+asyncpg://u:secret@db:5432/tonari"
+    )
+    assert async_database_url("sqlite:////tmp/t.db") == "sqlite+aiosqlite:////tmp/t.db"
+    with pytest.raises(ValueError):
+        async_database_url("sqlite+pysqlite:///:memory:")
+    with pytest.raises(ValueError):
+        async_database_url("mysql://u@localhost/tonari")
+
+
+def test_writer_commits_segment_and_usage_visible_to_sync_session(db_session):
+    work, chapter = _make_chapter(db_session)
+    stream_service = TranslationStreamService(db_session)
+    translation = stream_service.get_or_create_translation(chapter.id)
+    segment = stream_service.ensure_segments(translation, chapter.normalized_text)[0]
+    stream_service.persist_partial_segment_translation(segment, "hal")
+    attempt = CallAttempt(
+        provider="openai", model="gpt-5.2", outcome="ok", duration_ms=300, input_tokens=1000
+    )
+    usage = CallUsage(provider="openai", model="gpt-5.2", attempts=[attempt])
+    rows = UsageService.build_call_rows(translation, segment, usage, work_id=work.id)
+
+    async def run() -> None:
+        writer = TranslationWriter()
+        await writer.set_status(translation, "running")
+        await writer.complete_segment(
+            segment, "half", cache_key="key", translation=translation, usage_rows=rows
+        )
+
+    asyncio.run(run())
+
+    # Mirrored onto the loaded objects as committed, not as pending changes.
+    assert segment.tgt == "half"
+    assert segment.flags == []
+    assert translation.status == "running"
+    assert translation.meta["usage"]["calls"] == 1
+    assert not db_session.dirty
+
+    db_session.expire_all()
+    stored = db_session.execute(select(ChapterTranslation)).scalar_one()
+    assert stored.status == "running"
+    assert stored.cost_cents == translation.cost_cents
+    assert stored.meta == translation.meta
+    db_session.refresh(segment)
+    assert (segment.tgt, segment.cache_key, segment.flags) == ("half", "key", [])
+    assert db_session.execute(select(TranslationSegmentUsage)).scalar_one().segment_id == segment.id
@@ -5,6 +5,7 @@ from datetime import UTC, datetime, timedelta
 from decimal import Decimal
 from unittest.mock import patch
 
+from app.clients import NotModifiedError, Page, Validators
 from app.models import Chapter, ScrapeJob, Work
 from services.scrape_manager import ScrapeManager
 from tests.test_chapters_service import FakeScraper, _attach_fake_scraper
@@ -301,3 +302,130 @@ def test_run_scrape_job_marks_job_failed_when_work_has_no_source(db_session, mon
 
     db_session.refresh(job)
     assert job.status == "failed"
+
+
+class RevalidatingFakeScraper(FakeScraper):
+    """Serves every page with ETag "v1" and answers 304 to requests carrying it."""
+
+    def __init__(self) -> None:
+        self.sent_etags: dict[str, str | None] = {}
+        self.unparsable: set[str] = set()
+
+    async def afetch_chapter(self, url: str, *, validators: Validators | None = None) -> Page:
+        key = url.rsplit("/", 1)[-1]
+        self.sent_etags[key] = validators.etag if validators else None
+        if validators is not None and validators.etag == '"v1"':
+            raise NotModifiedError(url)
+        return Page(url, Validators(etag='"v1"'))
+
+    def parse_chapter(self, html: str):
+        if html.rsplit("/", 1)[-1] in self.unparsable:
+            raise ValueError("unexpected page layout")
+        return self.scrape_chapter(html)
+
+
+def _attach_revalidating_scraper(monkeypatch) -> RevalidatingFakeScraper:
+    scraper = RevalidatingFakeScraper()
+    monkeypatch.setattr("app.scrapers.scraper_registry._scrapers", [scraper])
+    return scraper
+
+
+def test_run_scrape_job_skips_stored_chapters_answered_not_modified(db_session, monkeypatch):
+    scraper = _attach_revalidating_scraper(monkeypatch)
+    work = Work(title="Conditional Work", source="fake", source_id="job-304")
+    db_session.add(work)
+    db_session.add(
+        Chapter(
+            work=work,
+            idx=1,
+            sort_key=Decimal("1.0000"),
+            title="Chapter 1",
+            normalized_text="Body 1",
+            text_hash="stored",
+            etag='"v1"',
+        )
+    )
+    db_session.commit()
+
+    manager = ScrapeManager(db_session)
+    job = manager.create_job(work.id, Decimal("1"), Decimal("2"))
+    asyncio.run(manager.run_scrape_job(job.id, force=False))
+
+    db_session.refresh(job)
+    assert scraper.sent_etags == {"1.0000": '"v1"', "2.0000": None}
+    assert (job.status, job.skipped_count, job.created_count) == ("completed", 1, 1)
+    # The new chapter's validators were stored with it.
+    db_session.expire_all()
+    assert {c.sort_key: c.etag for c in work.chapters} == {
+        Decimal("1.0000"): '"v1"',
+        Decimal("2.0000"): '"v1"',
+    }
+
+    # Forced jobs fetch everything in full.
+    job = manager.create_job(work.id, Decimal("1"), Decimal("2"))
+    asyncio.run(manager.run_scrape_job(job.id, force=True))
+    db_session.refresh(job)
+    assert scraper.sent_etags == {"1.0000": None, "2.0000": None}
+    assert job.updated_count == 2
+
+
+def test_run_scrape_job_refetches_pages_that_failed_to_store(db_session, monkeypatch):
+    scraper = _attach_revalidating_scraper(monkeypatch)
+    scraper.unparsable.add("1.0000")
+    work = Work(title="Unparsable Work", source="fake", source_id="job-parse")
+    db_session.add(work)
+    db_session.commit()
+
+    manager = ScrapeManager(db_session)
+    job = manager.create_job(work.id, Decimal("1"), Decimal("1"))
+    asyncio.run(manager.run_scrape_job(job.id, force=False))
+    db_session.refresh(job)
+    assert job.status == "failed"
+
+    # The page was fetched fine, but nothing was stored: the rescrape must not
+    # revalidate it into a 304 and skip it.
+    scraper.unparsable.clear()
+    job = manager.create_job(work.id, Decimal("1"), Decimal("1"))
+    asyncio.run(manager.run_scrape_job(job.id, force=False))
+    db_session.refresh(job)
+    assert scraper.sent_etags == {"1.0000": None}
+    assert (job.status, job.created_count, job.skipped_count) == ("completed", 1, 0)
+
+
+def test_run_scrape_job_heartbeats_while_the_engine_waits(db_session, monkeypatch):
+    _attach_fake_scraper(monkeypatch)
+    work = Work(title="Throttled Work", source="fake", source_id="job-heartbeat")
+    db_session.add(work)
+    db_session.commit()
+
+    manager = ScrapeManager(db_session)
+    job = manager.create_job(work.id, Decimal("1"), Decimal("2"))
+
+    class PausedEngine:
+        """Yields nothing for a while, like an engine backing off a throttled host."""
+
+        def __init__(self, *args, **kwargs) -> None:
+            pass
+
+        async def chapters(self, keys):
+            await asyncio.sleep(0.2)
+            return
+            yield
+
+    heartbeats = []
+    update_job = ScrapeManager._update_job
+
+    async def recording_update_job(job, **values):
+        if not values:
+            heartbeats.append(job.id)
+        await update_job(job, **values)
+
+    monkeypatch.setattr("services.scrape_manager.ScrapeEngine", PausedEngine)
+    monkeypatch.setattr("services.scrape_manager._HEARTBEAT_INTERVAL_S", 0.03)
+    monkeypatch.setattr(ScrapeManager, "_update_job", staticmethod(recording_update_job))
+
+    asyncio.run(manager.run_scrape_job(job.id, force=False))
+
+    assert len(heartbeats) >= 3
+    db_session.refresh(job)
+    assert job.status == "completed"
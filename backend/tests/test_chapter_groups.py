@@ -5,9 +5,9 @@ from __future__ import annotations
 from decimal import Decimal
 
 import pytest
-from sqlalchemy import select
+from sqlalchemy import inspect, select
 
-from app.models import Chapter, ChapterGroupMember, Work
+from app.models import Chapter, ChapterGroupMember, ChapterTranslation, Work
 from services.chapter_groups import ChapterGroupsService
 from services.exceptions import (
     ChapterGroupConflictError,
@@ -258,19 +258,20 @@ def test_get_chapters_with_groups_mixed_list(db_session):
     # Create group with chapters 2 and 3 (sort_key 2.0 and 3.0)
     service.create_group(work.id, "Arc 1", [chapters[1].id, chapters[2].id])
 
-    items, total_chapters, total_groups, total_items, limit, offset = (
-        service.get_chapters_with_groups(work.id, limit=10, offset=0)
-    )
+    page = service.get_chapters_with_groups(work.id, limit=10, offset=0)
+    items = page.items
 
     # Should have 4 items: Chapter 1 (ungrouped), Group (min 2.0), Chapter 4 (ungrouped), Chapter 5 (ungrouped)
     assert len(items) == 4
-    assert total_chapters == 5
-    assert total_groups == 1
-    assert total_items == 4
+    assert page.total_chapters == 5
+    assert page.total_groups == 1
+    assert page.total_items == 4
+    assert page.next_cursor is None
+    assert items[1].member_count == 2
 
     # Check sorting by sort_key
-    item_types = [item[0] for item in items]
-    sort_keys = [item[2] for item in items]
+    item_types = [item.item_type for item in items]
+    sort_keys = [item.sort_key for item in items]
 
     assert item_types[0] == "chapter"  # Chapter 1
     assert sort_keys[0] == Decimal("1.0000")
@@ -295,7 +296,7 @@ def test_get_chapters_with_groups_sorting(db_session):
     service.create_group(work.id, "Arc 2", [chapters[4].id, chapters[5].id])  # min 5.0
     service.create_group(work.id, "Arc 1", [chapters[1].id, chapters[2].id])  # min 2.0
 
-    items, _, _, _, _, _ = service.get_chapters_with_groups(work.id, limit=10, offset=0)
+    items = service.get_chapters_with_groups(work.id, limit=10, offset=0).items
 
     # Should be: Chapter 1, Arc 1 (min 2.0), Chapter 4, Arc 2 (min 5.0), Chapter 7
     assert len(items) == 5
@@ -309,8 +310,8 @@ def test_get_chapters_with_groups_sorting(db_session):
     ]
 
     for i, (expected_type, expected_key) in enumerate(expected_order):
-        assert items[i][0] == expected_type
-        assert items[i][2] == expected_key
+        assert items[i].item_type == expected_type
+        assert items[i].sort_key == expected_key
 
 
 def test_get_chapters_with_groups_pagination(db_session):
@@ -322,20 +323,18 @@ def test_get_chapters_with_groups_pagination(db_session):
     service.create_group(work.id, "Arc 1", [chapters[2].id, chapters[3].id])  # min 3.0
 
     # First page (limit 5)
-    items_page1, _, _, _, limit, offset = service.get_chapters_with_groups(
-        work.id, limit=5, offset=0
-    )
-    assert len(items_page1) == 5
-    assert limit == 5
-    assert offset == 0
+    page1 = service.get_chapters_with_groups(work.id, limit=5, offset=0)
+    assert len(page1.items) == 5
+    assert page1.limit == 5
+    assert page1.offset == 0
+    assert page1.next_cursor == Decimal("6.0000")
 
     # Second page
-    items_page2, _, _, _, limit, offset = service.get_chapters_with_groups(
-        work.id, limit=5, offset=5
-    )
-    assert len(items_page2) == 4  # 9 total items - 5 = 4
-    assert limit == 5
-    assert offset == 5
+    page2 = service.get_chapters_with_groups(work.id, limit=5, offset=5)
+    assert len(page2.items) == 4  # 9 total items - 5 = 4
+    assert page2.limit == 5
+    assert page2.offset == 5
+    assert page2.next_cursor is None
 
 
 def test_get_chapters_with_groups_only_groups(db_session):
@@ -347,16 +346,14 @@ def test_get_chapters_with_groups_only_groups(db_session):
     service.create_group(work.id, "Arc 1", [chapters[0].id, chapters[1].id])
     service.create_group(work.id, "Arc 2", [chapters[2].id, chapters[3].id])
 
-    items, total_chapters, total_groups, total_items, _, _ = service.get_chapters_with_groups(
-        work.id, limit=10, offset=0
-    )
+    page = service.get_chapters_with_groups(work.id, limit=10, offset=0)
 
     # Should have 2 groups only
-    assert len(items) == 2
-    assert total_chapters == 4
-    assert total_groups == 2
-    assert total_items == 2
-    assert all(item[0] == "group" for item in items)
+    assert len(page.items) == 2
+    assert page.total_chapters == 4
+    assert page.total_groups == 2
+    assert page.total_items == 2
+    assert all(item.item_type == "group" for item in page.items)
 
 
 def test_get_chapters_with_groups_no_groups(db_session):
@@ -365,16 +362,67 @@ def test_get_chapters_with_groups_no_groups(db_session):
     _create_chapters(db_session, work, count=3)
 
     service = ChapterGroupsService(db_session)
-    items, total_chapters, total_groups, total_items, _, _ = service.get_chapters_with_groups(
-        work.id, limit=10, offset=0
-    )
+    page = service.get_chapters_with_groups(work.id, limit=10, offset=0)
 
     # Should have 3 chapters only
-    assert len(items) == 3
-    assert total_chapters == 3
-    assert total_groups == 0
-    assert total_items == 3
-    assert all(item[0] == "chapter" for item in items)
+    assert len(page.items) == 3
+    assert page.total_chapters == 3
+    assert page.total_groups == 0
+    assert page.total_items == 3
+    assert all(item.item_type == "chapter" for item in page.items)
+
+
+def test_get_chapters_with_groups_keyset_walks_every_item_once(db_session):
+    """Following next_cursor visits the whole mixed list in order."""
+    work = _create_work(db_session)
+    chapters = _create_chapters(db_session, work, count=12)
+
+    service = ChapterGroupsService(db_session)
+    service.create_group(work.id, "Arc 1", [chapters[2].id, chapters[3].id, chapters[4].id])
+    service.create_group(work.id, "Arc 2", [chapters[9].id, chapters[7].id])  # min 8.0
+
+    seen = []
+    after = None
+    while True:
+        page = service.get_chapters_with_groups(work.id, limit=3, after=after)
+        seen.extend((item.item_type, item.sort_key) for item in page.items)
+        if page.next_cursor is None:
+            break
+        after = page.next_cursor
+
+    keys = [Decimal(f"{n}.0000") for n in (1, 2, 3, 6, 7, 8, 9, 11, 12)]
+    assert [key for _, key in seen] == keys
+    assert [kind for kind, _ in seen].count("group") == 2
+    assert page.total_items == len(seen)
+
+
+def test_get_chapters_with_groups_leaves_chapter_text_unloaded(db_session):
+    """List rows carry only list columns, plus batch-loaded translation status."""
+    work = _create_work(db_session)
+    chapters = _create_chapters(db_session, work, count=4)
+    db_session.add_all(
+        [
+            ChapterTranslation(chapter_id=chapters[0].id, status="completed"),
+            ChapterTranslation(chapter_id=chapters[1].id, status="completed"),
+            ChapterTranslation(chapter_id=chapters[2].id, status="running"),
+        ]
+    )
+    db_session.commit()
+
+    service = ChapterGroupsService(db_session)
+    service.create_group(work.id, "Done", [chapters[1].id])
+    service.create_group(work.id, "Partly", [chapters[2].id, chapters[3].id])
+    work_id = work.id
+    db_session.expunge_all()
+
+    items = service.get_chapters_with_groups(work_id, limit=10).items
+
+    assert [(item.item_type, item.is_fully_translated) for item in items] == [
+        ("chapter", True),
+        ("group", True),
+        ("group", False),
+    ]
+    assert "normalized_text" in inspect(items[0].data).unloaded
 
 
 # API endpoint tests
@@ -710,3 +758,15 @@ def test_chapters_list_with_groups_api(client, db_session):
     assert items[1]["item_type"] == "group"
     assert items[1]["data"]["name"] == "Arc 1"
     assert items[1]["data"]["member_count"] == 2
+    assert data["next_cursor"] is None
+
+    page = client.get(f"/works/{work.id}/chapters", params={"limit": 2}).json()
+    assert page["next_cursor"] == "2.0000"
+    rest = client.get(
+        f"/works/{work.id}/chapters", params={"limit": 2, "cursor": page["next_cursor"]}
+    ).json()
+    assert [item["data"]["title"] for item in rest["items"]] == ["Chapter 4", "Chapter 5"]
+    assert rest["next_cursor"] is None
+
+    assert client.get(f"/works/{work.id}/chapters", params={"cursor": "nan"}).status_code == 400
+    assert client.get(f"/works/{work.id}/chapters", params={"cursor": "x"}).status_code == 400
@@ -1,9 +1,11 @@
 from __future__ import annotations
 
+from datetime import UTC, datetime
 from decimal import Decimal
 
-from sqlalchemy import select
+from sqlalchemy import inspect, select
 
+from app.clients import Page, Validators
 from app.models import Chapter, Work
 from app.scrapers import scraper_registry
 from services.chapters import ChaptersService
@@ -22,6 +24,9 @@ class FakeScraper:
     def fetch_work_metadata(self, descriptor):  # pragma: no cover - unused
         raise NotImplementedError
 
+    async def aload_toc(self, source_id: str, fetch, parse) -> None:
+        pass
+
     def build_chapter_url(self, source_id: str, chapter_number: Decimal) -> str:
         return f"https://fake/{source_id}/{str(chapter_number)}"
 
@@ -32,6 +37,13 @@ class FakeScraper:
         label = str(normalized)
         return f"Chapter {label}", f"Body {label}"
 
+    async def afetch_chapter(self, url: str, *, validators: Validators | None = None) -> Page:
+        return Page(url, Validators())
+
+    def parse_chapter(self, html: str) -> tuple[str, str]:
+        # The "page" is its url, so subclasses overriding scrape_chapter fail here too.
+        return self.scrape_chapter(html)
+
 
 def _attach_fake_scraper(monkeypatch) -> None:
     fake = FakeScraper()
@@ -121,3 +133,49 @@ def test_scrape_updates_with_force_and_decimal_range(db_session, monkeypatch):
         Decimal("2.0000"),
         Decimal("2.5000"),
     ]
+
+
+def test_list_and_navigation_queries_leave_chapter_text_unloaded(db_session):
+    work = Work(title="Long Work", source="fake", source_id="novel-2")
+    db_session.add(work)
+    db_session.flush()
+    for n in (1, 2, 3):
+        db_session.add(
+            Chapter(
+                work_id=work.id,
+                idx=n,
+                sort_key=Decimal(n),
+                title=f"Chapter {n}",
+                normalized_text=f"Body {n}",
+                text_hash=f"hash{n}",
+                last_read_at=datetime(2024, 1, n, tzinfo=UTC),
+            )
+        )
+    db_session.commit()
+    work_id = work.id
+    db_session.expunge_all()
+
+    service = ChaptersService(db_session)
+    rows, total, _, _ = service.get_chapters_for_work(work_id, limit=10, offset=0)
+    middle = rows[1]
+    loaded = [
+        *rows,
+        service.get_next_chapter(work_id, middle.sort_key),
+        service.get_previous_chapter(work_id, middle.sort_key),
+    ]
+    assert total == 3
+    assert all("normalized_text" in inspect(ch).unloaded for ch in loaded)
+    # Loaded on demand for callers that do need it.
+    assert middle.normalized_text == "Body 2"
+
+    db_session.expunge_all()
+    assert "normalized_text" in inspect(service.get_chapter(middle.id)).unloaded
+    db_session.expunge_all()
+    chapter = service.get_chapter(middle.id, with_text=True)
+    assert "normalized_text" not in inspect(chapter).unloaded
+
+    recent = service.get_recently_read(limit=2)
+    assert [(row.title, row.work_title) for row in recent] == [
+        ("Chapter 3", "Long Work"),
+        ("Chapter 2", "Long Work"),
+    ]
@@ -0,0 +1,112 @@
+"""Tests for the fake LLM provider used by offline load tests."""
+
+from __future__ import annotations
+
+import asyncio
+
+import pytest
+
+from agents.base_agent import CallUsage
+from agents.fake_llm import FakeChatModel, FakeProviderError
+from agents.llm_registry import create_llm
+from agents.rate_limiter import is_throttle_error
+from agents.translation_agent import get_translation_agent
+from app.config import settings
+from app.explanation_schemas import FACET_SCHEMA_MAP
+from app.schemas import PromptVersionCreateRequest
+from constants.llm import get_model_info
+
+
+@pytest.fixture(autouse=True)
+def fake_llm_enabled(monkeypatch) -> None:
+    monkeypatch.setattr(settings, "enable_fake_llm", True)
+
+
+def _collect(model: FakeChatModel, text: str = "彼は静かに歩いていた。") -> list:
+    async def run() -> list:
+        return [chunk async for chunk in model.astream([("human", f"<source>{text}</source>")])]
+
+    return asyncio.run(run())
+
+
+def test_create_llm_builds_fake_model_from_settings(monkeypatch):
+    monkeypatch.setattr(settings, "fake_llm_ttft_ms", 5.0)
+    monkeypatch.setattr(settings, "fake_llm_seed", 7)
+    llm = create_llm(provider="fake", model="fake", api_key="fake", api_base=None)
+    assert isinstance(llm, FakeChatModel)
+    assert llm.ttft_ms == 5.0
+    assert llm.seed == 7
+
+
+def test_fake_model_is_unavailable_unless_enabled(monkeypatch):
+    monkeypatch.setattr(settings, "enable_fake_llm", False)
+    assert get_model_info("fake") is None
+    assert settings.get_api_key_for_provider("fake") is None
+    with pytest.raises(ValueError, match="Unsupported provider"):
+        create_llm(provider="fake", model="fake", api_key="fake", api_base=None)
+    with pytest.raises(ValueError, match="Invalid model 'fake'"):
+        PromptVersionCreateRequest(template="{text}", model="fake")
+
+
+def test_same_seed_gives_same_calls():
+    first = FakeChatModel(ttft_ms=1, tokens_per_s=10_000, seed=3)
+    second = FakeChatModel(ttft_ms=1, tokens_per_s=10_000, seed=3)
+    assert [c.content for c in _collect(first)] == [c.content for c in _collect(second)]
+    plans = [first.plan_call([])[0] for _ in range(3)]
+    assert plans == [second.plan_call([])[0] for _ in range(3)]
+
+
+def test_stream_reports_usage_on_last_chunk():
+    chunks = _collect(FakeChatModel(ttft_ms=1, tokens_per_s=10_000))
+    text_chunks = [c for c in chunks if c.content]
+    assert len(text_chunks) >= 8
+    usage = chunks[-1].usage_metadata
+    assert usage["output_tokens"] == len(text_chunks)
+    assert usage["total_tokens"] == usage["input_tokens"] + usage["output_tokens"]
+
+
+def test_injected_rate_limits_and_errors():
+    throttled = FakeChatModel(ttft_ms=1, rate_limit_rate=1.0)
+    with pytest.raises(FakeProviderError) as excinfo:
+        _collect(throttled)
+    assert excinfo.value.status_code == 429
+    assert is_throttle_error(excinfo.value)
+
+    failing = FakeChatModel(ttft_ms=1, tokens_per_s=10_000, error_rate=1.0)
+    with pytest.raises(FakeProviderError) as excinfo:
+        _collect(failing)
+    assert excinfo.value.status_code == 500
+
+
+def test_structured_output_matches_facet_schemas():
+    model = FakeChatModel(ttft_ms=1, tokens_per_s=10_000)
+
+    async def run() -> None:
+        for schema in FACET_SCHEMA_MAP.values():
+            runnable = model.with_structured_output(schema, include_raw=True)
+            wrapped = await runnable.ainvoke([("system", "s"), ("human", "h")])
+            assert isinstance(wrapped["parsed"], schema)
+            assert wrapped["raw"].usage_metadata["output_tokens"] > 0
+
+    asyncio.run(run())
+
+
+def test_translation_agent_streams_through_fake_provider(monkeypatch):
+    monkeypatch.setattr(settings, "translation_model", "fake")
+    monkeypatch.setattr(settings, "fake_llm_ttft_ms", 1.0)
+    monkeypatch.setattr(settings, "fake_llm_tokens_per_s", 10_000.0)
+    monkeypatch.setattr("agents.llm_registry._registry", None)
+    agent = get_translation_agent()
+    assert agent.provider == "fake"
+    assert agent.has_provider
+    usage = CallUsage()
+
+    async def run() -> str:
+        return "".join([c async for c in agent.stream_segment("彼は歩く。", usage=usage)])
+
+    assert asyncio.run(run()).strip()
+    assert usage.provider == "fake"
+    assert usage.output_tokens is not None
+    (attempt,) = usage.attempts
+    assert (attempt.kind, attempt.outcome) == ("primary", "ok")
+    assert attempt.output_tokens == usage.output_tokens
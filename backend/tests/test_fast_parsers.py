@@ -0,0 +1,99 @@
+"""Differential tests: the lxml chapter parsers must match the BeautifulSoup ones."""
+
+from __future__ import annotations
+
+from pathlib import Path
+
+import pytest
+
+from app.kakuyomu import fast_parser as kakuyomu_fast, parser as kakuyomu_parser
+from app.kakuyomu.scraper import KakuyomuScraper
+from app.scrapers import scraper_registry
+from app.scrapers.exceptions import ScraperError
+from app.syosetu import fast_parser as syosetu_fast, parser as syosetu_parser
+from app.syosetu.scraper import SyosetuScraper
+from tests.test_syosetu_parser import MODERN_HTML, RUBY_HTML
+
+EPISODE_HTML = (Path(__file__).parent / "fixtures" / "kakuyomu" / "episode.html").read_text(
+    encoding="utf-8"
+)
+RUBY = "<ruby>魔法<rp>(</rp><rt>まほう</rt><rp>)</rp></ruby>"
+
+SYOSETU_PAGES = {
+    "modern": MODERN_HTML,
+    "ruby": RUBY_HTML,
+    "legacy": (
+        "<p class='novel_subtitle' id='novel_subtitle'> 第一話 <ruby>序<rt>じょ</rt></ruby> </p>"
+        f"<div id='novel_honbun'><p id='L1'>　{RUBY}の光。</p><p id='L2'><br></p>"
+        "<div><p>入れ子</p><p>の段落</p></div><p>a<!-- note -->b<script>x()</script>c</p></div>"
+    ),
+    "modern_without_text_blocks": (
+        "<h1 class='p-novel__title'>題</h1>"
+        "<div class='p-novel__body'>本文<span>だけ</span><style>p{}</style></div>"
+    ),
+    "title_precedence": (
+        "<h1 class='p-novel__title'>後</h1><p id='novel_title'>作品</p>"
+        "<p id='novel_subtitle'>話</p><div id='honbun'><p>本文</p></div>"
+    ),
+    "blank_body_falls_through": (
+        "<div id='novel_honbun'><p>  </p></div>"
+        "<div class='p-novel__body'><div class='js-novel-text'><p>一</p></div>"
+        "<div class='js-novel-text'><p>二</p><p>三</p></div></div>"
+    ),
+    "blank_body_fallback": "<div id='novel_honbun'>\n<p>　</p>\n</div>",
+    "inline_body": "<div id='honbun'>一行目<br>二行目\r\n\r\n\r\n\r\n三行目</div>",
+    "duplicate_ids": "<p id='novel_subtitle'>一</p><p id='novel_subtitle'>二</p>",
+    "no_chapter": "<html><body><p>404</p></body></html>",
+    "empty": "",
+}
+
+KAKUYOMU_PAGES = {
+    "fixture": EPISODE_HTML,
+    "fixture_without_direct_paragraphs": EPISODE_HTML.replace(
+        'class="widget-episodeBody js-episode-body"',
+        'class="widget-episodeBody js-episode-body"><div class="wrap"',
+        1,
+    ),
+    "body_without_paragraphs": (
+        "<p class='widget-episodeTitle'>題</p>"
+        f"<div class='js-episode-body'>一{RUBY}<br>二<span>三</span></div>"
+    ),
+    "empty_title": "<p class='widget-episodeTitle'> </p><div class='js-episode-body'><p>x</p></div>",
+    "no_body": f"<p class='widget-episodeTitle'>{RUBY} 題</p>",
+    "wrong_tags": "<div class='widget-episodeTitle'>題</div><p class='js-episode-body'>x</p>",
+    "empty": "",
+}
+
+
+@pytest.mark.parametrize("html", SYOSETU_PAGES.values(), ids=SYOSETU_PAGES.keys())
+def test_syosetu_fast_parser_matches_beautifulsoup(html):
+    assert syosetu_fast.parse_chapter(html) == syosetu_parser.parse_chapter(html)
+
+
+@pytest.mark.parametrize("html", KAKUYOMU_PAGES.values(), ids=KAKUYOMU_PAGES.keys())
+def test_kakuyomu_fast_parser_matches_beautifulsoup(html):
+    assert kakuyomu_fast.parse_chapter(html) == kakuyomu_parser.parse_chapter(html)
+
+
+def test_fast_parser_output_on_fixture():
+    title, text = kakuyomu_fast.parse_chapter(EPISODE_HTML)
+    assert title == "第1話"
+    assert "　" in text
+    assert "・" not in text
+
+
+def test_scrapers_parse_with_the_selected_parser(monkeypatch):
+    assert SyosetuScraper(http_client=object()).parse_chapter is syosetu_parser.parse_chapter
+    fast = KakuyomuScraper(http_client=object(), chapter_parser="lxml")
+    assert fast.parse_chapter is kakuyomu_fast.parse_chapter
+    with pytest.raises(ScraperError):
+        SyosetuScraper(http_client=object(), chapter_parser="regex")
+
+    registered = [scraper_registry.resolve_by_source(s) for s in ("syosetu", "kakuyomu")]
+    for scraper in registered:
+        monkeypatch.setattr(scraper, "chapter_parser", scraper.chapter_parser)
+    scraper_registry.use_chapter_parser("lxml")
+    assert [scraper.parse_chapter for scraper in registered] == [
+        syosetu_fast.parse_chapter,
+        kakuyomu_fast.parse_chapter,
+    ]
@@ -0,0 +1,92 @@
+"""Tests for the raw HTML archive and the offline re-parse pipeline."""
+
+from __future__ import annotations
+
+import asyncio
+from decimal import Decimal
+from pathlib import Path
+
+from app.kakuyomu import parser as kakuyomu_parser
+from app.models import Chapter, Work
+from services.chapters import ChaptersService
+from services.html_archive import HtmlArchive, get_html_archive
+from services.reparse import ReparseService
+from services.scrape_engine import ScrapeEngine
+from services.translation_stream import TranslationStreamService
+from tests.test_scrape_engine import AsyncFakeScraper
+
+EPISODE_HTML = (Path(__file__).parent / "fixtures" / "kakuyomu" / "episode.html").read_text(
+    encoding="utf-8"
+)
+
+
+def test_archive_stores_each_distinct_page_once(tmp_path):
+    archive = HtmlArchive(tmp_path)
+    first = archive.put("syosetu", "n1", Decimal("1.0000"), "https://x/n1/1/", "<p>一</p>")
+    same = archive.put("syosetu", "n1", Decimal("2"), "https://x/n1/2/", "<p>一</p>")
+    other = archive.put("syosetu", "n1", Decimal("1"), "https://x/n1/1/", "<p>二</p>")
+
+    assert first == same != other
+    assert len(list((tmp_path / "objects").rglob("*.html.gz"))) == 2
+    # The latest fetch of a chapter wins, whatever the key's scale.
+    page = archive.get("syosetu", "n1", Decimal("1.0000"))
+    assert page.content_hash == other
+    assert archive.read(page.content_hash) == "<p>二</p>"
+    assert set(archive.pages("syosetu", "n1")) == {"1", "2"}
+    assert archive.works() == [("syosetu", "n1")]
+
+
+def test_scrape_engine_archives_fetched_pages():
+    scraper = AsyncFakeScraper()
+    keys = [Decimal(n) for n in (1, 2)]
+
+    async def run():
+        return [fetched async for fetched in ScrapeEngine(scraper, "w").chapters(keys)]
+
+    fetched = asyncio.run(run())
+
+    assert [f.title for f in fetched] == ["Chapter 1", "Chapter 2"]
+    archive = get_html_archive()
+    page = archive.get("fake", "w", Decimal(2))
+    assert page.url == "https://fake.test/w/2"
+    assert archive.read(page.content_hash) == "Chapter 2\nBody 2"
+
+
+def test_reparse_updates_and_resegments_only_changed_chapters(db_session):
+    title, text = kakuyomu_parser.parse_chapter(EPISODE_HTML)
+    hash_text = ChaptersService._hash_text
+    work = Work(title="Archived Work", source="kakuyomu", source_id="k1")
+    db_session.add(work)
+    db_session.flush()
+    # Chapter 1 was stored by an older parser that dropped the last paragraph.
+    stale_text = text.rsplit("\n", 1)[0]
+    chapters = [
+        Chapter(work_id=work.id, idx=1, sort_key=Decimal(1), title=title,
+                normalized_text=stale_text, text_hash=hash_text(stale_text)),
+        Chapter(work_id=work.id, idx=2, sort_key=Decimal(2), title=title,
+                normalized_text=text, text_hash=hash_text(text)),
+        Chapter(work_id=work.id, idx=3, sort_key=Decimal(3), title="Not archived",
+                normalized_text="本文", text_hash=hash_text("本文")),
+    ]  # fmt: skip
+    db_session.add_all(chapters)
+    db_session.commit()
+    translations = TranslationStreamService(db_session)
+    for chapter in chapters[:2]:
+        translation = translations.get_or_create_translation(chapter.id)
+        translations.ensure_segments(translation, chapter.normalized_text)
+    archive = get_html_archive()
+    for n in (1, 2):
+        url = f"https://kakuyomu.jp/works/k1/episodes/{n}"
+        archive.put("kakuyomu", "k1", Decimal(n), url, EPISODE_HTML)
+
+    summary = asyncio.run(ReparseService(db_session).reparse_work(work.id))
+
+    assert (summary.changed, summary.unchanged, summary.missing) == (1, 1, 1)
+    assert summary.errors == []
+    db_session.expire_all()
+    stored = db_session.get(Chapter, chapters[0].id)
+    assert stored.normalized_text == text
+    assert stored.text_hash == hash_text(text)
+    translation = translations.get_or_create_translation(stored.id)
+    segments = translations.get_segments_for_translation(translation.id)
+    assert segments[-1].end == len(text)
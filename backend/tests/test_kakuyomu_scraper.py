@@ -1,8 +1,10 @@
+import asyncio
 from decimal import Decimal
 from pathlib import Path
 
 import pytest
 
+from app.clients import Page, Validators
 from app.kakuyomu.scraper import KakuyomuScraper
 from app.scrapers.exceptions import ScraperError
 from services.scrape_manager import _source_chapter_id_from_url
@@ -21,13 +23,22 @@ class FixtureHttpClient:
         self.work_html = (FIXTURES / "work.html").read_text(encoding="utf-8")
         self.episode_html = (FIXTURES / "episode.html").read_text(encoding="utf-8")
         self.requested: list[str] = []
+        self.synchronous: list[str] = []
 
     def fetch(self, url: str, headers=None) -> str:
+        self.synchronous.append(url)
         self.requested.append(url)
         if "/episodes/" in url:
             return self.episode_html
         return self.work_html
 
+    async def afetch(self, url: str, headers=None) -> str:
+        self.requested.append(url)
+        return self.episode_html if "/episodes/" in url else self.work_html
+
+    async def afetch_page(self, url: str, headers=None, *, validators=None) -> Page:
+        return Page(await self.afetch(url, headers), Validators())
+
 
 @pytest.fixture
 def scraper() -> KakuyomuScraper:
@@ -107,6 +118,23 @@ def test_build_chapter_url_refreshes_stale_toc():
     assert any("/episodes/" not in r for r in client.requested)
 
 
+def test_build_chapter_url_keeps_a_freshly_loaded_toc():
+    client = FixtureHttpClient()
+    scraper = KakuyomuScraper(http_client=client)
+
+    async def fetch(url: str) -> str:
+        return client.work_html
+
+    async def parse(fn, html: str):
+        return fn(html)
+
+    asyncio.run(scraper.aload_toc(WORK_ID, fetch, parse))
+    with pytest.raises(ScraperError):
+        scraper.build_chapter_url(WORK_ID, Decimal(999))
+    # Just loaded: the out-of-range chapter does not re-fetch the work page.
+    assert client.requested == []
+
+
 def test_build_chapter_url_rejects_fractional(scraper):
     with pytest.raises(ScraperError):
         scraper.build_chapter_url(WORK_ID, Decimal("1.5"))
@@ -0,0 +1,169 @@
+"""Tests for the shared LLM client registry."""
+
+from __future__ import annotations
+
+import asyncio
+import threading
+from http.server import BaseHTTPRequestHandler, ThreadingHTTPServer
+from unittest.mock import MagicMock
+
+import httpx
+import pytest
+
+from agents.llm_registry import LLMClientRegistry, _count_connections, create_llm
+from agents.translation_agent import TranslationAgent
+from observability.metrics import (
+    LLM_CLIENT_CACHE_SIZE,
+    LLM_CLIENT_CACHE_TOTAL,
+    LLM_HTTP_REQUESTS_TOTAL,
+)
+
+
+def _fake_factory(**kwargs):
+    llm = MagicMock(name=f"llm-{kwargs['model']}")
+    llm.with_structured_output.side_effect = lambda schema, include_raw: MagicMock(
+        name=f"structured-{schema.__name__}"
+    )
+    return llm
+
+
+def _cache_counts(cache: str) -> dict[str, float]:
+    return {
+        outcome: LLM_CLIENT_CACHE_TOTAL.value(cache=cache, outcome=outcome)
+        for outcome in ("hit", "miss", "eviction")
+    }
+
+
+@pytest.fixture
+def registry(monkeypatch) -> LLMClientRegistry:
+    registry = LLMClientRegistry(max_clients=2, llm_factory=_fake_factory)
+    monkeypatch.setattr("agents.llm_registry._registry", registry)
+    return registry
+
+
+def test_clients_are_shared_per_provider_model_and_base(registry):
+    before = _cache_counts("clients")
+    kwargs = {"provider": "openai", "model": "m1", "api_key": "k", "api_base": None}
+    first = registry.get_llm(**kwargs)
+    assert registry.get_llm(**kwargs) is first
+    assert registry.get_llm(**{**kwargs, "api_base": "http://proxy"}) is not first
+    assert registry.get_llm(**{**kwargs, "api_key": "rotated"}) is not first
+
+    after = _cache_counts("clients")
+    assert {outcome: after[outcome] - before[outcome] for outcome in after} == {
+        "hit": 1,
+        "miss": 3,
+        "eviction": 1,
+    }
+    assert LLM_CLIENT_CACHE_SIZE.value(cache="clients") == 2
+
+
+def test_prompt_templates_and_structured_runnables_are_cached(registry):
+    assert registry.get_prompt("sys", "{source_text}") is registry.get_prompt(
+        "sys", "{source_text}"
+    )
+
+    class Schema:
+        pass
+
+    before = _cache_counts("structured_runnables")
+    kwargs = {"provider": "openai", "model": "m1", "api_key": "k", "api_base": None}
+    with registry.use_structured_llm(**kwargs, schema=Schema) as runnable:
+        pass
+    with registry.use_structured_llm(**kwargs, schema=Schema) as again:
+        assert again is runnable
+
+    after = _cache_counts("structured_runnables")
+    assert after["hit"] - before["hit"] == 1
+    assert after["miss"] - before["miss"] == 1
+
+
+def test_evicted_clients_close_their_pools_once_released():
+    registry = LLMClientRegistry(max_clients=1)
+    kwargs = {"provider": "openai", "api_key": "k", "api_base": None}
+
+    with registry.use_llm(model="m1", **kwargs) as leased:
+        idle = registry.get_llm(model="m2", **kwargs)
+        # m1 was evicted while in use: its pools stay open until the call ends.
+        assert not leased.http_client.is_closed
+        registry.get_llm(model="m3", **kwargs)
+        assert idle.http_client.is_closed and idle.http_async_client.is_closed
+        assert not leased.http_async_client.is_closed
+    assert leased.http_client.is_closed and leased.http_async_client.is_closed
+
+    # Clients never share a pool, so closing one leaves the live client usable.
+    live = registry.get_llm(model="m3", **kwargs)
+    assert not live.http_client.is_closed
+
+
+class _KeepAliveHandler(BaseHTTPRequestHandler):
+    protocol_version = "HTTP/1.1"
+
+    def do_GET(self) -> None:  # noqa: N802 - http.server naming
+        self.send_response(200)
+        self.send_header("Content-Length", "2")
+        self.end_headers()
+        self.wfile.write(b"ok")
+
+    def log_message(self, format, *args) -> None:
+        pass
+
+
+@pytest.fixture
+def server_url():
+    httpd = ThreadingHTTPServer(("127.0.0.1", 0), _KeepAliveHandler)
+    thread = threading.Thread(target=httpd.serve_forever, args=(0.05,), daemon=True)
+    thread.start()
+    yield f"http://127.0.0.1:{httpd.server_port}/"
+    httpd.shutdown()
+    httpd.server_close()
+
+
+def test_requests_are_counted_as_new_or_reused_connections(server_url):
+    def counts(provider: str) -> tuple[float, float]:
+        return (
+            LLM_HTTP_REQUESTS_TOTAL.value(provider=provider, connection="new"),
+            LLM_HTTP_REQUESTS_TOTAL.value(provider=provider, connection="reused"),
+        )
+
+    sync_before = counts("sync-test")
+    with httpx.Client() as client:
+        _count_connections(client, "sync-test")
+        for _ in range(3):
+            client.get(server_url)
+    sync_after = counts("sync-test")
+    assert (sync_after[0] - sync_before[0], sync_after[1] - sync_before[1]) == (1, 2)
+
+    async def fetch_twice() -> None:
+        async with httpx.AsyncClient() as client:
+            _count_connections(client, "async-test")
+            for _ in range(2):
+                await client.get(server_url)
+
+    async_before = counts("async-test")
+    asyncio.run(fetch_twice())
+    async_after = counts("async-test")
+    assert (async_after[0] - async_before[0], async_after[1] - async_before[1]) == (1, 1)
+
+
+def test_created_clients_count_their_connections():
+    llm = create_llm(provider="openai", model="m1", api_key="k", api_base=None)
+    assert llm.http_client.event_hooks["request"]
+    assert llm.http_async_client.event_hooks["request"]
+
+
+def test_agents_reuse_registry_clients(registry):
+    def _agent():
+        return TranslationAgent(
+            model="m1",
+            api_key="k",
+            api_base=None,
+            chunk_chars=32,
+            context_window=0,
+            provider="openai",
+        )
+
+    first, second = _agent(), _agent()
+    assert first.has_provider
+    assert first._llm is second._llm
+    assert first.prompt is second.prompt
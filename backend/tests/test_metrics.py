@@ -0,0 +1,85 @@
+"""Tests for the in-process metrics registry and the /metrics endpoint."""
+
+from __future__ import annotations
+
+import threading
+import time
+
+from observability.metrics import (
+    RECORD_BUDGET_NS,
+    TRANSLATION_SEGMENTS_TOTAL,
+    MetricsRegistry,
+)
+from tests.test_usage import _make_chapter, _metered_agent, _translate
+
+
+def test_render_counter_gauge_and_histogram():
+    registry = MetricsRegistry()
+    requests = registry.counter("app_requests_total", "Requests.", ["route", "code"])
+    in_flight = registry.gauge("app_in_flight", "In flight.")
+    latency = registry.histogram("app_latency_seconds", "Latency.", buckets=(0.1, 1.0))
+
+    requests.inc(route="/a", code="200")
+    requests.inc(2, route="/a", code="200")
+    in_flight.inc()
+    in_flight.inc()
+    in_flight.dec()
+    latency.observe(0.05)
+    latency.observe(0.5)
+    latency.observe(5.0)
+
+    lines = registry.render().splitlines()
+    assert "# TYPE app_requests_total counter" in lines
+    assert 'app_requests_total{route="/a",code="200"} 3' in lines
+    assert "app_in_flight 1" in lines
+    assert 'app_latency_seconds_bucket{le="0.1"} 1' in lines
+    assert 'app_latency_seconds_bucket{le="1"} 2' in lines
+    assert 'app_latency_seconds_bucket{le="+Inf"} 3' in lines
+    assert "app_latency_seconds_count 3" in lines
+    assert "app_latency_seconds_sum 5.55" in lines
+
+
+def test_samples_from_all_threads_are_merged():
+    registry = MetricsRegistry()
+    counter = registry.counter("app_events_total", "Events.", ["kind"])
+    gauge = registry.gauge("app_level", "Level.")
+
+    def work() -> None:
+        for _ in range(1000):
+            counter.inc(kind="x")
+        gauge.inc(5)
+
+    threads = [threading.Thread(target=work) for _ in range(4)]
+    for thread in threads:
+        thread.start()
+    for thread in threads:
+        thread.join()
+
+    assert counter.value(kind="x") == 4000
+    gauge.set(2)
+    assert gauge.value() == 2
+
+
+def test_recording_overhead_is_small():
+    registry = MetricsRegistry()
+    counter = registry.counter("app_hot_total", "Hot path.", ["outcome"])
+    events = 20_000
+    started = time.perf_counter_ns()
+    for _ in range(events):
+        counter.inc(outcome="ok")
+    per_event = (time.perf_counter_ns() - started) / events
+    # Generous margin over the budget: shared CI machines are noisy.
+    assert per_event < RECORD_BUDGET_NS * 5
+
+
+def test_metrics_endpoint_exposes_db_and_translation_metrics(client, db_session):
+    before = TRANSLATION_SEGMENTS_TOTAL.value(outcome="completed")
+    work, chapter = _make_chapter(db_session)
+    _translate(db_session, work, chapter, _metered_agent(ttft_ms=10))
+    assert TRANSLATION_SEGMENTS_TOTAL.value(outcome="completed") == before + 2
+
+    response = client.get("/metrics")
+    assert response.status_code == 200
+    assert response.headers["content-type"].startswith("text/plain")
+    assert 'tonari_db_query_seconds_count{engine="sync"}' in response.text
+    assert 'tonari_translation_segments_total{outcome="completed"}' in response.text
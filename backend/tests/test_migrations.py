@@ -168,6 +168,8 @@ class TestMigrationIntegrity:
             "scrape_jobs",
             "chapter_translations",
             "translation_segments",
+            "translation_batch_jobs",
+            "translation_segment_usage",
         }
         missing = expected_tables - tables
         assert not missing, f"Tables missing from Alembic-only DB: {missing}"
@@ -0,0 +1,132 @@
+"""Tests for batched chapter parsing in worker processes."""
+
+from __future__ import annotations
+
+import asyncio
+import multiprocessing
+from concurrent.futures import ProcessPoolExecutor, ThreadPoolExecutor
+from functools import partial
+from pathlib import Path
+
+import pytest
+
+from app.kakuyomu import parser as kakuyomu_parser
+from app.kakuyomu.scraper import KakuyomuScraper
+from app.syosetu import parser as syosetu_parser
+from app.syosetu.scraper import SyosetuScraper
+from services.parse_executor import ParseExecutor, _warm_worker
+
+FIXTURES = Path(__file__).parent / "fixtures" / "kakuyomu"
+EPISODE_HTML = (FIXTURES / "episode.html").read_text(encoding="utf-8")
+WORK_HTML = (FIXTURES / "work.html").read_text(encoding="utf-8")
+WORK_ID = "16818622172873736209"
+SYOSETU_HTML = (
+    "<html><body><p id='novel_subtitle'>第一話</p>"
+    "<div id='novel_honbun'><p>一行目</p><p>二行目</p></div></body></html>"
+)
+
+
+def _square(value: int) -> int:
+    if value < 0:
+        raise ValueError(f"negative: {value}")
+    return value * value
+
+
+class RecordingPool(ThreadPoolExecutor):
+    """Thread pool that remembers the inputs of each batch it is given."""
+
+    def __init__(self) -> None:
+        super().__init__(max_workers=2)
+        self.batches: list[list] = []
+
+    def submit(self, fn, /, *args, **kwargs):
+        if len(args) == 2:
+            self.batches.append(list(args[1]))
+        return super().submit(fn, *args, **kwargs)
+
+
+def test_worker_processes_parse_like_the_server_process():
+    pool = ProcessPoolExecutor(
+        max_workers=2,
+        mp_context=multiprocessing.get_context("spawn"),
+        initializer=_warm_worker,
+    )
+    executor = ParseExecutor(pool)
+
+    parse_toc = partial(kakuyomu_parser.parse_work_page, work_id=WORK_ID)
+
+    async def run():
+        executor.warm()
+        return await asyncio.gather(
+            executor.parse(kakuyomu_parser.parse_chapter, EPISODE_HTML),
+            executor.parse(syosetu_parser.parse_chapter, SYOSETU_HTML),
+            executor.parse(parse_toc, WORK_HTML),
+        )
+
+    try:
+        kakuyomu, syosetu, toc = asyncio.run(run())
+    finally:
+        pool.shutdown()
+
+    assert kakuyomu == kakuyomu_parser.parse_chapter(EPISODE_HTML)
+    assert syosetu == ("第一話", "一行目\n二行目")
+    assert toc.episodes == parse_toc(WORK_HTML).episodes
+
+
+def test_workers_warm_every_selectable_chapter_parser(monkeypatch):
+    warmed = []
+    for scraper in (SyosetuScraper, KakuyomuScraper):
+        parsers = {
+            name: lambda html, key=(scraper.source, name): warmed.append(key)
+            for name in scraper.chapter_parsers
+        }
+        monkeypatch.setattr(scraper, "chapter_parsers", parsers)
+
+    _warm_worker()
+
+    assert sorted(warmed) == [
+        ("kakuyomu", "bs4"),
+        ("kakuyomu", "lxml"),
+        ("syosetu", "bs4"),
+        ("syosetu", "lxml"),
+    ]
+
+
+def test_parses_arriving_together_share_a_batch():
+    pool = RecordingPool()
+    executor = ParseExecutor(pool, batch_size=3, batch_wait_s=0.01)
+
+    async def run():
+        return await asyncio.gather(*(executor.parse(_square, n) for n in range(5)))
+
+    try:
+        results = asyncio.run(run())
+    finally:
+        pool.shutdown()
+
+    assert results == [0, 1, 4, 9, 16]
+    # A full batch leaves at once; the rest follow when the wait runs out.
+    assert pool.batches == [[0, 1, 2], [3, 4]]
+
+
+def test_a_failed_page_fails_only_its_own_caller():
+    pool = ThreadPoolExecutor(max_workers=2)
+    executor = ParseExecutor(pool, batch_size=4)
+
+    async def run():
+        return await asyncio.gather(
+            *(executor.parse(_square, n) for n in (2, -1, 3)), return_exceptions=True
+        )
+
+    try:
+        results = asyncio.run(run())
+        listed = asyncio.run(executor.parse_all(_square, [1, -2, 3, 4, 5]))
+    finally:
+        pool.shutdown()
+
+    assert results[0] == 4 and results[2] == 9
+    assert isinstance(results[1], ValueError)
+    assert listed[:1] + listed[2:] == [1, 9, 16, 25]
+    assert isinstance(listed[1], ValueError)
+    with pytest.raises(ValueError, match="negative"):
+        raise listed[1]
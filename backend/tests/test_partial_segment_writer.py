@@ -0,0 +1,104 @@
+"""Tests for the write-behind buffer used for in-flight segment text."""
+
+from __future__ import annotations
+
+import asyncio
+from decimal import Decimal
+
+from sqlalchemy import select
+
+from app.models import Chapter, ChapterTranslation, TranslationSegment, Work
+from services.partial_segment_writer import PartialSegmentWriter
+
+
+def _make_segments(session, count: int) -> list[int]:
+    work = Work(title="Test Work", source="test", source_id="test-work", source_meta={})
+    session.add(work)
+    session.flush()
+    chapter = Chapter(
+        work_id=work.id,
+        idx=1,
+        sort_key=Decimal(1),
+        title="Chapter 1",
+        normalized_text="text",
+        text_hash="test-hash",
+    )
+    session.add(chapter)
+    session.flush()
+    translation = ChapterTranslation(chapter_id=chapter.id, status="running")
+    session.add(translation)
+    session.flush()
+    segments = [
+        TranslationSegment(
+            chapter_translation_id=translation.id,
+            order_index=i,
+            start=0,
+            end=1,
+            tgt="",
+            flags=[],
+            src_hash=f"h{i}",
+            cache_key="stale",
+        )
+        for i in range(count)
+    ]
+    session.add_all(segments)
+    session.commit()
+    return [segment.id for segment in segments]
+
+
+def _segments(session) -> list[TranslationSegment]:
+    session.expire_all()
+    stmt = select(TranslationSegment).order_by(TranslationSegment.order_index)
+    return list(session.execute(stmt).scalars().all())
+
+
+def test_flush_coalesces_and_batches_staged_text(db_session):
+    ids = _make_segments(db_session, 3)
+    writer = PartialSegmentWriter(interval_s=60.0)
+
+    async def _stage_and_flush():
+        for segment_id in ids:
+            for text in ("a", "ab", "abc"):
+                writer.stage(segment_id, f"{segment_id}:{text}", ["partial"])
+        await writer.flush()
+
+    asyncio.run(_stage_and_flush())
+
+    assert writer.flush_count == 1
+    assert writer.rows_written == 3
+    for segment_id, segment in zip(ids, _segments(db_session), strict=True):
+        assert segment.tgt == f"{segment_id}:abc"
+        assert segment.flags == ["partial"]
+        assert segment.cache_key is None
+
+
+def test_background_flush_runs_after_interval(db_session):
+    ids = _make_segments(db_session, 1)
+    writer = PartialSegmentWriter(interval_s=0.01)
+
+    async def _stage_and_wait():
+        writer.stage(ids[0], "streamed", ["partial"])
+        await asyncio.sleep(0.05)
+
+    asyncio.run(_stage_and_wait())
+
+    assert writer.flush_count == 1
+    assert _segments(db_session)[0].tgt == "streamed"
+
+
+def test_settle_discards_staged_text(db_session):
+    ids = _make_segments(db_session, 2)
+    writer = PartialSegmentWriter(interval_s=60.0)
+
+    async def _stage_settle_flush():
+        writer.stage(ids[0], "in flight", ["partial"])
+        writer.stage(ids[1], "other", ["partial"])
+        await writer.settle(ids[0])
+        await writer.flush()
+
+    asyncio.run(_stage_settle_flush())
+
+    first, second = _segments(db_session)
+    assert first.tgt == ""
+    assert second.tgt == "other"
+    assert writer.rows_written == 1
@@ -0,0 +1,67 @@
+"""Tests for cached work prompt resolution."""
+
+from __future__ import annotations
+
+from sqlalchemy import event
+
+from app.db import engine
+from services.prompt import PromptService, ResolvedPrompt
+from services.works import WorksService
+from tests.test_translation_workflow import _make_work
+
+
+class _QueryCounter:
+    def __init__(self) -> None:
+        self.count = 0
+
+    def __call__(self, *args, **kwargs) -> None:
+        self.count += 1
+
+    def __enter__(self) -> _QueryCounter:
+        event.listen(engine, "before_cursor_execute", self)
+        return self
+
+    def __exit__(self, *exc) -> None:
+        event.remove(engine, "before_cursor_execute", self)
+
+
+def _work_with_prompt(db_session):
+    work = _make_work(db_session)
+    db_session.commit()
+    service = PromptService(db_session)
+    prompt = service.create_prompt("Custom")
+    version = service.append_version(prompt.id, "model-a", "template a", parameters={"t": 1})
+    WorksService(db_session).set_work_default_prompt(work.id, prompt.id)
+    return work, prompt, version, service
+
+
+def test_resolution_is_cached_until_a_version_is_appended(db_session):
+    work, prompt, version, service = _work_with_prompt(db_session)
+
+    resolved = service.resolve_prompt_for_work(work.id)
+    assert resolved == ResolvedPrompt(
+        prompt_id=prompt.id,
+        template="template a",
+        model="model-a",
+        parameters={"t": 1},
+        prompt_version_id=version.id,
+    )
+    with _QueryCounter() as queries:
+        assert service.resolve_prompt_for_work(work.id) is resolved
+    assert queries.count == 0
+
+    service.append_version(prompt.id, "model-b", "template b")
+    assert service.resolve_prompt_for_work(work.id).model == "model-b"
+
+
+def test_assignment_change_and_delete_invalidate(db_session):
+    work, prompt, _, service = _work_with_prompt(db_session)
+    other = service.create_prompt("Other")
+    service.append_version(other.id, "model-o", "template o")
+    assert service.resolve_prompt_for_work(work.id).prompt_id == prompt.id
+
+    WorksService(db_session).set_work_default_prompt(work.id, other.id)
+    assert service.resolve_prompt_for_work(work.id).template == "template o"
+
+    service.soft_delete_prompt(other.id)
+    assert service.resolve_prompt_for_work(work.id) == ResolvedPrompt(None, None, None, None, None)
@@ -0,0 +1,118 @@
+"""Tests for the per-provider LLM rate limiter."""
+
+from __future__ import annotations
+
+import asyncio
+
+import pytest
+
+from agents.rate_limiter import Priority, ProviderLimiter, TokenBucket, is_throttle_error
+
+
+class _ProviderError(Exception):
+    def __init__(self, status_code: int) -> None:
+        super().__init__(f"status {status_code}")
+        self.status_code = status_code
+
+
+class _Clock:
+    def __init__(self) -> None:
+        self.now = 0.0
+
+    def __call__(self) -> float:
+        return self.now
+
+
+def test_token_bucket_refills_per_minute_and_allows_debt():
+    clock = _Clock()
+    bucket = TokenBucket(60, clock=clock)
+
+    assert bucket.delay_for(60) == 0
+    bucket.take(90)  # usage came in above the reservation
+    assert bucket.delay_for(1) == pytest.approx(31.0)
+
+    clock.now = 31.0
+    assert bucket.delay_for(1) == 0
+    # Requests larger than the whole budget only wait for a full bucket.
+    assert bucket.delay_for(1000) == pytest.approx(59.0)
+    assert TokenBucket(0).delay_for(10**9) == 0
+
+
+def test_throttle_errors_halve_concurrency_and_successes_recover():
+    limiter = ProviderLimiter("openai", rpm=0, tpm=0, max_concurrency=8)
+
+    async def call(exc: Exception | None = None) -> None:
+        async with limiter.slot():
+            if exc is not None:
+                raise exc
+
+    async def run() -> None:
+        for status in (429, 503):
+            with pytest.raises(_ProviderError):
+                await call(_ProviderError(status))
+        assert limiter.limit == 2
+        with pytest.raises(_ProviderError):
+            await call(_ProviderError(400))  # client errors are not a backoff signal
+        for _ in range(8):
+            await call()
+
+    asyncio.run(run())
+    assert limiter.throttled == 2
+    assert 4 < limiter.limit <= 8
+    assert limiter.in_flight == 0
+    assert is_throttle_error(_ProviderError(502))
+    assert not is_throttle_error(ValueError("boom"))
+
+
+def test_waiting_interactive_calls_are_served_before_background():
+    limiter = ProviderLimiter("openai", rpm=0, tpm=0, max_concurrency=1)
+    order: list[str] = []
+
+    async def call(name: str, priority: Priority, release: asyncio.Event | None = None) -> None:
+        async with limiter.slot(priority):
+            order.append(name)
+            if release is not None:
+                await release.wait()
+
+    async def run() -> None:
+        release = asyncio.Event()
+        holder = asyncio.create_task(call("holder", Priority.INTERACTIVE, release))
+        await asyncio.sleep(0)
+        waiters = [
+            asyncio.create_task(call("bg-1", Priority.BACKGROUND)),
+            asyncio.create_task(call("bg-2", Priority.BACKGROUND)),
+            asyncio.create_task(call("reader", Priority.INTERACTIVE)),
+        ]
+        await asyncio.sleep(0)
+        assert limiter.stats()["waiting"] == 3
+        release.set()
+        await asyncio.gather(holder, *waiters)
+
+    asyncio.run(run())
+    assert order == ["holder", "reader", "bg-1", "bg-2"]
+    assert limiter.in_flight == 0
+
+
+def test_cancelled_waiter_does_not_leak_a_slot():
+    limiter = ProviderLimiter("openai", rpm=0, tpm=0, max_concurrency=1)
+
+    async def run() -> None:
+        release = asyncio.Event()
+
+        async def hold() -> None:
+            async with limiter.slot():
+                await release.wait()
+
+        holder = asyncio.create_task(hold())
+        await asyncio.sleep(0)
+        waiter = asyncio.create_task(hold())
+        await asyncio.sleep(0)
+        waiter.cancel()
+        with pytest.raises(asyncio.CancelledError):
+            await waiter
+        release.set()
+        await holder
+
+    asyncio.run(run())
+    assert limiter.stats()["waiting"] == 0
+    assert limiter.in_flight == 0
@@ -0,0 +1,173 @@
+"""Tests for the pooled, retrying scraper HTTP client, against a local server."""
+
+from __future__ import annotations
+
+import asyncio
+import gzip
+import threading
+from http.server import BaseHTTPRequestHandler, ThreadingHTTPServer
+
+import httpx
+import pytest
+import requests
+
+from app.clients import NotModifiedError, Page, RequestsClient, Validators
+
+PAGE = "<html><body>第一話</body></html>".encode()
+
+
+class _Handler(BaseHTTPRequestHandler):
+    protocol_version = "HTTP/1.1"  # keep-alive
+
+    def do_GET(self) -> None:  # noqa: N802 - http.server naming
+        self.server.peers.add(self.client_address)
+        hits = self.server.hits
+        hits[self.path] = hits.get(self.path, 0) + 1
+        self.server.seen_headers.append(dict(self.headers))
+        if self.path == "/flaky" and hits[self.path] <= 2:
+            self._send(502, b"bad gateway")
+        elif self.path == "/busy":
+            self._send(503, b"slow down")
+        elif self.path == "/chapter":
+            if self.headers.get("If-None-Match") == '"v1"':
+                self._send(304, b"")
+            else:
+                self._send(200, PAGE, {"ETag": '"v1"'})
+        elif self.path == "/gzip":
+            self._send(200, gzip.compress(PAGE), {"Content-Encoding": "gzip"})
+        else:
+            self._send(200, PAGE)
+
+    def _send(self, status: int, body: bytes, headers: dict[str, str] | None = None) -> None:
+        self.send_response(status)
+        for name, value in (headers or {}).items():
+            self.send_header(name, value)
+        self.send_header("Content-Type", "text/html; charset=utf-8")
+        if status != 304:
+            self.send_header("Content-Length", str(len(body)))
+        self.end_headers()
+        self.wfile.write(body)
+
+    def log_message(self, *args) -> None:
+        pass
+
+
+@pytest.fixture
+def server():
+    httpd = ThreadingHTTPServer(("127.0.0.1", 0), _Handler)
+    httpd.hits = {}
+    httpd.seen_headers = []
+    httpd.peers = set()
+    thread = threading.Thread(target=httpd.serve_forever, args=(0.05,), daemon=True)
+    thread.start()
+    yield httpd
+    httpd.shutdown()
+    httpd.server_close()
+
+
+def _url(server, path: str) -> str:
+    return f"http://127.0.0.1:{server.server_port}{path}"
+
+
+def _afetch(client: RequestsClient, url: str, **kwargs) -> str:
+    async def run() -> str:
+        try:
+            return await client.afetch(url, **kwargs)
+        finally:
+            await client.aclose()
+
+    return asyncio.run(run())
+
+
+def test_page_validators_make_a_fetch_conditional(server):
+    client = RequestsClient()
+    url = _url(server, "/chapter")
+
+    async def run():
+        try:
+            page = await client.afetch_page(url)
+            # The client keeps no validators itself: the page downloads again.
+            assert await client.afetch(url) == PAGE.decode()
+            with pytest.raises(NotModifiedError):
+                await client.afetch_page(url, validators=page.validators)
+            return page
+        finally:
+            await client.aclose()
+
+    page = asyncio.run(run())
+
+    assert page == Page(PAGE.decode(), Validators(etag='"v1"'))
+    assert "If-None-Match" not in server.seen_headers[1]
+    assert server.seen_headers[-1]["If-None-Match"] == '"v1"'
+    stats = client.stats()[f"127.0.0.1:{server.server_port}"]
+    assert stats["requests"] == 3
+    assert stats["not_modified"] == 1
+    assert stats["bytes"] == 2 * len(PAGE)
+
+
+@pytest.mark.parametrize("use_async", [False, True])
+def test_transient_errors_are_retried(server, use_async):
+    client = RequestsClient(retry_base_delay_s=0.01)
+    fetch = (lambda url: _afetch(client, url)) if use_async else client.fetch
+
+    assert fetch(_url(server, "/flaky")) == PAGE.decode()
+    assert server.hits["/flaky"] == 3
+    assert client.stats()[f"127.0.0.1:{server.server_port}"]["retried"] == 2
+
+
+@pytest.mark.parametrize("use_async", [False, True])
+def test_throttling_answers_are_left_to_the_caller(server, use_async):
+    client = RequestsClient(retry_base_delay_s=0.01)
+    fetch = (lambda url: _afetch(client, url)) if use_async else client.fetch
+
+    with pytest.raises((requests.HTTPError, httpx.HTTPStatusError)) as excinfo:
+        fetch(_url(server, "/busy"))
+    assert excinfo.value.response.status_code == 503
+    assert server.hits["/busy"] == 1
+    assert client.stats()[f"127.0.0.1:{server.server_port}"]["errors"] == 1
+
+
+@pytest.mark.parametrize("use_async", [False, True])
+def test_compressed_responses_are_negotiated_and_decoded(server, use_async):
+    client = RequestsClient()
+    fetch = (lambda url: _afetch(client, url)) if use_async else client.fetch
+
+    assert fetch(_url(server, "/gzip")) == PAGE.decode()
+    assert "gzip" in server.seen_headers[-1]["Accept-Encoding"]
+
+
+@pytest.mark.parametrize("use_async", [False, True])
+def test_fetches_reuse_one_pooled_connection(server, use_async):
+    client = RequestsClient()
+    if use_async:
+
+        async def run() -> None:
+            for _ in range(3):
+                await client.afetch(_url(server, "/page"))
+            await client.aclose()
+
+        asyncio.run(run())
+    else:
+        for _ in range(3):
+            client.fetch(_url(server, "/page"))
+
+    assert server.hits["/page"] == 3
+    assert len(server.peers) == 1
+
+
+def test_each_event_loop_gets_a_client_closed_with_the_loop(server):
+    client = RequestsClient()
+    url = _url(server, "/page")
+
+    async def run() -> httpx.AsyncClient:
+        await client.afetch(url)
+        await client.afetch(url)
+        return client._async_clients[asyncio.get_running_loop()]
+
+    first = asyncio.run(run())
+    second = asyncio.run(run())
+
+    assert first is not second
+    assert first.is_closed and second.is_closed
+    assert client._async_clients == {}
+    assert len(server.peers) == 2
@@ -0,0 +1,174 @@
+"""Tests for streamed LLM call deadlines, retries and hedging."""
+
+from __future__ import annotations
+
+import asyncio
+import contextvars
+
+import pytest
+
+from agents.resilience import (
+    STREAM_STARTED,
+    FirstTokenTimeoutError,
+    InterTokenTimeoutError,
+    StreamPolicy,
+    resilient_stream,
+)
+
+
+class _ProviderError(Exception):
+    def __init__(self, status_code: int) -> None:
+        super().__init__(f"status {status_code}")
+        self.status_code = status_code
+
+
+def _scripted(*steps):
+    """Stream factory: each step is a chunk, a delay in seconds (float) or an exception."""
+    calls = {"opened": 0, "closed": 0}
+
+    def open_stream():
+        calls["opened"] += 1
+
+        async def _stream():
+            try:
+                for step in steps:
+                    if isinstance(step, BaseException):
+                        raise step
+                    if isinstance(step, float):
+                        await asyncio.sleep(step)
+                        continue
+                    yield step
+            finally:
+                calls["closed"] += 1
+
+        return _stream()
+
+    return open_stream, calls
+
+
+def _collect(stream) -> list[str]:
+    async def run() -> list[str]:
+        return [chunk async for chunk in stream]
+
+    return asyncio.run(run())
+
+
+def test_failures_before_first_token_are_retried():
+    failures = iter([_ProviderError(429), _ProviderError(503)])
+
+    def open_stream():
+        error = next(failures, None)
+
+        async def _stream():
+            if error is not None:
+                raise error
+            yield "ok"
+
+        return _stream()
+
+    policy = StreamPolicy(max_retries=2, retry_base_delay_s=0.001)
+    assert _collect(resilient_stream(open_stream, policy=policy)) == ["ok"]
+
+
+def test_non_transient_and_mid_stream_failures_propagate():
+    open_bad, bad_calls = _scripted(_ProviderError(400))
+    with pytest.raises(_ProviderError):
+        _collect(resilient_stream(open_bad, policy=StreamPolicy(max_retries=3)))
+    assert bad_calls["opened"] == 1
+
+    open_mid, mid_calls = _scripted("a", _ProviderError(503))
+    seen: list[str] = []
+
+    async def run() -> None:
+        async for chunk in resilient_stream(open_mid, policy=StreamPolicy(max_retries=3)):
+            seen.append(chunk)
+
+    with pytest.raises(_ProviderError):
+        asyncio.run(run())
+    assert seen == ["a"]
+    assert mid_calls["opened"] == 1
+
+
+def test_first_and_inter_token_deadlines():
+    open_slow, slow_calls = _scripted(1.0, "late")
+    policy = StreamPolicy(first_token_timeout_s=0.02, max_retries=1, retry_base_delay_s=0.001)
+    with pytest.raises(FirstTokenTimeoutError):
+        _collect(resilient_stream(open_slow, policy=policy))
+    assert slow_calls["opened"] == 2
+    assert slow_calls["closed"] == 2
+
+    open_stall, _ = _scripted("a", 1.0, "b")
+    with pytest.raises(InterTokenTimeoutError):
+        _collect(resilient_stream(open_stall, policy=StreamPolicy(inter_token_timeout_s=0.02)))
+
+
+def test_hedge_wins_when_primary_first_token_is_late():
+    open_primary, primary_calls = _scripted(1.0, "primary")
+    open_hedge, hedge_calls = _scripted("hedge", " done")
+    policy = StreamPolicy(hedge_after_s=0.02)
+
+    chunks = _collect(resilient_stream(open_primary, policy=policy, open_hedge=open_hedge))
+
+    assert chunks == ["hedge", " done"]
+    assert primary_calls == {"opened": 1, "closed": 1}
+    assert hedge_calls == {"opened": 1, "closed": 1}
+
+
+def test_no_hedge_when_primary_is_fast():
+    open_primary, _ = _scripted("primary")
+    open_hedge, hedge_calls = _scripted("hedge")
+    policy = StreamPolicy(hedge_after_s=0.5)
+
+    assert _collect(resilient_stream(open_primary, policy=policy, open_hedge=open_hedge)) == [
+        "primary"
+    ]
+    assert hedge_calls["opened"] == 0
+
+
+def test_deadline_and_hedge_start_once_the_stream_leaves_the_queue():
+    # 0.1s waiting for a limiter slot, then a prompt first token.
+    open_primary, _ = _scripted(0.1, STREAM_STARTED, "primary")
+    open_hedge, hedge_calls = _scripted(STREAM_STARTED, "hedge")
+    policy = StreamPolicy(first_token_timeout_s=0.05, hedge_after_s=0.03)
+
+    chunks = _collect(
+        resilient_stream(open_primary, policy=policy, open_hedge=open_hedge, announces_start=True)
+    )
+
+    assert chunks == ["primary"]
+    assert hedge_calls["opened"] == 0
+
+    open_slow, _ = _scripted(STREAM_STARTED, 1.0, "late")
+    with pytest.raises(FirstTokenTimeoutError):
+        _collect(
+            resilient_stream(
+                open_slow,
+                policy=StreamPolicy(first_token_timeout_s=0.02),
+                announces_start=True,
+            )
+        )
+
+
+def test_stream_runs_in_one_task_so_its_context_stays_valid():
+    span = contextvars.ContextVar("span", default=None)
+    tasks = set()
+
+    def open_stream():
+        async def _stream():
+            token = span.set("llm")
+            try:
+                for chunk in ("a", "b", "c"):
+                    tasks.add(asyncio.current_task())
+                    await asyncio.sleep(0)
+                    yield chunk
+            finally:
+                # Raises ValueError if reset from another task's context.
+                span.reset(token)
+
+        return _stream()
+
+    policy = StreamPolicy(inter_token_timeout_s=1.0, hedge_after_s=1.0)
+    chunks = _collect(resilient_stream(open_stream, policy=policy, open_hedge=open_stream))
+
+    assert chunks == ["a", "b", "c"]
+    assert len(tasks) == 1
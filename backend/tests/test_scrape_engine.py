@@ -0,0 +1,168 @@
+"""Tests for the concurrent, per-host polite chapter fetcher."""
+
+from __future__ import annotations
+
+import asyncio
+import time
+from decimal import Decimal
+
+import httpx
+import pytest
+
+from app.clients import Page, Validators
+from app.kakuyomu.scraper import KakuyomuScraper
+from services.scrape_engine import HostLimiter, ScrapeEngine, get_host_limiter
+from tests.test_kakuyomu_scraper import WORK_ID, WORK_URL, FixtureHttpClient
+
+
+def _http_error(status: int, headers: dict[str, str] | None = None) -> httpx.HTTPStatusError:
+    request = httpx.Request("GET", "https://example.test/")
+    response = httpx.Response(status, headers=headers, request=request)
+    return httpx.HTTPStatusError(f"status {status}", request=request, response=response)
+
+
+class AsyncFakeScraper:
+    """Chapter N takes ``delays[N]`` seconds; fails per ``failures[N]`` in order."""
+
+    source = "fake"
+
+    def __init__(self, delays=None, failures=None) -> None:
+        self.delays = delays or {}
+        self.failures = failures or {}
+        self.in_flight = 0
+        self.peak_in_flight = 0
+        self.started: list[float] = []
+
+    async def aload_toc(self, source_id: str, fetch, parse) -> None:
+        pass
+
+    def build_chapter_url(self, source_id: str, chapter_number: Decimal) -> str:
+        return f"https://fake.test/{source_id}/{int(chapter_number)}"
+
+    @staticmethod
+    def parse_chapter(html: str) -> tuple[str, str]:
+        title, _, body = html.partition("\n")
+        return title, body
+
+    async def afetch_chapter(self, url: str, *, validators: Validators | None = None) -> Page:
+        number = int(url.rsplit("/", 1)[-1])
+        self.started.append(time.monotonic())
+        self.in_flight += 1
+        self.peak_in_flight = max(self.peak_in_flight, self.in_flight)
+        try:
+            await asyncio.sleep(self.delays.get(number, 0.01))
+            failures = self.failures.get(number)
+            if failures:
+                raise failures.pop(0)
+            return Page(f"Chapter {number}\nBody {number}", Validators())
+        finally:
+            self.in_flight -= 1
+
+
+async def _collect(engine: ScrapeEngine, count: int):
+    keys = [Decimal(n) for n in range(1, count + 1)]
+    return [fetched async for fetched in engine.chapters(keys)]
+
+
+def test_chapters_come_back_in_order_while_fetched_concurrently():
+    # Later chapters finish first; the consumer still sees them in order.
+    scraper = AsyncFakeScraper(delays={1: 0.08, 2: 0.05, 3: 0.02})
+    fetched = asyncio.run(_collect(ScrapeEngine(scraper, "w", prefetch=4), 6))
+
+    assert [f.sort_key for f in fetched] == [Decimal(n) for n in range(1, 7)]
+    assert [f.title for f in fetched] == [f"Chapter {n}" for n in range(1, 7)]
+    assert fetched[0].url == "https://fake.test/w/1"
+    assert scraper.peak_in_flight > 1
+
+
+def test_kakuyomu_toc_is_loaded_once_within_the_host_limits():
+    client = FixtureHttpClient()
+    scraper = KakuyomuScraper(http_client=client)
+    fetched = asyncio.run(_collect(ScrapeEngine(scraper, WORK_ID, prefetch=4), 3))
+
+    assert [f.error for f in fetched] == [None] * 3
+    assert client.requested[0] == WORK_URL
+    assert client.requested.count(WORK_URL) == 1
+    assert client.synchronous == []
+    assert get_host_limiter("kakuyomu.jp").stats()["fetched"] == 4
+
+
+def test_host_concurrency_caps_requests_in_flight(monkeypatch):
+    monkeypatch.setattr("app.config.settings.scrape_host_max_concurrency", 2)
+    scraper = AsyncFakeScraper()
+    asyncio.run(_collect(ScrapeEngine(scraper, "w", prefetch=8), 8))
+
+    assert scraper.peak_in_flight == 2
+    assert get_host_limiter("fake.test").stats()["fetched"] == 8
+
+
+def test_host_min_interval_spaces_request_starts(monkeypatch):
+    monkeypatch.setattr("app.config.settings.scrape_host_min_interval_s", 0.05)
+    scraper = AsyncFakeScraper()
+    asyncio.run(_collect(ScrapeEngine(scraper, "w", prefetch=4), 4))
+
+    gaps = [b - a for a, b in zip(scraper.started, scraper.started[1:], strict=False)]
+    assert min(gaps) >= 0.045
+
+
+def test_throttled_chapter_is_retried_after_retry_after(monkeypatch):
+    monkeypatch.setattr("app.config.settings.scrape_host_max_concurrency", 4)
+    scraper = AsyncFakeScraper(failures={2: [_http_error(429, {"Retry-After": "0.05"})]})
+    started = time.monotonic()
+    fetched = asyncio.run(_collect(ScrapeEngine(scraper, "w"), 3))
+
+    assert all(f.error is None for f in fetched)
+    assert fetched[1].title == "Chapter 2"
+    assert time.monotonic() - started >= 0.05
+    stats = get_host_limiter("fake.test").stats()
+    assert stats["throttled"] == 1
+    assert stats["limit"] < 4
+
+
+def test_errors_are_reported_per_chapter_without_retry(monkeypatch):
+    monkeypatch.setattr("app.config.settings.scrape_throttle_retries", 1)
+    scraper = AsyncFakeScraper(
+        failures={
+            1: [_http_error(404)],
+            2: [_http_error(503), _http_error(503)],
+        }
+    )
+    monkeypatch.setattr("app.config.settings.scrape_throttle_backoff_s", 0.01)
+    fetched = asyncio.run(_collect(ScrapeEngine(scraper, "w"), 3))
+
+    assert fetched[0].error.response.status_code == 404
+    assert fetched[1].error.response.status_code == 503
+    assert fetched[2].error is None
+
+
+def test_closing_the_iterator_cancels_fetches_in_flight():
+    scraper = AsyncFakeScraper(delays={n: 10.0 for n in range(2, 6)})
+
+    async def run():
+        keys = [Decimal(n) for n in range(1, 6)]
+        stream = ScrapeEngine(scraper, "w", prefetch=5).chapters(keys)
+        first = await anext(stream)
+        await stream.aclose()
+        return first
+
+    started = time.monotonic()
+    first = asyncio.run(run())
+    assert first.title == "Chapter 1"
+    assert scraper.in_flight == 0
+    assert time.monotonic() - started < 5
+
+
+def test_host_limiter_aimd_halves_on_throttle_and_grows_back():
+    limiter = HostLimiter("h", max_concurrency=8, min_interval_s=0.0, backoff_s=0.0)
+
+    async def run():
+        with pytest.raises(httpx.HTTPStatusError):
+            async with limiter.slot():
+                raise _http_error(503)
+        assert limiter.limit == 4
+        for _ in range(8):
+            async with limiter.slot():
+                pass
+
+    asyncio.run(run())
+    assert 5 < limiter.limit <= 8
@@ -0,0 +1,273 @@
+"""Work-level batch translation jobs."""
+
+from __future__ import annotations
+
+import asyncio
+from datetime import UTC, datetime, timedelta
+from decimal import Decimal
+from unittest.mock import patch
+
+import pytest
+from sqlalchemy import select
+
+from app.db import SessionLocal
+from app.models import (
+    Chapter,
+    ChapterGroup,
+    ChapterGroupMember,
+    ChapterTranslation,
+    TranslationBatchJob,
+    Work,
+)
+from services.exceptions import ChapterGroupNotFoundError
+from services.translation_batch import TranslationBatchManager, _job_tasks
+from services.translation_workflow import TranslationWorkflow
+from tests.test_translation_workflow import _mock_agent
+
+
+@pytest.fixture(autouse=True)
+def fresh_scheduler(monkeypatch):
+    monkeypatch.setattr("services.translation_jobs._registry", None)
+    monkeypatch.setattr("services.translation_batch._chapter_slots", None)
+    monkeypatch.setattr("services.translation_batch._segment_slots", None)
+
+
+def _make_work_with_chapters(session, count: int, *, source_id: str = "batch") -> Work:
+    work = Work(title="Batch Work", source="test", source_id=source_id, source_meta={})
+    session.add(work)
+    session.flush()
+    # Insert out of order to check chapters are walked by sort key.
+    for i in reversed(range(count)):
+        session.add(
+            Chapter(
+                work_id=work.id,
+                idx=i + 1,
+                sort_key=Decimal(i + 1),
+                title=f"Chapter {i + 1}",
+                normalized_text=f"第{i + 1}話。",
+                text_hash=f"batch-{i + 1}",
+            )
+        )
+    session.commit()
+    session.refresh(work)
+    return work
+
+
+def _chapter_ids(session, work: Work) -> list[int]:
+    stmt = select(Chapter.id).where(Chapter.work_id == work.id).order_by(Chapter.sort_key)
+    return list(session.execute(stmt).scalars().all())
+
+
+def test_create_job_resolves_range_in_reading_order(db_session):
+    work = _make_work_with_chapters(db_session, 5)
+    manager = TranslationBatchManager(db_session)
+
+    job = manager.create_job(work.id, start=Decimal("2"), end=Decimal("4"))
+
+    assert job.status == "pending"
+    assert job.total == 3
+    assert job.chapter_ids == _chapter_ids(db_session, work)[1:4]
+
+
+def test_create_job_resolves_group_members(db_session):
+    work = _make_work_with_chapters(db_session, 3)
+    chapter_ids = _chapter_ids(db_session, work)
+    group = ChapterGroup(work_id=work.id, name="Arc")
+    db_session.add(group)
+    db_session.flush()
+    for order_index, chapter_id in enumerate([chapter_ids[2], chapter_ids[0]]):
+        db_session.add(
+            ChapterGroupMember(group_id=group.id, chapter_id=chapter_id, order_index=order_index)
+        )
+    db_session.commit()
+
+    job = TranslationBatchManager(db_session).create_job(work.id, chapter_group_id=group.id)
+
+    assert job.chapter_ids == [chapter_ids[2], chapter_ids[0]]
+
+
+def test_create_job_rejects_group_of_another_work(db_session):
+    work = _make_work_with_chapters(db_session, 1)
+    other = _make_work_with_chapters(db_session, 1, source_id="other")
+    group = ChapterGroup(work_id=other.id, name="Elsewhere")
+    db_session.add(group)
+    db_session.commit()
+
+    with pytest.raises(ChapterGroupNotFoundError):
+        TranslationBatchManager(db_session).create_job(work.id, chapter_group_id=group.id)
+
+
+def test_run_job_translates_every_chapter(db_session):
+    work = _make_work_with_chapters(db_session, 3)
+    manager = TranslationBatchManager(db_session)
+    job = manager.create_job(work.id, start=Decimal("1"), end=Decimal("3"))
+
+    with patch.object(TranslationWorkflow, "_resolve_agent", return_value=_mock_agent()):
+        asyncio.run(manager.run_job(job.id))
+
+    db_session.refresh(job)
+    assert job.status == "completed"
+    assert job.progress == 3
+    assert job.completed_count == 3
+    assert job.failed_count == 0
+    statuses = db_session.execute(select(ChapterTranslation.status)).scalars().all()
+    assert statuses == ["completed"] * 3
+
+
+def test_run_job_respects_global_chapter_budget(db_session, monkeypatch):
+    monkeypatch.setattr(
+        "services.translation_batch.settings.translation_batch_chapter_concurrency", 2
+    )
+    work = _make_work_with_chapters(db_session, 5)
+    manager = TranslationBatchManager(db_session)
+    job = manager.create_job(work.id, start=Decimal("1"), end=Decimal("5"))
+
+    active = 0
+    peak = 0
+
+    async def _stream(*args, **kwargs):
+        nonlocal active, peak
+        active += 1
+        peak = max(peak, active)
+        await asyncio.sleep(0.01)
+        yield "done"
+        active -= 1
+
+    agent = _mock_agent()
+    agent.stream_segment.side_effect = _stream
+    with patch.object(TranslationWorkflow, "_resolve_agent", return_value=agent):
+        asyncio.run(manager.run_job(job.id))
+
+    db_session.refresh(job)
+    assert job.completed_count == 5
+    assert peak == 2
+
+
+def test_run_job_records_failed_chapters_as_partial(db_session):
+    work = _make_work_with_chapters(db_session, 2)
+    manager = TranslationBatchManager(db_session)
+    job = manager.create_job(work.id, start=Decimal("1"), end=Decimal("2"))
+
+    async def _stream(src, **kwargs):
+        if src == "第2話。":
+            raise RuntimeError("provider down")
+        yield "ok"
+
+    agent = _mock_agent()
+    agent.stream_segment.side_effect = _stream
+    with patch.object(TranslationWorkflow, "_resolve_agent", return_value=agent):
+        asyncio.run(manager.run_job(job.id))
+
+    db_session.refresh(job)
+    assert job.status == "partial"
+    assert job.completed_count == 1
+    assert job.failed_count == 1
+    assert job.error_details == [
+        {"chapter_id": _chapter_ids(db_session, work)[1], "reason": "provider down"}
+    ]
+
+
+def test_resume_incomplete_jobs_restarts_running_jobs(db_session):
+    work = _make_work_with_chapters(db_session, 2)
+    manager = TranslationBatchManager(db_session)
+    job = manager.create_job(work.id, start=Decimal("1"), end=Decimal("2"))
+    # Left running by a process whose heartbeat stopped.
+    job.status = "running"
+    job.progress = 1
+    job.updated_at = datetime.now(UTC) - timedelta(minutes=5)
+    db_session.commit()
+    cancelled = manager.create_job(work.id, start=Decimal("1"), end=Decimal("1"))
+    cancelled.status = "cancelled"
+    db_session.commit()
+
+    async def scenario():
+        resumed = manager.resume_incomplete_jobs()
+        await asyncio.gather(*_job_tasks.values())
+        return resumed
+
+    with patch.object(TranslationWorkflow, "_resolve_agent", return_value=_mock_agent()):
+        resumed = asyncio.run(scenario())
+
+    assert resumed == [job.id]
+    db_session.refresh(job)
+    assert job.status == "completed"
+    assert job.progress == 2
+
+
+def test_a_job_runs_in_only_one_of_the_processes_resuming_it(db_session):
+    work = _make_work_with_chapters(db_session, 2)
+    job = TranslationBatchManager(db_session).create_job(
+        work.id, start=Decimal("1"), end=Decimal("2")
+    )
+    agent = _mock_agent()
+
+    async def two_workers():
+        # Each worker process resumes every active job on startup.
+        with SessionLocal() as other_db:
+            await asyncio.gather(
+                TranslationBatchManager(db_session).run_job(job.id),
+                TranslationBatchManager(other_db).run_job(job.id),
+            )
+
+    with patch.object(TranslationWorkflow, "_resolve_agent", return_value=agent):
+        asyncio.run(two_workers())
+
+    db_session.refresh(job)
+    assert (job.status, job.completed_count) == ("completed", 2)
+    assert agent.stream_segment.call_count == 2
+
+
+def test_running_job_with_a_live_heartbeat_is_not_taken_over(db_session):
+    work = _make_work_with_chapters(db_session, 1)
+    job = TranslationBatchManager(db_session).create_job(
+        work.id, start=Decimal("1"), end=Decimal("1")
+    )
+    job.status = "running"
+    db_session.commit()
+
+    assert asyncio.run(TranslationBatchManager._claim(job.id)) is False
+
+    job.updated_at = datetime.now(UTC) - timedelta(minutes=5)
+    db_session.commit()
+    assert asyncio.run(TranslationBatchManager._claim(job.id)) is True
+    assert asyncio.run(TranslationBatchManager._claim(job.id)) is False
+
+
+def test_cancelled_job_does_not_run(db_session):
+    work = _make_work_with_chapters(db_session, 1)
+    manager = TranslationBatchManager(db_session)
+    job = manager.create_job(work.id, start=Decimal("1"), end=Decimal("1"))
+    assert manager.cancel_job(work.id).id == job.id
+    agent = _mock_agent()
+
+    with patch.object(TranslationWorkflow, "_resolve_agent", return_value=agent):
+        asyncio.run(manager.run_job(job.id))
+
+    db_session.refresh(job)
+    assert job.status == "cancelled"
+    agent.stream_segment.assert_not_called()
+
+
+def test_batch_api_rejects_concurrent_jobs(client, db_session):
+    work = _make_work_with_chapters(db_session, 1)
+    existing = TranslationBatchJob(work_id=work.id, chapter_ids=[], status="running")
+    db_session.add(existing)
+    db_session.commit()
+
+    resp = client.post(f"/works/{work.id}/translation-batch", json={"start": 1, "end": 1})
+
+    assert resp.status_code == 409
+    assert f"job {existing.id}" in resp.json()["detail"]
+
+
+def test_batch_api_requires_range_or_group(client, db_session):
+    work = _make_work_with_chapters(db_session, 1)
+
+    resp = client.post(f"/works/{work.id}/translation-batch", json={"start": 1})
+    assert resp.status_code == 422
+
+    resp = client.post(
+        f"/works/{work.id}/translation-batch",
+        json={"start": 1, "end": 2, "chapter_group_id": 1},
+    )
+    assert resp.status_code == 422
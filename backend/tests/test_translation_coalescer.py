@@ -0,0 +1,81 @@
+"""Tests for SSE delta coalescing and frame statistics."""
+
+from __future__ import annotations
+
+import asyncio
+
+from services.translation_coalescer import SSEStreamStats, coalesce_segment_deltas
+from services.translation_workflow import (
+    SegmentCompleteEvent,
+    SegmentDeltaEvent,
+    TranslationCompleteEvent,
+)
+
+
+def _delta(segment_id: int, text: str) -> SegmentDeltaEvent:
+    return SegmentDeltaEvent(
+        chapter_translation_id=1, segment_id=segment_id, order_index=segment_id, delta=text
+    )
+
+
+def _collect(events, *, max_chars: int, max_delay_ms: int, gap_s: float = 0.0) -> list:
+    async def _source():
+        for event in events:
+            if gap_s:
+                await asyncio.sleep(gap_s)
+            yield None, event
+
+    async def _inner():
+        return [
+            event
+            async for _event_id, event in coalesce_segment_deltas(
+                _source(), max_chars=max_chars, max_delay_ms=max_delay_ms
+            )
+        ]
+
+    return asyncio.run(_inner())
+
+
+def test_deltas_merge_up_to_max_chars():
+    events = [_delta(1, c) for c in "abcdefg"]
+    out = _collect(events, max_chars=3, max_delay_ms=0)
+    assert [e.delta for e in out] == ["abc", "def", "g"]
+
+
+def test_buffered_text_is_released_before_other_events():
+    complete = SegmentCompleteEvent(
+        chapter_translation_id=1, segment_id=1, order_index=1, text="ab"
+    )
+    done = TranslationCompleteEvent(chapter_translation_id=1, status="completed")
+    out = _collect(
+        [_delta(1, "a"), _delta(1, "b"), complete, _delta(2, "c"), _delta(3, "d"), done],
+        max_chars=100,
+        max_delay_ms=0,
+    )
+    assert out[0] == _delta(1, "ab")
+    assert out[1] is complete
+    # Deltas of different segments are never merged together.
+    assert out[2:4] == [_delta(2, "c"), _delta(3, "d")]
+    assert out[4] is done
+
+
+def test_slow_upstream_flushes_after_max_delay():
+    out = _collect([_delta(1, "a"), _delta(1, "b")], max_chars=100, max_delay_ms=5, gap_s=0.05)
+    assert [e.delta for e in out] == ["a", "b"]
+
+
+def test_zero_limits_pass_events_through():
+    events = [_delta(1, c) for c in "abc"]
+    out = _collect(events, max_chars=0, max_delay_ms=0)
+    assert [e.delta for e in out] == ["a", "b", "c"]
+
+
+def test_stream_stats_count_frames_and_bytes():
+    stats = SSEStreamStats()
+    stats.record({"event": "segment-delta", "data": '{"delta": "ab"}'})
+    stats.record({"event": "segment-delta", "data": '{"delta": "é"}'})
+    assert stats.frames == 2
+    assert stats.bytes == len('event: segment-delta\r\ndata: {"delta": "ab"}\r\n\r\n') + len(
+        'event: segment-delta\r\ndata: {"delta": "é"}\r\n\r\n'.encode()
+    )
+    assert stats.frames_per_second > 0
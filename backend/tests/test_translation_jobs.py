@@ -0,0 +1,303 @@
+"""Background chapter translation runs managed by the translation registry."""
+
+from __future__ import annotations
+
+import asyncio
+from decimal import Decimal
+from unittest.mock import AsyncMock, patch
+
+import pytest
+from sqlalchemy import select
+
+from app.db import SessionLocal
+from app.models import Chapter, ChapterTranslation, TranslationSegment
+from observability.metrics import DB_POOL_CHECKED_OUT
+from services.translation_jobs import (
+    TranslationJobHandle,
+    TranslationJobs,
+    get_translation_registry,
+)
+from services.translation_workflow import (
+    SegmentCompleteEvent,
+    SegmentDeltaEvent,
+    SegmentStartEvent,
+    TranslationCompleteEvent,
+    TranslationStatusEvent,
+    TranslationWorkflow,
+)
+from tests.test_translation_workflow import _make_chapter, _make_work, _mock_agent
+
+
+@pytest.fixture(autouse=True)
+def fresh_registry(monkeypatch):
+    monkeypatch.setattr("services.translation_jobs._registry", None)
+
+
+def _gated_agent(gate: asyncio.Event):
+    """Mock agent that emits one token, then waits on ``gate`` before the second."""
+
+    async def _stream(*args, **kwargs):
+        yield "hello"
+        await gate.wait()
+        yield " world"
+
+    agent = _mock_agent()
+    agent.stream_segment.side_effect = _stream
+    return agent
+
+
+async def _collect(gen) -> list:
+    return [event async for _event_id, event in gen]
+
+
+def test_subscribers_share_a_single_run(db_session):
+    work = _make_work(db_session)
+    chapter = _make_chapter(db_session, work, "一。")
+
+    async def scenario():
+        gate = asyncio.Event()
+        agent = _gated_agent(gate)
+        jobs = TranslationJobs(db_session)
+        with patch.object(TranslationWorkflow, "_resolve_agent", return_value=agent):
+            first = asyncio.create_task(
+                _collect(
+                    jobs.subscribe(
+                        chapter,
+                        work.id,
+                        prompt_override=None,
+                        is_disconnected=AsyncMock(return_value=False),
+                    )
+                )
+            )
+            await asyncio.sleep(0.01)
+            second = asyncio.create_task(
+                _collect(
+                    jobs.subscribe(
+                        chapter,
+                        work.id,
+                        prompt_override=None,
+                        is_disconnected=AsyncMock(return_value=False),
+                    )
+                )
+            )
+            await asyncio.sleep(0.01)
+            gate.set()
+            return agent, await first, await second
+
+    agent, first, second = asyncio.run(scenario())
+
+    agent.stream_segment.assert_called_once()
+    # The late subscriber replays what it missed, then tails the same run.
+    assert [type(e) for e in second] == [type(e) for e in first]
+    assert "".join(e.delta for e in second if isinstance(e, SegmentDeltaEvent)) == "hello world"
+    assert isinstance(second[-1], TranslationCompleteEvent)
+
+
+def test_disconnect_does_not_cancel_the_run(db_session):
+    work = _make_work(db_session)
+    chapter = _make_chapter(db_session, work, "一。")
+
+    async def scenario():
+        gate = asyncio.Event()
+        jobs = TranslationJobs(db_session)
+        with patch.object(TranslationWorkflow, "_resolve_agent", return_value=_gated_agent(gate)):
+            events = await _collect(
+                jobs.subscribe(
+                    chapter,
+                    work.id,
+                    prompt_override=None,
+                    is_disconnected=AsyncMock(side_effect=[False, True]),
+                )
+            )
+            handle = await jobs.ensure(chapter, work.id, prompt_override=None)
+            gate.set()
+            await handle.done.wait()
+        return events
+
+    events = asyncio.run(scenario())
+
+    assert isinstance(events[0], TranslationStatusEvent)
+    db_session.expire_all()
+    translation = db_session.execute(select(ChapterTranslation)).scalar_one()
+    assert translation.status == "completed"
+    segment = db_session.execute(select(TranslationSegment)).scalar_one()
+    assert segment.tgt == "hello world"
+
+
+def test_cancel_stops_the_run_and_notifies_subscribers(db_session):
+    work = _make_work(db_session)
+    chapter = _make_chapter(db_session, work, "一。")
+
+    async def scenario():
+        jobs = TranslationJobs(db_session)
+        with patch.object(
+            TranslationWorkflow, "_resolve_agent", return_value=_gated_agent(asyncio.Event())
+        ):
+            handle = await jobs.ensure(chapter, work.id, prompt_override=None)
+            queue = handle.subscribe()
+            # Cancel once the first token is out; the run awaits its DB writes.
+            while not any(isinstance(e, SegmentDeltaEvent) for _, e in handle.buffer):
+                await asyncio.sleep(0.005)
+            cancelled = await jobs.cancel(chapter)
+            events = []
+            while (item := queue.get_nowait()) is not None:
+                events.append(item[1])
+            return cancelled, events, await jobs.cancel(chapter)
+
+    cancelled, events, cancelled_again = asyncio.run(scenario())
+
+    translation = db_session.execute(select(ChapterTranslation)).scalar_one()
+    assert cancelled == translation.id
+    assert cancelled_again is None
+    assert events[-1] == TranslationStatusEvent(
+        chapter_translation_id=translation.id, status="idle"
+    )
+    db_session.refresh(translation)
+    assert translation.status == "idle"
+    segment = db_session.execute(select(TranslationSegment)).scalar_one()
+    assert segment.tgt == "hello"
+    assert "partial" in segment.flags
+
+
+def test_streaming_runs_and_subscribers_hold_no_connection(db_session):
+    work = _make_work(db_session)
+    chapters = [
+        Chapter(
+            work_id=work.id,
+            idx=n,
+            sort_key=Decimal(n),
+            title=f"Chapter {n}",
+            normalized_text="一。",
+            text_hash=f"hash-{n}",
+        )
+        for n in (1, 2, 3)
+    ]
+    db_session.add_all(chapters)
+    db_session.commit()
+    for chapter in chapters:
+        db_session.refresh(chapter)
+    work_id = work.id
+    db_session.close()
+
+    async def subscriber(chapter, gate):
+        # Each SSE request has its own session, open for the whole stream.
+        with SessionLocal() as db:
+            return await _collect(
+                TranslationJobs(db).subscribe(
+                    chapter,
+                    work_id,
+                    prompt_override=None,
+                    is_disconnected=AsyncMock(return_value=False),
+                )
+            )
+
+    async def scenario():
+        gate = asyncio.Event()
+        baseline = DB_POOL_CHECKED_OUT.value(engine="sync")
+        with patch.object(TranslationWorkflow, "_resolve_agent", return_value=_gated_agent(gate)):
+            streams = [asyncio.create_task(subscriber(chapter, gate)) for chapter in chapters]
+            handles = []
+            for chapter in chapters:
+                while (handle := await get_translation_registry().get(chapter.id)) is None:
+                    await asyncio.sleep(0.005)
+                handles.append(handle)
+            # Every run is waiting on the model mid-segment, every subscriber tailing.
+            while not all(
+                any(isinstance(e, SegmentDeltaEvent) for _, e in h.buffer) for h in handles
+            ):
+                await asyncio.sleep(0.005)
+            in_flight = DB_POOL_CHECKED_OUT.value(engine="sync")
+            gate.set()
+            return baseline, in_flight, await asyncio.gather(*streams)
+
+    baseline, in_flight, streams = asyncio.run(asyncio.wait_for(scenario(), timeout=10))
+
+    assert in_flight == baseline
+    assert all(isinstance(events[-1], TranslationCompleteEvent) for events in streams)
+
+
+def test_replay_buffer_drops_deltas_of_completed_segments():
+    handle = TranslationJobHandle()
+    handle.emit(SegmentStartEvent(1, 10, 0, 0, 2, "一。"))
+    handle.emit(SegmentDeltaEvent(1, 10, 0, "he"))
+    handle.emit(SegmentDeltaEvent(1, 10, 0, "llo"))
+    handle.emit(SegmentCompleteEvent(1, 10, 0, "hello"))
+    handle.emit(SegmentStartEvent(1, 11, 1, 2, 4, "二。"))
+    handle.emit(SegmentDeltaEvent(1, 11, 1, "wor"))
+
+    assert [type(e) for _, e in handle.buffer] == [
+        SegmentStartEvent,
+        SegmentCompleteEvent,
+        SegmentStartEvent,
+        SegmentDeltaEvent,
+    ]
+
+
+def test_subscriber_resumes_after_last_event_id(db_session):
+    work = _make_work(db_session)
+    chapter = _make_chapter(db_session, work, "一。")
+
+    async def scenario():
+        gate = asyncio.Event()
+        jobs = TranslationJobs(db_session)
+        with patch.object(TranslationWorkflow, "_resolve_agent", return_value=_gated_agent(gate)):
+            # First connection drops right after the first delta.
+            first = []
+            async for event_id, event in jobs.subscribe(
+                chapter,
+                work.id,
+                prompt_override=None,
+                is_disconnected=AsyncMock(return_value=False),
+            ):
+                first.append((event_id, event))
+                if isinstance(event, SegmentDeltaEvent):
+                    break
+            gate.set()
+            resumed = [
+                item
+                async for item in jobs.subscribe(
+                    chapter,
+                    work.id,
+                    prompt_override=None,
+                    is_disconnected=AsyncMock(return_value=False),
+                    last_event_id=first[-1][0],
+                )
+            ]
+        return first, resumed
+
+    first, resumed = asyncio.run(scenario())
+
+    assert [e.delta for _, e in first if isinstance(e, SegmentDeltaEvent)] == ["hello"]
+    # Only what came after the last seen event is replayed: no second start, no
+    # repeated "hello" delta.
+    resumed_events = [e for _, e in resumed]
+    assert not any(isinstance(e, SegmentStartEvent) for e in resumed_events)
+    assert [e.delta for e in resumed_events if isinstance(e, SegmentDeltaEvent)] == [" world"]
+    assert isinstance(resumed_events[-1], TranslationCompleteEvent)
+    seqs = [int(event_id.rsplit("-", 1)[1]) for event_id, _ in first + resumed]
+    assert seqs == sorted(seqs) and len(set(seqs)) == len(seqs)
+
+
+def test_replay_after_evicted_events_requests_resync():
+    handle = TranslationJobHandle(replay_limit=2)
+    handle.emit(TranslationStatusEvent(1, "running"))
+    handle.emit(SegmentStartEvent(1, 10, 0, 0, 2, "一。"))
+    handle.emit(SegmentDeltaEvent(1, 10, 0, "he"))
+
+    assert [seq for seq, _ in handle.buffer] == [2, 3]
+    assert not handle.replay_is_complete(None)
+    assert handle.replay_is_complete(handle.parse_event_id(handle.event_id(1)))
+    queue = handle.subscribe(handle.parse_event_id(handle.event_id(2)))
+    assert queue.get_nowait() == (3, SegmentDeltaEvent(1, 10, 0, "he"))
+    # Ids from another run do not resume this one.
+    assert handle.parse_event_id("deadbeef-2") is None
+
+
+def test_cancel_endpoint_without_running_job(client, db_session):
+    work = _make_work(db_session)
+    chapter = _make_chapter(db_session, work)
+
+    resp = client.post(f"/works/{work.id}/chapters/{chapter.id}/translate/cancel")
+
+    assert resp.status_code == 200
+    assert resp.json() == {"status": "no_active_job"}
@@ -0,0 +1,92 @@
+"""Tests for TranslationStreamService segment bookkeeping."""
+
+from __future__ import annotations
+
+from sqlalchemy import select
+
+from app.models import TranslationExplanation, TranslationSegment
+from services.translation_stream import TranslationStreamService
+from tests.test_translation_workflow import _make_chapter, _make_work
+
+ORIGINAL = "一。\n\n二。\n\n三。"
+
+
+def _translated_chapter(db_session, text: str = ORIGINAL):
+    work = _make_work(db_session)
+    chapter = _make_chapter(db_session, work, text)
+    service = TranslationStreamService(db_session)
+    translation = service.get_or_create_translation(chapter.id)
+    segments = service.ensure_segments(translation, chapter.normalized_text)
+    for segment in segments:
+        if "whitespace" not in (segment.flags or []):
+            service.persist_completed_segment_translation(
+                segment, f"tr:{chapter.normalized_text[segment.start : segment.end]}"
+            )
+    translation.status = "completed"
+    db_session.commit()
+    return chapter, translation, service
+
+
+def _segments(db_session, translation_id: int) -> list[TranslationSegment]:
+    db_session.expire_all()
+    stmt = (
+        select(TranslationSegment)
+        .where(TranslationSegment.chapter_translation_id == translation_id)
+        .order_by(TranslationSegment.order_index)
+    )
+    return list(db_session.execute(stmt).scalars().all())
+
+
+def test_resegment_keeps_unchanged_segments_and_shifts_offsets(db_session):
+    chapter, translation, service = _translated_chapter(db_session)
+    before = {seg.src_hash: seg.id for seg in _segments(db_session, translation.id)}
+
+    # A new paragraph is inserted up front and the middle one is edited.
+    chapter.normalized_text = "零。\n\n一。\n\n二！\n\n三。"
+    result = service.resegment_chapter(chapter)
+
+    segments = _segments(db_session, translation.id)
+    text = chapter.normalized_text
+    assert [text[seg.start : seg.end] for seg in segments] == [
+        "零。",
+        "\n\n",
+        "一。",
+        "\n\n",
+        "二！",
+        "\n\n",
+        "三。",
+    ]
+    assert [seg.order_index for seg in segments] == list(range(7))
+    by_src = {text[seg.start : seg.end]: seg for seg in segments}
+    assert by_src["一。"].tgt == "tr:一。"
+    assert by_src["三。"].tgt == "tr:三。"
+    assert by_src["三。"].id == before[by_src["三。"].src_hash]
+    assert by_src["零。"].tgt == ""
+    assert by_src["二！"].tgt == ""
+    assert result.removed == 1
+    assert result.added == 3  # "零。", its separator, and "二！"
+    assert result.kept == 4
+
+    db_session.refresh(translation)
+    assert translation.status == "pending"
+
+
+def test_resegment_drops_explanations_of_changed_segments_only(db_session):
+    chapter, translation, service = _translated_chapter(db_session)
+    first, _, second, _, _ = _segments(db_session, translation.id)
+    for segment in (first, second):
+        db_session.add(
+            TranslationExplanation(
+                analysis_unit_type="segment",
+                anchor_segment_id=segment.id,
+                chapter_translation_id=translation.id,
+                density="sparse",
+            )
+        )
+    db_session.commit()
+
+    chapter.normalized_text = "一。\n\n二！\n\n三。"
+    service.resegment_chapter(chapter)
+
+    anchors = set(db_session.execute(select(TranslationExplanation.anchor_segment_id)).scalars())
+    assert anchors == {first.id}
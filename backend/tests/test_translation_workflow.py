@@ -88,6 +88,7 @@ def _mock_agent(tokens: list[str] | None = None) -> MagicMock:
     agent = MagicMock()
     agent.context_window = 3
     agent.model = "test-model"
+    agent.system_prompt = None
     agent.stream_segment = MagicMock(side_effect=_stream)
     return agent
 
@@ -100,25 +101,19 @@ def _mock_agent(tokens: list[str] | None = None) -> MagicMock:
 class TestResolveAgent:
     def test_resolve_agent_uses_work_prompt(self, db_session):
         """Agent is constructed using the latest prompt version assigned to the work."""
+        from services.prompt import PromptService
+        from services.works import WorksService
+
         work = _make_work(db_session)
         db_session.commit()
+        prompt_service = PromptService(db_session)
+        prompt = prompt_service.create_prompt("Custom")
+        prompt_service.append_version(prompt.id, "old-model", "old template")
+        prompt_service.append_version(prompt.id, "custom-model", "custom template")
+        WorksService(db_session).set_work_default_prompt(work.id, prompt.id)
 
         workflow = TranslationWorkflow(db_session)
-        mock_prompt = MagicMock()
-        mock_prompt.id = 1
-        mock_version = MagicMock()
-        mock_version.template = "custom template"
-        mock_version.model = "custom-model"
-
-        with (
-            patch.object(workflow._prompt_service, "get_prompt_for_work", return_value=mock_prompt),
-            patch.object(
-                workflow._prompt_service,
-                "get_prompt_versions",
-                return_value=([mock_version], 1, 1, 0),
-            ),
-            patch("services.translation_workflow.TranslationAgent") as mock_agent_cls,
-        ):
+        with patch("services.translation_workflow.TranslationAgent") as mock_agent_cls:
             workflow._resolve_agent(work.id, prompt_override=None)
             call_kwargs = mock_agent_cls.call_args.kwargs
             assert call_kwargs["system_prompt"] == "custom template"
@@ -401,9 +396,9 @@ class TestStartOrResume:
         assert "partial" not in (updated_segment.flags or [])
         assert captured_contexts == [[]]
 
-    def test_partial_persistence_is_throttled_across_many_deltas(self, db_session):
-        """Rapid-fire deltas should not commit on every token; final text must still land."""
-        from services import translation_workflow as tw
+    def test_partial_text_is_written_behind_the_stream(self, db_session):
+        """Rapid-fire deltas should not commit from the stream; final text must still land."""
+        from services import partial_segment_writer as psw
 
         work = _make_work(db_session)
         chapter = _make_chapter(db_session, work, "some text")
@@ -425,7 +420,7 @@ class TestStartOrResume:
                 "persist_partial_segment_translation",
                 side_effect=_tracking,
             ),
-            patch.object(tw, "PARTIAL_COMMIT_INTERVAL_S", 60.0),
+            patch.object(psw, "PARTIAL_COMMIT_INTERVAL_S", 60.0),
         ):
             events = _run(
                 workflow.start_or_resume(
@@ -436,19 +431,19 @@ class TestStartOrResume:
                 )
             )
 
-        # With a 60s throttle and a synchronous test loop, only the first delta
-        # should pass the interval gate. The rest coalesce into segment-complete.
-        assert len(persist_calls) == 1
-        assert persist_calls[0] == "t0"
+        # In-flight text only goes to the write-behind buffer, which is settled
+        # (not flushed) once the segment completes.
+        assert persist_calls == []
+        assert workflow._partials.rows_written == 0
 
         assert any(isinstance(e, SegmentCompleteEvent) for e in events)
         segment = db_session.execute(select(TranslationSegment)).scalars().first()
         assert segment.tgt == "".join(tokens)
         assert "partial" not in (segment.flags or [])
 
-    def test_throttled_partial_is_flushed_on_cancel(self, db_session):
-        """If cancel fires before throttle elapses, the collected text is flushed."""
-        from services import translation_workflow as tw
+    def test_buffered_partial_is_flushed_on_cancel(self, db_session):
+        """If cancel fires before the buffer flushes, the collected text is persisted."""
+        from services import partial_segment_writer as psw
 
         work = _make_work(db_session)
         chapter = _make_chapter(db_session, work, "some text")
@@ -460,7 +455,7 @@ class TestStartOrResume:
 
         with (
             patch.object(workflow, "_resolve_agent", return_value=agent),
-            patch.object(tw, "PARTIAL_COMMIT_INTERVAL_S", 60.0),
+            patch.object(psw, "PARTIAL_COMMIT_INTERVAL_S", 60.0),
         ):
             _events, was_cancelled = _run_until_cancelled(
                 workflow.start_or_resume(
@@ -473,8 +468,8 @@ class TestStartOrResume:
 
         assert was_cancelled
         segment = db_session.execute(select(TranslationSegment)).scalars().first()
-        # First delta persisted by throttle; cancel fires on the third iteration,
-        # after "alpha"+"beta" was collected. Flush-on-cancel must save that text.
+        # Cancel fires on the third iteration, after "alpha"+"beta" was collected
+        # but before the buffer's interval elapsed. Flush-on-cancel must save it.
         assert segment.tgt == "alphabeta"
         assert "partial" in (segment.flags or [])
 
@@ -623,3 +618,206 @@ class TestRetranslateSegment:
 
         with pytest.raises(SegmentNotFoundError):
             workflow.preflight_segment_check(chapter, segment_id=99999)
+
+
+# ---------------------------------------------------------------------------
+# Tests — translation memory
+# ---------------------------------------------------------------------------
+
+
+def _make_second_chapter(session, work: Work, text: str) -> Chapter:
+    chapter = Chapter(
+        work_id=work.id,
+        idx=2,
+        sort_key=Decimal(2),
+        title="Chapter 2",
+        normalized_text=text,
+        text_hash="test-hash-2",
+    )
+    session.add(chapter)
+    session.commit()
+    session.refresh(chapter)
+    return chapter
+
+
+def _translate(workflow, chapter, work, agent) -> list:
+    with patch.object(workflow, "_resolve_agent", return_value=agent):
+        return _run(
+            workflow.start_or_resume(
+                chapter,
+                work.id,
+                prompt_override=None,
+                is_disconnected=AsyncMock(return_value=False),
+            )
+        )
+
+
+class TestTranslationMemory:
+    def test_repeated_source_is_served_from_memory(self, db_session):
+        """A source line already translated in the work skips the agent entirely."""
+        work = _make_work(db_session)
+        first = _make_chapter(db_session, work, "◇◇◇")
+        second = _make_second_chapter(db_session, work, "◇◇◇")
+        workflow = TranslationWorkflow(db_session)
+
+        _translate(workflow, first, work, _mock_agent(["* * *"]))
+
+        agent = _mock_agent(["should not be used"])
+        events = _translate(workflow, second, work, agent)
+
+        agent.stream_segment.assert_not_called()
+        deltas = [e for e in events if isinstance(e, SegmentDeltaEvent)]
+        completes = [e for e in events if isinstance(e, SegmentCompleteEvent)]
+        assert [e.delta for e in deltas] == ["* * *"]
+        assert [e.text for e in completes] == ["* * *"]
+        assert isinstance(events[-1], TranslationCompleteEvent)
+
+        segments = (
+            db_session.execute(select(TranslationSegment).order_by(TranslationSegment.id))
+            .scalars()
+            .all()
+        )
+        assert [s.tgt for s in segments] == ["* * *", "* * *"]
+        assert segments[0].cache_key is not None
+        assert segments[0].cache_key == segments[1].cache_key
+
+    def test_bypass_policy_calls_agent(self, db_session):
+        """cache_policy other than "reuse" always goes to the agent."""
+        work = _make_work(db_session)
+        first = _make_chapter(db_session, work, "◇◇◇")
+        second = _make_second_chapter(db_session, work, "◇◇◇")
+        workflow = TranslationWorkflow(db_session)
+
+        _translate(workflow, first, work, _mock_agent(["* * *"]))
+
+        translation = workflow._stream_service.get_or_create_translation(second.id)
+        translation.cache_policy = "bypass"
+        db_session.commit()
+
+        agent = _mock_agent(["fresh"])
+        _translate(workflow, second, work, agent)
+
+        agent.stream_segment.assert_called_once()
+
+    def test_memory_is_keyed_by_model(self, db_session):
+        """A different model does not reuse another model's output."""
+        work = _make_work(db_session)
+        first = _make_chapter(db_session, work, "◇◇◇")
+        second = _make_second_chapter(db_session, work, "◇◇◇")
+        workflow = TranslationWorkflow(db_session)
+
+        _translate(workflow, first, work, _mock_agent(["* * *"]))
+
+        agent = _mock_agent(["other model"])
+        agent.model = "other-model"
+        _translate(workflow, second, work, agent)
+
+        agent.stream_segment.assert_called_once()
+
+    def test_manual_edit_clears_cache_key(self, db_session):
+        """Hand-edited segments drop out of the translation memory."""
+        work = _make_work(db_session)
+        chapter = _make_chapter(db_session, work, "◇◇◇")
+        workflow = TranslationWorkflow(db_session)
+        _translate(workflow, chapter, work, _mock_agent(["* * *"]))
+
+        segment = db_session.execute(select(TranslationSegment)).scalar_one()
+        assert segment.cache_key is not None
+
+        svc = TranslationStreamService(db_session)
+        svc.batch_update_segment_translations(
+            segment.chapter_translation_id, [{"segment_id": segment.id, "tgt": "edited"}]
+        )
+        db_session.refresh(segment)
+        assert segment.cache_key is None
+
+
+# ---------------------------------------------------------------------------
+# Tests — pipelined segment translation
+# ---------------------------------------------------------------------------
+
+
+def _pipelined_agent(delays: dict[str, float]) -> tuple[MagicMock, list]:
+    """Mock agent echoing ``[src]`` after a per-source delay, recording each call."""
+    calls: list[tuple[str, list]] = []
+
+    async def _stream(src, *, preceding_segments, **kwargs):
+        calls.append((src, preceding_segments))
+        await asyncio.sleep(delays.get(src, 0))
+        yield f"[{src}]"
+
+    agent = _mock_agent()
+    agent.provider = "openai"
+    agent.stream_segment = MagicMock(side_effect=_stream)
+    return agent, calls
+
+
+class TestPipelinedTranslation:
+    TEXT = "一。\n\n二。\n\n三。"
+
+    def test_events_stay_in_order_when_later_segments_finish_first(self, db_session, monkeypatch):
+        monkeypatch.setattr(
+            "services.translation_workflow.settings.translation_segment_concurrency_openai", 3
+        )
+        work = _make_work(db_session)
+        chapter = _make_chapter(db_session, work, self.TEXT)
+        workflow = TranslationWorkflow(db_session)
+        agent, calls = _pipelined_agent({"一。": 0.05, "二。": 0.02})
+
+        events = _translate(workflow, chapter, work, agent)
+
+        # All three requests were issued before the first one finished.
+        assert [src for src, _ in calls] == ["一。", "二。", "三。"]
+        completes = [e for e in events if isinstance(e, SegmentCompleteEvent)]
+        assert [e.text for e in completes] == ["[一。]", "[二。]", "[三。]"]
+        order = [e.order_index for e in events if isinstance(e, SegmentStartEvent)]
+        assert order == sorted(order)
+        assert isinstance(events[-1], TranslationCompleteEvent)
+
+    def test_in_flight_neighbours_contribute_source_only_context(self, db_session, monkeypatch):
+        monkeypatch.setattr(
+            "services.translation_workflow.settings.translation_segment_concurrency_openai", 2
+        )
+        work = _make_work(db_session)
+        chapter = _make_chapter(db_session, work, self.TEXT)
+        workflow = TranslationWorkflow(db_session)
+        agent, calls = _pipelined_agent({})
+
+        _translate(workflow, chapter, work, agent)
+
+        contexts = dict(calls)
+        assert contexts["一。"] == []
+        # 二。 was launched alongside 一。, before it had any translation.
+        assert contexts["二。"] == [{"src": "一。", "tgt": ""}]
+        # 三。 was launched once 一。 was emitted and 二。 had finished streaming.
+        assert contexts["三。"] == [
+            {"src": "一。", "tgt": "[一。]"},
+            {"src": "二。", "tgt": "[二。]"},
+        ]
+
+    def test_cancellation_keeps_segments_translated_ahead(self, db_session, monkeypatch):
+        monkeypatch.setattr(
+            "services.translation_workflow.settings.translation_segment_concurrency_openai", 3
+        )
+        work = _make_work(db_session)
+        chapter = _make_chapter(db_session, work, self.TEXT)
+        workflow = TranslationWorkflow(db_session)
+        agent, _ = _pipelined_agent({})
+
+        with patch.object(workflow, "_resolve_agent", return_value=agent):
+            _, was_cancelled = _run_until_cancelled(
+                workflow.start_or_resume(
+                    chapter,
+                    work.id,
+                    prompt_override=None,
+                    is_disconnected=AsyncMock(side_effect=[False, True]),
+                )
+            )
+
+        assert was_cancelled
+        translation = db_session.execute(select(ChapterTranslation)).scalar_one()
+        assert translation.status == "idle"
+        segments = workflow._stream_service.get_segments_for_translation(translation.id)
+        translated = [s for s in segments if s.tgt]
+        assert [s.tgt for s in translated] == ["[一。]", "[二。]", "[三。]"]
+        assert all("partial" not in (s.flags or []) for s in translated)
@@ -0,0 +1,271 @@
+"""Tests for per-segment LLM usage accounting and its aggregates."""
+
+from __future__ import annotations
+
+import asyncio
+from datetime import UTC, datetime, timedelta
+from decimal import Decimal
+from unittest.mock import AsyncMock, MagicMock, patch
+
+import pytest
+from langchain_core.messages import AIMessageChunk
+from sqlalchemy import select
+
+from agents.base_agent import CallAttempt, CallUsage
+from agents.llm_registry import LLMClientRegistry
+from agents.translation_agent import TranslationAgent
+from app.config import settings
+from app.models import Chapter, ChapterTranslation, TranslationSegmentUsage, Work
+from services.translation_workflow import TranslationWorkflow
+from services.usage import UsageService
+
+
+def _make_chapter(session, text: str = "彼は歩く。\n\n彼女も歩く。") -> tuple[Work, Chapter]:
+    work = Work(title="Usage Work", source="test", source_id="usage-work", source_meta={})
+    session.add(work)
+    session.flush()
+    chapter = Chapter(
+        work_id=work.id,
+        idx=1,
+        sort_key=Decimal(1),
+        title="Chapter 1",
+        normalized_text=text,
+        text_hash="usage-hash",
+    )
+    session.add(chapter)
+    session.commit()
+    return work, chapter
+
+
+def _metered_agent(ttft_ms: int, *, fail: Exception | None = None) -> MagicMock:
+    """Mock agent whose stream reports usage the way ``BaseAgent.stream`` does.
+
+    Each call makes a failed attempt that is retried, and a hedge that loses.
+    """
+
+    async def _stream(*args, usage=None, **kwargs):
+        usage.attempts.append(
+            CallAttempt(provider="openai", model="gpt-5.2", outcome="error", duration_ms=40)
+        )
+        usage.attempts.append(CallAttempt(provider="openai", model="gpt-5.2", kind="hedge"))
+        attempt = CallAttempt(provider="openai", model="gpt-5.2", kind="retry")
+        usage.attempts.append(attempt)
+        yield "translated"
+        if fail is not None:
+            attempt.outcome = "error"
+            raise fail
+        attempt.outcome = "ok"
+        attempt.ttft_ms = ttft_ms
+        attempt.duration_ms = ttft_ms + 100
+        attempt.input_tokens = 1000
+        attempt.output_tokens = 200
+        attempt.cache_read_tokens = 600
+
+    agent = MagicMock()
+    agent.context_window = 3
+    agent.model = "gpt-5.2"
+    agent.system_prompt = None
+    agent.stream_segment = MagicMock(side_effect=_stream)
+    return agent
+
+
+def _translate(session, work: Work, chapter: Chapter, agent) -> None:
+    workflow = TranslationWorkflow(session)
+
+    async def run() -> None:
+        with patch.object(workflow, "_resolve_agent", return_value=agent):
+            async for _ in workflow.start_or_resume(
+                chapter,
+                work.id,
+                prompt_override=None,
+                is_disconnected=AsyncMock(return_value=False),
+            ):
+                pass
+
+    asyncio.run(run())
+
+
+def _usage_rows(session) -> list[TranslationSegmentUsage]:
+    stmt = select(TranslationSegmentUsage).order_by(TranslationSegmentUsage.id)
+    return list(session.execute(stmt).scalars().all())
+
+
+def test_segment_calls_are_recorded_and_rolled_up(db_session):
+    work, chapter = _make_chapter(db_session)
+    _translate(db_session, work, chapter, _metered_agent(ttft_ms=250))
+
+    rows = _usage_rows(db_session)
+    # Every request is recorded: the failed one, the losing hedge and the retry.
+    assert [(row.kind, row.outcome) for row in rows] == [
+        ("primary", "error"),
+        ("hedge", "cancelled"),
+        ("retry", "ok"),
+    ] * 2
+    assert all(row.segment_id is not None for row in rows)
+    completed = [row for row in rows if row.outcome == "ok"]
+    assert {row.ttft_ms for row in completed} == {250}
+    # 1000 input at $1.25/1M + 200 output at $10/1M.
+    assert completed[0].cost_usd == Decimal("0.003250")
+    assert {row.cost_usd for row in rows if row.outcome != "ok"} == {None}
+
+    translation = db_session.execute(select(ChapterTranslation)).scalar_one()
+    usage = translation.meta["usage"]
+    assert usage["calls"] == 6
+    assert usage["input_tokens"] == 2000
+    assert usage["cache_read_tokens"] == 1200
+    assert usage["cost_usd"] == 0.0065
+    assert translation.cost_cents == 1
+
+
+def test_stub_calls_are_not_recorded(db_session):
+    work, chapter = _make_chapter(db_session)
+    agent = _metered_agent(ttft_ms=0)
+
+    async def _stub(*args, **kwargs):
+        yield "lorem"
+
+    agent.stream_segment = MagicMock(side_effect=_stub)
+    _translate(db_session, work, chapter, agent)
+
+    assert _usage_rows(db_session) == []
+
+
+def test_calls_of_failed_segments_are_recorded(db_session):
+    work, chapter = _make_chapter(db_session)
+    _translate(db_session, work, chapter, _metered_agent(ttft_ms=250, fail=ValueError("boom")))
+
+    rows = _usage_rows(db_session)
+    assert [(row.kind, row.outcome) for row in rows] == [
+        ("primary", "error"),
+        ("hedge", "cancelled"),
+        ("retry", "error"),
+    ]
+    translation = db_session.execute(select(ChapterTranslation)).scalar_one()
+    assert translation.status == "error"
+    assert translation.meta["usage"]["calls"] == 3
+
+
+def test_calls_of_cancelled_segments_are_recorded(db_session):
+    work, chapter = _make_chapter(db_session)
+    workflow = TranslationWorkflow(db_session)
+    # Pre-loop check, then the reader leaves on the first delta.
+    is_disconnected = AsyncMock(side_effect=[False, True])
+
+    async def run() -> None:
+        with patch.object(workflow, "_resolve_agent", return_value=_metered_agent(ttft_ms=250)):
+            async for _ in workflow.start_or_resume(
+                chapter, work.id, prompt_override=None, is_disconnected=is_disconnected
+            ):
+                pass
+
+    with pytest.raises(asyncio.CancelledError):
+        asyncio.run(run())
+
+    # The retry was still streaming when the segment was abandoned.
+    assert [(row.kind, row.outcome) for row in _usage_rows(db_session)] == [
+        ("primary", "error"),
+        ("hedge", "cancelled"),
+        ("retry", "cancelled"),
+    ]
+
+
+def test_work_usage_and_latency_endpoints(client, db_session):
+    work, chapter = _make_chapter(db_session)
+    _translate(db_session, work, chapter, _metered_agent(ttft_ms=250))
+
+    response = client.get(f"/works/{work.id}/usage")
+    assert response.status_code == 200
+    body = response.json()
+    assert body["totals"]["calls"] == 6
+    assert body["totals"]["output_tokens"] == 400
+    assert body["by_model"][0]["model"] == "gpt-5.2"
+    assert body["by_model"][0]["cost_usd"] == 0.0065
+    assert client.get("/works/999999/usage").status_code == 404
+
+    response = client.get("/models/latency", params={"model": "gpt-5.2", "days": 7})
+    assert response.status_code == 200
+    body = response.json()
+    assert body["calls"] == 2
+    assert body["ttft_ms"]["p95"] == 250
+    assert body["duration_ms"]["p50"] == 350
+
+
+def test_latency_summary_respects_window(db_session):
+    work, chapter = _make_chapter(db_session)
+    _translate(db_session, work, chapter, _metered_agent(ttft_ms=250))
+
+    future = datetime.now(UTC) + timedelta(days=1)
+    summary = UsageService(db_session).latency_summary("gpt-5.2", since=future)
+    assert summary["calls"] == 0
+    assert summary["ttft_ms"]["p95"] is None
+
+
+def test_latency_percentiles_are_nearest_rank_over_completed_calls(db_session):
+    work, chapter = _make_chapter(db_session)
+    translation = ChapterTranslation(chapter_id=chapter.id, status="completed")
+    db_session.add(translation)
+    db_session.flush()
+
+    def row(ms: int, outcome: str = "ok", model: str = "gpt-5.2") -> TranslationSegmentUsage:
+        return TranslationSegmentUsage(
+            work_id=work.id,
+            chapter_translation_id=translation.id,
+            provider="openai",
+            model=model,
+            outcome=outcome,
+            ttft_ms=ms,
+            duration_ms=ms * 10,
+        )
+
+    db_session.add_all(row(ms) for ms in range(100, 0, -1))
+    db_session.add_all([row(5000, outcome="cancelled"), row(9000, outcome="error")])
+    db_session.add(row(7, model="gpt-5.2-mini"))
+    db_session.commit()
+
+    service = UsageService(db_session)
+    summary = service.latency_summary("gpt-5.2", since=datetime.now(UTC) - timedelta(days=1))
+    assert summary["calls"] == 100
+    assert summary["ttft_ms"] == {"p50": 50, "p95": 95, "p99": 99}
+    assert summary["duration_ms"] == {"p50": 500, "p95": 950, "p99": 990}
+
+    single = service.latency_summary("gpt-5.2-mini", since=datetime.now(UTC) - timedelta(days=1))
+    assert single["calls"] == 1
+    assert single["ttft_ms"] == {"p50": 7, "p95": 7, "p99": 7}
+
+
+def test_agent_records_every_provider_request(monkeypatch):
+    failures = iter([ConnectionError("connection reset")])
+
+    class FlakyLLM:
+        async def astream(self, messages, **kwargs):
+            error = next(failures, None)
+            if error is not None:
+                raise error
+            yield AIMessageChunk(
+                content="translated",
+                usage_metadata={"input_tokens": 10, "output_tokens": 2, "total_tokens": 12},
+            )
+
+    registry = LLMClientRegistry(llm_factory=lambda **kwargs: FlakyLLM())
+    monkeypatch.setattr("agents.llm_registry._registry", registry)
+    monkeypatch.setattr(settings, "llm_stream_max_retries", 1)
+    monkeypatch.setattr(settings, "llm_retry_base_delay_s", 0.001)
+    monkeypatch.setattr(settings, "llm_hedge_after_ms", 0)
+    agent = TranslationAgent(
+        model="gpt-5.2",
+        api_key="k",
+        api_base=None,
+        chunk_chars=32,
+        context_window=0,
+        provider="openai",
+    )
+    usage = CallUsage()
+
+    async def run() -> str:
+        return "".join([chunk async for chunk in agent.stream_segment("彼は歩く。", usage=usage)])
+
+    assert asyncio.run(run()) == "translated"
+    assert [(a.kind, a.outcome) for a in usage.attempts] == [("primary", "error"), ("retry", "ok")]
+    assert usage.attempts[0].input_tokens is None
+    assert usage.attempts[1].input_tokens == 10
+    assert usage.input_tokens == 10
@@ -6,6 +6,7 @@ from decimal import Decimal
 from sqlalchemy import select
 from sqlalchemy.orm import Session
 
+from app.clients import Page, Validators
 from app.models import Chapter, ChapterTranslation, ScrapeJob, TranslationSegment, Work
 from app.syosetu.scraper import SyosetuScraper
 from services.scrape_manager import ScrapeManager
@@ -104,11 +105,14 @@ def test_get_work(client, db_session):
 
 
 def test_scrape_chapters_request(client, db_session, monkeypatch):
-    def fake_scrape(self, url: str):
-        chapter = url.rstrip("/").split("/")[-1]
+    async def fake_fetch(self, url: str, *, validators=None):
+        return Page(url.rstrip("/").split("/")[-1], Validators())
+
+    def fake_parse(chapter: str):
         return f"Title {chapter}", f"Body {chapter}"
 
-    monkeypatch.setattr(SyosetuScraper, "scrape_chapter", fake_scrape)
+    monkeypatch.setattr(SyosetuScraper, "afetch_chapter", fake_fetch)
+    monkeypatch.setattr(SyosetuScraper, "parse_chapter", staticmethod(fake_parse))
 
     work = _create_work(db_session, "Queued Work")
     resp = client.post(
@@ -339,6 +343,68 @@ def test_stream_chapter_translation_persists_segments(client, db_session):
     assert payload["segments"][2]["flags"] == []
 
 
+def test_translation_state_etag_revalidates_until_a_segment_changes(client, db_session):
+    work = _create_work(db_session, "Cached State")
+    chapter = Chapter(
+        work_id=work.id,
+        idx=1,
+        sort_key=Decimal(1),
+        title="Cached State #1",
+        normalized_text="雨だ。傘がない！\n\n帰ろう。",
+        text_hash="cached-state-1",
+    )
+    db_session.add(chapter)
+    db_session.commit()
+    url = f"/works/{work.id}/chapters/{chapter.id}/translation"
+
+    first = client.get(url)
+    assert first.status_code == 200
+    etag = first.headers["etag"]
+    payload = first.json()
+    assert [s["text"] for s in payload["segments"][0]["sentences"]] == ["雨だ。", "傘がない！"]
+
+    assert client.get(url).headers["etag"] == etag
+    not_modified = client.get(url, headers={"If-None-Match": etag})
+    assert not_modified.status_code == 304
+    assert not_modified.content == b""
+
+    segment_id = payload["segments"][0]["id"]
+    edit = client.patch(
+        f"/works/{work.id}/chapters/{chapter.id}/segments/batch",
+        json={"edits": [{"segment_id": segment_id, "tgt": "It's raining."}]},
+    )
+    assert edit.status_code == 200
+
+    changed = client.get(url, headers={"If-None-Match": etag})
+    assert changed.status_code == 200
+    assert changed.headers["etag"] != etag
+    assert changed.json()["segments"][0]["tgt"] == "It's raining."
+
+
+def test_sentence_spans_are_split_once_per_distinct_source(monkeypatch):
+    from app.utils.sentence_splitter import GreedySentenceSplitter
+    from services import translation_state
+
+    calls = []
+
+    class CountingSplitter(GreedySentenceSplitter):
+        def split(self, text):
+            calls.append(text)
+            return super().split(text)
+
+    monkeypatch.setattr(translation_state, "_sentence_spans", translation_state._BoundedCache(2))
+    monkeypatch.setattr(translation_state, "get_sentence_splitter", CountingSplitter)
+
+    first = translation_state.sentence_spans("一。二。")
+    assert translation_state.sentence_spans("一。二。") == first
+    assert [span.text for span in first] == ["一。", "二。"]
+    assert translation_state.sentence_spans("\n\n") == ()
+    translation_state.sentence_spans("三。")
+    translation_state.sentence_spans("四。")  # evicts "一。二。"
+    translation_state.sentence_spans("一。二。")
+    assert calls == ["一。二。", "三。", "四。", "一。二。"]
+
+
 # ---------------------------------------------------------------------------
 # Streaming endpoint error boundary tests
 # ---------------------------------------------------------------------------
@@ -303,12 +303,37 @@ export function useChapterTranslationStream({
 				setStatus("completed");
 				closeStream("completed");
 			});
+			source.addEventListener("translation-resync", () => {
+				// The server could not replay everything we missed; reload the state.
+				void client
+					.get({
+						url: `/works/${workId}/chapters/${chapterId}/translation`,
+						responseType: "json",
+						throwOnError: true,
+					})
+					.then((response) => {
+						if (eventSourceRef.current !== source) return;
+						const payload = response.data as ChapterTranslationStateResponse;
+						applyPayload(payload);
+						setStatus("running");
+					})
+					.catch(() => {
+						setError("Failed to reload translation");
+					});
+			});
 			source.onerror = () => {
+				// While CONNECTING the browser retries with Last-Event-ID and the
+				// server resumes right after the last event we received.
+				if (source.readyState === EventSource.CONNECTING) {
+					setStatus("connecting");
+					return;
+				}
 				setError("Translation stream disconnected");
 				closeStream("error");
 			};
 		},
 		[
+			applyPayload,
 			chapterId,
 			closeStream,
 			handleSegmentComplete,
@@ -320,7 +345,17 @@ export function useChapterTranslationStream({
 
 	const pause = useCallback(() => {
 		closeStream("idle");
-	}, [closeStream]);
+		if (!workId || !chapterId) return;
+		// The run continues server-side after the stream closes; stop it explicitly.
+		void client
+			.post({
+				url: `/works/${workId}/chapters/${chapterId}/translate/cancel`,
+				responseType: "json",
+			})
+			.catch(() => {
+				setError("Failed to pause translation");
+			});
+	}, [chapterId, closeStream, workId]);
 
 	useEffect(() => {
 		return () => {
@@ -457,6 +492,7 @@ export function useChapterTranslationStream({
 			};
 		},
 		[
+			applyPayload,
 			chapterId,
 			closeStream,
 			handleSegmentComplete,